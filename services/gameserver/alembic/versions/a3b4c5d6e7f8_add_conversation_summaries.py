@@ -0,0 +1,59 @@
+"""add conversation_summaries table
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'conversation_summaries',
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('thread_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('last_message_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('last_message_at', sa.DateTime(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('player_id', 'thread_id'),
+    )
+    op.create_index(
+        'ix_conversation_summaries_player_last', 'conversation_summaries',
+        ['player_id', 'last_message_at', 'thread_id'],
+    )
+
+    # Backfill from existing messages: latest visible message and unread count per player and thread
+    op.execute("""
+        INSERT INTO conversation_summaries (player_id, thread_id, last_message_id, last_message_at, unread_count)
+        SELECT DISTINCT ON (player_id, thread_id)
+               player_id, thread_id, id, sent_at,
+               SUM(unread) OVER (PARTITION BY player_id, thread_id)
+        FROM (
+            SELECT sender_id AS player_id, thread_id, id, sent_at, 0 AS unread
+            FROM messages
+            WHERE thread_id IS NOT NULL AND NOT COALESCE(deleted_by_sender, false)
+            UNION ALL
+            SELECT recipient_id, thread_id, id, sent_at, CASE WHEN read_at IS NULL THEN 1 ELSE 0 END
+            FROM messages
+            WHERE thread_id IS NOT NULL AND recipient_id IS NOT NULL
+              AND NOT COALESCE(deleted_by_recipient, false)
+        ) visible
+        ORDER BY player_id, thread_id, sent_at DESC, id DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversation_summaries_player_last', table_name='conversation_summaries')
+    op.drop_table('conversation_summaries')
@@ -0,0 +1,48 @@
+"""add bounty_board aggregate table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f4a5b6c7d8e9
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f4a5b6c7d8e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bounty_board',
+        sa.Column('target_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_amount', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bounty_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['target_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('target_id'),
+    )
+    op.create_index('ix_bounty_board_total_amount', 'bounty_board', [sa.text('total_amount DESC')])
+    op.create_index('ix_players_personal_reputation', 'players', ['personal_reputation'])
+
+    # Backfill from the bounties already stored in player settings
+    op.execute("""
+        INSERT INTO bounty_board (target_id, total_amount, bounty_count)
+        SELECT p.id, SUM((b->>'amount')::int), COUNT(*)
+        FROM players p
+        CROSS JOIN LATERAL jsonb_array_elements(
+            COALESCE(p.settings->'bounties', '[]'::jsonb)
+        ) AS b
+        GROUP BY p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_players_personal_reputation', table_name='players')
+    op.drop_index('ix_bounty_board_total_amount', table_name='bounty_board')
+    op.drop_table('bounty_board')
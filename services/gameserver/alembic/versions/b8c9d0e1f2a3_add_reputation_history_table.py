@@ -0,0 +1,46 @@
+"""add reputation_history table and reputations.last_updated index
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reputation_history',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('reputation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('faction_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('old_value', sa.Integer(), nullable=False),
+        sa.Column('new_value', sa.Integer(), nullable=False),
+        sa.Column('change', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['reputation_id'], ['reputations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['faction_id'], ['factions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_reputation_history_reputation_created', 'reputation_history', ['reputation_id', 'created_at'])
+    op.create_index('ix_reputation_history_player_created', 'reputation_history', ['player_id', 'created_at'])
+    op.create_index('ix_reputations_last_updated', 'reputations', ['last_updated'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reputations_last_updated', table_name='reputations')
+    op.drop_index('ix_reputation_history_player_created', table_name='reputation_history')
+    op.drop_index('ix_reputation_history_reputation_created', table_name='reputation_history')
+    op.drop_table('reputation_history')
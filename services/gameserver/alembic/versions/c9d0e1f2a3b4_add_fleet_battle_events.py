@@ -0,0 +1,60 @@
+"""add fleet_battle_events table and fleet_battles.rounds_completed
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d0e1f2a3b4'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'fleet_battle_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('battle_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('round', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('phase', sa.String(length=50), nullable=False),
+        sa.Column('event_type', sa.String(length=20), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['battle_id'], ['fleet_battles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_fleet_battle_events_battle_round', 'fleet_battle_events', ['battle_id', 'round'])
+
+    op.add_column(
+        'fleet_battles',
+        sa.Column('rounds_completed', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    # Backfill the round counter from the legacy JSON log
+    op.execute("""
+        UPDATE fleet_battles fb
+        SET rounds_completed = sub.rounds
+        FROM (
+            SELECT id, COUNT(*) AS rounds
+            FROM fleet_battles,
+                 json_array_elements(
+                     CASE WHEN json_typeof(battle_log) = 'array' THEN battle_log ELSE '[]'::json END
+                 ) AS e
+            WHERE e->>'round' IS NOT NULL
+            GROUP BY id
+        ) sub
+        WHERE fb.id = sub.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('fleet_battles', 'rounds_completed')
+    op.drop_index('ix_fleet_battle_events_battle_round', table_name='fleet_battle_events')
+    op.drop_table('fleet_battle_events')
@@ -0,0 +1,58 @@
+"""add sector_summaries table
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sector_summaries',
+        sa.Column('sector_id', sa.Integer(), nullable=False),
+        sa.Column('station_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('planet_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('warp_tunnel_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('player_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['sector_id'], ['sectors.sector_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sector_id'),
+    )
+
+    # Indexes the summary refresh aggregates on
+    op.create_index('ix_stations_sector_id', 'stations', ['sector_id'], if_not_exists=True)
+    op.create_index('ix_planets_sector_id', 'planets', ['sector_id'], if_not_exists=True)
+    op.create_index('ix_players_current_sector_id', 'players', ['current_sector_id'], if_not_exists=True)
+    op.create_index('ix_warp_tunnels_origin_sector_id', 'warp_tunnels', ['origin_sector_id'], if_not_exists=True)
+    op.create_index('ix_warp_tunnels_destination_sector_id', 'warp_tunnels', ['destination_sector_id'], if_not_exists=True)
+
+    # Backfill
+    op.execute("""
+        INSERT INTO sector_summaries (sector_id, station_count, planet_count, warp_tunnel_count, player_count)
+        SELECT s.sector_id,
+               (SELECT COUNT(*) FROM stations st WHERE st.sector_id = s.sector_id),
+               (SELECT COUNT(*) FROM planets p WHERE p.sector_id = s.sector_id),
+               (SELECT COUNT(*) FROM warp_tunnels w
+                 WHERE w.origin_sector_id = s.id OR w.destination_sector_id = s.id),
+               (SELECT COUNT(*) FROM players pl WHERE pl.current_sector_id = s.sector_id)
+        FROM sectors s
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_warp_tunnels_destination_sector_id', table_name='warp_tunnels', if_exists=True)
+    op.drop_index('ix_warp_tunnels_origin_sector_id', table_name='warp_tunnels', if_exists=True)
+    op.drop_index('ix_players_current_sector_id', table_name='players', if_exists=True)
+    op.drop_index('ix_planets_sector_id', table_name='planets', if_exists=True)
+    op.drop_index('ix_stations_sector_id', table_name='stations', if_exists=True)
+    op.drop_table('sector_summaries')
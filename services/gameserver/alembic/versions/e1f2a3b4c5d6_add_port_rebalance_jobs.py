@@ -0,0 +1,48 @@
+"""add port_rebalance_jobs table
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f2a3b4c5d6'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'port_rebalance_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('dry_run', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('batch_size', sa.Integer(), nullable=False, server_default='500'),
+        sa.Column('seed', sa.BigInteger(), nullable=False),
+        sa.Column('total_stations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed_stations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('changed_stations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_station_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('sample_changes', sa.JSON(), nullable=False, server_default='[]'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_port_rebalance_jobs_status', 'port_rebalance_jobs', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_port_rebalance_jobs_status', table_name='port_rebalance_jobs')
+    op.drop_table('port_rebalance_jobs')
@@ -0,0 +1,40 @@
+"""add anomaly_flags table
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e1f2a3b4c5d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'anomaly_flags',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('flag_type', sa.String(length=30), nullable=False),
+        sa.Column('severity', sa.String(length=10), nullable=False, server_default='medium'),
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('counterparty_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('commodity', sa.String(length=50), nullable=True),
+        sa.Column('metric', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('details', sa.JSON(), nullable=False, server_default='{}'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_anomaly_flags_type_created', 'anomaly_flags', ['flag_type', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_anomaly_flags_type_created', table_name='anomaly_flags')
+    op.drop_table('anomaly_flags')
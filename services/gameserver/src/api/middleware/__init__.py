@@ -2,6 +2,7 @@
 Middleware package for Sectorwars2102 gameserver
 """
 
+from .metrics import MetricsMiddleware
 from .security import (
     SecurityHeadersMiddleware,
     RateLimitingMiddleware,
@@ -11,6 +12,7 @@ from .security import (
 )
 
 __all__ = [
+    "MetricsMiddleware",
     "SecurityHeadersMiddleware",
     "RateLimitingMiddleware", 
     "InputValidationMiddleware",
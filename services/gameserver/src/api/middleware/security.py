@@ -15,6 +15,8 @@ import json
 from typing import Callable
 from sqlalchemy.orm import Session
 
+from src.utils.threat_scanner import ThreatScanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -233,6 +235,9 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
         "onclick=", "onmouseover=", "<iframe", "<object", "<embed"
     ]
     
+    # All patterns matched in one pass, with a verdict cache for repeated values
+    _scanner = ThreatScanner(regex_rules={}, literal_rules={"dangerous": DANGEROUS_PATTERNS})
+    
     def __init__(self, app):
         super().__init__(app)
         
@@ -263,8 +268,7 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
     
     def _contains_dangerous_pattern(self, value: str) -> bool:
         """Check if value contains any dangerous patterns"""
-        value_lower = value.lower()
-        return any(pattern in value_lower for pattern in self.DANGEROUS_PATTERNS)
+        return "dangerous" in self._scanner.scan(value)
 
 
 class AuditLoggingMiddleware(BaseHTTPMiddleware):
@@ -26,6 +26,16 @@ from src.models.planet import Planet
 from src.models.team import Team
 from src.models.game_event import GameEvent, EventEffect, EventParticipation, EventType, EventStatus
 from src.schemas.user import UserAdminResponse
+from src.services.admin_query_service import (
+    effect_counts,
+    effects_by_event,
+    page_sectors,
+    refresh_sector_summaries,
+    sector_flags,
+    team_rollups,
+    usernames_by_player,
+    usernames_by_user,
+)
 
 # Request schemas for universe management
 class GalaxyGenerateRequest(BaseModel):
@@ -609,23 +619,18 @@ async def get_all_teams(
     try:
         teams = db.query(Team).all()
         
+        # Member statistics and leader names for every team in two queries
+        rollups = team_rollups(db)
+        leader_names = usernames_by_player(db, (team.leader_id for team in teams))
+        
         # Build teams response
         teams_list = []
         for team in teams:
             try:
-                # Get team statistics with error handling
-                members = db.query(Player).filter(Player.team_id == team.id).all()
-                member_count = len(members)
-                total_credits = sum(member.credits for member in members)
-                
-                # Get leader info with error handling
-                leader_name = "Unknown"
-                try:
-                    leader = db.query(Player).join(User).filter(Player.id == team.leader_id).first()
-                    if leader and leader.user:
-                        leader_name = leader.user.username
-                except Exception as e:
-                    logger.warning(f"Failed to resolve leader name for team {team.id}: {e}")
+                rollup = rollups.get(team.id)
+                member_count = rollup.member_count if rollup else 0
+                total_credits = rollup.total_credits if rollup else 0
+                leader_name = leader_names.get(team.leader_id, "Unknown")
                 
                 teams_list.append({
                     "id": str(team.id),
@@ -676,12 +681,13 @@ async def get_teams_analytics(
         largest_team = None
         max_combat_rating = 0
         max_member_count = 0
+        rollups = team_rollups(db)
         
         for team in teams:
             try:
                 # Get member count for this team
-                members = db.query(Player).filter(Player.team_id == team.id).all()
-                member_count = len(members)
+                rollup = rollups.get(team.id)
+                member_count = rollup.member_count if rollup else 0
                 total_members += member_count
                 
                 # Track largest team
@@ -695,7 +701,7 @@ async def get_teams_analytics(
                 
                 # Calculate combat rating (simplified)
                 try:
-                    total_combat_rating = sum(getattr(member, 'combat_rating', 0) for member in members)
+                    total_combat_rating = rollup.total_combat_rating if rollup else 0
                     if total_combat_rating > max_combat_rating:
                         max_combat_rating = total_combat_rating
                         most_powerful_team = {
@@ -1241,33 +1247,22 @@ async def get_all_sectors(
     cluster_id: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_admin: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """Get sectors with optional filtering"""
-    query = db.query(Sector)
-    
+    filters = []
     if cluster_id:
-        query = query.filter(Sector.cluster_id == cluster_id)
+        filters.append(Sector.cluster_id == cluster_id)
     elif region_id:
-        query = query.join(Cluster).filter(Cluster.region_id == region_id)
+        filters.append(Sector.cluster_id.in_(db.query(Cluster.id).filter(Cluster.region_id == region_id)))
     
-    sectors = query.offset(offset).limit(limit).all()
+    sector_page = page_sectors(db, limit, cursor=cursor, offset=None if cursor else offset, filters=filters)
     
     sector_list = []
-    for sector in sectors:
-        # Check for port in this sector
-        has_port = db.query(Station).filter(Station.sector_id == sector.sector_id).first() is not None
-        
-        # Check for planet in this sector
-        has_planet = db.query(Planet).filter(Planet.sector_id == sector.sector_id).first() is not None
-        
-        # Check for warp tunnels from this sector (using UUID sector.id, not integer sector_id)
-        has_warp_tunnel = db.query(WarpTunnel).filter(
-            (WarpTunnel.origin_sector_id == sector.id) |
-            (WarpTunnel.destination_sector_id == sector.id)
-        ).first() is not None
-        
+    for sector, summary in sector_page.rows:
+        flags = sector_flags(summary)
         sector_list.append({
             "id": str(sector.id),
             "sector_id": sector.sector_id,
@@ -1280,14 +1275,15 @@ async def get_all_sectors(
             "hazard_level": sector.hazard_level,
             "is_discovered": sector.is_discovered,
             "is_navigable": True,  # Default to True, override if nav_hazards exist
-            "has_port": has_port,
-            "has_planet": has_planet,
-            "has_warp_tunnel": has_warp_tunnel,
+            "has_port": flags["has_port"],
+            "has_planet": flags["has_planet"],
+            "has_warp_tunnel": flags["has_warp_tunnel"],
             "resource_richness": "average",  # TODO: Calculate from resources
             "controlling_faction": sector.controlling_faction
         })
     
-    return {"sectors": sector_list, "total": query.count()}
+    total = db.query(func.count(Sector.id)).filter(*filters).scalar()
+    return {"sectors": sector_list, "total": total, "next_cursor": sector_page.next_cursor}
 
 @router.post("/warp-tunnels/create", response_model=dict)
 async def create_warp_tunnel(
@@ -1324,6 +1320,8 @@ async def create_warp_tunnel(
         )
         
         db.add(warp_tunnel)
+        db.flush()
+        refresh_sector_summaries(db, [source_sector.sector_id, target_sector.sector_id])
         db.commit()
         db.refresh(warp_tunnel)
         
@@ -1727,9 +1725,9 @@ async def get_game_events_summary(
             .all()
         )
 
+        creators = usernames_by_user(db, (event.created_by for event in recent_events))
         recent_list = []
         for event in recent_events:
-            creator = db.query(User).filter(User.id == event.created_by).first()
             recent_list.append({
                 "id": str(event.id),
                 "title": event.title,
@@ -1737,7 +1735,7 @@ async def get_game_events_summary(
                 "status": event.status.value if isinstance(event.status, EventStatus) else str(event.status),
                 "start_time": event.start_time.isoformat() if event.start_time else None,
                 "end_time": event.end_time.isoformat() if event.end_time else None,
-                "created_by": creator.username if creator else "System",
+                "created_by": creators.get(event.created_by, "System"),
                 "created_at": event.created_at.isoformat() if event.created_at else None,
                 "participation_count": event.participation_count or 0,
             })
@@ -1819,14 +1817,12 @@ async def list_game_events(
         total = query.count()
         events = query.order_by(desc(GameEvent.created_at)).offset(offset).limit(limit).all()
 
+        # Effect counts and creator names for the whole page
+        counts = effect_counts(db, (event.id for event in events))
+        creators = usernames_by_user(db, (event.created_by for event in events))
+
         events_list = []
         for event in events:
-            # Count effects
-            effect_count = db.query(EventEffect).filter(EventEffect.event_id == event.id).count()
-
-            # Get creator name
-            creator = db.query(User).filter(User.id == event.created_by).first()
-
             events_list.append({
                 "id": str(event.id),
                 "title": event.title,
@@ -1839,12 +1835,12 @@ async def list_game_events(
                 "actual_end_time": event.actual_end_time.isoformat() if event.actual_end_time else None,
                 "affected_regions": event.affected_regions or [],
                 "global_event": event.global_event,
-                "effect_count": effect_count,
+                "effect_count": counts.get(event.id, 0),
                 "participation_count": event.participation_count or 0,
                 "rewards_distributed": event.rewards_distributed or 0,
                 "auto_start": event.auto_start,
                 "priority": event.priority,
-                "created_by": creator.username if creator else "System",
+                "created_by": creators.get(event.created_by, "System"),
                 "created_at": event.created_at.isoformat() if event.created_at else None,
             })
 
@@ -1965,12 +1961,11 @@ async def get_active_game_events(
             .all()
         )
 
+        active_effects = effects_by_event(db, (event.id for event in active_events), active_only=True)
+
         events_list = []
         for event in active_events:
-            effects = db.query(EventEffect).filter(
-                EventEffect.event_id == event.id,
-                EventEffect.is_active == True
-            ).all()
+            effects = active_effects.get(event.id, [])
 
             effects_list = [
                 {
@@ -2,6 +2,7 @@
 Admin Combat Overview API routes
 """
 
+import asyncio
 from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -12,6 +13,7 @@ from src.core.database import get_db
 from src.auth.dependencies import require_admin
 from src.models.user import User
 from src.services.combat_analytics_service import CombatAnalyticsService
+from src.services.combat_balance_simulator import MAX_ITERATIONS
 
 
 router = APIRouter(prefix="/admin/combat", tags=["admin-combat"])
@@ -57,6 +59,8 @@ class CombatBalanceResponse(BaseModel):
     balance_metrics: dict
     outliers: List[dict]
     recommendations: List[str]
+    matchups: Optional[dict] = None
+    seed: Optional[int] = None
 
 
 class CombatDisputeResponse(BaseModel):
@@ -175,6 +179,9 @@ async def intervene_in_combat(
 async def get_combat_balance_analytics(
     timeframe: str = Query("7d", description="Timeframe: 1d, 7d, 30d"),
     group_by: str = Query("ship_type", description="Group by: ship_type, player_level, combat_type, overall"),
+    source: str = Query("logs", description="Source: logs (historical combats) or simulation (Monte Carlo)"),
+    iterations: int = Query(2000, ge=100, le=MAX_ITERATIONS, description="Simulated duels per ship matchup"),
+    seed: Optional[int] = Query(None, description="Seed for a reproducible simulation"),
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
@@ -190,14 +197,26 @@ async def get_combat_balance_analytics(
     The balance score (0-100) indicates how well-balanced combat is,
     with 100 being perfectly balanced.
     
+    With source=simulation the tables come from seeded Monte Carlo duels
+    between every pair of ship types rather than from recorded combats.
+    Simulations run one at a time and seeded results are cached, so
+    repeating a seeded request is cheap.
+    
     **Required permissions**: Admin access
     """
     try:
         analytics_service = CombatAnalyticsService(db)
-        balance_data = analytics_service.get_combat_balance_analytics(
-            timeframe=timeframe,
-            group_by=group_by
-        )
+        if source == "simulation":
+            balance_data = await asyncio.to_thread(
+                analytics_service.get_simulated_balance_analytics,
+                iterations=iterations,
+                seed=seed
+            )
+        else:
+            balance_data = analytics_service.get_combat_balance_analytics(
+                timeframe=timeframe,
+                group_by=group_by
+            )
         
         return CombatBalanceResponse(**balance_data)
     except Exception as e:
@@ -3,12 +3,13 @@ Comprehensive Admin API Routes
 Supports full game administration based on DOCS specifications
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func, desc, and_, or_
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 import uuid
 
@@ -20,15 +21,16 @@ from src.models.ship import Ship
 from src.models.planet import Planet
 from src.models.station import Station, StationStatus
 from src.models.sector import Sector
-from src.models.cluster import Cluster
 from src.models.galaxy import Galaxy
-from src.models.region import Region
 from src.models.zone import Zone
 from src.models.warp_tunnel import WarpTunnel
 from src.models.team import Team
+from src.models.port_rebalance_job import PortRebalanceJob
 from src.services.galaxy_service import GalaxyService
 from src.services.analytics_service import AnalyticsService
 from src.services.ai_security_service import get_security_service
+from src.services.admin_query_service import page_sectors, sector_flags
+from src.services import port_rebalance_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -815,6 +817,8 @@ async def create_players_from_all_users(
 async def get_sectors_comprehensive(
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
+    include_total: bool = Query(True, description="Count matching sectors (one extra query)"),
     filter_type: Optional[str] = None,
     filter_region: Optional[str] = None,
     filter_zone: Optional[str] = None,
@@ -824,38 +828,31 @@ async def get_sectors_comprehensive(
 ):
     """Get comprehensive sector information"""
     try:
-        query = db.query(Sector).join(Cluster).join(Region)
-        
         # Apply filters
+        filters = []
         if filter_type:
-            query = query.filter(Sector.type == filter_type)
+            filters.append(Sector.type == filter_type)
         if filter_region:
-            query = query.filter(Region.id == filter_region)
+            filters.append(Sector.region_id == filter_region)
         if filter_zone:
-            query = query.filter(Sector.zone_id == filter_zone)
+            filters.append(Sector.zone_id == filter_zone)
         if filter_discovered is not None:
-            query = query.filter(Sector.is_discovered == filter_discovered)
+            filters.append(Sector.is_discovered == filter_discovered)
         
         # Get total count
-        total_count = query.count()
+        total_count = db.query(func.count(Sector.id)).filter(*filters).scalar() if include_total else None
         
-        # Apply pagination
-        offset = (page - 1) * limit
-        sectors = query.offset(offset).limit(limit).all()
+        # Keyset page with pre-aggregated port/planet/tunnel/occupancy summaries
+        try:
+            sector_page = page_sectors(
+                db, limit, cursor=cursor, offset=None if cursor else (page - 1) * limit, filters=filters
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Build response data
         sectors_data = []
-        for sector in sectors:
-            # Check for ports and planets
-            has_port = db.query(Station).filter(Station.sector_id == sector.sector_id).first() is not None
-            has_planet = db.query(Planet).filter(Planet.sector_id == sector.sector_id).first() is not None
-            has_warp_tunnel = db.query(WarpTunnel).filter(
-                or_(WarpTunnel.origin_sector_id == sector.id, WarpTunnel.destination_sector_id == sector.id)
-            ).first() is not None
-            
-            # Count players in sector
-            player_count = db.query(Player).filter(Player.current_sector_id == sector.sector_id).count()
-            
+        for sector, summary in sector_page.rows:
             sectors_data.append(SectorManagementResponse(
                 id=str(sector.id),
                 sector_id=sector.sector_id,
@@ -871,11 +868,8 @@ async def get_sectors_comprehensive(
                 z_coord=sector.z_coord,
                 hazard_level=sector.hazard_level,
                 is_discovered=sector.is_discovered,
-                has_port=has_port,
-                has_planet=has_planet,
-                has_warp_tunnel=has_warp_tunnel,
-                player_count=player_count,
-                controlling_faction=sector.controlling_faction
+                controlling_faction=sector.controlling_faction,
+                **sector_flags(summary)
             ))
         
         return {
@@ -883,9 +877,12 @@ async def get_sectors_comprehensive(
             "total_count": total_count,
             "page": page,
             "limit": limit,
-            "total_pages": (total_count + limit - 1) // limit
+            "total_pages": (total_count + limit - 1) // limit if total_count is not None else None,
+            "next_cursor": sector_page.next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_sectors_comprehensive: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch sectors: {str(e)}")
@@ -1431,64 +1428,32 @@ async def create_analytics_snapshot(
         raise HTTPException(status_code=500, detail=f"Failed to create snapshot: {str(e)}")
 
 
-@router.post("/ports/update-stock-levels", response_model=Dict[str, Any])
+@router.post("/ports/update-stock-levels", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
 async def update_all_port_stock_levels(
+    background_tasks: BackgroundTasks,
+    batch_size: int = Query(port_rebalance_service.DEFAULT_BATCH_SIZE, ge=1, le=port_rebalance_service.MAX_BATCH_SIZE),
+    dry_run: bool = Query(False, description="Compute the changes without writing them"),
+    seed: Optional[int] = Query(None, description="Reuse a dry run's seed to apply exactly the previewed levels"),
     current_admin: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """
     Update stock levels for all existing ports to match their trading roles.
     This ensures ports have appropriate inventory for the commodities they trade.
+
+    Runs as a background job committing in batches; poll
+    GET /ports/update-stock-levels/jobs/{job_id} for progress.
     """
     try:
-        from src.models.station import Station
-        
-        # Get all ports
-        ports = db.query(Station).all()
-        
-        updated_ports = []
-        
-        for port in ports:
-            # Store original stock levels for reporting
-            original_commodities = dict(station.commodities)
-            
-            # Update trading flags and stock levels
-            station.update_commodity_trading_flags()
-            station.update_commodity_stock_levels()
-            
-            # Track changes
-            changes = {}
-            for commodity_name, commodity_data in station.commodities.items():
-                old_quantity = original_commodities.get(commodity_name, {}).get("quantity", 0)
-                new_quantity = commodity_data.get("quantity", 0)
-                if old_quantity != new_quantity:
-                    changes[commodity_name] = {
-                        "old_quantity": old_quantity,
-                        "new_quantity": new_quantity
-                    }
-            
-            if changes:
-                updated_ports.append({
-                    "station_id": str(station.id),
-                    "station_name": station.name,
-                    "station_class": station.station_class.value,
-                    "station_type": station.type.value,
-                    "sector_id": station.sector_id,
-                    "changes": changes
-                })
-        
-        # Commit all changes
-        db.commit()
+        job = port_rebalance_service.create_job(db, current_admin.id, batch_size, dry_run, seed)
+        background_tasks.add_task(port_rebalance_service.run_job, job.id)
         
-        logger.info(f"Admin {current_admin.username} updated stock levels for {len(updated_ports)} ports")
+        logger.info(f"Admin {current_admin.username} started port stock rebalance job {job.id} (dry_run={dry_run})")
         
         return {
             "success": True,
-            "message": f"Updated stock levels for {len(updated_ports)} ports out of {len(ports)} total",
-            "ports_updated": len(updated_ports),
-            "total_ports": len(ports),
-            "updated_ports": updated_ports[:20],  # Limit response size, show first 20
-            "has_more": len(updated_ports) > 20
+            "message": f"{'Dry run' if dry_run else 'Rebalance'} of {job.total_stations} ports started",
+            **port_rebalance_service.job_status(job)
         }
         
     except Exception as e:
@@ -1497,6 +1462,67 @@ async def update_all_port_stock_levels(
         raise HTTPException(status_code=500, detail=f"Failed to update port stock levels: {str(e)}")
 
 
+def _get_rebalance_job(db: Session, job_id: str) -> PortRebalanceJob:
+    try:
+        job = db.get(PortRebalanceJob, uuid.UUID(job_id))
+    except ValueError:
+        job = None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Rebalance job not found")
+    return job
+
+
+@router.get("/ports/update-stock-levels/jobs", response_model=Dict[str, Any])
+async def list_port_stock_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Recent port stock rebalance jobs, newest first"""
+    jobs = db.query(PortRebalanceJob).order_by(desc(PortRebalanceJob.created_at)).limit(limit).all()
+    return {"jobs": [port_rebalance_service.job_status(job) for job in jobs]}
+
+
+@router.get("/ports/update-stock-levels/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_port_stock_job(
+    job_id: str,
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Progress, sample diffs and errors of a rebalance job"""
+    return port_rebalance_service.job_status(_get_rebalance_job(db, job_id))
+
+
+@router.post("/ports/update-stock-levels/jobs/{job_id}/cancel", response_model=Dict[str, Any])
+async def cancel_port_stock_job(
+    job_id: str,
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Stop a rebalance job after its current batch (committed batches are kept)"""
+    job = port_rebalance_service.request_cancel(db, _get_rebalance_job(db, job_id))
+    logger.info(f"Admin {current_admin.username} cancelled port stock rebalance job {job_id}")
+    return port_rebalance_service.job_status(job)
+
+
+@router.post("/ports/update-stock-levels/jobs/{job_id}/resume", response_model=Dict[str, Any],
+             status_code=status.HTTP_202_ACCEPTED)
+async def resume_port_stock_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Continue a failed, cancelled or interrupted job from its last committed batch"""
+    job = _get_rebalance_job(db, job_id)
+    if not port_rebalance_service.prepare_resume(db, job):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status} and cannot be resumed")
+    background_tasks.add_task(port_rebalance_service.run_job, job.id)
+    logger.info(f"Admin {current_admin.username} resumed port stock rebalance job {job_id}")
+    db.refresh(job)
+    return port_rebalance_service.job_status(job)
+
+
 # =============================================================================
 # AI SECURITY MONITORING ENDPOINTS
 # =============================================================================
@@ -1512,7 +1538,7 @@ async def get_security_report(current_admin: User = Depends(get_current_admin)):
     """
     try:
         security_service = get_security_service()
-        report = security_service.generate_security_report()
+        report = await asyncio.to_thread(security_service.generate_security_report)
         
         logger.info(f"Admin {current_admin.username} generated security report")
         return report
@@ -1532,7 +1558,7 @@ async def get_security_alerts(current_admin: User = Depends(get_current_admin)):
     """
     try:
         security_service = get_security_service()
-        alerts = security_service.get_security_alerts()
+        alerts = await asyncio.to_thread(security_service.get_security_alerts)
         
         logger.info(f"Admin {current_admin.username} checked security alerts")
         return {
@@ -1560,7 +1586,7 @@ async def get_player_risk_assessment(
     """
     try:
         security_service = get_security_service()
-        assessment = security_service.get_player_risk_assessment(player_id)
+        assessment = await asyncio.to_thread(security_service.get_player_risk_assessment, player_id)
         
         logger.info(f"Admin {current_admin.username} assessed risk for player {player_id}")
         return assessment
@@ -1583,7 +1609,7 @@ async def get_player_security_status(
     """
     try:
         security_service = get_security_service()
-        status = security_service.get_player_security_status(player_id)
+        status = await asyncio.to_thread(security_service.get_player_security_status, player_id)
         
         logger.info(f"Admin {current_admin.username} checked status for player {player_id}")
         return status
@@ -1604,7 +1630,7 @@ async def cleanup_security_data(
     """
     try:
         security_service = get_security_service()
-        security_service.cleanup_old_data(days_to_keep)
+        await asyncio.to_thread(security_service.cleanup_old_data, days_to_keep)
         
         logger.info(f"Admin {current_admin.username} cleaned up security data (keeping {days_to_keep} days)")
         return {
@@ -1639,7 +1665,7 @@ async def take_security_action(
     """
     try:
         security_service = get_security_service()
-        profile = security_service.get_or_create_player_profile(player_id)
+        profile = await asyncio.to_thread(security_service.get_or_create_player_profile, player_id)
         
         if action.action == "block":
             if action.duration_hours is None:
@@ -1666,6 +1692,7 @@ async def take_security_action(
         else:
             raise HTTPException(status_code=400, detail=f"Unknown action: {action.action}")
         
+        await asyncio.to_thread(security_service.save_player_profile, profile)
         logger.info(f"Admin {current_admin.username} took security action '{action.action}' on player {player_id}: {action.reason}")
         
         return {
@@ -1674,7 +1701,7 @@ async def take_security_action(
             "action": action.action,
             "player_id": player_id,
             "reason": action.reason,
-            "new_status": security_service.get_player_security_status(player_id)
+            "new_status": await asyncio.to_thread(security_service.get_player_security_status, player_id)
         }
         
     except HTTPException:
@@ -392,7 +392,7 @@ async def get_battle_details(
             duration=str(battle.ended_at - battle.started_at) if battle.ended_at else None
         ),
         "casualties": casualty_summary,
-        "battle_log": battle.battle_log
+        "battle_log": FleetService(db).get_battle_log(battle)
     }
 
 
@@ -453,6 +453,22 @@ async def intervene_in_battle(
     return {"message": "Intervention completed"}
 
 
+@router.post("/battles/{battle_id}/resolve")
+async def resolve_battle(
+    battle_id: UUID,
+    max_rounds: Optional[int] = Query(None, ge=1, le=100),
+    seed: Optional[int] = Query(None),
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Run a battle forward in one batch (to completion unless max_rounds is given)."""
+    service = FleetService(db)
+    try:
+        return service.simulate_battle(battle_id, max_rounds=max_rounds, seed=seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # =============================================================================
 # Parameterized routes - /{fleet_id} and sub-routes
 # These MUST come after all named routes above
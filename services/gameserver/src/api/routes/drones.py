@@ -52,6 +52,11 @@ class InitiateCombatRequest(BaseModel):
     sector_id: UUID
 
 
+class AssaultSectorRequest(BaseModel):
+    """Request to engage all enemy drones in a sector."""
+    sector_id: UUID
+
+
 class RepairDroneRequest(BaseModel):
     """Request to repair a drone."""
     repair_amount: int
@@ -397,6 +402,27 @@ async def initiate_combat(
         )
 
 
+@router.post("/combat/assault-sector")
+async def assault_sector(
+    request: AssaultSectorRequest,
+    current_player: Player = Depends(get_current_player),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """Engage every enemy drone in a sector with your deployed drones (costs turns, with a cooldown)."""
+    service = DroneService(db)
+
+    try:
+        return await service.assault_sector(
+            sector_id=request.sector_id,
+            player_id=current_player.id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("/deployments", response_model=List[DroneDeploymentResponse])
 async def get_my_deployments(
     active_only: bool = True,
@@ -1,5 +1,6 @@
 from uuid import UUID
 from typing import Dict, Any, Optional
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -11,7 +12,7 @@ from src.models.player import Player
 from src.models.first_login import ShipChoice
 from src.services.first_login_service import FirstLoginService
 from src.services.ai_dialogue_service import get_ai_dialogue_service, AIDialogueService
-from src.services.ai_security_service import get_security_service, AISecurityService
+from src.services.ai_security_service import get_security_service, AISecurityService, SecurityViolationType
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -264,7 +265,9 @@ async def answer_dialogue(
     # Note: Skip SQL/XSS checks for First Login since it's creative storytelling,
     # not form input. Players use technical terms like "SELECT coordinates" which
     # would false-positive as SQL injection.
-    is_safe, violations = security_service.validate_input(
+    # The security store may call Redis, so keep its blocking calls off the event loop
+    is_safe, violations = await asyncio.to_thread(
+        security_service.validate_input,
         response.response,
         str(player.id),
         str(exchange_id),
@@ -275,21 +278,20 @@ async def answer_dialogue(
     if not is_safe:
         # Log security violation for monitoring
         logger.warning(f"Security violation by player {player.id}: {[v.violation_type.value for v in violations]}")
+        # validate_input checks and counts the request against the rate limits atomically
+        if any(v.violation_type == SecurityViolationType.RATE_LIMIT_EXCEEDED for v in violations):
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Please wait before making another request."
+            )
         raise HTTPException(
             status_code=400,
             detail="Input validation failed due to security policy"
         )
     
-    # Check rate limits to prevent abuse
-    if not security_service.check_rate_limits(str(player.id)):
-        raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded. Please wait before making another request."
-        )
-    
     # Estimate and check AI costs to prevent cost abuse
     estimated_cost = security_service.estimate_ai_cost(response.response)
-    if not security_service.check_cost_limits(str(player.id), estimated_cost):
+    if not await asyncio.to_thread(security_service.check_cost_limits, str(player.id), estimated_cost):
         raise HTTPException(
             status_code=402,
             detail="Daily AI usage limit reached. Try again tomorrow."
@@ -307,7 +309,7 @@ async def answer_dialogue(
     if result.get("analysis", {}).get("ai_used", False):
         # Estimate actual cost based on response (real cost tracking would need API response data)
         actual_cost = estimated_cost  # Simplified for now
-        security_service.track_cost(str(player.id), actual_cost)
+        await asyncio.to_thread(security_service.track_cost, str(player.id), actual_cost)
     
     # If not final, generate the next question
     next_question = None
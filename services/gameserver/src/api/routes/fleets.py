@@ -248,7 +248,7 @@ async def get_team_battles(
             attacker_fleet_name=battle.attacker_fleet.name if battle.attacker_fleet else "Unknown",
             defender_fleet_id=battle.defender_fleet_id,
             defender_fleet_name=battle.defender_fleet.name if battle.defender_fleet else "Unknown",
-            round=len(battle.battle_log),
+            round=battle.rounds_completed or 0,
             attacker_remaining=battle.attacker_fleet.total_ships if battle.attacker_fleet else 0,
             defender_remaining=battle.defender_fleet.total_ships if battle.defender_fleet else 0,
             battle_ongoing=battle.ended_at is None,
@@ -171,6 +171,7 @@ async def delete_message(
 @router.get("/conversations")
 async def get_conversations(
     page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     current_player: Player = Depends(get_current_player),
     db: Session = Depends(get_db)
 ):
@@ -180,11 +181,14 @@ async def get_conversations(
             db=db,
             player_id=current_player.id,
             page=page,
-            limit=20
+            limit=20,
+            cursor=cursor
         )
         
         return result
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
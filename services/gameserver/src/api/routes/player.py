@@ -266,6 +266,10 @@ async def move_to_sector(
             detail=result["message"]
         )
     
+    # Move the live connection (and its Redis sector presence) with the player
+    from src.api.routes.websocket import notify_player_moved
+    await notify_player_moved(str(player.user_id), sector_id)
+    
     # Return the movement response with turn cost and remaining turns
     return MoveResponse(
         success=True,
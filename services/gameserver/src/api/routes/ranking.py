@@ -4,6 +4,7 @@ Military Ranking, Reputation & Bounty API Routes
 Player-facing and admin endpoints for ranking, reputation, and bounty systems.
 """
 
+import asyncio
 import uuid
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -568,6 +569,23 @@ async def get_player_reputation(
     return result
 
 
+@router.post("/reputation/decay")
+async def run_reputation_decay(
+    chunk_size: int = Query(default=1000, ge=100, le=10000, description="Rows updated per transaction"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Run the weekly faction and personal reputation decay for all players. Admin only.
+
+    Skipped (``skipped: true``) if a run finished, or is still running, within the last 7 days.
+    """
+    from src.services.reputation_decay_service import ReputationDecayService
+    decay_service = ReputationDecayService(db)
+    # The run commits chunk by chunk for minutes; keep it off the event loop
+    return await asyncio.to_thread(decay_service.run_weekly, chunk_size=chunk_size)
+
+
 # ------------------------------------------------------------------
 # Bounty endpoints
 # ------------------------------------------------------------------
@@ -212,6 +212,11 @@ async def ai_providers_health():
     
     overall_status = "healthy" if healthy_count > 0 else "degraded" if configured_count > 0 else "unavailable"
     
+    # Circuit state, concurrency and latency histograms from the pooled clients
+    for name, gate_stats in service.get_provider_stats().items():
+        if name in providers_status:
+            providers_status[name]["gate"] = gate_stats
+    
     return {
         "provider": "all",
         "status": overall_status,
@@ -221,6 +226,7 @@ async def ai_providers_health():
             "configured": configured_count,
             "total": len(providers_status)
         },
+        "generation_cache": service.get_cache_stats(),
         "response_time": round(total_response_time, 2),
         "last_check": datetime.datetime.now().isoformat()
     }
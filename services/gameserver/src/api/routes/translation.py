@@ -4,12 +4,14 @@ Translation API routes for internationalization support
 
 import logging
 from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, Request, Header
+from fastapi import APIRouter, Depends, HTTPException, Request, Header, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from src.core.database import get_async_session
-from src.services.translation_service import TranslationService, get_translation_service
+from src.services.translation_service import (
+    TranslationService, TranslationBundle, get_translation_service
+)
 from src.auth.dependencies import get_current_user, get_current_admin_user
 from src.models.user import User
 
@@ -57,6 +59,32 @@ class TranslationProgressResponse(BaseModel):
     namespaces: Dict[str, Any]
 
 
+def _bundle_response(request: Request, bundle: TranslationBundle) -> Response:
+    """Serve a compiled bundle, honouring If-None-Match and gzip negotiation"""
+    accept_encoding = request.headers.get("accept-encoding", "")
+    gzipped = bundle.compressible and "gzip" in accept_encoding.lower()
+    
+    # Each representation gets its own strong ETag so caches never swap them
+    etag = bundle.gzip_etag if gzipped else bundle.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=bundle.gzipped, media_type="application/json", headers=headers)
+    
+    return Response(content=bundle.body, media_type="application/json", headers=headers)
+
+
 # Public endpoints (no authentication required)
 
 @router.get("/languages", response_model=List[LanguageResponse])
@@ -90,6 +118,7 @@ async def detect_language(
 
 @router.get("/{language_code}")
 async def get_translations(
+    request: Request,
     language_code: str,
     namespace: Optional[str] = None,
     include_context: bool = False,
@@ -97,10 +126,10 @@ async def get_translations(
 ):
     """Get translations for a language and optional namespace"""
     try:
-        translations = await translation_service.get_translations(
+        bundle = await translation_service.get_translation_bundle(
             language_code, namespace, include_context
         )
-        return translations
+        return _bundle_response(request, bundle)
     except Exception as e:
         logger.error(f"Failed to get translations: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve translations")
@@ -108,16 +137,15 @@ async def get_translations(
 
 @router.get("/{language_code}/{namespace}")
 async def get_namespace_translations(
+    request: Request,
     language_code: str,
     namespace: str,
     translation_service: TranslationService = Depends(get_translation_service)
 ):
     """Get translations for a specific namespace"""
     try:
-        translations = await translation_service.get_namespace_translations(
-            language_code, namespace
-        )
-        return translations
+        bundle = await translation_service.get_namespace_bundle(language_code, namespace)
+        return _bundle_response(request, bundle)
     except Exception as e:
         logger.error(f"Failed to get namespace translations: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve translations")
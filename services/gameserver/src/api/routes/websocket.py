@@ -9,11 +9,13 @@ from typing import Optional, Dict
 import logging
 
 from pydantic import BaseModel, Field as PydanticField
-from src.core.database import get_db
+from src.core.database import get_db, session_scope
 from src.auth.dependencies import get_current_user_from_token, get_current_admin_user
 from src.models.user import User
 from src.models.player import Player
-from src.services.websocket_service import connection_manager, handle_websocket_message, handle_admin_websocket_message
+from src.services.websocket_service import (
+    connection_manager, handle_websocket_message, handle_admin_websocket_message, player_snapshot
+)
 
 
 class BroadcastRequest(BaseModel):
@@ -45,48 +47,36 @@ def _check_ws_rate_limit(user_id: str) -> bool:
 @router.websocket("/connect")
 async def websocket_endpoint(
     websocket: WebSocket,
-    token: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    token: Optional[str] = Query(None)
 ):
     """
     WebSocket endpoint for real-time multiplayer features.
     Requires authentication via token query parameter.
+
+    The handshake uses a short-lived database session that is closed before
+    the receive loop starts, so idle sockets do not hold pool connections.
     """
     if not token:
         await websocket.close(code=4001, reason="Authentication token required")
         return
     
     try:
-        # Authenticate user from token
-        user = await get_current_user_from_token(token, db)
+        # Authenticate user and snapshot the player, then release the session
+        with session_scope() as db:
+            user = await get_current_user_from_token(token, db)
+            player = db.query(Player).filter(Player.user_id == user.id).first() if user else None
+            user_data = player_snapshot(user, player) if player else None
+
         if not user:
             await websocket.close(code=4001, reason="Invalid authentication token")
             return
-        
-        # Get player data
-        player = db.query(Player).filter(Player.user_id == user.id).first()
-        if not player:
+        if not user_data:
             await websocket.close(code=4002, reason="Player profile not found")
             return
-        
-        # Prepare user data for connection
-        user_data = {
-            "user_id": str(user.id),
-            "username": user.username,
-            "player_id": str(player.id),
-            "current_sector": player.current_sector_id,
-            "team_id": str(player.team_id) if player.team_id else None,
-            "credits": player.credits,
-            "turns": player.turns,
-            # Reputation and Ranking for Comms display
-            "personal_reputation": player.personal_reputation,
-            "reputation_tier": player.reputation_tier,
-            "name_color": player.name_color,
-            "military_rank": player.military_rank
-        }
+        user_id = user_data["user_id"]
         
         # Connect to WebSocket manager
-        await connection_manager.connect(websocket, str(user.id), user_data)
+        await connection_manager.connect(websocket, user_id, user_data)
         
         try:
             while True:
@@ -94,8 +84,8 @@ async def websocket_endpoint(
                 data = await websocket.receive_text()
 
                 # Rate limit: 100 msg/s per connection
-                if not _check_ws_rate_limit(str(user.id)):
-                    await connection_manager.send_personal_message(str(user.id), {
+                if not _check_ws_rate_limit(user_id):
+                    await connection_manager.send_personal_message(user_id, {
                         "type": "error",
                         "message": "Rate limit exceeded. Max 100 messages per second."
                     })
@@ -103,26 +93,26 @@ async def websocket_endpoint(
 
                 try:
                     message_data = json.loads(data)
-                    await handle_websocket_message(str(user.id), message_data)
+                    await handle_websocket_message(user_id, message_data)
                 except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON received from user {user.id}")
-                    await connection_manager.send_personal_message(str(user.id), {
+                    logger.warning(f"Invalid JSON received from user {user_id}")
+                    await connection_manager.send_personal_message(user_id, {
                         "type": "error",
                         "message": "Invalid message format"
                     })
                 except Exception as e:
-                    logger.error(f"Error handling WebSocket message from user {user.id}: {e}")
-                    await connection_manager.send_personal_message(str(user.id), {
+                    logger.error(f"Error handling WebSocket message from user {user_id}: {e}")
+                    await connection_manager.send_personal_message(user_id, {
                         "type": "error",
                         "message": "Error processing message"
                     })
         
         except WebSocketDisconnect:
-            logger.info(f"WebSocket disconnected for user {user.id}")
+            logger.info(f"WebSocket disconnected for user {user_id}")
         except Exception as e:
-            logger.error(f"WebSocket error for user {user.id}: {e}")
+            logger.error(f"WebSocket error for user {user_id}: {e}")
         finally:
-            await connection_manager.disconnect(str(user.id))
+            await connection_manager.disconnect(user_id)
     
     except Exception as e:
         logger.error(f"WebSocket connection error: {e}")
@@ -135,8 +125,7 @@ async def websocket_endpoint(
 @router.websocket("/admin")
 async def admin_websocket_endpoint(
     websocket: WebSocket,
-    token: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    token: Optional[str] = Query(None)
 ):
     """
     Admin WebSocket endpoint for real-time admin dashboard updates.
@@ -147,21 +136,23 @@ async def admin_websocket_endpoint(
         return
     
     try:
-        # Authenticate admin user from token
-        user = await get_current_user_from_token(token, db)
-        if not user or not user.is_admin:
+        # Authenticate admin user from token with a short-lived session
+        with session_scope() as db:
+            user = await get_current_user_from_token(token, db)
+            admin_data = {
+                "user_id": str(user.id),
+                "username": user.username,
+                "is_admin": True
+            } if user and user.is_admin else None
+
+        if not admin_data:
             await websocket.close(code=4001, reason="Admin authentication required")
             return
         
-        # Prepare admin data for connection
-        admin_data = {
-            "user_id": str(user.id),
-            "username": user.username,
-            "is_admin": True
-        }
-        
+        admin_id = admin_data["user_id"]
+
         # Connect to WebSocket manager
-        await connection_manager.connect_admin(websocket, str(user.id), admin_data)
+        await connection_manager.connect_admin(websocket, admin_id, admin_data)
         
         try:
             while True:
@@ -170,28 +161,28 @@ async def admin_websocket_endpoint(
                 
                 try:
                     message_data = json.loads(data)
-                    await handle_admin_websocket_message(str(user.id), message_data)
+                    await handle_admin_websocket_message(admin_id, message_data)
                 except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON received from admin {user.id}: {data}")
-                    await connection_manager.send_admin_message(str(user.id), {
+                    logger.warning(f"Invalid JSON received from admin {admin_id}: {data}")
+                    await connection_manager.send_admin_message(admin_id, {
                         "type": "error",
                         "message": "Invalid message format",
                         "timestamp": datetime.utcnow().isoformat()
                     })
                 except Exception as e:
-                    logger.error(f"Error handling admin WebSocket message from {user.id}: {e}")
-                    await connection_manager.send_admin_message(str(user.id), {
+                    logger.error(f"Error handling admin WebSocket message from {admin_id}: {e}")
+                    await connection_manager.send_admin_message(admin_id, {
                         "type": "error",
                         "message": "Error processing message",
                         "timestamp": datetime.utcnow().isoformat()
                     })
         
         except WebSocketDisconnect:
-            logger.info(f"Admin WebSocket disconnected for {user.id}")
+            logger.info(f"Admin WebSocket disconnected for {admin_id}")
         except Exception as e:
-            logger.error(f"Admin WebSocket error for {user.id}: {e}")
+            logger.error(f"Admin WebSocket error for {admin_id}: {e}")
         finally:
-            await connection_manager.disconnect_admin(str(user.id))
+            await connection_manager.disconnect_admin(admin_id)
                 
     except Exception as e:
         logger.error(f"Admin WebSocket connection error: {str(e)}")
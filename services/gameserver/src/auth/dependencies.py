@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from src.auth.jwt import decode_token
+from src.auth.principal_cache import resolve_user
 from src.core.database import get_async_session, get_db
 from src.models.user import User
 from src.models.player import Player
@@ -35,8 +36,8 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
         
-    user = db.query(User).filter(User.id == user_id, User.deleted == False).first()
-    if user is None or not user.is_active:
+    user = await resolve_user(db, user_id)
+    if user is None:
         raise credentials_exception
         
     return user
@@ -116,11 +117,7 @@ async def get_current_user_from_token(
     except JWTError:
         return None
         
-    user = db.query(User).filter(User.id == user_id, User.deleted == False).first()
-    if user is None or not user.is_active:
-        return None
-        
-    return user
+    return await resolve_user(db, user_id)
 
 
 async def validate_websocket_token(token: str, db: AsyncSession) -> Player:
@@ -0,0 +1,285 @@
+"""
+Cached principal resolution for request authentication.
+
+get_current_user used to load the User row on every authenticated request.
+Resolved users are now kept as column snapshots in a bounded, short-TTL
+in-process LRU, backed by a longer-lived Redis copy shared by all workers.
+A cache hit is attached to the request's session with merge(load=False),
+so routes still get a persistent User (relationships lazy-load and changes
+flush as usual) without a SELECT.
+
+Entries are dropped, locally and in Redis, when a committed flush changes a
+User row or a user's admin/player credentials (deactivation, deletion, role
+change, password reset). Invalidation also bumps a per-user generation in
+Redis, and a snapshot read from the database is only written back if the
+generation is unchanged, so a request that raced a change cannot republish
+the old row. Other workers may serve a stale entry until their local TTL
+runs out.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from src.models.admin_credentials import AdminCredentials
+from src.models.player_credentials import PlayerCredentials
+from src.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "15"))
+PRINCIPAL_CACHE_MAX_USERS = int(os.getenv("PRINCIPAL_CACHE_MAX_USERS", "10000"))
+PRINCIPAL_REDIS_TTL_SECONDS = int(os.getenv("PRINCIPAL_REDIS_TTL_SECONDS", "60"))
+
+_REDIS_KEY = "auth:principal:{user_id}"
+_GENERATION_KEY = "auth:principal_gen:{user_id}"
+_PENDING_KEY = "principal_invalidations"
+
+# KEYS: snapshot, generation; ARGV: generation read before the DB lookup, snapshot, ttl
+_SET_IF_CURRENT_LUA = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+_USER_COLUMNS = {attr.key: attr.columns[0].type for attr in inspect(User).column_attrs}
+
+
+class PrincipalCache:
+    """Bounded LRU of user column snapshots with a TTL"""
+
+    def __init__(self, max_users: int = PRINCIPAL_CACHE_MAX_USERS,
+                 ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS, clock=time.monotonic):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return snapshot
+
+    def put(self, user_id: str, snapshot: Dict[str, Any]) -> None:
+        self._entries[user_id] = (snapshot, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+# Snapshots
+
+def snapshot_user(user: User) -> Dict[str, Any]:
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> str:
+    return json.dumps({
+        key: value.isoformat() if isinstance(value, datetime) else
+        str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in snapshot.items()
+    })
+
+
+def decode_snapshot(data: str) -> Dict[str, Any]:
+    raw = json.loads(data)
+    snapshot = {}
+    for key, column_type in _USER_COLUMNS.items():
+        value = raw.get(key)
+        if value is not None and isinstance(column_type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column_type, PG_UUID):
+            value = uuid.UUID(value)
+        snapshot[key] = value
+    return snapshot
+
+
+def attach_user(db: Session, snapshot: Dict[str, Any]) -> User:
+    """A session-attached User built from a snapshot without querying"""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+# Redis backstop (optional: auth never fails because Redis is unavailable)
+
+_redis_clients: Dict[str, Any] = {}
+_invalidation_tasks: Set[asyncio.Task] = set()
+
+
+def _redis_client(kind: str):
+    """Lazily created redis-py client: "async" for request paths, "sync" outside an event loop"""
+    client = _redis_clients.get(kind)
+    if client is None:
+        try:
+            import redis
+            import redis.asyncio
+            from src.core.config import settings
+
+            module = redis.asyncio if kind == "async" else redis
+            client = module.from_url(
+                settings.REDIS_URL, decode_responses=True,
+                socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        except Exception as e:
+            logger.debug(f"Principal cache Redis client unavailable: {e}")
+            return None
+        _redis_clients[kind] = client
+    return client
+
+
+async def _redis_get(user_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """The shared snapshot (if any) and the user's current generation"""
+    client = _redis_client("async")
+    if client is None:
+        return None, None
+    try:
+        data, generation = await client.mget(
+            _REDIS_KEY.format(user_id=user_id), _GENERATION_KEY.format(user_id=user_id)
+        )
+        return (decode_snapshot(data) if data else None), generation or "0"
+    except Exception as e:
+        logger.debug(f"Principal cache Redis read failed: {e}")
+        return None, None
+
+
+async def _redis_set(user_id: str, snapshot: Dict[str, Any], generation: str) -> None:
+    """Publish a snapshot unless the user was invalidated since ``generation`` was read"""
+    client = _redis_client("async")
+    if client is None:
+        return
+    try:
+        await client.eval(
+            _SET_IF_CURRENT_LUA, 2,
+            _REDIS_KEY.format(user_id=user_id), _GENERATION_KEY.format(user_id=user_id),
+            generation, encode_snapshot(snapshot), PRINCIPAL_REDIS_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.debug(f"Principal cache Redis write failed: {e}")
+
+
+def _queue_invalidation(pipe, user_id: str) -> None:
+    generation_key = _GENERATION_KEY.format(user_id=user_id)
+    pipe.incr(generation_key)
+    pipe.expire(generation_key, 2 * PRINCIPAL_REDIS_TTL_SECONDS)
+    pipe.delete(_REDIS_KEY.format(user_id=user_id))
+
+
+async def _redis_invalidate(user_id: str) -> None:
+    client = _redis_client("async")
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=True)
+        _queue_invalidation(pipe, user_id)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Principal cache Redis invalidation failed for {user_id}: {e}")
+
+
+def invalidate_principal(user_id: Any) -> None:
+    """Forget a user's cached principal in this process and in Redis"""
+    user_id = str(user_id)
+    principal_cache.invalidate(user_id)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        # Committed from an async route: don't block the event loop on Redis
+        task = loop.create_task(_redis_invalidate(user_id))
+        _invalidation_tasks.add(task)
+        task.add_done_callback(_invalidation_tasks.discard)
+        return
+
+    client = _redis_client("sync")
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=True)
+        _queue_invalidation(pipe, user_id)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Principal cache Redis invalidation failed for {user_id}: {e}")
+
+
+async def resolve_user(db: Session, user_id: str) -> Optional[User]:
+    """The active, non-deleted user for a token subject, from cache when possible"""
+    generation = None
+    snapshot = principal_cache.get(user_id)
+    if snapshot is None:
+        snapshot, generation = await _redis_get(user_id)
+        if snapshot is not None:
+            principal_cache.put(user_id, snapshot)
+    if snapshot is not None and snapshot.get("is_active") and not snapshot.get("deleted"):
+        return attach_user(db, snapshot)
+
+    user = db.query(User).filter(User.id == user_id, User.deleted == False).first()
+    if user is None or not user.is_active:
+        return None
+    snapshot = snapshot_user(user)
+    principal_cache.put(user_id, snapshot)
+    if generation is not None:
+        await _redis_set(user_id, snapshot, generation)
+    return user
+
+
+# Invalidation on committed changes to users and their credentials
+
+def _changed_user_ids(session: Session) -> Set[str]:
+    user_ids = set()
+    for obj in list(session.dirty) + list(session.deleted) + list(session.new):
+        if isinstance(obj, User) and (obj in session.deleted or session.is_modified(obj)):
+            user_ids.add(str(obj.id))
+        elif isinstance(obj, (AdminCredentials, PlayerCredentials)) and obj.user_id is not None:
+            user_ids.add(str(obj.user_id))
+    return user_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_principal_changes(session, flush_context, instances):
+    user_ids = _changed_user_ids(session)
+    if user_ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    session.info.pop(_PENDING_KEY, None)
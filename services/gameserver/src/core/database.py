@@ -1,15 +1,18 @@
-from typing import Generator, AsyncGenerator
+from contextlib import contextmanager
+from typing import Generator, AsyncGenerator, Iterator
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from src.core.config import settings
+from src.core.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 # Create SQLAlchemy engine instance
 # Use the appropriate database URL based on environment
 engine = create_engine(
     settings.get_db_url(),
+    poolclass=TimedQueuePool,
     pool_size=settings.SQLALCHEMY_POOL_SIZE,
     max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
     pool_pre_ping=True,
@@ -21,6 +24,7 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create async engine and session
 async_engine = create_async_engine(
     settings.get_db_url().replace("postgresql://", "postgresql+asyncpg://"),
+    poolclass=TimedAsyncAdaptedQueuePool,
     pool_size=settings.SQLALCHEMY_POOL_SIZE,
     max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
     pool_pre_ping=True,
@@ -51,6 +55,20 @@ def get_db() -> Generator:
         db.close()
 
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Short-lived session for code that is not a request, such as websocket
+    handshakes and per-message handlers, so the pool connection is returned
+    as soon as the block ends instead of being held for the life of a socket.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 # Dependency to get async DB session
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
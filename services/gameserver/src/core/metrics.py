@@ -0,0 +1,457 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A small registry of counters, gauges and fixed-bucket histograms, cheap
+enough to update on every request and query (a dict lookup, a bisect and a
+lock per observation). Values that already live elsewhere, such as pool
+checkouts or open websockets, are read by collectors at scrape time
+instead of being tracked on the hot path.
+
+Hot-path instrumentation:
+
+- HTTP latency per route template (src/api/middleware/metrics.py)
+- pool checkout wait and in-use connections for the sync and async engines
+- query latency per statement fingerprint
+- open websockets and in-flight websocket sends
+- event-loop lag and Redis round trip, sampled in the background
+
+State is per process; with several workers each exposes its own series.
+
+/metrics is only served when METRICS_TOKEN is set, and scrapers must send
+it as "Authorization: Bearer <token>".
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+LOOP_LAG_SAMPLE_SECONDS = float(os.getenv("LOOP_LAG_SAMPLE_SECONDS", "0.5"))
+LOOP_LAG_WARN_SECONDS = float(os.getenv("LOOP_LAG_WARN_SECONDS", "0.25"))
+REDIS_PING_SAMPLE_SECONDS = float(os.getenv("REDIS_PING_SAMPLE_SECONDS", "10"))
+MAX_QUERY_FINGERPRINTS = int(os.getenv("METRICS_MAX_QUERY_FINGERPRINTS", "500"))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines += self._samples()
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run a function before each scrape, to refresh gauges read from elsewhere"""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.debug(f"Metrics collector failed: {e}")
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "gameserver_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"),
+))
+HTTP_REQUESTS_IN_PROGRESS = registry.register(Gauge(
+    "gameserver_http_requests_in_progress", "HTTP requests being handled",
+))
+DB_POOL_CHECKOUT_SECONDS = registry.register(Histogram(
+    "gameserver_db_pool_checkout_wait_seconds", "Time to obtain a pooled database connection",
+    ("pool",), QUERY_BUCKETS,
+))
+DB_POOL_CHECKOUT_FAILURES = registry.register(Counter(
+    "gameserver_db_pool_checkout_failures_total", "Checkouts that failed, mostly pool timeouts under saturation",
+    ("pool",),
+))
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "gameserver_db_pool_connections", "Pooled database connections by state (in_use, idle, overflow, size)",
+    ("pool", "state"),
+))
+DB_QUERY_SECONDS = registry.register(Histogram(
+    "gameserver_db_query_duration_seconds", "Query latency by statement fingerprint",
+    ("fingerprint", "statement"), QUERY_BUCKETS,
+))
+WEBSOCKET_CONNECTIONS = registry.register(Gauge(
+    "gameserver_websocket_connections", "Open websocket connections", ("kind",),
+))
+WEBSOCKET_SENDS_IN_FLIGHT = registry.register(Gauge(
+    "gameserver_websocket_sends_in_flight", "Websocket sends awaiting the client (send backlog)",
+))
+WEBSOCKET_SEND_SECONDS = registry.register(Histogram(
+    "gameserver_websocket_send_duration_seconds", "Time to hand one websocket message to the client",
+    (), QUERY_BUCKETS,
+))
+EVENT_LOOP_LAG_SECONDS = registry.register(Histogram(
+    "gameserver_event_loop_lag_seconds", "Delay of a scheduled wakeup on the asyncio event loop",
+    (), LATENCY_BUCKETS,
+))
+EVENT_LOOP_LAG_MAX_SECONDS = registry.register(Gauge(
+    "gameserver_event_loop_lag_max_seconds", "Largest event-loop lag since the previous scrape",
+))
+REDIS_PING_SECONDS = registry.register(Histogram(
+    "gameserver_redis_roundtrip_seconds", "Redis PING round trip", ("client",), QUERY_BUCKETS,
+))
+
+
+def render_metrics() -> str:
+    return registry.render()
+
+
+# Database pools and queries
+
+class _TimedPoolMixin:
+    """Records how long each checkout waited for a connection (including opening one)"""
+    metrics_name = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            DB_POOL_CHECKOUT_FAILURES.inc(self.metrics_name)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, self.metrics_name)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    metrics_name = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\([^)]*\)s|\$\d+|(?<!:):\w+|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+_TABLES = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+\"?(\w+)\"?", re.IGNORECASE)
+
+_statement_labels: Dict[str, Tuple[str, str]] = {}     # Raw statement text -> labels
+_known_fingerprints: Set[str] = set()
+_fingerprints_lock = threading.Lock()
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement with literals and bind parameters replaced by ? and IN lists collapsed"""
+    normalized = _LITERALS.sub("?", _SPACES.sub(" ", statement).strip())
+    return _IN_LISTS.sub("(?)", normalized)
+
+
+def fingerprint_statement(statement: str) -> Tuple[str, str]:
+    """(short hash, "VERB table,...") labels for a statement, cached per distinct statement text"""
+    labels = _statement_labels.get(statement)
+    if labels is not None:
+        return labels
+    normalized = normalize_statement(statement)
+    verb = normalized.split(" ", 1)[0].upper() if normalized else ""
+    tables = ",".join(dict.fromkeys(table.lower() for table in _TABLES.findall(normalized)))
+    labels = (hashlib.sha1(normalized.encode()).hexdigest()[:12], f"{verb} {tables}".strip())
+    with _fingerprints_lock:
+        if labels[0] not in _known_fingerprints:
+            if len(_known_fingerprints) >= MAX_QUERY_FINGERPRINTS:
+                # Bound label cardinality; new shapes past the cap share one series
+                labels = ("other", "other")
+            else:
+                _known_fingerprints.add(labels[0])
+                logger.debug(f"Query fingerprint {labels[0]}: {normalized}")
+        if len(_statement_labels) >= 10 * MAX_QUERY_FINGERPRINTS:
+            _statement_labels.clear()
+        _statement_labels[statement] = labels
+    return labels
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_metrics_query_start")
+    if starts:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - starts.pop(), *fingerprint_statement(statement))
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("_metrics_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+_pools: Dict[str, QueuePool] = {}
+
+
+def install_database_metrics(engines: Dict[str, Engine]) -> None:
+    """Time queries and report pool usage for sync engines (async engines: .sync_engine), keyed by pool label"""
+    if not METRICS_ENABLED:
+        return
+    for name, engine in engines.items():
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+        if isinstance(engine.pool, QueuePool):
+            _pools[name] = engine.pool
+    registry.add_collector(_pool_collector)
+
+
+def _pool_collector() -> None:
+    for name, pool in _pools.items():
+        DB_POOL_CONNECTIONS.set(pool.checkedout(), name, "in_use")
+        DB_POOL_CONNECTIONS.set(pool.checkedin(), name, "idle")
+        DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), name, "overflow")
+        DB_POOL_CONNECTIONS.set(pool.size(), name, "size")
+
+
+# Websockets
+
+async def timed_send(websocket, text: str) -> None:
+    """websocket.send_text, counted while in flight so slow clients show up as send backlog"""
+    if not METRICS_ENABLED:
+        await websocket.send_text(text)
+        return
+    WEBSOCKET_SENDS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    try:
+        await websocket.send_text(text)
+    finally:
+        WEBSOCKET_SENDS_IN_FLIGHT.dec()
+        WEBSOCKET_SEND_SECONDS.observe(time.perf_counter() - started)
+
+
+def _websocket_collector() -> None:
+    from src.services.websocket_service import connection_manager
+
+    WEBSOCKET_CONNECTIONS.set(len(connection_manager.active_connections), "player")
+    WEBSOCKET_CONNECTIONS.set(len(connection_manager.admin_connections), "admin")
+
+
+# Background samplers
+
+class LoopLagSampler:
+    """Sleeps a fixed interval and records how late each wakeup was"""
+
+    def __init__(self, interval: float = LOOP_LAG_SAMPLE_SECONDS, warn_after: float = LOOP_LAG_WARN_SECONDS,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.interval = interval
+        self.warn_after = warn_after
+        self.clock = clock
+        self.max_lag = 0.0
+
+    def record(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.warn_after:
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms (a synchronous call on the loop)")
+
+    def collect(self) -> None:
+        EVENT_LOOP_LAG_MAX_SECONDS.set(self.max_lag)
+        self.max_lag = 0.0
+
+    async def run(self) -> None:
+        while True:
+            expected = self.clock() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(self.clock() - expected)
+
+
+async def _redis_ping_loop() -> None:
+    try:
+        import redis
+        import redis.asyncio
+        from src.core.config import settings
+
+        options = dict(socket_connect_timeout=1.0, socket_timeout=1.0)
+        async_client = redis.asyncio.from_url(settings.REDIS_URL, **options)
+        sync_client = redis.from_url(settings.REDIS_URL, **options)
+    except Exception as e:
+        logger.info(f"Redis round-trip sampling disabled: {e}")
+        return
+    while True:
+        await asyncio.sleep(REDIS_PING_SAMPLE_SECONDS)
+        try:
+            started = time.perf_counter()
+            await async_client.ping()
+            REDIS_PING_SECONDS.observe(time.perf_counter() - started, "async")
+            started = time.perf_counter()
+            await asyncio.to_thread(sync_client.ping)
+            REDIS_PING_SECONDS.observe(time.perf_counter() - started, "sync")
+        except Exception as e:
+            logger.debug(f"Redis ping failed: {e}")
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    """Whether an Authorization header carries METRICS_TOKEN (never, when no token is set)"""
+    if not METRICS_TOKEN or not authorization:
+        return False
+    return secrets.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode())
+
+
+def start_runtime_samplers() -> None:
+    """Start the loop-lag and Redis samplers on the running loop and register scrape-time collectors"""
+    if not METRICS_ENABLED:
+        return
+    sampler = LoopLagSampler()
+    registry.add_collector(sampler.collect)
+    registry.add_collector(_websocket_collector)
+    asyncio.create_task(sampler.run())
+    asyncio.create_task(_redis_ping_loop())
@@ -10,12 +10,20 @@ from typing import Any, Dict
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.core.config import settings
-from src.core.database import Base, async_engine, get_async_session
+from src.core.database import Base, async_engine, engine, get_async_session
+from src.core.metrics import (
+    METRICS_ENABLED,
+    METRICS_TOKEN,
+    install_database_metrics,
+    metrics_authorized,
+    render_metrics,
+    start_runtime_samplers,
+)
 from src.api.api import api_router
 from src.utils.error_handling import setup_error_handling
 
@@ -139,6 +147,21 @@ async def startup_event():
         logger.error(f"Admin user initialization failed: {e}")
         # Don't crash the server if admin creation fails
 
+    # Connect the shared Redis service (sector presence, sessions, caching)
+    try:
+        from src.services.redis_service import init_redis
+        await init_redis()
+    except Exception as e:
+        logger.warning(f"Redis service unavailable, sector presence disabled: {e}")
+
+    # Feed trade and combat writes to the streaming anomaly detector
+    from src.services.anomaly_detector import install_anomaly_detector
+    install_anomaly_detector()
+
+    # Hot-path metrics: query timing, pool usage, event-loop lag and Redis round trip
+    install_database_metrics({"sync": engine, "async": async_engine.sync_engine})
+    start_runtime_samplers()
+
     # Start WebSocket heartbeat cleanup background task
     import asyncio
     async def _heartbeat_cleanup_loop():
@@ -153,6 +176,59 @@ async def startup_event():
 
     asyncio.create_task(_heartbeat_cleanup_loop())
 
+    # Keep the per-sector admin summaries (ports, planets, tunnels, occupancy) current
+    async def _sector_summary_refresh_loop():
+        """Periodically recompute sector_summaries for admin universe views."""
+        from src.services.admin_query_service import SECTOR_SUMMARY_REFRESH_SECONDS, refresh_all_sector_summaries
+        while True:
+            await asyncio.sleep(SECTOR_SUMMARY_REFRESH_SECONDS)
+            try:
+                await asyncio.to_thread(refresh_all_sector_summaries)
+            except Exception as e:
+                logger.warning(f"Sector summary refresh error: {e}")
+
+    asyncio.create_task(_sector_summary_refresh_loop())
+
+    # Apply colony production and growth to every planet
+    async def _colony_production_loop():
+        """Periodically run the vectorized colony economy tick."""
+        from src.services.colony_economy_engine import COLONY_PRODUCTION_TICK_SECONDS, run_colony_production_tick
+        while True:
+            await asyncio.sleep(COLONY_PRODUCTION_TICK_SECONDS)
+            try:
+                await asyncio.to_thread(run_colony_production_tick)
+            except Exception as e:
+                logger.warning(f"Colony production tick error: {e}")
+
+    asyncio.create_task(_colony_production_loop())
+
+    # Detect sieges across the galaxy and notify owners of sieges starting or lifting
+    async def _siege_sweep_loop():
+        """Periodically run the sector-indexed siege sweep."""
+        from src.services.siege_sweep_service import SIEGE_SWEEP_SECONDS, notify_siege_changes, run_siege_sweep
+        while True:
+            await asyncio.sleep(SIEGE_SWEEP_SECONDS)
+            try:
+                result = await asyncio.to_thread(run_siege_sweep)
+                await notify_siege_changes(result.changes)
+            except Exception as e:
+                logger.warning(f"Siege sweep error: {e}")
+
+    asyncio.create_task(_siege_sweep_loop())
+
+    # Write the anomaly flags raised by committed trades and combats
+    async def _anomaly_flag_loop():
+        """Periodically persist queued anomaly detector flags."""
+        from src.services.anomaly_detector import ANOMALY_FLAG_FLUSH_SECONDS, persist_pending_flags
+        while True:
+            await asyncio.sleep(ANOMALY_FLAG_FLUSH_SECONDS)
+            try:
+                await asyncio.to_thread(persist_pending_flags)
+            except Exception as e:
+                logger.warning(f"Anomaly flag write error: {e}")
+
+    asyncio.create_task(_anomaly_flag_loop())
+
     logger.info("Sectorwars 2102 Game Server started successfully")
 
 
@@ -161,6 +237,19 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Sectorwars 2102 Game Server...")
 
+    from src.services.redis_service import close_redis
+    await close_redis()
+
+    # Stop the combat balance simulator's worker processes if a run started them
+    import asyncio
+    from src.services.combat_balance_simulator import shutdown_pool
+    await asyncio.to_thread(shutdown_pool)
+
+    # Close pooled LLM connections if the AI provider service was used
+    from src.services import ai_provider_service
+    if ai_provider_service._ai_provider_service is not None:
+        await ai_provider_service._ai_provider_service.aclose()
+
 
 @app.get("/")
 async def root():
@@ -205,6 +294,20 @@ async def health_check():
         )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint; requires METRICS_TOKEN as a bearer token"""
+    if not METRICS_ENABLED or not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    if not metrics_authorized(request.headers.get("authorization")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # Setup error handling
 setup_error_handling(app)
 
@@ -216,6 +319,11 @@ try:
 except Exception as e:
     logger.warning(f"Failed to register security middleware: {e}")
 
+# Request latency metrics; added last so it is outermost and times the whole middleware stack
+if METRICS_ENABLED:
+    from src.api.middleware.metrics import MetricsMiddleware
+    app.add_middleware(MetricsMiddleware)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -5,7 +5,7 @@ from src.models.oauth_account import OAuthAccount
 from src.models.refresh_token import RefreshToken
 from src.models.player import Player
 from src.models.ship import Ship, ShipSpecification, ShipType, FailureType, UpgradeType, InsuranceType, ShipStatus
-from src.models.reputation import Reputation, TeamReputation, ReputationLevel
+from src.models.reputation import Reputation, ReputationDecayRun, ReputationHistory, TeamReputation, ReputationLevel
 from src.models.team import Team, TeamReputationHandling, TeamRecruitmentStatus
 from src.models.team_member import TeamMember, TeamRole
 from src.models.planet import Planet, player_planets
@@ -30,9 +30,14 @@ from src.models.first_login import FirstLoginSession, DialogueExchange, PlayerFi
 from src.models.ai_trading import AIMarketPrediction, PlayerTradingProfile, AIRecommendation, AIModelPerformance, AITrainingData
 from src.models.audit_log import AuditLog
 from src.models.message import Message
+from src.models.conversation_summary import ConversationSummary
 from src.models.faction import Faction, FactionType, FactionMission
 from src.models.drone import Drone, DroneType, DroneStatus, DroneDeployment, DroneCombat
-from src.models.fleet import Fleet, FleetMember, FleetBattle, FleetBattleCasualty, FleetRole, FleetStatus, BattlePhase
+from src.models.bounty import BountyBoardEntry
+from src.models.sector_summary import SectorSummary
+from src.models.port_rebalance_job import PortRebalanceJob, RebalanceJobStatus
+from src.models.anomaly_flag import AnomalyFlag, AnomalyFlagType
+from src.models.fleet import Fleet, FleetMember, FleetBattle, FleetBattleCasualty, FleetBattleEvent, FleetRole, FleetStatus, BattlePhase
 from src.models.mfa import MFASecret, MFAAttempt
 from src.models.translation import (
     Language, TranslationNamespace, TranslationKey, 
@@ -0,0 +1,48 @@
+"""
+Anomaly flag model
+
+Flags raised by the streaming anomaly detector as trades and combats are
+written (wash trading, price outliers, repeat combats, win-rate outliers).
+Admin analytics read these rows instead of re-scanning history tables.
+"""
+
+import enum
+import uuid
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, JSON, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from src.core.database import Base
+
+
+class AnomalyFlagType(str, enum.Enum):
+    WASH_TRADING = "wash_trading"
+    PRICE_DEVIATION = "price_deviation"
+    REPEAT_COMBAT = "repeat_combat"
+    WIN_RATE_OUTLIER = "win_rate_outlier"
+
+
+MARKET_FLAG_TYPES = (AnomalyFlagType.WASH_TRADING.value, AnomalyFlagType.PRICE_DEVIATION.value)
+COMBAT_FLAG_TYPES = (AnomalyFlagType.REPEAT_COMBAT.value, AnomalyFlagType.WIN_RATE_OUTLIER.value)
+
+
+class AnomalyFlag(Base):
+    __tablename__ = "anomaly_flags"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    flag_type = Column(String(30), nullable=False)
+    severity = Column(String(10), nullable=False, default="medium")
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="SET NULL"), nullable=True)
+    counterparty_id = Column(UUID(as_uuid=True), nullable=True)  # Defender player or trading station
+    commodity = Column(String(50), nullable=True)
+    metric = Column(Float, nullable=False, default=0.0)  # Window count, z-score or win rate
+    details = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_anomaly_flags_type_created", "flag_type", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<AnomalyFlag {self.flag_type} {self.severity} player={self.player_id}>"
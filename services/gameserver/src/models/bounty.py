@@ -0,0 +1,32 @@
+"""
+Bounty board aggregate model
+
+Individual player bounties stay in Player.settings["bounties"]; this table keeps
+the per-target total and count so the bounty board can be served from an index.
+"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from src.core.database import Base
+
+
+class BountyBoardEntry(Base):
+    __tablename__ = "bounty_board"
+
+    target_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    total_amount = Column(Integer, nullable=False, default=0)  # Sum of active player-placed bounties
+    bounty_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Relationships
+    target = relationship("Player")
+
+    __table_args__ = (
+        Index("ix_bounty_board_total_amount", total_amount.desc()),
+    )
+
+    def __repr__(self):
+        return f"<BountyBoardEntry {self.target_id} total={self.total_amount} count={self.bounty_count}>"
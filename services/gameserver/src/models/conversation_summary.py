@@ -0,0 +1,32 @@
+"""
+Conversation summary model
+
+One row per (player, thread) with the latest message visible to that player
+and how many of the thread's messages they have not read. MessageService
+keeps the rows current on send, read and delete, so the conversation list
+is a keyset scan of a player's rows instead of a GROUP BY over all their
+messages.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.database import Base
+
+
+class ConversationSummary(Base):
+    __tablename__ = "conversation_summaries"
+
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    thread_id = Column(UUID(as_uuid=True), primary_key=True)
+    last_message_id = Column(UUID(as_uuid=True), ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)
+    last_message_at = Column(DateTime, nullable=False)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Keyset order of a player's conversation list
+        Index("ix_conversation_summaries_player_last", "player_id", "last_message_at", "thread_id"),
+    )
+
+    def __repr__(self):
+        return f"<ConversationSummary {self.player_id} thread={self.thread_id} unread={self.unread_count}>"
@@ -8,7 +8,7 @@ from uuid import uuid4
 from datetime import datetime
 from typing import Optional, List
 import enum
-from sqlalchemy import Column, String, DateTime, Integer, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Float, Boolean, ForeignKey, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 
@@ -172,8 +172,9 @@ class FleetBattle(Base):
     attacker_damage_dealt = Column(Integer, default=0)
     defender_damage_dealt = Column(Integer, default=0)
     
-    # Battle events log (JSON array)
+    # Legacy battle events log (JSON array); new events go to fleet_battle_events
     battle_log = Column(JSON, default=list)
+    rounds_completed = Column(Integer, default=0, nullable=False)
     
     # Loot and rewards
     credits_looted = Column(Integer, default=0)
@@ -184,11 +185,38 @@ class FleetBattle(Base):
     defender_fleet = relationship("Fleet", foreign_keys=[defender_fleet_id])
     sector = relationship("Sector")
     ship_casualties = relationship("FleetBattleCasualty", back_populates="battle", cascade="all, delete-orphan")
+    events = relationship("FleetBattleEvent", back_populates="battle", cascade="all, delete-orphan",
+                          order_by="FleetBattleEvent.id")
     
     def __repr__(self):
         return f"<FleetBattle(id={self.id}, attacker={self.attacker_fleet_id}, defender={self.defender_fleet_id})>"
 
 
+class FleetBattleEvent(Base):
+    """
+    Append-only battle event (preparation, round result, aftermath).
+    """
+    __tablename__ = "fleet_battle_events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    battle_id = Column(UUID(as_uuid=True), ForeignKey("fleet_battles.id", ondelete="CASCADE"), nullable=False)
+    round = Column(Integer, default=0, nullable=False)  # 0 for non-round events
+    phase = Column(String(50), nullable=False)
+    event_type = Column(String(20), nullable=False)  # "preparation", "round", "aftermath"
+    payload = Column(JSON, default=dict)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    battle = relationship("FleetBattle", back_populates="events")
+    
+    __table_args__ = (
+        Index("ix_fleet_battle_events_battle_round", "battle_id", "round"),
+    )
+    
+    def __repr__(self):
+        return f"<FleetBattleEvent(battle={self.battle_id}, round={self.round}, type={self.event_type})>"
+
+
 class FleetBattleCasualty(Base):
     """
     Record of individual ship casualties in a fleet battle.
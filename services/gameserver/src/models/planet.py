@@ -54,7 +54,7 @@ class Planet(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
-    sector_id = Column(Integer, nullable=False)
+    sector_id = Column(Integer, nullable=False, index=True)
     sector_uuid = Column(UUID(as_uuid=True), ForeignKey("sectors.id", ondelete="CASCADE"), nullable=True)
     owner_id = Column(UUID(as_uuid=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -130,6 +130,8 @@ class Planet(Base):
     under_siege = Column(Boolean, nullable=False, default=False)
     siege_started_at = Column(DateTime(timezone=True), nullable=True)
     siege_attacker_id = Column(UUID(as_uuid=True), nullable=True)
+    siege_turns = Column(Integer, nullable=False, default=0, server_default="0")  # Consecutive turns with enemies present
+    morale = Column(Integer, nullable=False, default=100, server_default="100")  # 0-100, drops under siege
     
     # Citadel system
     citadel_level = Column(Integer, nullable=False, default=0)  # 0-5
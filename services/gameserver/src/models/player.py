@@ -33,7 +33,7 @@ class Player(Base):
     reputation = Column(JSONB, nullable=False, default={})  # Faction reputations
 
     # Personal Reputation System (good vs evil alignment)
-    personal_reputation = Column(Integer, nullable=False, default=0)  # -1000 to +1000
+    personal_reputation = Column(Integer, nullable=False, default=0, index=True)  # -1000 to +1000
     reputation_tier = Column(String(50), nullable=False, default="Neutral")  # Cached tier name
     name_color = Column(String(20), nullable=False, default="#FFFFFF")  # Cached color code
 
@@ -49,7 +49,7 @@ class Player(Base):
 
     current_ship_id = Column(UUID(as_uuid=True), ForeignKey("ships.id", ondelete="SET NULL"), nullable=True)
     home_sector_id = Column(Integer, nullable=False, default=1)
-    current_sector_id = Column(Integer, nullable=False, default=1)
+    current_sector_id = Column(Integer, nullable=False, default=1, index=True)
     is_docked = Column(Boolean, nullable=False, default=False)
     current_port_id = Column(UUID(as_uuid=True), ForeignKey("stations.id", ondelete="SET NULL"), nullable=True)  # Station player is docked at
     is_landed = Column(Boolean, nullable=False, default=False)
@@ -0,0 +1,61 @@
+"""
+Port stock rebalance job model
+
+Tracks a chunked rebalance of every station's commodity flags and stock
+levels: progress, the keyset checkpoint it resumes from, and a sample of the
+per-station diffs (the full preview for dry runs is capped the same way).
+"""
+
+import enum
+import uuid
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, BigInteger, String, Text, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from src.core.database import Base
+
+
+class RebalanceJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    CANCELLING = "cancelling"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+    COMPLETED = "completed"
+
+
+class PortRebalanceJob(Base):
+    __tablename__ = "port_rebalance_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = Column(String(20), nullable=False, default=RebalanceJobStatus.PENDING.value, index=True)
+    dry_run = Column(Boolean, nullable=False, default=False)
+    batch_size = Column(Integer, nullable=False, default=500)
+    seed = Column(BigInteger, nullable=False)  # Same seed => same stock levels (dry run previews an apply)
+
+    # Progress; last_station_id is the keyset checkpoint committed with each batch
+    total_stations = Column(Integer, nullable=False, default=0)
+    processed_stations = Column(Integer, nullable=False, default=0)
+    changed_stations = Column(Integer, nullable=False, default=0)
+    last_station_id = Column(UUID(as_uuid=True), nullable=True)
+    sample_changes = Column(JSON, nullable=False, default=list)
+    error = Column(Text, nullable=True)
+
+    # Set when a worker claims the job and renewed with each batch; a RUNNING job past it was interrupted
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (
+            RebalanceJobStatus.COMPLETED.value, RebalanceJobStatus.CANCELLED.value, RebalanceJobStatus.FAILED.value
+        )
+
+    def __repr__(self):
+        return f"<PortRebalanceJob {self.id} {self.status} {self.processed_stations}/{self.total_stations}>"
@@ -2,7 +2,7 @@ import uuid
 import enum
 from datetime import datetime
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
-from sqlalchemy import Boolean, Column, DateTime, String, Integer, Float, ForeignKey, Enum, func
+from sqlalchemy import Boolean, Column, DateTime, String, Integer, BigInteger, Float, ForeignKey, Enum, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -43,9 +43,9 @@ class Reputation(Base):
     current_value = Column(Integer, nullable=False, default=0)
     current_level = Column(Enum(ReputationLevel, name="reputation_level"), nullable=False, default=ReputationLevel.NEUTRAL)
     title = Column(String(50), nullable=False, default="Neutral")
-    last_updated = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_updated = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     decay_paused = Column(Boolean, nullable=False, default=False)
-    history = Column(JSONB, nullable=False, default=[])
+    history = Column(JSONB, nullable=False, default=[])  # Legacy; new entries go to reputation_history
     
     # Reputation effects
     trade_modifier = Column(Float, nullable=False, default=0)
@@ -108,6 +108,41 @@ class Reputation(Base):
         return level_map[self.current_level]
 
 
+class ReputationHistory(Base):
+    """Append-only log of faction reputation changes"""
+    __tablename__ = "reputation_history"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    reputation_id = Column(UUID(as_uuid=True), ForeignKey("reputations.id", ondelete="CASCADE"), nullable=False)
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    faction_id = Column(UUID(as_uuid=True), ForeignKey("factions.id", ondelete="CASCADE"), nullable=False)
+    old_value = Column(Integer, nullable=False)
+    new_value = Column(Integer, nullable=False)
+    change = Column(Integer, nullable=False)
+    reason = Column(String(255), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_reputation_history_reputation_created", "reputation_id", "created_at"),
+        Index("ix_reputation_history_player_created", "player_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<ReputationHistory {self.reputation_id}: {self.old_value} -> {self.new_value}>"
+
+
+class ReputationDecayRun(Base):
+    """One row per population-wide weekly decay run, so the run is not repeated within the week"""
+    __tablename__ = "reputation_decay_runs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)  # NULL while running
+
+    def __repr__(self):
+        return f"<ReputationDecayRun {self.started_at}>"
+
+
 class TeamReputation(Base):
     __tablename__ = "team_reputations"
 
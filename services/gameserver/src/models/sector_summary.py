@@ -0,0 +1,40 @@
+"""
+Sector summary model
+
+Per-sector counts of stations, planets, warp tunnels and occupying players,
+maintained by refresh_sector_summaries (periodic refresh plus targeted
+refreshes on writes) so admin universe views join one row per sector instead
+of querying each table per sector.
+"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from src.core.database import Base
+
+
+class SectorSummary(Base):
+    __tablename__ = "sector_summaries"
+
+    sector_id = Column(Integer, ForeignKey("sectors.sector_id", ondelete="CASCADE"), primary_key=True)
+    station_count = Column(Integer, nullable=False, default=0)
+    planet_count = Column(Integer, nullable=False, default=0)
+    warp_tunnel_count = Column(Integer, nullable=False, default=0)  # Tunnels starting or ending here
+    player_count = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    @property
+    def has_port(self) -> bool:
+        return self.station_count > 0
+
+    @property
+    def has_planet(self) -> bool:
+        return self.planet_count > 0
+
+    @property
+    def has_warp_tunnel(self) -> bool:
+        return self.warp_tunnel_count > 0
+
+    def __repr__(self):
+        return (f"<SectorSummary {self.sector_id} stations={self.station_count} "
+                f"planets={self.planet_count} players={self.player_count}>")
@@ -73,7 +73,7 @@ class Station(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
-    sector_id = Column(Integer, nullable=False)
+    sector_id = Column(Integer, nullable=False, index=True)
     sector_uuid = Column(UUID(as_uuid=True), ForeignKey("sectors.id", ondelete="CASCADE"), nullable=True)
     owner_id = Column(UUID(as_uuid=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -244,9 +244,13 @@ class Station(Base):
             if commodity in self.commodities:
                 self.commodities[commodity]["sells"] = True
     
-    def update_commodity_stock_levels(self):
-        """Update commodity stock levels to match port's trading role."""
+    def update_commodity_stock_levels(self, rng=None):
+        """Update commodity stock levels to match port's trading role.
+
+        ``rng`` (a random.Random) makes the result reproducible.
+        """
         import random
+        rng = rng or random
         
         pattern = self.get_trading_pattern()
         is_premium_seller = self.station_class == StationClass.CLASS_9  # Nova
@@ -262,30 +266,30 @@ class Station(Base):
                 # Station sells this commodity - needs high stock
                 if is_premium_seller:
                     # Premium sellers have maximum stock
-                    stock_level = int(base_capacity * random.uniform(0.8, 1.0))
+                    stock_level = int(base_capacity * rng.uniform(0.8, 1.0))
                     production_rate = commodity_data.get("production_rate", 50) * 2
                 elif is_distribution:
                     # Distribution centers have very high stock for selling
-                    stock_level = int(base_capacity * random.uniform(0.7, 0.9))
+                    stock_level = int(base_capacity * rng.uniform(0.7, 0.9))
                     production_rate = commodity_data.get("production_rate", 50) * 1.5
                 else:
                     # Regular sellers have good stock
-                    stock_level = int(base_capacity * random.uniform(0.4, 0.7))
+                    stock_level = int(base_capacity * rng.uniform(0.4, 0.7))
                     production_rate = commodity_data.get("production_rate", 50)
                     
             elif commodity_name in pattern.get("buys", []):
                 # Station buys this commodity - needs low stock, high capacity
                 if is_premium_buyer or is_collection:
                     # Premium buyers and collection hubs have minimal stock, maximum capacity
-                    stock_level = int(base_capacity * random.uniform(0.05, 0.15))
+                    stock_level = int(base_capacity * rng.uniform(0.05, 0.15))
                     production_rate = 0  # They don't produce, they collect
                 else:
                     # Regular buyers have low stock
-                    stock_level = int(base_capacity * random.uniform(0.1, 0.3))
+                    stock_level = int(base_capacity * rng.uniform(0.1, 0.3))
                     production_rate = 0
             else:
                 # Station doesn't trade this commodity - minimal stock
-                stock_level = int(base_capacity * random.uniform(0.1, 0.25))
+                stock_level = int(base_capacity * rng.uniform(0.1, 0.25))
                 production_rate = commodity_data.get("production_rate", 10)
             
             # Ensure minimum stock of 1 for all commodities
@@ -41,8 +41,8 @@ class WarpTunnel(Base):
     last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships and structure
-    origin_sector_id = Column(UUID(as_uuid=True), ForeignKey("sectors.id", ondelete="CASCADE"), nullable=False)
-    destination_sector_id = Column(UUID(as_uuid=True), ForeignKey("sectors.id", ondelete="CASCADE"), nullable=False)
+    origin_sector_id = Column(UUID(as_uuid=True), ForeignKey("sectors.id", ondelete="CASCADE"), nullable=False, index=True)
+    destination_sector_id = Column(UUID(as_uuid=True), ForeignKey("sectors.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Type and status - aligned with data definition
     type = Column(Enum(WarpTunnelType, name="warp_tunnel_type"), nullable=False)
@@ -0,0 +1,278 @@
+"""
+Admin data-access layer
+
+Admin list pages used to page with OFFSET and run several queries per row
+(ports, planets, tunnels and players per sector; members and leader per team;
+effects and creator per event). The helpers here give every admin page a
+constant number of queries:
+
+- keyset (cursor) pagination over stable unique keys, so page N costs the same
+  as page 1
+- sector_summaries rows (see models/sector_summary.py) joined in place of
+  per-sector lookups; refresh_sector_summaries keeps them current and is run
+  periodically from the server and for the sectors touched by admin writes
+- batched rollups and lookups keyed by id for teams, members and event effects
+"""
+
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session, joinedload
+
+from src.models.game_event import EventEffect
+from src.models.player import Player
+from src.models.sector import Sector
+from src.models.sector_summary import SectorSummary
+from src.models.user import User
+
+logger = logging.getLogger(__name__)
+
+SECTOR_SUMMARY_REFRESH_SECONDS = 60
+
+
+# Cursors
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for the last row of a page"""
+    payload = json.dumps([str(v) if not isinstance(v, (int, float, str)) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Values encoded by encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+# Sector summaries
+
+_SECTOR_COUNTS_SQL = """
+    SELECT s.sector_id,
+           COALESCE(st.n, 0) AS station_count,
+           COALESCE(p.n, 0) AS planet_count,
+           COALESCE(w.n, 0) AS warp_tunnel_count,
+           COALESCE(pl.n, 0) AS player_count
+    FROM sectors s
+    LEFT JOIN (SELECT sector_id, COUNT(*) AS n FROM stations GROUP BY sector_id) st
+           ON st.sector_id = s.sector_id
+    LEFT JOIN (SELECT sector_id, COUNT(*) AS n FROM planets GROUP BY sector_id) p
+           ON p.sector_id = s.sector_id
+    LEFT JOIN (
+        SELECT sid, COUNT(*) AS n FROM (
+            SELECT origin_sector_id AS sid FROM warp_tunnels
+            UNION ALL
+            SELECT destination_sector_id FROM warp_tunnels WHERE destination_sector_id <> origin_sector_id
+        ) ends GROUP BY sid
+    ) w ON w.sid = s.id
+    LEFT JOIN (SELECT current_sector_id, COUNT(*) AS n FROM players GROUP BY current_sector_id) pl
+           ON pl.current_sector_id = s.sector_id
+    {where}
+"""
+
+# Rows whose counts are unchanged are left alone, so a full refresh only
+# writes (and bloats) the sectors that actually changed
+_REFRESH_SECTOR_SUMMARIES_SQL = """
+    INSERT INTO sector_summaries
+        (sector_id, station_count, planet_count, warp_tunnel_count, player_count, refreshed_at)
+    SELECT c.sector_id, c.station_count, c.planet_count, c.warp_tunnel_count, c.player_count, now()
+    FROM ({counts}) c
+    ON CONFLICT (sector_id) DO UPDATE SET
+        station_count = EXCLUDED.station_count,
+        planet_count = EXCLUDED.planet_count,
+        warp_tunnel_count = EXCLUDED.warp_tunnel_count,
+        player_count = EXCLUDED.player_count,
+        refreshed_at = EXCLUDED.refreshed_at
+    WHERE (sector_summaries.station_count, sector_summaries.planet_count,
+           sector_summaries.warp_tunnel_count, sector_summaries.player_count)
+        IS DISTINCT FROM
+          (EXCLUDED.station_count, EXCLUDED.planet_count, EXCLUDED.warp_tunnel_count, EXCLUDED.player_count)
+"""
+
+
+def _sector_filter(sector_ids: Optional[Iterable[int]], params: Dict[str, Any]) -> str:
+    if sector_ids is None:
+        return ""
+    params["sector_ids"] = sorted(set(sector_ids))
+    return "WHERE s.sector_id = ANY(:sector_ids)"
+
+
+def refresh_sector_summaries(db: Session, sector_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute summary rows in one statement, for all sectors or only
+    ``sector_ids`` (sector numbers). Returns the number of rows inserted or
+    changed. Does not commit.
+    """
+    params: Dict[str, Any] = {}
+    where = _sector_filter(sector_ids, params)
+    if sector_ids is not None and not params["sector_ids"]:
+        return 0
+    sql = _REFRESH_SECTOR_SUMMARIES_SQL.format(counts=_SECTOR_COUNTS_SQL.format(where=where))
+    result = db.execute(text(sql), params)
+    return result.rowcount or 0
+
+
+def compute_sector_summaries(db: Session, sector_ids: Iterable[int]) -> Dict[int, SectorSummary]:
+    """Unsaved summaries for ``sector_ids``, computed with one read-only query"""
+    params: Dict[str, Any] = {}
+    where = _sector_filter(sector_ids, params)
+    if not params["sector_ids"]:
+        return {}
+    rows = db.execute(text(_SECTOR_COUNTS_SQL.format(where=where)), params).mappings()
+    return {row["sector_id"]: SectorSummary(**row) for row in rows}
+
+
+def refresh_all_sector_summaries() -> int:
+    """Refresh every summary row in its own session (for the background loop)"""
+    from src.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        refreshed = refresh_sector_summaries(db)
+        db.commit()
+        return refreshed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@dataclass
+class SectorPage:
+    rows: List[Tuple[Sector, SectorSummary]]
+    next_cursor: Optional[str]
+
+
+def page_sectors(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: Optional[int] = None,
+    filters: Sequence[Any] = (),
+) -> SectorPage:
+    """
+    One page of sectors ordered by sector number, each with its summary.
+
+    ``cursor`` (from a previous page's next_cursor) selects the keyset page;
+    ``offset`` is only for callers that still page by number. Sectors whose
+    summary has never been computed get one computed for the page in one
+    read-only query; the refresh loop stores it later, so a GET never writes.
+    """
+    query = (
+        db.query(Sector, SectorSummary)
+        .outerjoin(SectorSummary, SectorSummary.sector_id == Sector.sector_id)
+        .options(joinedload(Sector.region), joinedload(Sector.zone))
+        .filter(*filters)
+    )
+    if cursor:
+        (after,) = decode_cursor(cursor)
+        query = query.filter(Sector.sector_id > int(after))
+    query = query.order_by(Sector.sector_id)
+    if offset and not cursor:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    missing = [sector.sector_id for sector, summary in rows if summary is None]
+    if missing:
+        summaries = compute_sector_summaries(db, missing)
+        rows = [(sector, summary or summaries.get(sector.sector_id)) for sector, summary in rows]
+
+    next_cursor = encode_cursor(rows[-1][0].sector_id) if has_more and rows else None
+    return SectorPage(rows=rows, next_cursor=next_cursor)
+
+
+def sector_flags(summary: Optional[SectorSummary]) -> Dict[str, Any]:
+    """has_port/has_planet/has_warp_tunnel/player_count for a sector row"""
+    if summary is None:
+        return {"has_port": False, "has_planet": False, "has_warp_tunnel": False, "player_count": 0}
+    return {
+        "has_port": summary.has_port,
+        "has_planet": summary.has_planet,
+        "has_warp_tunnel": summary.has_warp_tunnel,
+        "player_count": summary.player_count,
+    }
+
+
+# Teams
+
+@dataclass
+class TeamRollup:
+    member_count: int = 0
+    total_credits: int = 0
+    total_combat_rating: int = 0
+
+
+def team_rollups(db: Session, team_ids: Optional[Iterable[Any]] = None) -> Dict[Any, TeamRollup]:
+    """Member count, credits and combat rating per team in one grouped query"""
+    combat_rating = getattr(Player, "combat_rating", None)
+    query = db.query(
+        Player.team_id,
+        func.count(Player.id),
+        func.coalesce(func.sum(Player.credits), 0),
+        func.coalesce(func.sum(combat_rating), 0) if combat_rating is not None else func.sum(0),
+    ).filter(Player.team_id.isnot(None))
+    if team_ids is not None:
+        query = query.filter(Player.team_id.in_(list(team_ids)))
+    return {
+        team_id: TeamRollup(int(count), int(credits or 0), int(combat or 0))
+        for team_id, count, credits, combat in query.group_by(Player.team_id)
+    }
+
+
+def usernames_by_player(db: Session, player_ids: Iterable[Any]) -> Dict[Any, str]:
+    """Username for each player id (missing players are omitted)"""
+    ids = {pid for pid in player_ids if pid is not None}
+    if not ids:
+        return {}
+    rows = db.query(Player.id, User.username).join(User, User.id == Player.user_id).filter(Player.id.in_(ids))
+    return dict(rows)
+
+
+def usernames_by_user(db: Session, user_ids: Iterable[Any]) -> Dict[Any, str]:
+    """Username for each user id (missing users are omitted)"""
+    ids = {uid for uid in user_ids if uid is not None}
+    if not ids:
+        return {}
+    return dict(db.query(User.id, User.username).filter(User.id.in_(ids)))
+
+
+# Events
+
+def effect_counts(db: Session, event_ids: Iterable[Any]) -> Dict[Any, int]:
+    """Number of effects per event in one grouped query"""
+    ids = list(event_ids)
+    if not ids:
+        return {}
+    rows = (
+        db.query(EventEffect.event_id, func.count(EventEffect.id))
+        .filter(EventEffect.event_id.in_(ids))
+        .group_by(EventEffect.event_id)
+    )
+    return {event_id: int(count) for event_id, count in rows}
+
+
+def effects_by_event(db: Session, event_ids: Iterable[Any], active_only: bool = False) -> Dict[Any, List[EventEffect]]:
+    """Effects grouped by event id in one query"""
+    ids = list(event_ids)
+    if not ids:
+        return {}
+    query = db.query(EventEffect).filter(EventEffect.event_id.in_(ids))
+    if active_only:
+        query = query.filter(EventEffect.is_active == True)
+    grouped: Dict[Any, List[EventEffect]] = {}
+    for effect in query:
+        grouped.setdefault(effect.event_id, []).append(effect)
+    return grouped
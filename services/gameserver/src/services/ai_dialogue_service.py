@@ -13,11 +13,12 @@ import json
 import logging
 import html
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 import os
 from datetime import datetime
 
+from src.services.ai_generation_cache import bucket, get_generation_cache, make_cache_key
 from src.services.translation_service import TranslationService
 
 logger = logging.getLogger(__name__)
@@ -178,6 +179,8 @@ class AIDialogueService:
         self.model_provider = os.getenv("AI_DIALOGUE_PROVIDER", "anthropic")
         self.model_name = os.getenv("AI_DIALOGUE_MODEL", "claude-3-sonnet-20240229")
         self.fallback_enabled = os.getenv("AI_DIALOGUE_FALLBACK", "true").lower() == "true"
+        self.question_variants = int(os.getenv("AI_DIALOGUE_VARIANTS", "3"))
+        self.cache = get_generation_cache()
         
         # Initialize clients
         self.anthropic_client = None
@@ -248,12 +251,14 @@ class AIDialogueService:
             return self._fallback_generate_question(context, analysis)
         
         try:
-            if self.model_provider == "anthropic" and self.anthropic_client:
-                return await self._generate_with_anthropic(context, analysis)
-            elif self.model_provider == "openai" and self.openai_client:
-                return await self._generate_with_openai(context, analysis)
-            else:
-                raise Exception("No AI provider available")
+            # Generation only sees bucketed context features, so identical
+            # situations across players share cached guard responses
+            response = await self.cache.get_or_generate(
+                self._question_cache_key(context, analysis),
+                lambda: self._generate_with_provider(context, analysis),
+                variants=self.question_variants
+            )
+            return replace(response)
                 
         except Exception as e:
             logger.error(f"AI question generation failed: {e}")
@@ -263,6 +268,34 @@ class AIDialogueService:
             else:
                 raise
 
+    async def _generate_with_provider(self, context: DialogueContext, analysis: ResponseAnalysis) -> GuardResponse:
+        if self.model_provider == "anthropic" and self.anthropic_client:
+            return await self._generate_with_anthropic(context, analysis)
+        elif self.model_provider == "openai" and self.openai_client:
+            return await self._generate_with_openai(context, analysis)
+        else:
+            raise Exception("No AI provider available")
+
+    def _question_cache_key(self, context: DialogueContext, analysis: ResponseAnalysis) -> str:
+        """Key on the features _build_generation_user_prompt exposes to the model"""
+        turn = len(context.dialogue_history) + 1
+        return make_cache_key(
+            "guard_question",
+            provider=self.model_provider,
+            model=self.model_name,
+            claimed_ship=context.claimed_ship,
+            actual_ship=context.actual_ship,
+            mood=analysis.suggested_guard_mood,
+            turn=turn,
+            persuasiveness=bucket(analysis.persuasiveness_score),
+            confidence=bucket(analysis.confidence_level),
+            consistency=bucket(analysis.consistency_score),
+            believability=bucket(analysis.overall_believability),
+            inconsistencies=len(analysis.detected_inconsistencies),
+            should_decide=analysis.overall_believability < 0.4 or analysis.overall_believability > 0.7,
+            ship_specifications=context.ship_specifications,
+        )
+
     async def _analyze_with_anthropic(
         self,
         response: str,
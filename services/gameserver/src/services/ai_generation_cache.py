@@ -0,0 +1,240 @@
+"""
+Generation cache for AI text
+
+LLM output for first-login scenes, guard dialogue and ARIA replies depends on a
+small set of context features (guard personality, ship list, score buckets),
+not on who is asking. This cache keys generated content on those normalized
+features so the number of LLM calls follows content diversity rather than
+player count:
+
+- TTL + LRU eviction over a bounded number of keys
+- single-flight: concurrent misses for the same key share one generation
+- variant pools: a key can hold several generated variants, served at random,
+  with missing variants generated in the background after a hit
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SECONDS = 6 * 3600
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if hasattr(value, "value"):  # Enum
+        return _normalize(value.value)
+    return value
+
+
+def make_cache_key(namespace: str, **features: Any) -> str:
+    """Stable key from a namespace and context features (case/whitespace-insensitive)"""
+    payload = json.dumps(_normalize(features), sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+def bucket(value: Optional[float], step: float = 0.1) -> Optional[float]:
+    """Quantize a 0..1 score so nearby values share a cache key"""
+    if value is None:
+        return None
+    return round(round(value / step) * step, 4)
+
+
+@dataclass
+class _Entry:
+    variants: List[Any] = field(default_factory=list)
+    expires_at: float = 0.0
+
+
+class GenerationCache:
+    """TTL/LRU cache of generated content with single-flight and variant pools"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic, rng: Optional[random.Random] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refilling: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.generations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _live_entry(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """A random cached variant for ``key``, or None"""
+        entry = self._live_entry(key)
+        if entry is None or not entry.variants:
+            return None
+        return self._rng.choice(entry.variants)
+
+    def variant_count(self, key: str) -> int:
+        entry = self._live_entry(key)
+        return len(entry.variants) if entry else 0
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, max_variants: int = 1) -> None:
+        """Store ``value`` as a variant of ``key``; the oldest variant is dropped when full"""
+        entry = self._live_entry(key)
+        if entry is None:
+            entry = _Entry(expires_at=self._clock() + (ttl if ttl is not None else self.ttl))
+            self._entries[key] = entry
+        entry.variants.append(value)
+        del entry.variants[:-max(1, max_variants)]
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_generate(self, key: str, factory: Callable[[], Awaitable[T]],
+                              ttl: Optional[float] = None, variants: int = 1) -> T:
+        """
+        Return a cached variant, or generate one.
+
+        Concurrent callers missing the same key await a single ``factory()``
+        call. Failures are not cached and propagate to every waiter. When a key
+        holds fewer than ``variants`` entries, a hit also schedules one more
+        generation in the background.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            if self.variant_count(key) < variants:
+                self._schedule_refill(key, factory, ttl, variants)
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._generate(factory)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            self.put(key, value, ttl, variants)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _generate(self, factory: Callable[[], Awaitable[T]]) -> T:
+        self.generations += 1
+        value = await factory()
+        if value is None:
+            raise ValueError("Generation returned no content")
+        return value
+
+    def _schedule_refill(self, key: str, factory: Callable[[], Awaitable[Any]],
+                         ttl: Optional[float], variants: int) -> None:
+        if key in self._refilling or key in self._inflight:
+            return
+        self._refilling.add(key)
+        task = asyncio.create_task(self._refill(key, factory, ttl, variants))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refill(self, key: str, factory: Callable[[], Awaitable[Any]],
+                      ttl: Optional[float], variants: int) -> None:
+        try:
+            value = await self._generate(factory)
+            if self._live_entry(key) is not None:
+                self.put(key, value, ttl, variants)
+        except Exception as e:
+            logger.debug(f"Background variant generation for {key} failed: {e}")
+        finally:
+            self._refilling.discard(key)
+
+    async def prewarm(self, key: str, factory: Callable[[], Awaitable[Any]],
+                      variants: int, ttl: Optional[float] = None) -> int:
+        """Fill ``key`` up to ``variants`` entries; returns how many were generated"""
+        missing = variants - self.variant_count(key)
+        if missing <= 0:
+            return 0
+        results = await asyncio.gather(
+            *(self._generate(factory) for _ in range(missing)), return_exceptions=True
+        )
+        generated = 0
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"Prewarm generation for {key} failed: {result}")
+                continue
+            self.put(key, result, ttl, variants)
+            generated += 1
+        return generated
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "generations": self.generations,
+            "in_flight": len(self._inflight),
+            "refilling": len(self._refilling),
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+        }
+
+
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> GenerationCache:
+    """Get or create the process-wide generation cache"""
+    global _generation_cache
+    if _generation_cache is None:
+        _generation_cache = GenerationCache(
+            max_entries=int(os.getenv("AI_GENERATION_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))),
+            ttl=float(os.getenv("AI_GENERATION_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+        )
+    return _generation_cache
@@ -0,0 +1,295 @@
+"""
+Async LLM client pool with per-provider gates
+
+Keeps one persistent async SDK client per provider (sharing a pooled
+httpx.AsyncClient), and wraps every call in a ProviderGate. A gate has a
+concurrency semaphore, a circuit breaker that fails fast while a provider is
+down, and latency/error histograms for the status endpoint.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+T = TypeVar("T")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000]
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised without calling the provider while its circuit is open"""
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and every
+    request is rejected until ``recovery_timeout`` seconds pass; then a single
+    probe is let through (half-open). A successful probe closes the circuit,
+    a failed one re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self.recovery_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot without counting an outcome"""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    def __init__(self, buckets_ms: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, value_ms)] += 1
+        self.total += 1
+        self.sum_ms += value_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (None if empty)"""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{int(b)}" for b in self.buckets_ms] + ["le_inf"]
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 2) if self.total else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class ProviderGate:
+    """Concurrency limit, circuit breaker and metrics around one provider"""
+
+    def __init__(self, name: str, max_concurrency: int, timeout: float,
+                 breaker: CircuitBreaker):
+        self.name = name
+        self.timeout = timeout
+        self.breaker = breaker
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.latency = LatencyHistogram()
+        self.error_latency = LatencyHistogram()
+        self.errors: Dict[str, int] = {}
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.breaker.state == CircuitState.OPEN
+
+    async def call(self, factory: Callable[[], Awaitable[T]]) -> T:
+        if not self.breaker.allow_request():
+            self.rejected += 1
+            raise ProviderUnavailableError(f"{self.name} circuit open")
+
+        try:
+            async with self._semaphore:
+                self.in_flight += 1
+                start = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(factory(), timeout=self.timeout)
+                except Exception as e:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    self.error_latency.observe(elapsed_ms)
+                    error_type = type(e).__name__
+                    self.errors[error_type] = self.errors.get(error_type, 0) + 1
+                    self.breaker.record_failure()
+                    raise
+                else:
+                    self.latency.observe((time.perf_counter() - start) * 1000)
+                    self.breaker.record_success()
+                    return result
+                finally:
+                    self.in_flight -= 1
+        except asyncio.CancelledError:
+            # Lost a hedge race, while queued or in the call: not the provider's fault
+            self.breaker.release_probe()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state.value,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rejected_while_open": self.rejected,
+            "errors": dict(self.errors),
+            "latency": self.latency.snapshot(),
+            "error_latency": self.error_latency.snapshot(),
+        }
+
+
+class LLMClientPool:
+    """
+    Persistent async OpenAI/Anthropic clients sharing one pooled HTTP client.
+
+    ``transport`` lets tests point both SDKs at a local httpx.MockTransport
+    (or any ASGI/WSGI stand-in) instead of the real APIs.
+    """
+
+    def __init__(self, openai_api_key: Optional[str] = None, anthropic_api_key: Optional[str] = None,
+                 openai_base_url: Optional[str] = None, anthropic_base_url: Optional[str] = None,
+                 max_connections: int = 20, timeout: float = 20.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.openai_api_key = openai_api_key
+        self.anthropic_api_key = anthropic_api_key
+        self.openai_base_url = openai_base_url
+        self.anthropic_base_url = anthropic_base_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._openai = None
+        self._anthropic = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._http
+
+    @property
+    def openai(self):
+        if self._openai is None:
+            if not OPENAI_AVAILABLE:
+                raise ValueError("OpenAI not available")
+            if not self.openai_api_key:
+                raise ValueError("OpenAI API key not configured")
+            # Retries are handled by the provider chain, not the SDK
+            self._openai = openai.AsyncOpenAI(
+                api_key=self.openai_api_key,
+                base_url=self.openai_base_url,
+                max_retries=0,
+                http_client=self._http_client(),
+            )
+        return self._openai
+
+    @property
+    def anthropic(self):
+        if self._anthropic is None:
+            if not ANTHROPIC_AVAILABLE:
+                raise ValueError("Anthropic not available")
+            if not self.anthropic_api_key:
+                raise ValueError("Anthropic API key not configured")
+            self._anthropic = anthropic.AsyncAnthropic(
+                api_key=self.anthropic_api_key,
+                base_url=self.anthropic_base_url,
+                max_retries=0,
+                http_client=self._http_client(),
+            )
+        return self._anthropic
+
+    async def openai_chat(self, model: str, messages: List[Dict[str, str]],
+                          temperature: float, max_tokens: int) -> str:
+        completion = await self.openai.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return completion.choices[0].message.content
+
+    async def anthropic_message(self, model: str, messages: List[Dict[str, str]],
+                                temperature: float, max_tokens: int,
+                                system: Optional[str] = None) -> str:
+        kwargs: Dict[str, Any] = {}
+        if system:
+            kwargs["system"] = system
+        message = await self.anthropic.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=messages,
+            **kwargs,
+        )
+        return message.content[0].text
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._openai = None
+        self._anthropic = None
@@ -7,34 +7,35 @@ sophisticated manual fallback that includes cat boost and ship tier logic.
 """
 
 import asyncio
+import importlib.util
 import logging
 import os
 import random
 import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple, TypeVar, Union
 from dataclasses import dataclass
 from enum import Enum
 
 from src.services.ai_dialogue_service import (
     DialogueContext, ResponseAnalysis, GuardResponse, GuardMood, ShipType
 )
+from src.services.ai_generation_cache import GenerationCache, get_generation_cache, make_cache_key
+from src.services.ai_provider_pool import (
+    CircuitBreaker, LLMClientPool, ProviderGate, ProviderUnavailableError
+)
 
 logger = logging.getLogger(__name__)
 
-# Try imports with graceful fallbacks
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+T = TypeVar("T")
+
+# Probe for the provider SDKs without importing them; the SDK clients are built in ai_provider_pool
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+if not OPENAI_AVAILABLE:
     logger.warning("OpenAI library not available")
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not ANTHROPIC_AVAILABLE:
     logger.warning("Anthropic library not available")
 
 
@@ -77,6 +78,24 @@ class ProviderConfig:
     max_retries: int = 2
     retry_delay: float = 1.0
 
+    # Client pool settings (base URLs allow pointing at a local stand-in)
+    openai_base_url: Optional[str] = None
+    anthropic_base_url: Optional[str] = None
+    max_connections: int = 20
+    request_timeout: float = 20.0
+
+    # Per-provider concurrency and circuit breaker
+    max_concurrency: int = 8
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+
+    # Start the secondary provider if the primary has not answered after this
+    # many seconds (None disables hedging)
+    hedge_after: Optional[float] = None
+
+    # Generated opening scenes kept per guard/ship-list combination
+    scene_variants: int = 3
+
 
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
@@ -106,11 +125,12 @@ class AIProvider(ABC):
 class OpenAIProvider(AIProvider):
     """OpenAI GPT provider implementation"""
     
-    def __init__(self, config: ProviderConfig):
+    def __init__(self, config: ProviderConfig, pool: Optional[LLMClientPool] = None,
+                 gate: Optional[ProviderGate] = None):
         self.config = config
         self.api_key = os.getenv("OPENAI_API_KEY")
-        if self.api_key and OPENAI_AVAILABLE:
-            openai.api_key = self.api_key
+        self.pool = pool or LLMClientPool(openai_api_key=self.api_key, openai_base_url=config.openai_base_url)
+        self.gate = gate
     
     def is_available(self) -> bool:
         return OPENAI_AVAILABLE and bool(self.api_key)
@@ -118,6 +138,16 @@ class OpenAIProvider(AIProvider):
     @property
     def provider_type(self) -> ProviderType:
         return ProviderType.OPENAI
+
+    async def _chat(self, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """Send a chat completion through the shared async client and gate"""
+        def factory():
+            return self.pool.openai_chat(
+                self.config.openai_model, messages, self.config.openai_temperature, max_tokens
+            )
+        if self.gate is None:
+            return await factory()
+        return await self.gate.call(factory)
     
     async def analyze_response(self, response: str, context: DialogueContext) -> ResponseAnalysis:
         """Analyze player response using OpenAI"""
@@ -128,18 +158,13 @@ class OpenAIProvider(AIProvider):
         prompt = self._build_analysis_prompt(response, context)
         
         try:
-            client = openai.OpenAI(api_key=self.api_key)
-            completion = client.chat.completions.create(
-                model=self.config.openai_model,
-                messages=[
+            analysis_text = await self._chat(
+                [
                     {"role": "system", "content": "You are an expert analyst evaluating dialogue for a space trading game."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=self.config.openai_temperature,
                 max_tokens=500
             )
-            
-            analysis_text = completion.choices[0].message.content
             return self._parse_analysis_response(analysis_text, context)
             
         except Exception as e:
@@ -156,18 +181,13 @@ class OpenAIProvider(AIProvider):
             prompts = self._build_enhanced_question_prompt(context, analysis)
 
             try:
-                client = openai.OpenAI(api_key=self.api_key)
-                completion = client.chat.completions.create(
-                    model=self.config.openai_model,
-                    messages=[
+                response_text = await self._chat(
+                    [
                         {"role": "system", "content": prompts["system"]},
                         {"role": "user", "content": prompts["user"]}
                     ],
-                    temperature=self.config.openai_temperature,
                     max_tokens=300  # More tokens for dynamic ending detection
                 )
-
-                response_text = completion.choices[0].message.content
                 return self._parse_enhanced_question_response(response_text, context, analysis)
 
             except Exception as e:
@@ -178,18 +198,13 @@ class OpenAIProvider(AIProvider):
             prompt = self._build_question_prompt(context, analysis)
 
             try:
-                client = openai.OpenAI(api_key=self.api_key)
-                completion = client.chat.completions.create(
-                    model=self.config.openai_model,
-                    messages=[
+                question_text = await self._chat(
+                    [
                         {"role": "system", "content": "You are a suspicious security guard in a 2102 space station shipyard."},
                         {"role": "user", "content": prompt}
                     ],
-                    temperature=self.config.openai_temperature,
                     max_tokens=200
                 )
-
-                question_text = completion.choices[0].message.content
                 return self._parse_question_response(question_text, context, analysis)
 
             except Exception as e:
@@ -429,13 +444,12 @@ Keep response under 150 characters. Be direct and authoritative.
 class AnthropicProvider(AIProvider):
     """Anthropic Claude provider implementation"""
     
-    def __init__(self, config: ProviderConfig):
+    def __init__(self, config: ProviderConfig, pool: Optional[LLMClientPool] = None,
+                 gate: Optional[ProviderGate] = None):
         self.config = config
         self.api_key = os.getenv("ANTHROPIC_API_KEY")
-        if self.api_key and ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
-        else:
-            self.client = None
+        self.pool = pool or LLMClientPool(anthropic_api_key=self.api_key, anthropic_base_url=config.anthropic_base_url)
+        self.gate = gate
     
     def is_available(self) -> bool:
         return ANTHROPIC_AVAILABLE and bool(self.api_key)
@@ -443,6 +457,18 @@ class AnthropicProvider(AIProvider):
     @property
     def provider_type(self) -> ProviderType:
         return ProviderType.ANTHROPIC
+
+    async def _message(self, messages: List[Dict[str, str]], max_tokens: int,
+                       system: Optional[str] = None) -> str:
+        """Send a message through the shared async client and gate"""
+        def factory():
+            return self.pool.anthropic_message(
+                self.config.anthropic_model, messages, self.config.anthropic_temperature,
+                max_tokens, system=system
+            )
+        if self.gate is None:
+            return await factory()
+        return await self.gate.call(factory)
     
     async def analyze_response(self, response: str, context: DialogueContext) -> ResponseAnalysis:
         """Analyze player response using Anthropic Claude"""
@@ -452,16 +478,12 @@ class AnthropicProvider(AIProvider):
         prompt = self._build_analysis_prompt(response, context)
         
         try:
-            message = self.client.messages.create(
-                model=self.config.anthropic_model,
-                max_tokens=500,
-                temperature=self.config.anthropic_temperature,
-                messages=[
+            analysis_text = await self._message(
+                [
                     {"role": "user", "content": prompt}
-                ]
+                ],
+                max_tokens=500
             )
-            
-            analysis_text = message.content[0].text
             return self._parse_analysis_response(analysis_text, context)
             
         except Exception as e:
@@ -476,21 +498,17 @@ class AnthropicProvider(AIProvider):
         # Use same enhanced/basic prompt logic as OpenAI
         if hasattr(context, 'guard_name') and context.guard_name:
             # Use OpenAI provider's helper methods (shared logic)
-            openai_helper = OpenAIProvider(self.config)
+            openai_helper = OpenAIProvider(self.config, pool=self.pool)
             prompts = openai_helper._build_enhanced_question_prompt(context, analysis)
 
             try:
-                message = self.client.messages.create(
-                    model=self.config.anthropic_model,
-                    max_tokens=300,
-                    temperature=self.config.anthropic_temperature,
-                    system=prompts["system"],
-                    messages=[
+                response_text = await self._message(
+                    [
                         {"role": "user", "content": prompts["user"]}
-                    ]
+                    ],
+                    max_tokens=300,
+                    system=prompts["system"]
                 )
-
-                response_text = message.content[0].text
                 return openai_helper._parse_enhanced_question_response(response_text, context, analysis)
 
             except Exception as e:
@@ -501,16 +519,12 @@ class AnthropicProvider(AIProvider):
             prompt = self._build_question_prompt(context, analysis)
 
             try:
-                message = self.client.messages.create(
-                    model=self.config.anthropic_model,
-                    max_tokens=200,
-                    temperature=self.config.anthropic_temperature,
-                    messages=[
+                question_text = await self._message(
+                    [
                         {"role": "user", "content": prompt}
-                    ]
+                    ],
+                    max_tokens=200
                 )
-
-                question_text = message.content[0].text
                 return self._parse_question_response(question_text, context, analysis)
 
             except Exception as e:
@@ -538,8 +552,34 @@ class AnthropicProvider(AIProvider):
 class AIProviderService:
     """Enhanced AI Provider Service with robust fallback chain"""
 
-    def __init__(self, config: Optional[ProviderConfig] = None):
+    def __init__(self, config: Optional[ProviderConfig] = None, pool: Optional[LLMClientPool] = None,
+                 cache: Optional[GenerationCache] = None):
         self.config = config or ProviderConfig()
+        self.cache = cache or get_generation_cache()
+
+        # One persistent async client pool shared by every provider
+        self.pool = pool or LLMClientPool(
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+            openai_base_url=self.config.openai_base_url,
+            anthropic_base_url=self.config.anthropic_base_url,
+            max_connections=self.config.max_connections,
+            timeout=self.config.request_timeout,
+        )
+
+        # Concurrency limit, circuit breaker and metrics per remote provider
+        self.gates: Dict[ProviderType, ProviderGate] = {
+            provider_type: ProviderGate(
+                provider_type.value,
+                max_concurrency=self.config.max_concurrency,
+                timeout=self.config.request_timeout,
+                breaker=CircuitBreaker(
+                    failure_threshold=self.config.breaker_failure_threshold,
+                    recovery_timeout=self.config.breaker_recovery_timeout,
+                ),
+            )
+            for provider_type in (ProviderType.OPENAI, ProviderType.ANTHROPIC)
+        }
 
         # Initialize providers in priority order
         self.providers: List[AIProvider] = []
@@ -548,15 +588,11 @@ class AIProviderService:
         self.last_generation_metadata: Optional[AIGenerationMetadata] = None
         
         # Add providers based on configuration
-        if self.config.primary_provider == ProviderType.OPENAI:
-            self.providers.append(OpenAIProvider(self.config))
-        elif self.config.primary_provider == ProviderType.ANTHROPIC:
-            self.providers.append(AnthropicProvider(self.config))
-        
-        if self.config.secondary_provider == ProviderType.OPENAI:
-            self.providers.append(OpenAIProvider(self.config))
-        elif self.config.secondary_provider == ProviderType.ANTHROPIC:
-            self.providers.append(AnthropicProvider(self.config))
+        for provider_type in (self.config.primary_provider, self.config.secondary_provider):
+            if provider_type == ProviderType.OPENAI:
+                self.providers.append(OpenAIProvider(self.config, self.pool, self.gates[provider_type]))
+            elif provider_type == ProviderType.ANTHROPIC:
+                self.providers.append(AnthropicProvider(self.config, self.pool, self.gates[provider_type]))
         
         # Always add manual fallback last
         from src.services.enhanced_manual_provider import EnhancedManualProvider
@@ -572,60 +608,123 @@ class AIProviderService:
         self.providers = unique_providers
         
         logger.info(f"Initialized AI provider service with {len(self.providers)} providers: {[p.provider_type.value for p in self.providers]}")
-    
-    async def analyze_response(self, response: str, context: DialogueContext) -> Tuple[ResponseAnalysis, ProviderType]:
-        """Analyze player response with fallback chain"""
-        last_error = None
-        
-        for provider in self.providers:
-            if not provider.is_available():
-                logger.debug(f"Provider {provider.provider_type.value} not available, skipping")
+
+    def _is_circuit_open(self, provider: AIProvider) -> bool:
+        gate = self.gates.get(provider.provider_type)
+        return gate is not None and gate.is_open
+
+    async def _hedged(
+        self,
+        operation: str,
+        first: AIProvider,
+        second: AIProvider,
+        call: Callable[[AIProvider], Awaitable[T]]
+    ) -> Tuple[T, ProviderType]:
+        """Run ``first``; unless it succeeds within hedge_after, race ``second`` against it."""
+        first_task = asyncio.ensure_future(call(first))
+        tasks = {first_task: first}
+        done, _ = await asyncio.wait(tasks, timeout=self.config.hedge_after)
+        if not done or first_task.exception() is not None:
+            logger.debug(f"{operation}: {first.provider_type.value} slow or failed, hedging with {second.provider_type.value}")
+            tasks[asyncio.ensure_future(call(second))] = second
+
+        last_error: Optional[BaseException] = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), tasks[task].provider_type
+                    last_error = task.exception()
+                    logger.warning(f"{operation} failed with {tasks[task].provider_type.value}: {last_error}")
+        finally:
+            for task in pending:
+                task.cancel()
+        raise last_error
+
+    async def _run_chain(
+        self,
+        operation: str,
+        call: Callable[[AIProvider], Awaitable[T]],
+        include_manual: bool = True
+    ) -> Tuple[T, ProviderType]:
+        """
+        Try providers in priority order.
+
+        Providers whose circuit is open are skipped without a call or a delay.
+        With hedge_after set, the first two remote providers are raced once
+        the first is slower than the hedge delay.
+        """
+        candidates = [
+            p for p in self.providers
+            if p.is_available() and (include_manual or p.provider_type != ProviderType.MANUAL)
+        ]
+        last_error: Optional[BaseException] = None
+
+        i = 0
+        while i < len(candidates):
+            provider = candidates[i]
+            if self._is_circuit_open(provider):
+                logger.debug(f"Provider {provider.provider_type.value} circuit open, skipping")
+                i += 1
                 continue
-            
+
+            partner = candidates[i + 1] if i + 1 < len(candidates) else None
+            hedge = (
+                self.config.hedge_after is not None
+                and partner is not None
+                and partner.provider_type != ProviderType.MANUAL
+                and not self._is_circuit_open(partner)
+            )
+
             try:
-                logger.debug(f"Attempting analysis with {provider.provider_type.value}")
-                analysis = await provider.analyze_response(response, context)
-                logger.info(f"Analysis successful with {provider.provider_type.value}")
-                return analysis, provider.provider_type
-                
+                logger.debug(f"Attempting {operation} with {provider.provider_type.value}")
+                if hedge:
+                    result, used = await self._hedged(operation, provider, partner, call)
+                else:
+                    result, used = await call(provider), provider.provider_type
+                logger.info(f"{operation} successful with {used.value}")
+                return result, used
+
+            except ProviderUnavailableError as e:
+                last_error = e
             except Exception as e:
-                logger.warning(f"Analysis failed with {provider.provider_type.value}: {e}")
+                logger.warning(f"{operation} failed with {provider.provider_type.value}: {e}")
                 last_error = e
-                
-                # Add retry delay for non-manual providers
-                if provider.provider_type != ProviderType.MANUAL:
+
+                # Only pause before the next provider while this one is not known to be down
+                if provider.provider_type != ProviderType.MANUAL and not self._is_circuit_open(provider):
                     await asyncio.sleep(self.config.retry_delay)
-        
-        # If we get here, all providers failed
-        logger.error(f"All providers failed for analysis. Last error: {last_error}")
+
+            i += 2 if hedge else 1
+
         raise RuntimeError(f"All AI providers failed: {last_error}")
+
+    async def analyze_response(self, response: str, context: DialogueContext) -> Tuple[ResponseAnalysis, ProviderType]:
+        """Analyze player response with fallback chain"""
+        try:
+            return await self._run_chain(
+                "analysis", lambda provider: provider.analyze_response(response, context)
+            )
+        except RuntimeError as e:
+            logger.error(f"All providers failed for analysis. {e}")
+            raise
     
     async def generate_question(self, context: DialogueContext, analysis: ResponseAnalysis) -> Tuple[GuardResponse, ProviderType]:
         """Generate guard question with fallback chain"""
-        last_error = None
-        
-        for provider in self.providers:
-            if not provider.is_available():
-                logger.debug(f"Provider {provider.provider_type.value} not available, skipping")
-                continue
-            
-            try:
-                logger.debug(f"Attempting question generation with {provider.provider_type.value}")
-                response = await provider.generate_question(context, analysis)
-                logger.info(f"Question generation successful with {provider.provider_type.value}")
-                return response, provider.provider_type
-                
-            except Exception as e:
-                logger.warning(f"Question generation failed with {provider.provider_type.value}: {e}")
-                last_error = e
-                
-                # Add retry delay for non-manual providers
-                if provider.provider_type != ProviderType.MANUAL:
-                    await asyncio.sleep(self.config.retry_delay)
-        
-        # If we get here, all providers failed
-        logger.error(f"All providers failed for question generation. Last error: {last_error}")
-        raise RuntimeError(f"All AI providers failed: {last_error}")
+        try:
+            return await self._run_chain(
+                "question generation", lambda provider: provider.generate_question(context, analysis)
+            )
+        except RuntimeError as e:
+            logger.error(f"All providers failed for question generation. {e}")
+            raise
+
+    async def _call_custom(self, provider: AIProvider, prompts: Dict[str, str], max_tokens: int) -> str:
+        if provider.provider_type == ProviderType.OPENAI:
+            return await self._call_openai_custom(prompts, max_tokens=max_tokens)
+        return await self._call_anthropic_custom(prompts, max_tokens=max_tokens)
     
     async def generate_initial_scene(
         self,
@@ -648,39 +747,20 @@ class AIProviderService:
             guard_base_suspicion, available_ships
         )
 
-        last_error = None
-
-        for provider in self.providers:
-            if not provider.is_available():
-                continue
-
-            # Skip manual provider for scene generation (no template exists)
-            if provider.provider_type == ProviderType.MANUAL:
-                continue
-
-            try:
-                logger.debug(f"Attempting scene generation with {provider.provider_type.value}")
-
-                # Call the AI directly with our custom prompts
-                if provider.provider_type == ProviderType.OPENAI:
-                    scene_text = await self._call_openai_custom(prompts, max_tokens=300)
-                elif provider.provider_type == ProviderType.ANTHROPIC:
-                    scene_text = await self._call_anthropic_custom(prompts, max_tokens=300)
-                else:
-                    continue
-
-                logger.info(f"Scene generation successful with {provider.provider_type.value}")
-                return scene_text.strip(), provider.provider_type
-
-            except Exception as e:
-                logger.warning(f"Scene generation failed with {provider.provider_type.value}: {e}")
-                last_error = e
-                if provider.provider_type != ProviderType.MANUAL:
-                    await asyncio.sleep(self.config.retry_delay)
-
-        # All AI providers failed, return None to trigger manual fallback
-        logger.error(f"All AI providers failed for scene generation: {last_error}")
-        return None, ProviderType.MANUAL
+        # The scene depends only on the guard and the ship list, so players
+        # meeting the same guard share a small pool of generated variants
+        key = self._scene_cache_key(
+            guard_name, guard_title, guard_trait, guard_description,
+            guard_base_suspicion, available_ships
+        )
+        try:
+            return await self.cache.get_or_generate(
+                key, lambda: self._generate_scene(prompts), variants=self.config.scene_variants
+            )
+        except RuntimeError as e:
+            # All AI providers failed, return None to trigger manual fallback
+            logger.error(f"All AI providers failed for scene generation: {e}")
+            return None, ProviderType.MANUAL
 
     async def generate_outcome_text(
         self,
@@ -707,80 +787,117 @@ class AIProviderService:
             conversation_history
         )
 
-        last_error = None
-
-        for provider in self.providers:
-            if not provider.is_available():
-                continue
-
+        async def generate() -> Tuple[str, ProviderType]:
             # Skip manual provider (no template)
-            if provider.provider_type == ProviderType.MANUAL:
-                continue
-
-            try:
-                logger.debug(f"Attempting outcome generation with {provider.provider_type.value}")
-
-                if provider.provider_type == ProviderType.OPENAI:
-                    outcome_text = await self._call_openai_custom(prompts, max_tokens=200)
-                elif provider.provider_type == ProviderType.ANTHROPIC:
-                    outcome_text = await self._call_anthropic_custom(prompts, max_tokens=200)
-                else:
-                    continue
+            outcome_text, provider_type = await self._run_chain(
+                "outcome generation",
+                lambda provider: self._call_custom(provider, prompts, max_tokens=200),
+                include_manual=False
+            )
+            return outcome_text.strip(), provider_type
+
+        # The verdict quotes the player's own story, so the conversation is part
+        # of the key: this coalesces retries and duplicate submissions only
+        key = make_cache_key(
+            "outcome",
+            guard=[guard_name, guard_title, guard_trait],
+            outcome=outcome_type,
+            ships=[claimed_ship, awarded_ship],
+            score=round(final_score, 2),
+            skill=negotiation_skill,
+            history=[[exchange.get("npc"), exchange.get("player")] for exchange in conversation_history],
+        )
+        try:
+            return await self.cache.get_or_generate(key, generate)
+        except RuntimeError as e:
+            logger.error(f"All AI providers failed for outcome generation: {e}")
+            return None, ProviderType.MANUAL
+
+    async def _generate_scene(self, prompts: Dict[str, str]) -> Tuple[str, ProviderType]:
+        # Skip manual provider for scene generation (no template exists)
+        scene_text, provider_type = await self._run_chain(
+            "scene generation",
+            lambda provider: self._call_custom(provider, prompts, max_tokens=300),
+            include_manual=False
+        )
+        return scene_text.strip(), provider_type
 
-                logger.info(f"Outcome generation successful with {provider.provider_type.value}")
-                return outcome_text.strip(), provider.provider_type
+    @staticmethod
+    def _scene_cache_key(
+        guard_name: str,
+        guard_title: str,
+        guard_trait: str,
+        guard_description: str,
+        guard_base_suspicion: float,
+        available_ships: List[str]
+    ) -> str:
+        return make_cache_key(
+            "scene",
+            guard=[guard_name, guard_title, guard_trait, guard_description],
+            suspicion=int(guard_base_suspicion * 100),
+            ships=sorted(available_ships),
+        )
 
-            except Exception as e:
-                logger.warning(f"Outcome generation failed with {provider.provider_type.value}: {e}")
-                last_error = e
-                if provider.provider_type != ProviderType.MANUAL:
-                    await asyncio.sleep(self.config.retry_delay)
+    async def prewarm_initial_scene(
+        self,
+        guard_name: str,
+        guard_title: str,
+        guard_trait: str,
+        guard_description: str,
+        guard_base_suspicion: float,
+        available_ships: List[str]
+    ) -> int:
+        """Pre-generate the scene variant pool for a guard/ship list (e.g. before a launch)"""
+        from src.services.ai_prompts import FirstLoginAIPrompts
 
-        # All AI providers failed
-        logger.error(f"All AI providers failed for outcome generation: {last_error}")
-        return None, ProviderType.MANUAL
+        prompts = FirstLoginAIPrompts.build_initial_scene_prompt(
+            guard_name, guard_title, guard_trait, guard_description,
+            guard_base_suspicion, available_ships
+        )
+        key = self._scene_cache_key(
+            guard_name, guard_title, guard_trait, guard_description,
+            guard_base_suspicion, available_ships
+        )
+        return await self.cache.prewarm(key, lambda: self._generate_scene(prompts), self.config.scene_variants)
 
     async def _call_openai_custom(self, prompts: Dict[str, str], max_tokens: int = 300) -> str:
         """Helper to call OpenAI with custom prompts"""
         if not OPENAI_AVAILABLE:
             raise ValueError("OpenAI not available")
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OpenAI API key not configured")
-
-        client = openai.OpenAI(api_key=api_key)
-        completion = client.chat.completions.create(
-            model=self.config.openai_model,
-            messages=[
-                {"role": "system", "content": prompts["system"]},
-                {"role": "user", "content": prompts["user"]}
-            ],
-            temperature=self.config.openai_temperature,
-            max_tokens=max_tokens
+        messages = [
+            {"role": "system", "content": prompts["system"]},
+            {"role": "user", "content": prompts["user"]}
+        ]
+        return await self.gates[ProviderType.OPENAI].call(
+            lambda: self.pool.openai_chat(
+                self.config.openai_model, messages, self.config.openai_temperature, max_tokens
+            )
         )
-        return completion.choices[0].message.content
 
     async def _call_anthropic_custom(self, prompts: Dict[str, str], max_tokens: int = 300) -> str:
         """Helper to call Anthropic with custom prompts"""
         if not ANTHROPIC_AVAILABLE:
             raise ValueError("Anthropic not available")
 
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError("Anthropic API key not configured")
-
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model=self.config.anthropic_model,
-            max_tokens=max_tokens,
-            temperature=self.config.anthropic_temperature,
-            system=prompts["system"],
-            messages=[
-                {"role": "user", "content": prompts["user"]}
-            ]
+        messages = [{"role": "user", "content": prompts["user"]}]
+        return await self.gates[ProviderType.ANTHROPIC].call(
+            lambda: self.pool.anthropic_message(
+                self.config.anthropic_model, messages, self.config.anthropic_temperature,
+                max_tokens, system=prompts["system"]
+            )
         )
-        return message.content[0].text
+
+    def get_provider_stats(self) -> Dict[str, Any]:
+        """Circuit state, in-flight count, error counts and latency histograms per provider"""
+        return {provider_type.value: gate.stats() for provider_type, gate in self.gates.items()}
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections"""
+        await self.pool.aclose()
 
     def get_available_providers(self) -> List[ProviderType]:
         """Get list of currently available providers"""
@@ -805,7 +922,13 @@ def get_ai_provider_service() -> AIProviderService:
             secondary_provider=ProviderType(os.getenv("AI_PROVIDER_SECONDARY", "anthropic")),
             fallback_provider=ProviderType(os.getenv("AI_PROVIDER_FALLBACK", "manual")),
             openai_model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
-            anthropic_model=os.getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
+            anthropic_model=os.getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20240229"),
+            openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
+            anthropic_base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+            max_concurrency=int(os.getenv("AI_PROVIDER_MAX_CONCURRENCY", "8")),
+            request_timeout=float(os.getenv("AI_PROVIDER_TIMEOUT", "20")),
+            hedge_after=float(os.getenv("AI_PROVIDER_HEDGE_AFTER")) if os.getenv("AI_PROVIDER_HEDGE_AFTER") else None,
+            scene_variants=int(os.getenv("AI_SCENE_VARIANTS", "3"))
         )
         _ai_provider_service = AIProviderService(config)
     
@@ -13,12 +13,21 @@ import html
 import logging
 import hashlib
 import time
+import sys
 from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import json
 from datetime import datetime, timedelta
 
+from src.services.security_profile_store import (
+    PlayerSecurityProfile,
+    RATE_WINDOWS,
+    SecurityProfileStore,
+    create_security_profile_store,
+)
+from src.utils.threat_scanner import ThreatScanner
+
 logger = logging.getLogger(__name__)
 
 class SecurityThreatLevel(Enum):
@@ -56,24 +65,10 @@ class SecurityViolation:
         if self.timestamp is None:
             self.timestamp = datetime.utcnow()
 
-@dataclass
-class PlayerSecurityProfile:
-    """Tracks security metrics per player"""
-    player_id: str
-    violation_count: int = 0
-    last_violation: Optional[datetime] = None
-    request_count_1min: int = 0
-    request_count_1hour: int = 0
-    request_count_1day: int = 0
-    last_request_time: Optional[datetime] = None
-    is_blocked: bool = False
-    block_expires: Optional[datetime] = None
-    trust_score: float = 1.0  # 0.0 (untrusted) to 1.0 (trusted)
-
 class AISecurityService:
     """Comprehensive security service for AI dialogue interactions"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[SecurityProfileStore] = None):
         # Rate limiting configuration
         self.rate_limits = {
             "requests_per_minute": 10,
@@ -84,15 +79,12 @@ class AISecurityService:
             "max_cost_per_day_usd": 1.0  # $1 per player per day max
         }
         
-        # Player security profiles
-        self.player_profiles: Dict[str, PlayerSecurityProfile] = {}
+        # Player profiles, request windows and daily costs (Redis when available)
+        self.store = store if store is not None else create_security_profile_store()
         
         # Blocked content patterns
         self.setup_security_patterns()
         
-        # Cost tracking
-        self.cost_tracking: Dict[str, float] = {}  # player_id -> daily_cost_usd
-        
     def setup_security_patterns(self):
         """Initialize security detection patterns"""
         
@@ -200,6 +192,69 @@ class AISecurityService:
             r"(.{10,})\1{5,}",  # Repeated phrases
         ]
 
+        # AI-specific prompt injection patterns
+        self.ai_injection_patterns = [
+            r'ignore\s+previous\s+instructions',
+            r'forget\s+everything',
+            r'new\s+instructions?:',
+            r'system\s*[:\-]',
+            r'prompt\s*[:\-]',
+            r'override\s+your',
+            r'you\s+are\s+now',
+            r'pretend\s+to\s+be',
+            r'roleplay\s+as',
+            r'act\s+as\s+(if\s+)?you\s+are',
+            r'jailbreak',
+            r'dan\s+mode',
+            r'developer\s+mode',
+            r'admin\s+mode',
+            r'sudo\s+mode',
+            r'god\s+mode',
+            r'\\n\\nhuman:',
+            r'\\n\\nassistant:',
+            r'<\|im_start\|>',
+            r'<\|im_end\|>',
+            r'```python',
+            r'exec\s*\(',
+            r'eval\s*\(',
+            r'import\s+os',
+            r'import\s+subprocess',
+            r'__import__',
+        ]
+
+        # Jailbreak indicators (several together suggest an attempt)
+        self.jailbreak_indicators = ["ignore", "system", "assistant", "pretend", "roleplay", "forget"]
+        self.jailbreak_phrases = [
+            "hypothetically",
+            "theoretically", 
+            "in a fictional scenario",
+            "creative writing exercise",
+            "for educational purposes",
+            "academic research",
+            "thought experiment",
+            "what if scenario",
+            "imagine if",
+            "suppose that",
+        ]
+
+        # Every category above is evaluated by one precompiled scanner
+        self.scanner = ThreatScanner(
+            regex_rules={
+                "xss": (self.xss_patterns, re.IGNORECASE | re.DOTALL),
+                "sql_injection": (self.sql_injection_patterns, re.IGNORECASE),
+                "prompt_injection": (self.prompt_injection_patterns, re.IGNORECASE),
+                "system_command": (self.system_command_patterns, re.IGNORECASE),
+                "code_injection": (self.code_injection_patterns, re.IGNORECASE),
+                "ai_injection": (self.ai_injection_patterns, re.IGNORECASE),
+                "cost_abuse": (self.cost_abuse_patterns, 0),
+            },
+            literal_rules={
+                "inappropriate": self.inappropriate_keywords,
+                "jailbreak_indicators": self.jailbreak_indicators,
+                "jailbreak_phrases": self.jailbreak_phrases,
+            },
+        )
+
     def validate_input(
         self,
         text: str,
@@ -223,9 +278,6 @@ class AISecurityService:
         """
         violations = []
         
-        # Update player profile
-        profile = self.get_or_create_player_profile(player_id)
-        
         # Check if player is blocked
         if self.is_player_blocked(player_id):
             violations.append(SecurityViolation(
@@ -238,8 +290,8 @@ class AISecurityService:
             ))
             return False, violations
         
-        # Rate limiting checks
-        if not self.check_rate_limits(player_id):
+        # Rate limiting: atomically count this request if every window allows it
+        if not self.store.consume_request(player_id, self.rate_limits, datetime.utcnow()):
             violations.append(SecurityViolation(
                 SecurityViolationType.RATE_LIMIT_EXCEEDED,
                 SecurityThreatLevel.DANGEROUS,
@@ -302,9 +354,6 @@ class AISecurityService:
             for violation in dangerous_violations:
                 self.apply_security_penalty(player_id, violation.violation_type)
         
-        # Update request tracking
-        self.update_request_tracking(player_id)
-        
         return is_safe, violations
 
     def sanitize_input(self, text: str) -> str:
@@ -358,10 +407,9 @@ class AISecurityService:
     def detect_xss(self, text: str, player_id: str, session_id: str) -> List[SecurityViolation]:
         """Detect XSS attack attempts"""
         violations = []
-        text_lower = text.lower()
         
-        for pattern in self.xss_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE | re.DOTALL)
+        for pattern in self.scanner.scan(text).get("xss", ()):
+            matches = self.scanner.findall("xss", pattern, text.lower())
             if matches:
                 violations.append(SecurityViolation(
                     SecurityViolationType.XSS_ATTEMPT,
@@ -378,8 +426,8 @@ class AISecurityService:
         """Detect SQL injection attempts"""
         violations = []
         
-        for pattern in self.sql_injection_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self.scanner.scan(text).get("sql_injection", ()):
+            matches = self.scanner.findall("sql_injection", pattern, text)
             if matches:
                 violations.append(SecurityViolation(
                     SecurityViolationType.SQL_INJECTION,
@@ -395,22 +443,20 @@ class AISecurityService:
     def detect_ai_attacks(self, text: str, player_id: str, session_id: str) -> List[SecurityViolation]:
         """Detect AI-specific attacks (prompt injection, jailbreaking)"""
         violations = []
-        text_lower = text.lower()
+        hits = self.scanner.scan(text)
         
-        for pattern in self.prompt_injection_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                violations.append(SecurityViolation(
-                    SecurityViolationType.PROMPT_INJECTION,
-                    SecurityThreatLevel.DANGEROUS,
-                    "Potential prompt injection attack detected",
-                    [f"Pattern: {pattern}"],
-                    player_id,
-                    session_id
-                ))
+        for pattern in hits.get("prompt_injection", ()):
+            violations.append(SecurityViolation(
+                SecurityViolationType.PROMPT_INJECTION,
+                SecurityThreatLevel.DANGEROUS,
+                "Potential prompt injection attack detected",
+                [f"Pattern: {pattern}"],
+                player_id,
+                session_id
+            ))
         
         # Check for jailbreak attempts (multiple indicators)
-        jailbreak_indicators = ["ignore", "system", "assistant", "pretend", "roleplay", "forget"]
-        indicator_count = sum(1 for indicator in jailbreak_indicators if indicator in text_lower)
+        indicator_count = len(hits.get("jailbreak_indicators", ()))
         
         if indicator_count >= 3:
             violations.append(SecurityViolation(
@@ -428,16 +474,15 @@ class AISecurityService:
         """Detect system command injection attempts"""
         violations = []
         
-        for pattern in self.system_command_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                violations.append(SecurityViolation(
-                    SecurityViolationType.SYSTEM_COMMAND,
-                    SecurityThreatLevel.DANGEROUS,
-                    "Potential system command injection detected",
-                    [f"Pattern: {pattern}"],
-                    player_id,
-                    session_id
-                ))
+        for pattern in self.scanner.scan(text).get("system_command", ()):
+            violations.append(SecurityViolation(
+                SecurityViolationType.SYSTEM_COMMAND,
+                SecurityThreatLevel.DANGEROUS,
+                "Potential system command injection detected",
+                [f"Pattern: {pattern}"],
+                player_id,
+                session_id
+            ))
         
         return violations
 
@@ -445,26 +490,23 @@ class AISecurityService:
         """Detect code injection attempts"""
         violations = []
         
-        for pattern in self.code_injection_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                violations.append(SecurityViolation(
-                    SecurityViolationType.CODE_INJECTION,
-                    SecurityThreatLevel.DANGEROUS,
-                    "Potential code injection detected",
-                    [f"Pattern: {pattern}"],
-                    player_id,
-                    session_id
-                ))
+        for pattern in self.scanner.scan(text).get("code_injection", ()):
+            violations.append(SecurityViolation(
+                SecurityViolationType.CODE_INJECTION,
+                SecurityThreatLevel.DANGEROUS,
+                "Potential code injection detected",
+                [f"Pattern: {pattern}"],
+                player_id,
+                session_id
+            ))
         
         return violations
 
     def check_content_appropriateness(self, text: str, player_id: str, session_id: str) -> List[SecurityViolation]:
         """Check for inappropriate content"""
         violations = []
-        text_lower = text.lower()
         
-        found_keywords = [keyword for keyword in self.inappropriate_keywords 
-                         if keyword in text_lower]
+        found_keywords = list(self.scanner.scan(text).get("inappropriate", ()))
         
         if found_keywords:
             violations.append(SecurityViolation(
@@ -482,81 +524,37 @@ class AISecurityService:
         """Detect attempts to abuse API costs"""
         violations = []
         
-        for pattern in self.cost_abuse_patterns:
-            if re.search(pattern, text):
-                violations.append(SecurityViolation(
-                    SecurityViolationType.COST_ABUSE,
-                    SecurityThreatLevel.DANGEROUS,
-                    "Potential cost abuse pattern detected",
-                    [f"Pattern: {pattern}"],
-                    player_id,
-                    session_id
-                ))
+        for pattern in self.scanner.scan(text).get("cost_abuse", ()):
+            violations.append(SecurityViolation(
+                SecurityViolationType.COST_ABUSE,
+                SecurityThreatLevel.DANGEROUS,
+                "Potential cost abuse pattern detected",
+                [f"Pattern: {pattern}"],
+                player_id,
+                session_id
+            ))
         
         return violations
 
     def detect_ai_specific_attacks(self, text: str, player_id: str, session_id: str) -> List[SecurityViolation]:
         """Detect AI-specific attack patterns"""
         violations = []
-        text_lower = text.lower()
-        
-        # Prompt injection patterns
-        injection_patterns = [
-            r'ignore\s+previous\s+instructions',
-            r'forget\s+everything',
-            r'new\s+instructions?:',
-            r'system\s*[:\-]',
-            r'prompt\s*[:\-]',
-            r'override\s+your',
-            r'you\s+are\s+now',
-            r'pretend\s+to\s+be',
-            r'roleplay\s+as',
-            r'act\s+as\s+(if\s+)?you\s+are',
-            r'jailbreak',
-            r'dan\s+mode',
-            r'developer\s+mode',
-            r'admin\s+mode',
-            r'sudo\s+mode',
-            r'god\s+mode',
-            r'\\n\\nhuman:',
-            r'\\n\\nassistant:',
-            r'<\|im_start\|>',
-            r'<\|im_end\|>',
-            r'```python',
-            r'exec\s*\(',
-            r'eval\s*\(',
-            r'import\s+os',
-            r'import\s+subprocess',
-            r'__import__',
-        ]
+        hits = self.scanner.scan(text)
         
-        for pattern in injection_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                violations.append(SecurityViolation(
-                    SecurityViolationType.PROMPT_INJECTION,
-                    SecurityThreatLevel.DANGEROUS,
-                    "Potential prompt injection detected",
-                    [f"Pattern: {pattern}"],
-                    player_id,
-                    session_id
-                ))
-                break
+        # Prompt injection patterns (first match is enough)
+        injection_hits = hits.get("ai_injection", ())
+        if injection_hits:
+            violations.append(SecurityViolation(
+                SecurityViolationType.PROMPT_INJECTION,
+                SecurityThreatLevel.DANGEROUS,
+                "Potential prompt injection detected",
+                [f"Pattern: {injection_hits[0]}"],
+                player_id,
+                session_id
+            ))
         
         # Jailbreak attempt detection
-        jailbreak_indicators = [
-            "hypothetically",
-            "theoretically", 
-            "in a fictional scenario",
-            "creative writing exercise",
-            "for educational purposes",
-            "academic research",
-            "thought experiment",
-            "what if scenario",
-            "imagine if",
-            "suppose that",
-        ]
-        
-        jailbreak_count = sum(1 for indicator in jailbreak_indicators if indicator in text_lower)
+        jailbreak_count = len(hits.get("jailbreak_phrases", ()))
         if jailbreak_count >= 2:
             violations.append(SecurityViolation(
                 SecurityViolationType.JAILBREAK_ATTEMPT,
@@ -599,69 +597,41 @@ class AISecurityService:
         return violations
 
     def check_rate_limits(self, player_id: str) -> bool:
-        """Check if player has exceeded rate limits"""
-        profile = self.get_or_create_player_profile(player_id)
-        now = datetime.utcnow()
-        
-        # Check per-minute limit
-        if profile.last_request_time:
-            if now - profile.last_request_time < timedelta(minutes=1):
-                if profile.request_count_1min >= self.rate_limits["requests_per_minute"]:
-                    return False
-            else:
-                profile.request_count_1min = 0
-        
-        # Check per-hour limit
-        if profile.last_request_time:
-            if now - profile.last_request_time < timedelta(hours=1):
-                if profile.request_count_1hour >= self.rate_limits["requests_per_hour"]:
-                    return False
-            else:
-                profile.request_count_1hour = 0
-        
-        # Check per-day limit
-        if profile.last_request_time:
-            if now - profile.last_request_time < timedelta(days=1):
-                if profile.request_count_1day >= self.rate_limits["requests_per_day"]:
-                    return False
-            else:
-                profile.request_count_1day = 0
-        
-        return True
+        """Check if player has exceeded rate limits (does not count a request)"""
+        counts = self.store.request_counts(player_id, datetime.utcnow())
+        return all(count < self.rate_limits[name] for count, (name, _) in zip(counts, RATE_WINDOWS))
 
     def check_cost_limits(self, player_id: str, estimated_cost_usd: float) -> bool:
         """Check if API call would exceed cost limits"""
-        today_key = datetime.utcnow().strftime("%Y-%m-%d")
-        player_daily_key = f"{player_id}:{today_key}"
-        
-        current_cost = self.cost_tracking.get(player_daily_key, 0.0)
+        current_cost = self.get_daily_cost_usage(player_id)
         if current_cost + estimated_cost_usd > self.rate_limits["max_cost_per_day_usd"]:
             return False
         
         return True
 
-    def track_cost(self, player_id: str, actual_cost_usd: float):
-        """Track API costs per player per day"""
+    def track_cost(self, player_id: str, actual_cost_usd: float) -> float:
+        """Track API costs per player per day; returns the new daily total"""
         today_key = datetime.utcnow().strftime("%Y-%m-%d")
-        player_daily_key = f"{player_id}:{today_key}"
-        
-        current_cost = self.cost_tracking.get(player_daily_key, 0.0)
-        self.cost_tracking[player_daily_key] = current_cost + actual_cost_usd
+        return self.store.add_cost(player_id, actual_cost_usd, today_key)
 
     def get_or_create_player_profile(self, player_id: str) -> PlayerSecurityProfile:
         """Get or create security profile for player"""
-        if player_id not in self.player_profiles:
-            self.player_profiles[player_id] = PlayerSecurityProfile(player_id=player_id)
-        return self.player_profiles[player_id]
+        return self.store.get_profile(player_id)
+
+    def save_player_profile(self, profile: PlayerSecurityProfile):
+        """Persist changes made directly to a profile (e.g. admin actions)"""
+        self.store.save_profile(profile)
 
     def is_player_blocked(self, player_id: str) -> bool:
         """Check if player is currently blocked"""
-        profile = self.get_or_create_player_profile(player_id)
-        
+        return self._is_blocked(self.get_or_create_player_profile(player_id), datetime.utcnow())
+
+    @staticmethod
+    def _is_blocked(profile: PlayerSecurityProfile, now: datetime) -> bool:
         if not profile.is_blocked:
             return False
         
-        if profile.block_expires and datetime.utcnow() > profile.block_expires:
+        if profile.block_expires and now > profile.block_expires:
             # Block expired, unblock player
             profile.is_blocked = False
             profile.block_expires = None
@@ -671,10 +641,6 @@ class AISecurityService:
 
     def apply_security_penalty(self, player_id: str, violation_type: SecurityViolationType):
         """Apply security penalties based on violation type"""
-        profile = self.get_or_create_player_profile(player_id)
-        profile.violation_count += 1
-        profile.last_violation = datetime.utcnow()
-        
         # Reduce trust score
         trust_reduction = {
             SecurityViolationType.XSS_ATTEMPT: 0.3,
@@ -687,34 +653,27 @@ class AISecurityService:
             SecurityViolationType.COST_ABUSE: 0.3,
         }.get(violation_type, 0.1)
         
-        profile.trust_score = max(0.0, profile.trust_score - trust_reduction)
+        now = datetime.utcnow()
+        profile = self.store.record_violation(player_id, trust_reduction, now)
         
         # Apply blocks for severe violations or repeat offenders
         if violation_type in [SecurityViolationType.XSS_ATTEMPT, SecurityViolationType.SQL_INJECTION,
                              SecurityViolationType.SYSTEM_COMMAND, SecurityViolationType.CODE_INJECTION]:
             # Immediate block for severe violations
-            profile.is_blocked = True
-            profile.block_expires = datetime.utcnow() + timedelta(hours=24)
+            self.store.set_block(player_id, now + timedelta(hours=24))
         
         elif profile.violation_count >= 5:
             # Block repeat offenders
-            profile.is_blocked = True
-            profile.block_expires = datetime.utcnow() + timedelta(hours=6)
+            self.store.set_block(player_id, now + timedelta(hours=6))
         
         elif profile.violation_count >= 3:
             # Temporary block for moderate repeat violations
-            profile.is_blocked = True
-            profile.block_expires = datetime.utcnow() + timedelta(hours=1)
+            self.store.set_block(player_id, now + timedelta(hours=1))
 
     def update_request_tracking(self, player_id: str):
-        """Update request tracking for rate limiting"""
-        profile = self.get_or_create_player_profile(player_id)
-        now = datetime.utcnow()
-        
-        profile.request_count_1min += 1
-        profile.request_count_1hour += 1
-        profile.request_count_1day += 1
-        profile.last_request_time = now
+        """Count a request for rate limiting without checking the limits"""
+        unlimited = {name: sys.maxsize for name, _ in RATE_WINDOWS}
+        self.store.consume_request(player_id, unlimited, datetime.utcnow())
 
     def log_security_violations(self, violations: List[SecurityViolation]):
         """Log security violations for monitoring"""
@@ -800,8 +759,7 @@ class AISecurityService:
     def get_daily_cost_usage(self, player_id: str) -> float:
         """Get current daily cost usage for player"""
         today_key = datetime.utcnow().strftime("%Y-%m-%d")
-        player_daily_key = f"{player_id}:{today_key}"
-        return self.cost_tracking.get(player_daily_key, 0.0)
+        return self.store.get_cost(player_id, today_key)
 
     def sanitize_output(self, ai_response: str) -> str:
         """Sanitize AI-generated responses for safe display"""
@@ -874,26 +832,21 @@ class AISecurityService:
         now = datetime.utcnow()
         
         # Collect player statistics
-        total_players = len(self.player_profiles)
-        blocked_players = sum(1 for p in self.player_profiles.values() if self.is_player_blocked(p.player_id))
-        high_risk_players = sum(1 for p in self.player_profiles.values() if p.trust_score < 0.3)
+        profiles = list(self.store.iter_profiles())
+        total_players = len(profiles)
+        blocked_players = sum(1 for p in profiles if self._is_blocked(p, now))
+        high_risk_players = sum(1 for p in profiles if p.trust_score < 0.3)
         
         # Collect violation statistics
         violation_counts = {}
         total_violations = 0
-        for profile in self.player_profiles.values():
+        for profile in profiles:
             total_violations += profile.violation_count
         
         # Calculate cost statistics
         today_key = now.strftime("%Y-%m-%d")
-        daily_costs = {}
-        total_daily_cost = 0.0
-        
-        for key, cost in self.cost_tracking.items():
-            if key.endswith(today_key):
-                player_id = key.split(':')[0]
-                daily_costs[player_id] = cost
-                total_daily_cost += cost
+        daily_costs = self.store.daily_costs(today_key)
+        total_daily_cost = sum(daily_costs.values())
         
         return {
             "timestamp": now.isoformat(),
@@ -930,11 +883,10 @@ class AISecurityService:
         
         # Check for cost abuse
         today_key = now.strftime("%Y-%m-%d")
-        high_cost_users = []
-        for key, cost in self.cost_tracking.items():
-            if key.endswith(today_key) and cost > self.rate_limits["max_cost_per_day_usd"] * 0.8:
-                player_id = key.split(':')[0]
-                high_cost_users.append((player_id, cost))
+        high_cost_users = [
+            (player_id, cost) for player_id, cost in self.store.daily_costs(today_key).items()
+            if cost > self.rate_limits["max_cost_per_day_usd"] * 0.8
+        ]
         
         if high_cost_users:
             alerts.append({
@@ -946,8 +898,9 @@ class AISecurityService:
             })
         
         # Check for high violation rate
+        profiles = list(self.store.iter_profiles())
         recent_violations = []
-        for profile in self.player_profiles.values():
+        for profile in profiles:
             if (profile.last_violation and 
                 now - profile.last_violation < timedelta(hours=1) and
                 profile.violation_count >= 3):
@@ -963,13 +916,14 @@ class AISecurityService:
             })
         
         # Check for blocked players
-        blocked_count = sum(1 for p in self.player_profiles.values() if self.is_player_blocked(p.player_id))
+        blocked = [p.player_id for p in profiles if self._is_blocked(p, now)]
+        blocked_count = len(blocked)
         if blocked_count > 0:
             alerts.append({
                 "type": "blocked_players",
                 "severity": "medium",
                 "message": f"{blocked_count} players currently blocked",
-                "details": [p.player_id for p in self.player_profiles.values() if self.is_player_blocked(p.player_id)][:10],
+                "details": blocked[:10],
                 "timestamp": now.isoformat()
             })
         
@@ -977,10 +931,10 @@ class AISecurityService:
 
     def get_player_risk_assessment(self, player_id: str) -> Dict:
         """Get detailed risk assessment for a specific player"""
-        if player_id not in self.player_profiles:
+        profile = self.store.find_profile(player_id)
+        if profile is None:
             return {"risk_level": "unknown", "reason": "No data available"}
         
-        profile = self.player_profiles[player_id]
         now = datetime.utcnow()
         
         # Calculate risk factors
@@ -1045,20 +999,9 @@ class AISecurityService:
     def cleanup_old_data(self, days_to_keep: int = 7):
         """Clean up old tracking data to prevent memory growth"""
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
-        cutoff_str = cutoff_date.strftime("%Y-%m-%d")
-        
-        # Clean up old cost tracking data
-        keys_to_remove = []
-        for key in self.cost_tracking.keys():
-            if ':' in key:
-                date_part = key.split(':')[1]
-                if date_part < cutoff_str:
-                    keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.cost_tracking[key]
+        removed = self.store.cleanup(cutoff_date.strftime("%Y-%m-%d"))
         
-        logger.info(f"Cleaned up {len(keys_to_remove)} old cost tracking entries")
+        logger.info(f"Cleaned up {removed} old cost tracking entries")
 
 # Global security service instance
 security_service = AISecurityService()
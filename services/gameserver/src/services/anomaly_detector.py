@@ -0,0 +1,354 @@
+"""
+Streaming anomaly detector
+
+Consumes market transactions and combat logs once they are committed and
+keeps sliding-window statistics in memory, emitting AnomalyFlag rows in
+constant (amortized) time per event:
+
+- wash trading: trades by one player at one station in one commodity
+  within the window
+- price deviation: z-score of a trade's unit price against an EWMA of
+  prices for that station, commodity and direction (buy or sell)
+- repeat combat: combats between the same attacker/defender pair within
+  the window
+- win-rate outlier: a player's win rate over their recent finished
+  attacks against the global attacker win rate
+
+Events are captured at flush time and only reach the detector after the
+transaction commits, so rolled-back trades never move the statistics or use
+up a one-shot threshold. The resulting flags are queued and written by
+persist_pending_flags on its own session. State is per process;
+with several workers each sees only its own share of events, which the
+thresholds tolerate because abusive patterns repeat quickly.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from src.models.anomaly_flag import AnomalyFlag, AnomalyFlagType
+from src.models.combat_log import CombatLog, CombatOutcome
+from src.models.market_transaction import MarketTransaction
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 3600
+WASH_TRADE_THRESHOLD = 10           # Flag above this many same-player/station/commodity trades per window
+REPEAT_COMBAT_THRESHOLD = 5         # Flag above this many combats per pair per window...
+REPEAT_COMBAT_HIGH_THRESHOLD = 10   # ...and again, as high severity, above this many
+PRICE_EWMA_ALPHA = 0.05
+PRICE_MIN_SAMPLES = 30
+PRICE_Z_THRESHOLD = 4.0
+WIN_RATE_RECENT_COMBATS = 50
+WIN_RATE_MIN_COMBATS = 20
+WIN_RATE_Z_THRESHOLD = 3.0
+WIN_RATE_PRIOR = 0.5                # Global attacker win rate before any finished combat is seen
+PRUNE_EVERY_EVENTS = 10_000
+MAX_PENDING_FLAGS = 10_000
+ANOMALY_FLAG_FLUSH_SECONDS = int(os.getenv("ANOMALY_FLAG_FLUSH_SECONDS", "5"))
+
+ANOMALY_DETECTION_ENABLED = os.getenv("ANOMALY_DETECTION_ENABLED", "true").lower() == "true"
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over the trailing window (deque of timestamps per key)"""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self.events: Dict[Hashable, Deque[float]] = {}
+
+    def add(self, key: Hashable, now: float) -> int:
+        timestamps = self.events.setdefault(key, deque())
+        timestamps.append(now)
+        self._evict(timestamps, now)
+        return len(timestamps)
+
+    def _evict(self, timestamps: Deque[float], now: float) -> None:
+        cutoff = now - self.window_seconds
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+    def prune(self, now: float) -> None:
+        """Drop keys with no events left in the window"""
+        for key in list(self.events):
+            self._evict(self.events[key], now)
+            if not self.events[key]:
+                del self.events[key]
+
+
+@dataclass
+class EwmaStats:
+    """Exponentially weighted mean and variance of one price series"""
+    mean: float = 0.0
+    var: float = 0.0
+    samples: int = 0
+
+    def update(self, value: float, alpha: float = PRICE_EWMA_ALPHA) -> Optional[float]:
+        """Fold in a value; returns its z-score against the prior statistics"""
+        z = None
+        if self.samples >= PRICE_MIN_SAMPLES and self.var > 0:
+            z = (value - self.mean) / math.sqrt(self.var)
+        if self.samples == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            incr = alpha * diff
+            self.mean += incr
+            self.var = (1 - alpha) * (self.var + diff * incr)
+        self.samples += 1
+        return z
+
+
+@dataclass
+class RecentResults:
+    """A player's last finished attacks (True for a win) with a running win count"""
+    results: Deque[bool] = field(default_factory=lambda: deque(maxlen=WIN_RATE_RECENT_COMBATS))
+    wins: int = 0
+    flagged: bool = False
+
+    def add(self, won: bool) -> None:
+        if len(self.results) == self.results.maxlen:
+            self.wins -= self.results[0]
+        self.results.append(won)
+        self.wins += won
+
+    @property
+    def rate(self) -> float:
+        return self.wins / len(self.results) if self.results else 0.0
+
+
+@dataclass
+class Flag:
+    flag_type: str
+    severity: str
+    player_id: Any
+    counterparty_id: Any = None
+    commodity: Optional[str] = None
+    metric: float = 0.0
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_model(self) -> AnomalyFlag:
+        return AnomalyFlag(
+            flag_type=self.flag_type,
+            severity=self.severity,
+            player_id=self.player_id,
+            counterparty_id=self.counterparty_id,
+            commodity=self.commodity,
+            metric=self.metric,
+            details=self.details,
+        )
+
+
+class AnomalyDetector:
+    """Sliding-window trade and combat statistics producing flags as events arrive"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.trades = SlidingWindowCounter(WINDOW_SECONDS)
+        self.combats = SlidingWindowCounter(WINDOW_SECONDS)
+        self.prices: Dict[Tuple[Any, str, Any], EwmaStats] = {}
+        self.win_rates: Dict[Any, RecentResults] = {}
+        self.finished_combats = 0
+        self.attacker_wins = 0
+        self.pending_flags: Deque[Flag] = deque(maxlen=MAX_PENDING_FLAGS)
+        self._events = 0
+        self._lock = threading.Lock()
+
+    def _tick(self, now: float) -> None:
+        self._events += 1
+        if self._events % PRUNE_EVERY_EVENTS == 0:
+            self.trades.prune(now)
+            self.combats.prune(now)
+
+    @property
+    def global_win_rate(self) -> float:
+        if not self.finished_combats:
+            return WIN_RATE_PRIOR
+        return self.attacker_wins / self.finished_combats
+
+    def observe_trade(self, player_id, station_id, commodity: str, unit_price: float,
+                      transaction_type: Any = None) -> List[Flag]:
+        flags: List[Flag] = []
+        with self._lock:
+            now = self.clock()
+            self._tick(now)
+
+            count = self.trades.add((player_id, station_id, commodity), now)
+            if count == WASH_TRADE_THRESHOLD + 1:
+                flags.append(Flag(
+                    AnomalyFlagType.WASH_TRADING.value, "high", player_id, station_id, commodity, count,
+                    {"trade_count": count, "window_seconds": WINDOW_SECONDS},
+                ))
+
+            if unit_price is not None:
+                # Buy and sell prices sit on either side of the spread; mixing them inflates the variance
+                stats = self.prices.setdefault((station_id, commodity, transaction_type), EwmaStats())
+                z = stats.update(float(unit_price))
+                if z is not None and abs(z) > PRICE_Z_THRESHOLD:
+                    flags.append(Flag(
+                        AnomalyFlagType.PRICE_DEVIATION.value,
+                        "high" if abs(z) > 2 * PRICE_Z_THRESHOLD else "medium",
+                        player_id, station_id, commodity, round(z, 2),
+                        {"unit_price": unit_price, "expected_price": round(stats.mean, 2),
+                         "transaction_type": getattr(transaction_type, "value", transaction_type)},
+                    ))
+        return flags
+
+    def observe_combat(self, attacker_id, defender_id) -> List[Flag]:
+        """A combat started between two players"""
+        flags: List[Flag] = []
+        if attacker_id is None or defender_id is None:
+            return flags
+        with self._lock:
+            now = self.clock()
+            self._tick(now)
+            count = self.combats.add((attacker_id, defender_id), now)
+            if count in (REPEAT_COMBAT_THRESHOLD + 1, REPEAT_COMBAT_HIGH_THRESHOLD + 1):
+                flags.append(Flag(
+                    AnomalyFlagType.REPEAT_COMBAT.value,
+                    "high" if count > REPEAT_COMBAT_HIGH_THRESHOLD else "medium",
+                    attacker_id, defender_id, None, count,
+                    {"combat_count": count, "window_seconds": WINDOW_SECONDS},
+                ))
+        return flags
+
+    def observe_combat_result(self, attacker_id, attacker_won: bool) -> List[Flag]:
+        """An attack finished; flags the attacker once when their win rate becomes an outlier"""
+        flags: List[Flag] = []
+        if attacker_id is None:
+            return flags
+        with self._lock:
+            baseline = self.global_win_rate
+            self.finished_combats += 1
+            self.attacker_wins += attacker_won
+
+            recent = self.win_rates.setdefault(attacker_id, RecentResults())
+            recent.add(attacker_won)
+            n = len(recent.results)
+            if n < WIN_RATE_MIN_COMBATS or not 0 < baseline < 1:
+                return flags
+
+            z = (recent.rate - baseline) / math.sqrt(baseline * (1 - baseline) / n)
+            outlier = z > WIN_RATE_Z_THRESHOLD
+            if outlier and not recent.flagged:
+                flags.append(Flag(
+                    AnomalyFlagType.WIN_RATE_OUTLIER.value, "medium", attacker_id, None, None, round(recent.rate, 3),
+                    {"win_rate": round(recent.rate, 3), "global_win_rate": round(baseline, 3),
+                     "combats": n, "z_score": round(z, 2)},
+                ))
+            recent.flagged = outlier
+        return flags
+
+
+def _attacker_won(outcome) -> bool:
+    return outcome == CombatOutcome.ATTACKER_WIN or outcome == CombatOutcome.ATTACKER_WIN.value
+
+
+def _is_finished(outcome) -> bool:
+    return outcome is not None and outcome not in (CombatOutcome.ONGOING, CombatOutcome.ONGOING.value)
+
+
+def collect_events(new: List[Any], dirty: List[Any]) -> List[Tuple]:
+    """Snapshot the trade and combat events of one flush, to be fed after commit"""
+    events: List[Tuple] = []
+    for obj in new:
+        if isinstance(obj, MarketTransaction):
+            events.append(("trade", obj.player_id, obj.station_id, obj.commodity, obj.unit_price, obj.transaction_type))
+        elif isinstance(obj, CombatLog):
+            events.append(("combat", obj.attacker_id, obj.defender_id))
+            if _is_finished(obj.outcome):
+                events.append(("result", obj.attacker_id, _attacker_won(obj.outcome)))
+    for obj in dirty:
+        if isinstance(obj, CombatLog):
+            history = inspect(obj).attrs.outcome.history
+            if history.has_changes() and _is_finished(obj.outcome) and not any(
+                _is_finished(previous) for previous in history.deleted
+            ):
+                events.append(("result", obj.attacker_id, _attacker_won(obj.outcome)))
+    return events
+
+
+def feed_events(detector: AnomalyDetector, events: List[Tuple]) -> List[Flag]:
+    """Feed committed events to the detector"""
+    flags: List[Flag] = []
+    for kind, *args in events:
+        if kind == "trade":
+            player_id, station_id, commodity, unit_price, transaction_type = args
+            flags += detector.observe_trade(player_id, station_id, commodity, unit_price, transaction_type)
+        elif kind == "combat":
+            flags += detector.observe_combat(*args)
+        else:
+            flags += detector.observe_combat_result(*args)
+    return flags
+
+
+def collect_flags(detector: AnomalyDetector, new: List[Any], dirty: List[Any]) -> List[Flag]:
+    """Feed the new and changed rows of one flush to the detector"""
+    return feed_events(detector, collect_events(new, dirty))
+
+
+anomaly_detector = AnomalyDetector()
+_PENDING_KEY = "anomaly_detector_events"
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    try:
+        events = collect_events(list(session.new), list(session.dirty))
+    except Exception as e:
+        logger.warning(f"Anomaly detection failed: {e}")
+        return
+    if events:
+        session.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+def _after_commit(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if not events:
+        return
+    try:
+        anomaly_detector.pending_flags.extend(feed_events(anomaly_detector, events))
+    except Exception as e:
+        logger.warning(f"Anomaly detection failed: {e}")
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def persist_pending_flags(detector: AnomalyDetector = anomaly_detector, session_factory=None) -> int:
+    """Write the queued flags in one transaction; returns how many were written"""
+    flags = []
+    while detector.pending_flags:
+        flags.append(detector.pending_flags.popleft())
+    if not flags:
+        return 0
+    if session_factory is None:
+        from src.core.database import SessionLocal
+        session_factory = SessionLocal
+    db = session_factory()
+    try:
+        db.add_all(flag.to_model() for flag in flags)
+        db.commit()
+    except Exception:
+        db.rollback()
+        detector.pending_flags.extendleft(reversed(flags))
+        raise
+    finally:
+        db.close()
+    return len(flags)
+
+
+def install_anomaly_detector() -> None:
+    """Start feeding every ORM session's committed trade and combat writes to the detector"""
+    if ANOMALY_DETECTION_ENABLED and not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -2,7 +2,9 @@
 Bounty Service
 
 Player-placed and system-generated bounties.
-Uses Player.settings["bounties"] JSONB — no new database table required.
+Individual bounties live in Player.settings["bounties"] JSONB; the per-target
+total and count are mirrored in the bounty_board table so the board is served
+from an index instead of scanning every player.
 """
 
 import logging
@@ -10,9 +12,12 @@ import uuid
 from datetime import datetime, UTC
 from typing import Dict, Any, List, Optional
 
+from sqlalchemy import case, func, select, union
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
+from src.models.bounty import BountyBoardEntry
 from src.models.player import Player
 
 logger = logging.getLogger(__name__)
@@ -27,6 +32,25 @@ SYSTEM_BOUNTY_TIERS = {
     -1000: 100000, # Villain max: 100,000 credit bounty
 }
 
+# Reputation at or below which a player carries at least one system bounty
+SYSTEM_BOUNTY_THRESHOLD = max(SYSTEM_BOUNTY_TIERS)
+
+
+def _system_bounty_columns():
+    """SQL expressions for the system bounty total and count of a player.
+
+    Mirrors _get_system_bounties: every tier whose threshold the reputation
+    has reached contributes its amount.
+    """
+    amount_whens = []
+    count_whens = []
+    for threshold in sorted(SYSTEM_BOUNTY_TIERS):
+        reached = [t for t in SYSTEM_BOUNTY_TIERS if threshold <= t]
+        condition = Player.personal_reputation <= threshold
+        amount_whens.append((condition, sum(SYSTEM_BOUNTY_TIERS[t] for t in reached)))
+        count_whens.append((condition, len(reached)))
+    return case(*amount_whens, else_=0), case(*count_whens, else_=0)
+
 
 class BountyService:
     def __init__(self, db: Session):
@@ -44,6 +68,17 @@ class BountyService:
         player.settings["bounties"] = bounties
         flag_modified(player, "settings")
 
+    def _lock_players(self, *player_ids: uuid.UUID) -> Dict[uuid.UUID, Player]:
+        """Lock player rows FOR UPDATE in id order, so opposing callers cannot deadlock."""
+        rows = (
+            self.db.query(Player)
+            .filter(Player.id.in_(set(player_ids)))
+            .order_by(Player.id)
+            .with_for_update()
+            .all()
+        )
+        return {player.id: player for player in rows}
+
     def place_bounty(
         self, placer_id: uuid.UUID, target_id: uuid.UUID, amount: int
     ) -> Dict[str, Any]:
@@ -54,9 +89,11 @@ class BountyService:
                 "message": f"Minimum bounty is {BOUNTY_MIN_AMOUNT} credits",
             }
 
-        # Lock placer row to prevent concurrent bounty placement race conditions
-        placer = self.db.query(Player).filter(Player.id == placer_id).with_for_update().first()
-        target = self.db.query(Player).filter(Player.id == target_id).first()
+        # Lock the placer (credits) and the target (bounty list and board row)
+        # so concurrent placements and collections serialise per target
+        players = self._lock_players(placer_id, target_id)
+        placer = players.get(placer_id)
+        target = players.get(target_id)
 
         if not placer or not target:
             return {"success": False, "message": "Player not found"}
@@ -89,6 +126,21 @@ class BountyService:
         bounties.append(bounty_entry)
         self._set_bounties(target, bounties)
 
+        # Upsert keeps the aggregate consistent under concurrent placements
+        board_upsert = insert(BountyBoardEntry).values(
+            target_id=target_id, total_amount=amount, bounty_count=1,
+        )
+        self.db.execute(
+            board_upsert.on_conflict_do_update(
+                index_elements=[BountyBoardEntry.target_id],
+                set_={
+                    "total_amount": BountyBoardEntry.total_amount + amount,
+                    "bounty_count": BountyBoardEntry.bounty_count + 1,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
         self.db.flush()
 
         logger.info(
@@ -133,8 +185,9 @@ class BountyService:
     ) -> Dict[str, Any]:
         """Award all bounties on target to collector (called on kill)."""
         # Lock both rows to prevent double-collection race condition
-        collector = self.db.query(Player).filter(Player.id == collector_id).with_for_update().first()
-        target = self.db.query(Player).filter(Player.id == target_id).with_for_update().first()
+        players = self._lock_players(collector_id, target_id)
+        collector = players.get(collector_id)
+        target = players.get(target_id)
 
         if not collector or not target:
             return {"success": False, "message": "Player not found"}
@@ -154,6 +207,9 @@ class BountyService:
 
         # Clear player bounties
         self._set_bounties(target, [])
+        self.db.query(BountyBoardEntry).filter(
+            BountyBoardEntry.target_id == target_id
+        ).delete(synchronize_session=False)
 
         self.db.flush()
 
@@ -189,34 +245,58 @@ class BountyService:
         return bounties
 
     def get_available_bounties(self, limit: int = 20) -> Dict[str, Any]:
-        """List all players who currently have bounties on them."""
-        # Find all players with non-empty bounties in settings
-        players = self.db.query(Player).filter(
-            Player.is_active == True
-        ).all()
-
-        bounty_targets = []
-        for player in players:
-            player_bounties = self._get_bounties(player)
-            system_bounties = self._get_system_bounties(player)
-            total = sum(b["amount"] for b in player_bounties) + sum(
-                b["amount"] for b in system_bounties
+        """List the players with the highest total bounty on them.
+
+        Candidates are players on the bounty board plus players whose
+        reputation earns a system bounty, both of which are indexed, so the
+        cost tracks the number of bounty targets rather than all players.
+        """
+        system_amount, system_count = _system_bounty_columns()
+        player_amount = func.coalesce(BountyBoardEntry.total_amount, 0)
+        total_bounty = (player_amount + system_amount).label("total_bounty")
+        bounty_count = (func.coalesce(BountyBoardEntry.bounty_count, 0) + system_count).label("bounty_count")
+
+        # Each branch of the union is served by its own index
+        candidate_ids = union(
+            select(BountyBoardEntry.target_id.label("player_id")).where(BountyBoardEntry.total_amount > 0),
+            select(Player.id.label("player_id")).where(Player.personal_reputation <= SYSTEM_BOUNTY_THRESHOLD),
+        ).subquery()
+
+        candidates = (
+            self.db.query(Player)
+            .join(candidate_ids, candidate_ids.c.player_id == Player.id)
+            .outerjoin(BountyBoardEntry, BountyBoardEntry.target_id == Player.id)
+            .filter(Player.is_active == True)
+        )
+
+        rows = (
+            candidates.with_entities(
+                Player.id,
+                Player.nickname,
+                Player.reputation_tier,
+                Player.current_sector_id,
+                total_bounty,
+                bounty_count,
             )
-            if total > 0:
-                bounty_targets.append({
-                    "player_id": str(player.id),
-                    "player_name": player.nickname,
-                    "reputation_tier": player.reputation_tier,
-                    "total_bounty": total,
-                    "bounty_count": len(player_bounties) + len(system_bounties),
-                    "current_sector": player.current_sector_id,
-                })
+            .order_by(total_bounty.desc(), Player.id)
+            .limit(limit)
+            .all()
+        )
 
-        # Sort by total bounty descending
-        bounty_targets.sort(key=lambda x: x["total_bounty"], reverse=True)
+        bounty_targets = [
+            {
+                "player_id": str(row.id),
+                "player_name": row.nickname,
+                "reputation_tier": row.reputation_tier,
+                "total_bounty": row.total_bounty,
+                "bounty_count": row.bounty_count,
+                "current_sector": row.current_sector_id,
+            }
+            for row in rows
+        ]
 
         return {
             "success": True,
-            "bounties": bounty_targets[:limit],
-            "total_targets": len(bounty_targets),
+            "bounties": bounty_targets,
+            "total_targets": candidates.count(),
         }
@@ -0,0 +1,291 @@
+"""
+Colony economy engine
+
+Applies planetary production and colonist growth to every colony at once.
+Planet rows are loaded as plain columns into NumPy arrays, production and
+growth are computed in one vectorized pass with the formulas of
+PlanetaryService._calculate_production_rates (building bonuses,
+habitability, specialization multipliers and SIEGE_PRODUCTION_PENALTY), and
+the production is written back as deltas with one UPDATE ... FROM unnest(...)
+statement per chunk. The read takes no locks, so the write adds to whatever
+the row holds by then (a terraforming spend or transfer made meanwhile is
+kept) and only applies where last_production still has the value the tick
+read, so overlapping ticks cannot credit the same interval twice.
+
+Rates are per day; a tick credits ``rate * days elapsed since
+last_production`` (capped at MAX_CATCH_UP_DAYS). Integer stockpiles are
+rounded stochastically so short ticks keep fractional production in
+expectation instead of truncating it to zero. Colonist growth stops at the
+habitability-scaled capacity (see PlanetaryService.get_habitability_effects).
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from src.models.planet import Planet
+from src.services.planetary_service import SIEGE_PRODUCTION_PENALTY, SPECIALIZATION_BONUSES
+
+logger = logging.getLogger(__name__)
+
+BASE_RATE = 10                  # Production per allocated colonist per day
+BUILDING_BONUS_PER_LEVEL = 0.1
+COLONIST_GROWTH_RATE = 0.01     # 1% per day at habitability 100
+MAX_CATCH_UP_DAYS = 7.0
+WRITE_CHUNK_SIZE = 10_000
+COLONY_PRODUCTION_TICK_SECONDS = int(os.getenv("COLONY_PRODUCTION_TICK_SECONDS", "3600"))
+
+# Specialization index 0 means "none"; the rest follow SPECIALIZATION_BONUSES
+SPECIALIZATIONS: List[str] = list(SPECIALIZATION_BONUSES)
+_SPECIALIZATION_INDEX: Dict[str, int] = {name: i + 1 for i, name in enumerate(SPECIALIZATIONS)}
+_BALANCED_INDEX = _SPECIALIZATION_INDEX["balanced"]
+# Rows: specialization index; columns: fuel, organics, equipment, colonists
+SPECIALIZATION_MULTIPLIERS = np.array(
+    [[1.0, 1.0, 1.0, 1.0]] + [
+        [SPECIALIZATION_BONUSES[name]["production"].get(k, 1.0) for k in ("fuel", "organics", "equipment", "colonists")]
+        for name in SPECIALIZATIONS
+    ],
+    dtype=np.float64,
+)
+
+_COLUMNS = (
+    Planet.id,
+    Planet.fuel_allocation,
+    Planet.organics_allocation,
+    Planet.equipment_allocation,
+    Planet.mine_level,
+    Planet.farm_level,
+    Planet.factory_level,
+    Planet.habitability_score,
+    Planet.specialization,
+    Planet.under_siege,
+    Planet.colonists,
+    Planet.max_colonists,
+    Planet.fuel_ore,
+    Planet.organics,
+    Planet.equipment,
+    Planet.last_production,
+)
+
+
+def specialization_index(specialization: Optional[str]) -> int:
+    """Row of SPECIALIZATION_MULTIPLIERS (unknown names count as balanced)"""
+    if not specialization:
+        return 0
+    return _SPECIALIZATION_INDEX.get(specialization, _BALANCED_INDEX)
+
+
+@dataclass
+class PlanetColumns:
+    """Columnar planet state; every array has one entry per planet"""
+    ids: np.ndarray
+    fuel_allocation: np.ndarray
+    organics_allocation: np.ndarray
+    equipment_allocation: np.ndarray
+    mine_level: np.ndarray
+    farm_level: np.ndarray
+    factory_level: np.ndarray
+    habitability: np.ndarray
+    specialization: np.ndarray
+    under_siege: np.ndarray
+    colonists: np.ndarray
+    max_colonists: np.ndarray
+    fuel_ore: np.ndarray
+    organics: np.ndarray
+    equipment: np.ndarray
+    last_production: np.ndarray  # epoch seconds, NaN when never produced
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> "PlanetColumns":
+        """Build from rows in _COLUMNS order"""
+        n = len(rows)
+        cols = list(zip(*rows)) if n else [()] * len(_COLUMNS)
+
+        def ints(values):
+            return np.fromiter((v or 0 for v in values), dtype=np.int64, count=n)
+
+        return cls(
+            ids=np.array(cols[0], dtype=object),
+            fuel_allocation=ints(cols[1]),
+            organics_allocation=ints(cols[2]),
+            equipment_allocation=ints(cols[3]),
+            mine_level=ints(cols[4]),
+            farm_level=ints(cols[5]),
+            factory_level=ints(cols[6]),
+            habitability=ints(cols[7]),
+            specialization=np.fromiter((specialization_index(v) for v in cols[8]), dtype=np.int8, count=n),
+            under_siege=np.fromiter((bool(v) for v in cols[9]), dtype=bool, count=n),
+            colonists=ints(cols[10]),
+            max_colonists=np.fromiter((10000 if v is None else v for v in cols[11]), dtype=np.int64, count=n),
+            fuel_ore=ints(cols[12]),
+            organics=ints(cols[13]),
+            equipment=ints(cols[14]),
+            last_production=np.fromiter(
+                (v.timestamp() if v is not None else np.nan for v in cols[15]), dtype=np.float64, count=n
+            ),
+        )
+
+    @classmethod
+    def from_planets(cls, planets: Iterable[Planet]) -> "PlanetColumns":
+        """Build from loaded Planet objects"""
+        return cls.from_rows([tuple(getattr(p, c.key) for c in _COLUMNS) for p in planets])
+
+
+@dataclass
+class ProductionRates:
+    """Per-day rates, one entry per planet"""
+    fuel: np.ndarray
+    organics: np.ndarray
+    equipment: np.ndarray
+    colonists: np.ndarray
+
+    def as_dict(self, i: int) -> Dict[str, float]:
+        """Rates of planet ``i`` rounded like the API has always reported them"""
+        return {
+            "fuel": round(float(self.fuel[i]), 2),
+            "organics": round(float(self.organics[i]), 2),
+            "equipment": round(float(self.equipment[i]), 2),
+            "colonists": round(float(self.colonists[i]), 2),
+        }
+
+
+def production_rates(cols: PlanetColumns) -> ProductionRates:
+    """Vectorized PlanetaryService._calculate_production_rates"""
+    multipliers = SPECIALIZATION_MULTIPLIERS[cols.specialization]
+    siege = np.where(cols.under_siege, 1.0 - SIEGE_PRODUCTION_PENALTY, 1.0)
+
+    fuel = cols.fuel_allocation * BASE_RATE * (1 + cols.mine_level * BUILDING_BONUS_PER_LEVEL)
+    organics = cols.organics_allocation * BASE_RATE * (1 + cols.farm_level * BUILDING_BONUS_PER_LEVEL)
+    equipment = cols.equipment_allocation * BASE_RATE * (1 + cols.factory_level * BUILDING_BONUS_PER_LEVEL)
+    colonists = cols.colonists * COLONIST_GROWTH_RATE * (np.maximum(cols.habitability, 1) / 100.0)
+
+    return ProductionRates(
+        fuel=fuel * multipliers[:, 0] * siege,
+        organics=organics * multipliers[:, 1] * siege,
+        equipment=equipment * multipliers[:, 2] * siege,
+        colonists=np.where(cols.under_siege, 0.0, colonists * multipliers[:, 3]),
+    )
+
+
+def _stochastic_round(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    floor = np.floor(values)
+    return (floor + (rng.random(values.shape) < (values - floor))).astype(np.int64)
+
+
+@dataclass
+class TickResult:
+    mask: np.ndarray          # planets whose state changed
+    fuel_ore: np.ndarray
+    organics: np.ndarray
+    equipment: np.ndarray
+    colonists: np.ndarray
+
+
+def apply_production(
+    cols: PlanetColumns, now: float, rng: Optional[np.random.Generator] = None
+) -> TickResult:
+    """New stockpiles and colonists after producing since each planet's last_production"""
+    rng = rng or np.random.default_rng()
+    rates = production_rates(cols)
+
+    elapsed = np.where(np.isnan(cols.last_production), 0.0, now - cols.last_production)
+    days = np.clip(elapsed / 86400.0, 0.0, MAX_CATCH_UP_DAYS)
+
+    fuel_ore = cols.fuel_ore + _stochastic_round(rates.fuel * days, rng)
+    organics = cols.organics + _stochastic_round(rates.organics * days, rng)
+    equipment = cols.equipment + _stochastic_round(rates.equipment * days, rng)
+
+    capacity = (cols.max_colonists * (np.maximum(cols.habitability, 0) / 100.0)).astype(np.int64)
+    grown = np.minimum(cols.colonists + _stochastic_round(rates.colonists * days, rng), capacity)
+    colonists = np.maximum(cols.colonists, grown)  # Never shrink colonies already above capacity
+
+    mask = (
+        (fuel_ore != cols.fuel_ore) | (organics != cols.organics)
+        | (equipment != cols.equipment) | (colonists != cols.colonists)
+        | np.isnan(cols.last_production) | (days > 0)
+    )
+    return TickResult(mask, fuel_ore, organics, equipment, colonists)
+
+
+_UPDATE_SQL = text("""
+    UPDATE planets AS p
+    SET fuel_ore = COALESCE(p.fuel_ore, 0) + v.d_fuel_ore,
+        organics = COALESCE(p.organics, 0) + v.d_organics,
+        equipment = COALESCE(p.equipment, 0) + v.d_equipment,
+        colonists = COALESCE(p.colonists, 0) + v.d_colonists,
+        last_production = :now
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:d_fuel_ore AS integer[]), CAST(:d_organics AS integer[]),
+        CAST(:d_equipment AS integer[]), CAST(:d_colonists AS integer[]),
+        CAST(:old_last_production AS timestamptz[])
+    ) AS v(id, d_fuel_ore, d_organics, d_equipment, d_colonists, old_last_production)
+    WHERE p.id = v.id
+      AND p.last_production IS NOT DISTINCT FROM v.old_last_production
+""")
+
+
+def run_production_tick(
+    db: Session, now: Optional[datetime] = None, rng: Optional[np.random.Generator] = None
+) -> Dict[str, float]:
+    """Produce for every colony and bulk-write the results; commits. Returns timings and counts."""
+    now = now or datetime.now(timezone.utc)
+    started = time.perf_counter()
+
+    rows = db.execute(select(*_COLUMNS).where(Planet.colonists > 0)).all()
+    cols = PlanetColumns.from_rows(rows)
+    loaded = time.perf_counter()
+
+    result = apply_production(cols, now.timestamp(), rng)
+    computed = time.perf_counter()
+
+    changed = np.flatnonzero(result.mask)
+    updated = 0
+    for start in range(0, len(changed), WRITE_CHUNK_SIZE):
+        idx = changed[start:start + WRITE_CHUNK_SIZE]
+        updated += db.execute(_UPDATE_SQL, {
+            "now": now,
+            "ids": [str(i) for i in cols.ids[idx]],
+            "d_fuel_ore": (result.fuel_ore[idx] - cols.fuel_ore[idx]).tolist(),
+            "d_organics": (result.organics[idx] - cols.organics[idx]).tolist(),
+            "d_equipment": (result.equipment[idx] - cols.equipment[idx]).tolist(),
+            "d_colonists": (result.colonists[idx] - cols.colonists[idx]).tolist(),
+            "old_last_production": [rows[i][-1] for i in idx],
+        }).rowcount
+    db.commit()
+    written = time.perf_counter()
+
+    if updated < len(changed):
+        logger.info(f"Colony production tick: {len(changed) - updated} planets already produced by another tick")
+    stats = {
+        "planets": len(cols),
+        "updated": updated,
+        "load_seconds": round(loaded - started, 4),
+        "compute_seconds": round(computed - loaded, 4),
+        "write_seconds": round(written - computed, 4),
+    }
+    logger.info(f"Colony production tick: {stats}")
+    return stats
+
+
+def run_colony_production_tick() -> Dict[str, float]:
+    """Run one tick in its own session (for the background loop)"""
+    from src.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return run_production_tick(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -2,12 +2,16 @@
 Combat Analytics Service for Admin Dashboard
 """
 
+import os
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, desc
 
+from src.models.anomaly_flag import AnomalyFlag, AnomalyFlagType, COMBAT_FLAG_TYPES
 from src.models.combat_log import CombatLog, CombatStats
 from src.models.player import Player
 from src.models.ship import Ship
@@ -15,6 +19,20 @@ from src.models.planet import Planet
 from src.models.fleet import FleetBattle
 from src.models.sector import Sector
 from src.services.audit_service import AuditService, AuditAction
+from src.services.combat_balance_simulator import DEFAULT_ITERATIONS, run_balance_simulation
+
+# The live feed is shared by every admin watching the dashboard; results are
+# reused for a few seconds per (limit, combat_type, sector_id, active_only)
+LIVE_FEED_CACHE_SECONDS = float(os.getenv("COMBAT_FEED_CACHE_SECONDS", "5"))
+
+_live_feed_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = {}
+_live_feed_lock = threading.Lock()
+
+
+def invalidate_live_combat_feed() -> None:
+    """Drop cached feed pages (after an intervention changes a combat)"""
+    with _live_feed_lock:
+        _live_feed_cache.clear()
 
 
 class CombatAnalyticsService:
@@ -28,6 +46,28 @@ class CombatAnalyticsService:
                             sector_id: Optional[uuid.UUID] = None,
                             active_only: bool = True) -> List[Dict[str, Any]]:
         """Get live/recent combat activities"""
+        key = (limit, combat_type, sector_id, active_only)
+        now = time.monotonic()
+        with _live_feed_lock:
+            cached = _live_feed_cache.get(key)
+            if cached and now - cached[0] < LIVE_FEED_CACHE_SECONDS:
+                return list(cached[1])
+        
+        combat_feed = self._build_live_combat_feed(limit, combat_type, sector_id, active_only)
+        with _live_feed_lock:
+            # Drop expired pages so one-off filter combinations do not accumulate
+            expired_before = time.monotonic() - LIVE_FEED_CACHE_SECONDS
+            for stale in [k for k, (cached_at, _) in _live_feed_cache.items() if cached_at <= expired_before]:
+                del _live_feed_cache[stale]
+            _live_feed_cache[key] = (now, combat_feed)
+        return list(combat_feed)
+    
+    def _build_live_combat_feed(self,
+                                limit: int,
+                                combat_type: Optional[str],
+                                sector_id: Optional[uuid.UUID],
+                                active_only: bool) -> List[Dict[str, Any]]:
+        """Build one feed page; participants and sectors are resolved in one query each"""
         query = self.db.query(CombatLog)
         
         if active_only:
@@ -51,15 +91,27 @@ class CombatAnalyticsService:
         # Order by most recent first
         combats = query.order_by(desc(CombatLog.started_at)).limit(limit).all()
         
+        # Resolve participants (assuming both are players for now) and sectors for the whole page
+        participants = self._get_participants_info(
+            [c.attacker_id for c in combats] + [c.defender_id for c in combats], "player"
+        )
+        sector_ids = {c.sector_uuid for c in combats if c.sector_uuid is not None}
+        sectors = {
+            row.id: row
+            for row in (
+                self.db.query(Sector.id, Sector.name, Sector.x_coord, Sector.y_coord, Sector.z_coord)
+                .filter(Sector.id.in_(sector_ids))
+                .all()
+                if sector_ids else []
+            )
+        }
+        
         # Format combat data
         combat_feed = []
         for combat in combats:
-            # Get participant details (assuming both are players for now)
-            attacker = self._get_participant_info(combat.attacker_id, "player")
-            defender = self._get_participant_info(combat.defender_id, "player")
-            
-            # Get sector info
-            sector = self.db.query(Sector).filter(Sector.id == combat.sector_uuid).first()
+            attacker = participants.get(combat.attacker_id) or self._unknown_participant(combat.attacker_id, "player")
+            defender = participants.get(combat.defender_id) or self._unknown_participant(combat.defender_id, "player")
+            sector = sectors.get(combat.sector_uuid)
             
             # Determine status based on ended_at and outcome
             if combat.ended_at is None:
@@ -206,6 +258,7 @@ class CombatAnalyticsService:
             )
             
             self.db.commit()
+            invalidate_live_combat_feed()
             
             return {
                 "intervention_id": str(intervention_id),
@@ -279,6 +332,27 @@ class CombatAnalyticsService:
             "recommendations": self._generate_balance_recommendations(outliers)
         }
     
+    def get_simulated_balance_analytics(self,
+                                        iterations: int = DEFAULT_ITERATIONS,
+                                        seed: Optional[int] = None,
+                                        workers: Optional[int] = None) -> Dict[str, Any]:
+        """Win-rate tables from Monte Carlo runs of the combat kernel instead of logs"""
+        simulation = run_balance_simulation(iterations=iterations, seed=seed, workers=workers)
+        analytics = simulation["by_ship_type"]
+        outliers = self._identify_balance_outliers(analytics)
+        
+        return {
+            "timeframe": "simulated",
+            "total_combats": simulation["total_simulations"],
+            "group_by": "ship_type",
+            "analytics": analytics,
+            "balance_metrics": self._calculate_balance_metrics(analytics),
+            "outliers": outliers,
+            "recommendations": self._generate_balance_recommendations(outliers),
+            "matchups": simulation["matchups"],
+            "seed": simulation["seed"]
+        }
+    
     def get_combat_disputes(self, 
                           status: Optional[str] = None,
                           limit: int = 50) -> List[Dict[str, Any]]:
@@ -353,32 +427,42 @@ class CombatAnalyticsService:
     
     # Helper methods
     
-    def _get_participant_info(self, participant_id: uuid.UUID, 
-                            participant_type: str) -> Dict[str, Any]:
-        """Get participant information for combat feed"""
-        info = {
+    @staticmethod
+    def _unknown_participant(participant_id: Optional[uuid.UUID], participant_type: str) -> Dict[str, Any]:
+        return {
             "id": str(participant_id),
             "type": participant_type,
             "name": "Unknown"
         }
-        
+    
+    def _get_participants_info(self, participant_ids: Iterable[Optional[uuid.UUID]],
+                               participant_type: str) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """Participant information for many ids of one type with a single query"""
+        ids = {pid for pid in participant_ids if pid is not None}
+        if not ids:
+            return {}
+        
+        infos: Dict[uuid.UUID, Dict[str, Any]] = {}
         if participant_type == "player":
-            player = self.db.query(Player).filter(Player.id == participant_id).first()
-            if player:
-                info["name"] = player.nickname or "Unknown"
-                info["team_id"] = str(player.team_id) if player.team_id else None
+            for row in self.db.query(Player.id, Player.nickname, Player.team_id).filter(Player.id.in_(ids)):
+                info = self._unknown_participant(row.id, participant_type)
+                info["name"] = row.nickname or "Unknown"
+                info["team_id"] = str(row.team_id) if row.team_id else None
+                infos[row.id] = info
         elif participant_type == "ship":
-            ship = self.db.query(Ship).filter(Ship.id == participant_id).first()
-            if ship:
-                info["name"] = f"{ship.ship_type} ({ship.name})"
-                info["owner_id"] = str(ship.owner_id) if ship.owner_id else None
+            for row in self.db.query(Ship.id, Ship.ship_type, Ship.name, Ship.owner_id).filter(Ship.id.in_(ids)):
+                info = self._unknown_participant(row.id, participant_type)
+                info["name"] = f"{row.ship_type} ({row.name})"
+                info["owner_id"] = str(row.owner_id) if row.owner_id else None
+                infos[row.id] = info
         elif participant_type == "planet":
-            planet = self.db.query(Planet).filter(Planet.id == participant_id).first()
-            if planet:
-                info["name"] = planet.name
-                info["owner_id"] = str(planet.owner_id) if planet.owner_id else None
+            for row in self.db.query(Planet.id, Planet.name, Planet.owner_id).filter(Planet.id.in_(ids)):
+                info = self._unknown_participant(row.id, participant_type)
+                info["name"] = row.name
+                info["owner_id"] = str(row.owner_id) if row.owner_id else None
+                infos[row.id] = info
         
-        return info
+        return infos
     
     def _check_intervention_needed(self, combat: CombatLog) -> bool:
         """Check if combat needs admin intervention"""
@@ -674,47 +758,43 @@ class CombatAnalyticsService:
         return recommendations
     
     def _find_suspicious_combats(self) -> List[Dict[str, Any]]:
-        """Find potentially suspicious combat patterns"""
-        suspicious = []
-        
-        # Check for rapid repeated combats between same players
+        """Suspicious combat patterns flagged by the streaming anomaly detector in the last hour"""
         one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+        defender = aliased(Player)
         
-        repeat_combats = (
-            self.db.query(
-                CombatLog.attacker_id,
-                CombatLog.defender_id,
-                func.count(CombatLog.id).label('combat_count')
-            )
+        flags = (
+            self.db.query(AnomalyFlag, Player.nickname, defender.nickname)
+            .outerjoin(Player, Player.id == AnomalyFlag.player_id)
+            .outerjoin(defender, defender.id == AnomalyFlag.counterparty_id)
             .filter(
-                CombatLog.started_at >= one_hour_ago,
-                CombatLog.attacker_id.isnot(None),
-                CombatLog.defender_id.isnot(None)
+                AnomalyFlag.flag_type.in_(COMBAT_FLAG_TYPES),
+                AnomalyFlag.created_at >= one_hour_ago
             )
-            .group_by(CombatLog.attacker_id, CombatLog.defender_id)
-            .having(func.count(CombatLog.id) > 5)
+            .order_by(desc(AnomalyFlag.created_at))
+            .limit(200)
             .all()
         )
         
-        for result in repeat_combats:
-            attacker = self.db.query(Player).filter(Player.id == result.attacker_id).first()
-            defender = self.db.query(Player).filter(Player.id == result.defender_id).first()
+        suspicious = []
+        for flag, attacker_name, defender_name in flags:
+            participants = {"attacker": {"id": str(flag.player_id), "name": attacker_name or "Unknown"}}
+            if flag.flag_type == AnomalyFlagType.REPEAT_COMBAT.value:
+                participants["defender"] = {"id": str(flag.counterparty_id), "name": defender_name or "Unknown"}
+                description = f"{int(flag.metric)} combats between same players in 1 hour"
+                action = "Investigate for potential combat farming or harassment"
+            else:
+                description = (
+                    f"Win rate {flag.metric:.0%} over {flag.details.get('combats')} recent attacks "
+                    f"(global {flag.details.get('global_win_rate', 0):.0%})"
+                )
+                action = "Review the player's recent combats for exploits or arranged fights"
             
             suspicious.append({
-                "type": "repeat_combat",
-                "severity": "high" if result.combat_count > 10 else "medium",
-                "description": f"{result.combat_count} combats between same players in 1 hour",
-                "participants": {
-                    "attacker": {
-                        "id": str(result.attacker_id),
-                        "name": attacker.nickname if attacker else "Unknown"
-                    },
-                    "defender": {
-                        "id": str(result.defender_id),
-                        "name": defender.nickname if defender else "Unknown"
-                    }
-                },
-                "action": "Investigate for potential combat farming or harassment"
+                "type": flag.flag_type,
+                "severity": flag.severity,
+                "description": description,
+                "participants": participants,
+                "action": action
             })
         
-        return suspicious
\ No newline at end of file
+        return suspicious
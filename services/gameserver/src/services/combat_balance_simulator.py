@@ -0,0 +1,217 @@
+"""
+Combat balance simulator
+
+Monte Carlo runner over the combat kernel. Every ship-type matchup is fought
+``iterations`` times with a stock loadout (full drone bay, spec speed, no rank
+bonus). Work is split into fixed chunks whose seeds are spawned from one root
+seed, so results are identical for a given seed whatever the worker count.
+Chunks are spread across one shared ProcessPoolExecutor, shut down with the
+app (or at interpreter exit) by shutdown_pool. Runs are serialised
+and iterations are capped so an admin endpoint cannot queue unbounded CPU
+work; seeded results are deterministic, so they are cached by their inputs.
+"""
+
+import atexit
+import copy
+import logging
+import os
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.ship_specifications_seeder import SHIP_SPECIFICATIONS
+from src.models.combat import CombatResult
+from src.models.ship import ShipType
+from src.services.combat_kernel import (
+    CombatantStats, resolve_ship_duel, ship_attack_power, ship_defense_power
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ITERATIONS = 2000
+MAX_ITERATIONS = 10_000
+CHUNK_SIZE = 5000
+RESULT_CACHE_SIZE = 32
+# Below this many duels the process pool costs more than it saves
+PARALLEL_THRESHOLD = 50_000
+
+# Escape pods cannot initiate combat, so they are left out by default
+DEFAULT_SHIP_TYPES = [t for t in ShipType if t != ShipType.ESCAPE_POD]
+
+_OUTCOMES = [
+    CombatResult.ATTACKER_VICTORY,
+    CombatResult.DEFENDER_VICTORY,
+    CombatResult.DRAW,
+    CombatResult.ATTACKER_FLED,
+    CombatResult.DEFENDER_FLED,
+    CombatResult.MUTUAL_DESTRUCTION,
+]
+_OUTCOME_INDEX = {outcome: i for i, outcome in enumerate(_OUTCOMES)}
+
+# One simulation at a time, on a pool reused across runs
+_run_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+# Seeded results by (ship types, iterations, seed), least recently used first
+_results: "OrderedDict[Tuple[Tuple[str, ...], int, int], Dict[str, Any]]" = OrderedDict()
+
+
+def baseline_combatant(ship_type: ShipType, drones: Optional[int] = None) -> CombatantStats:
+    """Stock combat stats for a ship type: full drone bay and spec speed."""
+    spec = SHIP_SPECIFICATIONS.get(ship_type, {})
+    if drones is None:
+        drones = spec.get("max_drones", 0)
+    return CombatantStats(
+        name=ship_type.value,
+        ship_type=ship_type,
+        attack_power=ship_attack_power(ship_type, None, drones),
+        defense_power=ship_defense_power(ship_type, None, drones),
+        drones=drones,
+        speed=spec.get("speed", 1.0),
+    )
+
+
+def _simulate_chunk(task: Tuple[str, str, int, int]) -> Tuple[str, str, List[int], int]:
+    """Fight one chunk of a matchup; returns outcome counts and total rounds."""
+    attacker_type, defender_type, iterations, seed = task
+    attacker = baseline_combatant(ShipType(attacker_type))
+    defender = baseline_combatant(ShipType(defender_type))
+    rng = random.Random(seed)
+
+    counts = [0] * len(_OUTCOMES)
+    rounds = 0
+    for _ in range(iterations):
+        outcome = resolve_ship_duel(attacker, defender, rng, record=False)
+        counts[_OUTCOME_INDEX[outcome["result"]]] += 1
+        rounds += outcome["rounds"]
+    return attacker_type, defender_type, counts, rounds
+
+
+def _build_tasks(
+    ship_types: List[ShipType], iterations: int, seed: Optional[int]
+) -> List[Tuple[str, str, int, int]]:
+    chunks = []
+    for attacker_type in ship_types:
+        for defender_type in ship_types:
+            remaining = iterations
+            while remaining > 0:
+                size = min(CHUNK_SIZE, remaining)
+                chunks.append((attacker_type.value, defender_type.value, size))
+                remaining -= size
+
+    child_seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    return [
+        chunk + (int(child.generate_state(1)[0]),)
+        for chunk, child in zip(chunks, child_seeds)
+    ]
+
+
+def _run_tasks(tasks: List[Tuple[str, str, int, int]], workers: Optional[int]) -> Iterable:
+    total = sum(task[2] for task in tasks)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or total < PARALLEL_THRESHOLD:
+        return map(_simulate_chunk, tasks)
+
+    return list(_get_pool(workers).map(_simulate_chunk, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared worker pool, recreated only when the worker count changes (caller holds _run_lock)"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the shared worker pool, waiting for any running simulation to finish first"""
+    global _pool, _pool_workers
+    with _run_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+def run_balance_simulation(
+    ship_types: Optional[List[ShipType]] = None,
+    iterations: int = DEFAULT_ITERATIONS,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Simulate every attacker/defender ship-type matchup and tabulate win rates.
+
+    Returns ``matchups`` (outcome rates per "ATTACKER vs DEFENDER" pair) and
+    ``by_ship_type`` (attacker-side wins/losses/total/win_rate per type, the
+    same shape CombatAnalyticsService builds from combat logs).
+    Raises ValueError if iterations is outside 1..MAX_ITERATIONS.
+    """
+    if not 1 <= iterations <= MAX_ITERATIONS:
+        raise ValueError(f"iterations must be between 1 and {MAX_ITERATIONS}")
+    ship_types = ship_types or DEFAULT_SHIP_TYPES
+    seeded = seed is not None
+    if not seeded:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    key = (tuple(t.value for t in ship_types), iterations, seed)
+
+    with _run_lock:
+        if seeded and key in _results:
+            _results.move_to_end(key)
+            return copy.deepcopy(_results[key])
+        result = _simulate(ship_types, iterations, seed, workers)
+        if seeded:
+            _results[key] = result
+            if len(_results) > RESULT_CACHE_SIZE:
+                _results.popitem(last=False)
+        return copy.deepcopy(result)
+
+
+def _simulate(
+    ship_types: List[ShipType], iterations: int, seed: int, workers: Optional[int]
+) -> Dict[str, Any]:
+    tasks = _build_tasks(ship_types, iterations, seed)
+
+    totals: Dict[Tuple[str, str], Tuple[np.ndarray, int]] = {}
+    for attacker_type, defender_type, counts, rounds in _run_tasks(tasks, workers):
+        key = (attacker_type, defender_type)
+        prev_counts, prev_rounds = totals.get(key, (np.zeros(len(_OUTCOMES), dtype=np.int64), 0))
+        totals[key] = (prev_counts + np.array(counts, dtype=np.int64), prev_rounds + rounds)
+
+    matchups = {}
+    by_ship_type: Dict[str, Dict[str, Any]] = {}
+    for (attacker_type, defender_type), (counts, rounds) in sorted(totals.items()):
+        total = int(counts.sum())
+        rates = {outcome.value.lower(): round(int(counts[i]) / total, 4) for i, outcome in enumerate(_OUTCOMES)}
+        matchups[f"{attacker_type} vs {defender_type}"] = {
+            "attacker": attacker_type,
+            "defender": defender_type,
+            "simulations": total,
+            "avg_rounds": round(rounds / total, 2),
+            **rates,
+        }
+
+        wins = int(counts[_OUTCOME_INDEX[CombatResult.ATTACKER_VICTORY]])
+        stats = by_ship_type.setdefault(attacker_type, {"wins": 0, "losses": 0, "total": 0})
+        stats["wins"] += wins
+        stats["losses"] += total - wins
+        stats["total"] += total
+
+    for stats in by_ship_type.values():
+        stats["win_rate"] = stats["wins"] / stats["total"]
+
+    return {
+        "seed": seed,
+        "iterations_per_matchup": iterations,
+        "total_simulations": sum(stats["total"] for stats in by_ship_type.values()),
+        "matchups": matchups,
+        "by_ship_type": by_ship_type,
+    }
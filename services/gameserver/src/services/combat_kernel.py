@@ -0,0 +1,819 @@
+"""
+Combat kernel
+
+Pure, seedable combat resolution. Every function here works on plain stats
+(CombatantStats, PlanetDefense, StationDefense) and an explicit
+``random.Random`` instance, with no ORM or session access. CombatService loads
+the inputs and persists the outputs; the balance simulator calls the same
+functions millions of times with ``record=False`` so no per-round log entries
+are built.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.combat import CombatResult
+from src.models.ship import ShipType
+
+# Weapon effectiveness multipliers based on ship type matchups
+SHIP_COMBAT_MODIFIERS = {
+    # (attacker_type, defender_type): damage_multiplier
+    (ShipType.DEFENDER, ShipType.CARGO_HAULER): 1.5,      # Military vs trade
+    (ShipType.DEFENDER, ShipType.LIGHT_FREIGHTER): 1.3,   # Military vs light trade
+    (ShipType.FAST_COURIER, ShipType.CARRIER): 0.7,       # Light vs heavy
+    (ShipType.SCOUT_SHIP, ShipType.CARRIER): 0.5,         # Scout vs capital
+    (ShipType.CARRIER, ShipType.SCOUT_SHIP): 1.8,         # Capital vs scout
+    (ShipType.CARRIER, ShipType.FAST_COURIER): 1.5,       # Capital vs light
+    (ShipType.COLONY_SHIP, ShipType.DEFENDER): 0.5,       # Colony ship weak in combat
+}
+
+# Weapon type effectiveness against different defenses
+WEAPON_TYPES = {
+    "laser": {"base_damage": 1.0, "shield_effectiveness": 0.8, "hull_effectiveness": 1.0, "description": "Standard energy weapon"},
+    "plasma": {"base_damage": 1.2, "shield_effectiveness": 1.2, "hull_effectiveness": 0.9, "description": "High-energy plasma bolts"},
+    "missile": {"base_damage": 1.5, "shield_effectiveness": 0.6, "hull_effectiveness": 1.5, "description": "Physical projectile, bypasses some shields"},
+    "emp": {"base_damage": 0.5, "shield_effectiveness": 2.0, "hull_effectiveness": 0.3, "description": "Electromagnetic pulse, devastating to shields"},
+}
+
+# Default weapon type by ship type
+SHIP_DEFAULT_WEAPONS = {
+    ShipType.ESCAPE_POD: "laser",
+    ShipType.LIGHT_FREIGHTER: "laser",
+    ShipType.CARGO_HAULER: "laser",
+    ShipType.FAST_COURIER: "laser",
+    ShipType.SCOUT_SHIP: "emp",
+    ShipType.COLONY_SHIP: "laser",
+    ShipType.DEFENDER: "plasma",
+    ShipType.CARRIER: "missile",
+    ShipType.WARP_JUMPER: "plasma",
+}
+
+# Ship types that get a bonus to escape chance due to speed/agility
+FAST_ESCAPE_SHIP_TYPES = {ShipType.FAST_COURIER, ShipType.SCOUT_SHIP}
+
+# Base attack/defense power by ship type
+SHIP_TYPE_ATTACK = {
+    ShipType.LIGHT_FREIGHTER: 10,
+    ShipType.CARGO_HAULER: 15,
+    ShipType.FAST_COURIER: 20,
+    ShipType.SCOUT_SHIP: 25,
+    ShipType.COLONY_SHIP: 15,
+    ShipType.DEFENDER: 40,
+    ShipType.CARRIER: 30,
+    ShipType.WARP_JUMPER: 20
+}
+
+SHIP_TYPE_DEFENSE = {
+    ShipType.LIGHT_FREIGHTER: 10,
+    ShipType.CARGO_HAULER: 20,
+    ShipType.FAST_COURIER: 15,
+    ShipType.SCOUT_SHIP: 10,
+    ShipType.COLONY_SHIP: 20,
+    ShipType.DEFENDER: 50,
+    ShipType.CARRIER: 40,
+    ShipType.WARP_JUMPER: 15
+}
+
+SHIP_DUEL_MAX_ROUNDS = 10
+DRONE_ASSAULT_MAX_ROUNDS = 8
+PLANET_ASSAULT_MAX_ROUNDS = 10
+PORT_ASSAULT_MAX_ROUNDS = 8
+
+
+@dataclass(frozen=True)
+class CombatantStats:
+    """Plain combat inputs for one ship and the drones escorting it"""
+    name: str
+    ship_type: Optional[ShipType]
+    attack_power: float
+    defense_power: float
+    drones: int
+    damage_mult: float = 1.0
+    speed: float = 1.0
+
+
+@dataclass(frozen=True)
+class PlanetDefense:
+    name: str
+    defense_level: int = 0
+    shields: int = 0
+    weapon_batteries: int = 0
+    defense_shields: int = 0  # shield generator level
+
+
+@dataclass(frozen=True)
+class StationDefense:
+    name: str
+    defense_level: int = 0
+    shields: int = 0
+    defense_weapons: int = 0
+
+
+def ship_attack_power(ship_type: Optional[ShipType], combat: Optional[Dict[str, Any]], drones: int) -> float:
+    """Attack power of a ship and its drones."""
+    combat = combat or {}
+    # Each drone contributes to attack power
+    return SHIP_TYPE_ATTACK.get(ship_type, 10) + combat.get("attack_bonus", 0) + drones * 2
+
+
+def ship_defense_power(ship_type: Optional[ShipType], combat: Optional[Dict[str, Any]], drones: int) -> float:
+    """Defense power of a ship and its drones."""
+    combat = combat or {}
+    return (
+        SHIP_TYPE_DEFENSE.get(ship_type, 10)
+        + combat.get("shield_bonus", 0)
+        + combat.get("hull_bonus", 0)
+        + combat.get("evasion", 0)
+        + drones * 1.5
+    )
+
+
+def escape_chance(fleeing_speed: float, fleeing_type: Optional[ShipType], pursuing_speed: float) -> int:
+    """Escape chance percentage (10-90) from relative speed, +20 for nimble ship types."""
+    chance = 30 + int(fleeing_speed * 10) - int(pursuing_speed * 5)
+    if fleeing_type in FAST_ESCAPE_SHIP_TYPES:
+        chance += 20
+    return max(10, min(90, chance))
+
+
+def planetary_defense_reduction(defense_level: int, shield_gen_level: int, shields: int) -> Dict[str, Any]:
+    """Damage reduction factor and shield HP pool granted by planetary defenses."""
+    # Each defense_level reduces damage by 5%, capped at 50% (level 10)
+    level_reduction = min(defense_level * 0.05, 0.50)
+
+    # Shield generators add a flat shield HP pool (500 HP per generator level,
+    # plus any existing shield value on the planet).
+    shield_hp = (shield_gen_level * 500) + (shields * 100)
+
+    # Each shield generator level adds 4% reduction, up to 40% at level 10
+    gen_reduction = min(shield_gen_level * 0.04, 0.40)
+
+    # Combined reduction capped at 0.9 so planets are never invincible
+    damage_reduction = min(level_reduction + gen_reduction, 0.90)
+
+    parts = []
+    if defense_level > 0:
+        parts.append(f"Level {defense_level} defenses ({level_reduction:.0%} reduction)")
+    if shield_gen_level > 0:
+        parts.append(f"Level {shield_gen_level} shield generators ({gen_reduction:.0%} reduction, {shield_hp} shield HP)")
+    description = " + ".join(parts) if parts else "No planetary defenses"
+
+    return {
+        "damage_reduction": round(damage_reduction, 2),
+        "shield_hp": shield_hp,
+        "description": description
+    }
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """numerator / denominator, treating a non-positive denominator as unbounded."""
+    return numerator / denominator if denominator > 0 else float("inf")
+
+
+def _finish(details: Optional[List[Dict[str, Any]]], round_number: int, result: CombatResult, message: str) -> None:
+    if details is not None:
+        details.append({
+            "round": round_number,
+            "action": "combat_end",
+            "result": result.name,
+            "message": message
+        })
+
+
+def _ship_volley(
+    shooter: CombatantStats,
+    target: CombatantStats,
+    target_drones: int,
+    hit_chance: float,
+    actor: str,
+    round_number: int,
+    rng: random.Random,
+    details: Optional[List[Dict[str, Any]]],
+) -> Tuple[int, bool]:
+    """One side's turn in a ship duel; returns (target drones destroyed, target ship destroyed)."""
+    if rng.random() >= hit_chance:
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": actor,
+                "action": "miss",
+                "message": f"{shooter.name}'s attack missed {target.name}'s ship"
+            })
+        return 0, False
+
+    weapon_name = SHIP_DEFAULT_WEAPONS.get(shooter.ship_type, "laser")
+    weapon = WEAPON_TYPES[weapon_name]
+
+    if target_drones > 0:
+        # Attack drones first (shield layer) — apply shield_effectiveness
+        raw_destroyed = rng.randint(1, min(3, target_drones))
+        drones_destroyed = max(1, int(raw_destroyed * weapon["shield_effectiveness"]))
+        drones_destroyed = min(drones_destroyed, target_drones)
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": actor,
+                "action": "drone_attack",
+                "message": f"{shooter.name}'s {weapon_name} destroyed {drones_destroyed} of {target.name}'s drones",
+                "drones_destroyed": drones_destroyed,
+                "weapon_type": weapon_name,
+                "weapon_effectiveness": weapon["shield_effectiveness"]
+            })
+        return drones_destroyed, False
+
+    # Attack ship - damage with rank bonus, weapon type, and type modifier
+    base_damage = rng.randint(1, 10)
+    type_modifier = SHIP_COMBAT_MODIFIERS.get((shooter.ship_type, target.ship_type), 1.0)
+    # Drones gone = hull exposed, use hull_effectiveness
+    weapon_eff = weapon["hull_effectiveness"]
+    damage = int(base_damage * shooter.damage_mult * type_modifier * weapon["base_damage"] * weapon_eff)
+
+    ship_destruction_chance = damage / 50  # Example: 10 damage = 20% chance
+    if rng.random() < ship_destruction_chance:
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": actor,
+                "action": "ship_destroyed",
+                "message": f"{shooter.name}'s {weapon_name} critically damaged {target.name}'s ship, forcing ejection",
+                "weapon_type": weapon_name
+            })
+        return 0, True
+
+    if details is not None:
+        modifier_note = f" (x{type_modifier:.1f} type advantage)" if type_modifier != 1.0 else ""
+        weapon_note = f" [{weapon_name} x{weapon_eff:.1f} hull eff.]"
+        details.append({
+            "round": round_number,
+            "actor": actor,
+            "action": "ship_attack",
+            "message": f"{shooter.name}'s {weapon_name} hit {target.name}'s ship for {damage} damage{modifier_note}{weapon_note}",
+            "weapon_type": weapon_name,
+            "weapon_effectiveness": weapon_eff
+        })
+    return 0, False
+
+
+def steal_cargo(cargo: Dict[str, int], rng: random.Random) -> Dict[str, int]:
+    """Random portion of a defeated ship's cargo taken by the victor."""
+    stolen = {}
+    for resource, amount in cargo.items():
+        if rng.random() < 0.7:  # 70% chance to steal each resource
+            steal_amount = int(amount * rng.uniform(0.3, 0.8))  # Steal 30-80%
+            if steal_amount > 0:
+                stolen[resource] = steal_amount
+    return stolen
+
+
+def resolve_ship_duel(
+    attacker: CombatantStats,
+    defender: CombatantStats,
+    rng: random.Random,
+    defender_cargo: Optional[Dict[str, int]] = None,
+    record: bool = True,
+) -> Dict[str, Any]:
+    """Resolve ship-to-ship combat between two players."""
+    details: Optional[List[Dict[str, Any]]] = [] if record else None
+    attacker_drones = attacker.drones
+    defender_drones = defender.drones
+
+    round_number = 0
+    attacker_drones_lost = 0
+    defender_drones_lost = 0
+    attacker_ship_destroyed = False
+    defender_ship_destroyed = False
+    fled_result = None  # Set to CombatResult.ATTACKER_FLED or DEFENDER_FLED if someone escapes
+
+    attacker_hit_chance = min(0.8, _ratio(attacker.attack_power, defender.defense_power * 1.5) * 0.6)
+    defender_hit_chance = min(0.8, _ratio(defender.defense_power, attacker.attack_power * 1.5) * 0.6)
+
+    # Combat continues until one side is defeated or retreats
+    while not attacker_ship_destroyed and not defender_ship_destroyed:
+        round_number += 1
+        if details is not None:
+            details.append({"round": round_number, "message": f"Combat Round {round_number}"})
+
+        # Attacker's turn
+        lost, defender_ship_destroyed = _ship_volley(
+            attacker, defender, defender_drones, attacker_hit_chance, "attacker", round_number, rng, details
+        )
+        defender_drones -= lost
+        defender_drones_lost += lost
+        if defender_ship_destroyed:
+            break
+
+        # Defender's turn
+        lost, attacker_ship_destroyed = _ship_volley(
+            defender, attacker, attacker_drones, defender_hit_chance, "defender", round_number, rng, details
+        )
+        attacker_drones -= lost
+        attacker_drones_lost += lost
+
+        # A combatant whose hull is exposed (all drones destroyed) attempts to flee
+        if not attacker_ship_destroyed:
+            if defender_drones <= 0:
+                escape_pct = escape_chance(defender.speed, defender.ship_type, attacker.speed)
+                if rng.randint(1, 100) <= escape_pct:
+                    fled_result = CombatResult.DEFENDER_FLED
+                    if details is not None:
+                        details.append({
+                            "round": round_number,
+                            "actor": "defender",
+                            "action": "escape",
+                            "message": (
+                                f"{defender.name}'s ship engaged emergency thrusters "
+                                f"and escaped! (escape chance: {escape_pct}%)"
+                            ),
+                            "escape_chance": escape_pct
+                        })
+
+            if fled_result is None and attacker_drones <= 0:
+                escape_pct = escape_chance(attacker.speed, attacker.ship_type, defender.speed)
+                if rng.randint(1, 100) <= escape_pct:
+                    fled_result = CombatResult.ATTACKER_FLED
+                    if details is not None:
+                        details.append({
+                            "round": round_number,
+                            "actor": "attacker",
+                            "action": "escape",
+                            "message": (
+                                f"{attacker.name}'s ship engaged emergency thrusters "
+                                f"and escaped! (escape chance: {escape_pct}%)"
+                            ),
+                            "escape_chance": escape_pct
+                        })
+
+        if fled_result is not None or attacker_ship_destroyed:
+            break
+
+        if round_number >= SHIP_DUEL_MAX_ROUNDS:
+            if details is not None:
+                details.append({
+                    "round": round_number,
+                    "action": "stalemate",
+                    "message": f"Combat ends in a draw after {SHIP_DUEL_MAX_ROUNDS} rounds"
+                })
+            break
+
+    if fled_result is not None:
+        result = fled_result
+        if fled_result == CombatResult.ATTACKER_FLED:
+            message = f"{attacker.name} fled from combat with {defender.name}"
+        else:
+            message = f"{defender.name} escaped from {attacker.name}'s attack"
+    elif attacker_ship_destroyed and defender_ship_destroyed:
+        result = CombatResult.MUTUAL_DESTRUCTION
+        message = "Combat ended in mutual destruction"
+    elif attacker_ship_destroyed:
+        result = CombatResult.DEFENDER_VICTORY
+        message = f"{defender.name} defeated {attacker.name} in combat"
+    elif defender_ship_destroyed:
+        result = CombatResult.ATTACKER_VICTORY
+        message = f"{attacker.name} defeated {defender.name} in combat"
+    else:
+        result = CombatResult.DRAW
+        message = "Combat ended in a draw"
+
+    cargo_stolen = {}
+    if result == CombatResult.ATTACKER_VICTORY and defender_cargo:
+        cargo_stolen = steal_cargo(defender_cargo, rng)
+        if cargo_stolen and details is not None:
+            cargo_list = ", ".join([f"{amount} {resource}" for resource, amount in cargo_stolen.items()])
+            details.append({
+                "round": round_number,
+                "actor": "attacker",
+                "action": "cargo_theft",
+                "message": f"{attacker.name} salvaged cargo from {defender.name}'s ship: {cargo_list}"
+            })
+
+    _finish(details, round_number, result, message)
+
+    return {
+        "result": result,
+        "message": message,
+        "rounds": round_number,
+        "attacker_drones_lost": attacker_drones_lost,
+        "defender_drones_lost": defender_drones_lost,
+        "attacker_ship_destroyed": attacker_ship_destroyed,
+        "defender_ship_destroyed": defender_ship_destroyed,
+        "cargo_stolen": cargo_stolen,
+        "combat_details": details or []
+    }
+
+
+def _defender_strike(
+    attacker: CombatantStats,
+    attacker_drones: int,
+    hit_chance: float,
+    max_damage: int,
+    destruction_divisor: int,
+    defender_label: str,
+    miss_label: str,
+    round_number: int,
+    rng: random.Random,
+    details: Optional[List[Dict[str, Any]]],
+) -> Tuple[int, bool]:
+    """Static defenses (drones, planet, station) firing at the attacking ship."""
+    if rng.random() >= hit_chance:
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": "defender",
+                "action": "miss",
+                "message": f"{miss_label} attack missed {attacker.name}'s ship"
+            })
+        return 0, False
+
+    if attacker_drones > 0:
+        # Attack attacker's drones first
+        drones_destroyed = rng.randint(1, min(3, attacker_drones))
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": "defender",
+                "action": "drone_attack",
+                "message": f"{defender_label} destroyed {drones_destroyed} of {attacker.name}'s drones",
+                "drones_destroyed": drones_destroyed
+            })
+        return drones_destroyed, False
+
+    damage = rng.randint(1, max_damage)
+    if rng.random() < damage / destruction_divisor:
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": "defender",
+                "action": "ship_destroyed",
+                "message": f"{defender_label} critically damaged {attacker.name}'s ship, forcing ejection"
+            })
+        return 0, True
+
+    if details is not None:
+        details.append({
+            "round": round_number,
+            "actor": "defender",
+            "action": "ship_attack",
+            "message": f"{defender_label} hit {attacker.name}'s ship for {damage} damage"
+        })
+    return 0, False
+
+
+def allocate_losses(counts: Sequence[int], total_lost: int) -> np.ndarray:
+    """
+    Attribute ``total_lost`` drones to deployments in order: the first
+    deployment loses drones until it is empty, then the next, and so on.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    before = np.cumsum(counts) - counts
+    return np.clip(total_lost - before, 0, counts)
+
+
+def resolve_drone_assault(
+    attacker: CombatantStats,
+    deployments: Sequence[Tuple[str, str, int]],
+    rng: random.Random,
+    record: bool = True,
+) -> Dict[str, Any]:
+    """Resolve combat between a ship and sector drones.
+
+    ``deployments`` is a sequence of (deployment_id, player_id, drone_count).
+    """
+    details: Optional[List[Dict[str, Any]]] = [] if record else None
+    attacker_drones = attacker.drones
+    total_defender_drones = sum(count for _, _, count in deployments)
+    defender_drones = total_defender_drones
+    defender_attack = total_defender_drones * 0.5  # Each drone contributes to attack power
+
+    round_number = 0
+    attacker_drones_lost = 0
+    defender_drones_lost = 0
+    attacker_ship_destroyed = False
+
+    hit_chance = min(0.7, _ratio(defender_attack, attacker.attack_power * 2) * 0.5)
+
+    while not attacker_ship_destroyed and defender_drones > 0:
+        round_number += 1
+        if details is not None:
+            details.append({"round": round_number, "message": f"Combat Round {round_number}"})
+
+        # Attacker's turn
+        drones_destroyed = rng.randint(1, min(5, defender_drones))
+        defender_drones -= drones_destroyed
+        defender_drones_lost += drones_destroyed
+
+        if details is not None:
+            details.append({
+                "round": round_number,
+                "actor": "attacker",
+                "action": "drone_attack",
+                "message": f"{attacker.name}'s ship destroyed {drones_destroyed} sector defense drones",
+                "drones_destroyed": drones_destroyed
+            })
+
+        if defender_drones <= 0:
+            break
+
+        # Defender's turn (drones)
+        lost, attacker_ship_destroyed = _defender_strike(
+            attacker, attacker_drones, hit_chance, 8, 60,
+            "Sector defense drones", "Sector defense drones'", round_number, rng, details
+        )
+        attacker_drones -= lost
+        attacker_drones_lost += lost
+
+        if round_number >= DRONE_ASSAULT_MAX_ROUNDS:
+            if details is not None:
+                details.append({
+                    "round": round_number,
+                    "action": "stalemate",
+                    "message": f"Combat ends as attacker withdraws after {DRONE_ASSAULT_MAX_ROUNDS} rounds"
+                })
+            break
+
+    if attacker_ship_destroyed:
+        result = CombatResult.DEFENDER_VICTORY
+        message = f"Sector defense drones defeated {attacker.name}"
+    elif defender_drones <= 0:
+        result = CombatResult.ATTACKER_VICTORY
+        message = f"{attacker.name} destroyed all sector defense drones"
+    else:
+        result = CombatResult.DRAW
+        message = "Combat ended in a stalemate"
+
+    _finish(details, round_number, result, message)
+
+    # Losses fall on deployments in order, so they are attributed once from the total
+    lost_per_deployment = allocate_losses([count for _, _, count in deployments], defender_drones_lost)
+    deployment_updates = [
+        {
+            "deployment_id": deployment_id,
+            "player_id": player_id,
+            "starting_drones": count,
+            "drones_lost": int(lost)
+        }
+        for (deployment_id, player_id, count), lost in zip(deployments, lost_per_deployment)
+    ]
+
+    return {
+        "result": result,
+        "message": message,
+        "rounds": round_number,
+        "attacker_drones_lost": attacker_drones_lost,
+        "defender_drones_lost": defender_drones_lost,
+        "attacker_ship_destroyed": attacker_ship_destroyed,
+        "deployment_updates": deployment_updates,
+        "combat_details": details or []
+    }
+
+
+def resolve_planet_assault(
+    attacker: CombatantStats,
+    planet: PlanetDefense,
+    rng: random.Random,
+    record: bool = True,
+) -> Dict[str, Any]:
+    """Resolve combat between a ship and a planet."""
+    details: Optional[List[Dict[str, Any]]] = [] if record else None
+    attacker_drones = attacker.drones
+
+    planetary_def = planetary_defense_reduction(planet.defense_level, planet.defense_shields, planet.shields)
+    damage_reduction = planetary_def["damage_reduction"]
+    remaining_shield_hp = planetary_def["shield_hp"]
+
+    planet_attack = planet.weapon_batteries * 2 + planet.defense_level * 3
+    planet_defense = planet.shields * 3 + planet.defense_level * 5
+
+    round_number = 0
+    attacker_drones_lost = 0
+    planet_damage = 0
+    attacker_ship_destroyed = False
+    planet_captured = False
+
+    if details is not None and (damage_reduction > 0 or remaining_shield_hp > 0):
+        details.append({
+            "round": 0,
+            "action": "planetary_defense_status",
+            "message": f"Planetary defenses active: {planetary_def['description']}",
+            "damage_reduction": damage_reduction,
+            "shield_hp": remaining_shield_hp
+        })
+
+    planet_hit_chance = min(0.7, _ratio(planet_attack, attacker.attack_power * 1.5) * 0.5)
+
+    while not attacker_ship_destroyed and not planet_captured:
+        round_number += 1
+        if details is not None:
+            details.append({"round": round_number, "message": f"Combat Round {round_number}"})
+
+        # Attacker's turn
+        hit_chance = min(0.8, _ratio(attacker.attack_power, planet_defense * 1.2) * 0.6)
+        if rng.random() < hit_chance:
+            raw_damage = rng.randint(1, 5)
+            # Apply planetary defense reduction to attacker's damage
+            reduced_damage = max(1, int(raw_damage * (1.0 - damage_reduction)))
+
+            # If shield HP remains, absorb damage there first
+            if remaining_shield_hp > 0:
+                shield_absorbed = min(reduced_damage, remaining_shield_hp)
+                remaining_shield_hp -= shield_absorbed
+                damage = reduced_damage - shield_absorbed
+                if details is not None and shield_absorbed > 0:
+                    details.append({
+                        "round": round_number,
+                        "actor": "attacker",
+                        "action": "shield_hit",
+                        "message": f"Planetary shields absorbed {shield_absorbed} damage ({remaining_shield_hp} shield HP remaining)",
+                        "shield_absorbed": shield_absorbed,
+                        "shield_hp_remaining": remaining_shield_hp
+                    })
+            else:
+                damage = reduced_damage
+
+            planet_damage += damage
+
+            # Update planet defense parameters for subsequent rounds
+            effective_defense_left = max(0, planet.defense_level - planet_damage)
+            planet_defense = effective_defense_left * 5 + planet.shields * 3
+
+            if details is not None and damage > 0:
+                reduction_note = f" (reduced from {raw_damage} by {damage_reduction:.0%} defenses)" if damage_reduction > 0 else ""
+                details.append({
+                    "round": round_number,
+                    "actor": "attacker",
+                    "action": "planet_attack",
+                    "message": f"{attacker.name}'s ship damaged planet defenses for {damage} points{reduction_note}",
+                    "damage": damage,
+                    "raw_damage": raw_damage,
+                    "damage_reduction": damage_reduction
+                })
+
+            if planet_damage >= planet.defense_level:
+                planet_captured = True
+                if details is not None:
+                    details.append({
+                        "round": round_number,
+                        "actor": "attacker",
+                        "action": "planet_captured",
+                        "message": f"{attacker.name} has overcome planetary defenses and captured the planet"
+                    })
+        elif details is not None:
+            details.append({
+                "round": round_number,
+                "actor": "attacker",
+                "action": "miss",
+                "message": f"{attacker.name}'s attack missed planetary defenses"
+            })
+
+        if planet_captured:
+            break
+
+        # Planet's turn
+        lost, attacker_ship_destroyed = _defender_strike(
+            attacker, attacker_drones, planet_hit_chance, 7, 50,
+            "Planetary defenses", "Planetary defense systems'", round_number, rng, details
+        )
+        attacker_drones -= lost
+        attacker_drones_lost += lost
+
+        if round_number >= PLANET_ASSAULT_MAX_ROUNDS:
+            if details is not None:
+                details.append({
+                    "round": round_number,
+                    "action": "stalemate",
+                    "message": f"Combat ends as attacker withdraws after {PLANET_ASSAULT_MAX_ROUNDS} rounds"
+                })
+            break
+
+    if attacker_ship_destroyed:
+        result = CombatResult.DEFENDER_VICTORY
+        message = f"Planetary defenses defeated {attacker.name}"
+    elif planet_captured:
+        result = CombatResult.ATTACKER_VICTORY
+        message = f"{attacker.name} captured planet {planet.name}"
+    else:
+        result = CombatResult.DRAW
+        message = "Combat ended in a stalemate"
+
+    _finish(details, round_number, result, message)
+
+    return {
+        "result": result,
+        "message": message,
+        "rounds": round_number,
+        "attacker_drones_lost": attacker_drones_lost,
+        "defender_drones_lost": 0,  # Planets don't have drones
+        "attacker_ship_destroyed": attacker_ship_destroyed,
+        "planet_damage": planet_damage,
+        "planet_captured": planet_captured,
+        "combat_details": details or []
+    }
+
+
+def resolve_port_assault(
+    attacker: CombatantStats,
+    station: StationDefense,
+    rng: random.Random,
+    record: bool = True,
+) -> Dict[str, Any]:
+    """Resolve combat between a ship and a station."""
+    details: Optional[List[Dict[str, Any]]] = [] if record else None
+    attacker_drones = attacker.drones
+
+    port_attack = station.defense_weapons * 2 + station.defense_level * 2
+    port_defense = station.shields * 2 + station.defense_level * 4
+
+    round_number = 0
+    attacker_drones_lost = 0
+    port_damage = 0
+    attacker_ship_destroyed = False
+    port_captured = False
+
+    port_hit_chance = min(0.7, _ratio(port_attack, attacker.attack_power * 1.3) * 0.5)
+
+    while not attacker_ship_destroyed and not port_captured:
+        round_number += 1
+        if details is not None:
+            details.append({"round": round_number, "message": f"Combat Round {round_number}"})
+
+        # Attacker's turn
+        hit_chance = min(0.8, _ratio(attacker.attack_power, port_defense * 1.1) * 0.6)
+        if rng.random() < hit_chance:
+            damage = rng.randint(1, 5)
+            port_damage += damage
+
+            # Update port defense parameters for subsequent rounds
+            effective_defense_left = max(0, station.defense_level - port_damage)
+            port_defense = effective_defense_left * 4 + station.shields * 2
+
+            if details is not None:
+                details.append({
+                    "round": round_number,
+                    "actor": "attacker",
+                    "action": "port_attack",
+                    "message": f"{attacker.name}'s ship damaged port defenses for {damage} points",
+                    "damage": damage
+                })
+
+            if port_damage >= station.defense_level:
+                port_captured = True
+                if details is not None:
+                    details.append({
+                        "round": round_number,
+                        "actor": "attacker",
+                        "action": "port_captured",
+                        "message": f"{attacker.name} has overcome port defenses and captured the port"
+                    })
+        elif details is not None:
+            details.append({
+                "round": round_number,
+                "actor": "attacker",
+                "action": "miss",
+                "message": f"{attacker.name}'s attack missed port defenses"
+            })
+
+        if port_captured:
+            break
+
+        # Station's turn
+        lost, attacker_ship_destroyed = _defender_strike(
+            attacker, attacker_drones, port_hit_chance, 6, 50,
+            "Station defenses", "Station defense systems'", round_number, rng, details
+        )
+        attacker_drones -= lost
+        attacker_drones_lost += lost
+
+        if round_number >= PORT_ASSAULT_MAX_ROUNDS:
+            if details is not None:
+                details.append({
+                    "round": round_number,
+                    "action": "stalemate",
+                    "message": f"Combat ends as attacker withdraws after {PORT_ASSAULT_MAX_ROUNDS} rounds"
+                })
+            break
+
+    if attacker_ship_destroyed:
+        result = CombatResult.DEFENDER_VICTORY
+        message = f"Station defenses defeated {attacker.name}"
+    elif port_captured:
+        result = CombatResult.ATTACKER_VICTORY
+        message = f"{attacker.name} captured port {station.name}"
+    else:
+        result = CombatResult.DRAW
+        message = "Combat ended in a stalemate"
+
+    _finish(details, round_number, result, message)
+
+    return {
+        "result": result,
+        "message": message,
+        "rounds": round_number,
+        "attacker_drones_lost": attacker_drones_lost,
+        "defender_drones_lost": 0,  # Ports don't have drones like players
+        "attacker_ship_destroyed": attacker_ship_destroyed,
+        "port_damage": port_damage,
+        "port_captured": port_captured,
+        "combat_details": details or []
+    }
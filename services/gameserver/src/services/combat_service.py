@@ -17,6 +17,12 @@ from src.models.planet import Planet
 from src.models.station import Station
 from src.services.ship_service import ShipService
 from src.services.ranking_service import RankingService
+from src.services.combat_kernel import (
+    SHIP_COMBAT_MODIFIERS, WEAPON_TYPES, SHIP_DEFAULT_WEAPONS, FAST_ESCAPE_SHIP_TYPES,
+    CombatantStats, PlanetDefense, StationDefense,
+    escape_chance, planetary_defense_reduction, ship_attack_power, ship_defense_power,
+    resolve_drone_assault, resolve_planet_assault, resolve_port_assault, resolve_ship_duel,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,45 +30,17 @@ logger = logging.getLogger(__name__)
 class CombatService:
     """Service for managing combat in the game."""
 
-    # Weapon effectiveness multipliers based on ship type matchups
-    SHIP_COMBAT_MODIFIERS = {
-        # (attacker_type, defender_type): damage_multiplier
-        (ShipType.DEFENDER, ShipType.CARGO_HAULER): 1.5,      # Military vs trade
-        (ShipType.DEFENDER, ShipType.LIGHT_FREIGHTER): 1.3,   # Military vs light trade
-        (ShipType.FAST_COURIER, ShipType.CARRIER): 0.7,       # Light vs heavy
-        (ShipType.SCOUT_SHIP, ShipType.CARRIER): 0.5,         # Scout vs capital
-        (ShipType.CARRIER, ShipType.SCOUT_SHIP): 1.8,         # Capital vs scout
-        (ShipType.CARRIER, ShipType.FAST_COURIER): 1.5,       # Capital vs light
-        (ShipType.COLONY_SHIP, ShipType.DEFENDER): 0.5,       # Colony ship weak in combat
-    }
+    # Combat tables live in the kernel; kept here for existing callers
+    SHIP_COMBAT_MODIFIERS = SHIP_COMBAT_MODIFIERS
+    WEAPON_TYPES = WEAPON_TYPES
+    SHIP_DEFAULT_WEAPONS = SHIP_DEFAULT_WEAPONS
+    FAST_ESCAPE_SHIP_TYPES = FAST_ESCAPE_SHIP_TYPES
 
-    # Weapon type effectiveness against different defenses
-    WEAPON_TYPES = {
-        "laser": {"base_damage": 1.0, "shield_effectiveness": 0.8, "hull_effectiveness": 1.0, "description": "Standard energy weapon"},
-        "plasma": {"base_damage": 1.2, "shield_effectiveness": 1.2, "hull_effectiveness": 0.9, "description": "High-energy plasma bolts"},
-        "missile": {"base_damage": 1.5, "shield_effectiveness": 0.6, "hull_effectiveness": 1.5, "description": "Physical projectile, bypasses some shields"},
-        "emp": {"base_damage": 0.5, "shield_effectiveness": 2.0, "hull_effectiveness": 0.3, "description": "Electromagnetic pulse, devastating to shields"},
-    }
-
-    # Default weapon type by ship type
-    SHIP_DEFAULT_WEAPONS = {
-        ShipType.ESCAPE_POD: "laser",
-        ShipType.LIGHT_FREIGHTER: "laser",
-        ShipType.CARGO_HAULER: "laser",
-        ShipType.FAST_COURIER: "laser",
-        ShipType.SCOUT_SHIP: "emp",
-        ShipType.COLONY_SHIP: "laser",
-        ShipType.DEFENDER: "plasma",
-        ShipType.CARRIER: "missile",
-        ShipType.WARP_JUMPER: "plasma",
-    }
-
-    # Ship types that get a bonus to escape chance due to speed/agility
-    FAST_ESCAPE_SHIP_TYPES = {ShipType.FAST_COURIER, ShipType.SCOUT_SHIP}
-
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, seed: Optional[int] = None):
         self.db = db
         self.ship_service = ShipService(db)
+        # Seeding makes every resolution in this service replayable
+        self.rng = random.Random(seed)
     
     def attack_player(self, attacker_id: uuid.UUID, defender_id: uuid.UUID) -> Dict[str, Any]:
         """Initiate ship-to-ship combat between two players."""
@@ -321,11 +299,12 @@ class CombatService:
         
         # Update deployments and sector drone count
         new_sector_drone_count = 0
+        deployments_by_id = {str(d.id): d for d in deployments}
         for deployment_update in combat_result["deployment_updates"]:
             deployment_id = deployment_update["deployment_id"]
             drones_lost = deployment_update["drones_lost"]
             
-            deployment = next((d for d in deployments if str(d.id) == deployment_id), None)
+            deployment = deployments_by_id.get(deployment_id)
             if deployment:
                 deployment.drones_lost += drones_lost
                 deployment.drone_count = max(0, deployment.drone_count - drones_lost)
@@ -903,843 +882,67 @@ class CombatService:
         # In Border regions, combat is allowed but with penalties
         return True
     
+    def _combatant(self, player: Player, damage_mult: float = 1.0) -> CombatantStats:
+        """Snapshot a player's current ship and drones as kernel inputs."""
+        ship = player.current_ship
+        drones = player.defense_drones or 0
+        return CombatantStats(
+            name=player.username,
+            ship_type=ship.type if ship else None,
+            attack_power=self._calculate_attack_power(ship, drones),
+            defense_power=self._calculate_defense_power(ship, drones),
+            drones=drones,
+            damage_mult=damage_mult,
+            speed=ship.current_speed if ship else 1.0,
+        )
+
     def _resolve_ship_combat(self, attacker: Player, defender: Player, sector: Sector) -> Dict[str, Any]:
         """Resolve ship-to-ship combat between two players."""
-        # Get ships and equipment
-        attacker_ship = attacker.current_ship
-        defender_ship = defender.current_ship
-
         # Get rank combat bonuses for both sides
         attacker_bonuses = RankingService.get_rank_bonuses(attacker.military_rank)
         defender_bonuses = RankingService.get_rank_bonuses(defender.military_rank)
         attacker_damage_mult = 1.0 + (attacker_bonuses["combat_damage_bonus_percent"] / 100.0)
         defender_damage_mult = 1.0 + (defender_bonuses["combat_damage_bonus_percent"] / 100.0)
 
-        # Combat parameters
-        attacker_drones = attacker.defense_drones
-        defender_drones = defender.defense_drones
-        attacker_attack = self._calculate_attack_power(attacker_ship, attacker_drones)
-        defender_defense = self._calculate_defense_power(defender_ship, defender_drones)
-        
-        # Track combat details
-        round_number = 0
-        attacker_drones_lost = 0
-        defender_drones_lost = 0
-        attacker_ship_destroyed = False
-        defender_ship_destroyed = False
-        fled_result = None  # Set to CombatResult.ATTACKER_FLED or DEFENDER_FLED if someone escapes
-        combat_details = []
-        
-        # Combat continues until one side is defeated or retreats
-        while (not attacker_ship_destroyed and not defender_ship_destroyed):
-            round_number += 1
-            
-            # Add round header
-            combat_details.append({
-                "round": round_number,
-                "message": f"Combat Round {round_number}"
-            })
-            
-            # Attacker's turn
-            if not attacker_ship_destroyed:
-                # Calculate chance to hit
-                hit_chance = min(0.8, attacker_attack / (defender_defense * 1.5) * 0.6)
-                
-                # Random element
-                if random.random() < hit_chance:
-                    # Successful hit
-                    # Determine if attacking drones or ship
-                    # Determine attacker weapon type
-                    atk_weapon_name = self.SHIP_DEFAULT_WEAPONS.get(attacker_ship.type, "laser")
-                    atk_weapon = self.WEAPON_TYPES[atk_weapon_name]
-
-                    if defender_drones > 0:
-                        # Attack drones first (shield layer) — apply shield_effectiveness
-                        raw_destroyed = random.randint(1, min(3, defender_drones))
-                        drones_destroyed = max(1, int(raw_destroyed * atk_weapon["shield_effectiveness"]))
-                        drones_destroyed = min(drones_destroyed, defender_drones)
-                        defender_drones -= drones_destroyed
-                        defender_drones_lost += drones_destroyed
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "attacker",
-                            "action": "drone_attack",
-                            "message": f"{attacker.username}'s {atk_weapon_name} destroyed {drones_destroyed} of {defender.username}'s drones",
-                            "drones_destroyed": drones_destroyed,
-                            "weapon_type": atk_weapon_name,
-                            "weapon_effectiveness": atk_weapon["shield_effectiveness"]
-                        })
-                    else:
-                        # Attack ship - calculate ship damage with rank bonus, weapon type, and type modifier
-                        base_damage = random.randint(1, 10)
-                        type_modifier = self.SHIP_COMBAT_MODIFIERS.get(
-                            (attacker_ship.type, defender_ship.type), 1.0
-                        )
-                        weapon_base = atk_weapon["base_damage"]
-                        # Drones gone = hull exposed, use hull_effectiveness
-                        weapon_eff = atk_weapon["hull_effectiveness"]
-                        damage = int(base_damage * attacker_damage_mult * type_modifier * weapon_base * weapon_eff)
-
-                        # Check if defender ship destroyed
-                        ship_destruction_chance = damage / 50  # Example: 10 damage = 20% chance
-                        if random.random() < ship_destruction_chance:
-                            defender_ship_destroyed = True
-                            combat_details.append({
-                                "round": round_number,
-                                "actor": "attacker",
-                                "action": "ship_destroyed",
-                                "message": f"{attacker.username}'s {atk_weapon_name} critically damaged {defender.username}'s ship, forcing ejection",
-                                "weapon_type": atk_weapon_name
-                            })
-                        else:
-                            modifier_note = f" (x{type_modifier:.1f} type advantage)" if type_modifier != 1.0 else ""
-                            weapon_note = f" [{atk_weapon_name} x{weapon_eff:.1f} hull eff.]"
-                            combat_details.append({
-                                "round": round_number,
-                                "actor": "attacker",
-                                "action": "ship_attack",
-                                "message": f"{attacker.username}'s {atk_weapon_name} hit {defender.username}'s ship for {damage} damage{modifier_note}{weapon_note}",
-                                "weapon_type": atk_weapon_name,
-                                "weapon_effectiveness": weapon_eff
-                            })
-                else:
-                    # Miss
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "attacker",
-                        "action": "miss",
-                        "message": f"{attacker.username}'s attack missed {defender.username}'s ship"
-                    })
-
-            # Check if combat is over
-            if defender_ship_destroyed:
-                break
-
-            # Defender's turn
-            if not defender_ship_destroyed:
-                # Calculate chance to hit
-                hit_chance = min(0.8, defender_defense / (attacker_attack * 1.5) * 0.6)
-
-                # Random element
-                if random.random() < hit_chance:
-                    # Successful hit
-                    # Determine if attacking drones or ship
-                    # Determine defender weapon type
-                    def_weapon_name = self.SHIP_DEFAULT_WEAPONS.get(defender_ship.type, "laser")
-                    def_weapon = self.WEAPON_TYPES[def_weapon_name]
-
-                    if attacker_drones > 0:
-                        # Attack drones first (shield layer) — apply shield_effectiveness
-                        raw_destroyed = random.randint(1, min(3, attacker_drones))
-                        drones_destroyed = max(1, int(raw_destroyed * def_weapon["shield_effectiveness"]))
-                        drones_destroyed = min(drones_destroyed, attacker_drones)
-                        attacker_drones -= drones_destroyed
-                        attacker_drones_lost += drones_destroyed
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "drone_attack",
-                            "message": f"{defender.username}'s {def_weapon_name} destroyed {drones_destroyed} of {attacker.username}'s drones",
-                            "drones_destroyed": drones_destroyed,
-                            "weapon_type": def_weapon_name,
-                            "weapon_effectiveness": def_weapon["shield_effectiveness"]
-                        })
-                    else:
-                        # Attack ship - calculate ship damage with rank bonus, weapon type, and type modifier
-                        base_damage = random.randint(1, 10)
-                        type_modifier = self.SHIP_COMBAT_MODIFIERS.get(
-                            (defender_ship.type, attacker_ship.type), 1.0
-                        )
-                        weapon_base = def_weapon["base_damage"]
-                        # Drones gone = hull exposed, use hull_effectiveness
-                        weapon_eff = def_weapon["hull_effectiveness"]
-                        damage = int(base_damage * defender_damage_mult * type_modifier * weapon_base * weapon_eff)
-
-                        # Check if attacker ship destroyed
-                        ship_destruction_chance = damage / 50  # Example: 10 damage = 20% chance
-                        if random.random() < ship_destruction_chance:
-                            attacker_ship_destroyed = True
-                            combat_details.append({
-                                "round": round_number,
-                                "actor": "defender",
-                                "action": "ship_destroyed",
-                                "message": f"{defender.username}'s {def_weapon_name} critically damaged {attacker.username}'s ship, forcing ejection",
-                                "weapon_type": def_weapon_name
-                            })
-                        else:
-                            modifier_note = f" (x{type_modifier:.1f} type advantage)" if type_modifier != 1.0 else ""
-                            weapon_note = f" [{def_weapon_name} x{weapon_eff:.1f} hull eff.]"
-                            combat_details.append({
-                                "round": round_number,
-                                "actor": "defender",
-                                "action": "ship_attack",
-                                "message": f"{defender.username}'s {def_weapon_name} hit {attacker.username}'s ship for {damage} damage{modifier_note}{weapon_note}",
-                                "weapon_type": def_weapon_name,
-                                "weapon_effectiveness": weapon_eff
-                            })
-                else:
-                    # Miss
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "defender",
-                        "action": "miss",
-                        "message": f"{defender.username}'s attack missed {attacker.username}'s ship"
-                    })
-
-            # --- Escape check after both sides have dealt damage this round ---
-            # A combatant whose hull is exposed (all drones destroyed) attempts
-            # to flee. This represents being "below 25% effective hull" since
-            # the drone shield layer is gone and the ship is taking direct hits.
-            if not attacker_ship_destroyed and not defender_ship_destroyed:
-                # Defender tries to escape if they have no drones left (hull exposed)
-                if defender_drones <= 0:
-                    escape_pct = self._calculate_escape_chance(defender_ship, attacker_ship)
-                    if random.randint(1, 100) <= escape_pct:
-                        fled_result = CombatResult.DEFENDER_FLED
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "escape",
-                            "message": (
-                                f"{defender.username}'s ship engaged emergency thrusters "
-                                f"and escaped! (escape chance: {escape_pct}%)"
-                            ),
-                            "escape_chance": escape_pct
-                        })
-
-                # Attacker tries to escape if they have no drones left (hull exposed)
-                if fled_result is None and attacker_drones <= 0:
-                    escape_pct = self._calculate_escape_chance(attacker_ship, defender_ship)
-                    if random.randint(1, 100) <= escape_pct:
-                        fled_result = CombatResult.ATTACKER_FLED
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "attacker",
-                            "action": "escape",
-                            "message": (
-                                f"{attacker.username}'s ship engaged emergency thrusters "
-                                f"and escaped! (escape chance: {escape_pct}%)"
-                            ),
-                            "escape_chance": escape_pct
-                        })
-
-            if fled_result is not None:
-                break
+        defender_ship = defender.current_ship
+        return resolve_ship_duel(
+            self._combatant(attacker, attacker_damage_mult),
+            self._combatant(defender, defender_damage_mult),
+            self.rng,
+            defender_cargo=defender_ship.cargo if defender_ship else None,
+        )
 
-            # Check if combat ends due to round limit
-            if round_number >= 10:
-                combat_details.append({
-                    "round": round_number,
-                    "action": "stalemate",
-                    "message": "Combat ends in a draw after 10 rounds"
-                })
-                break
-        
-        # Determine result
-        if fled_result is not None:
-            result = fled_result
-            if fled_result == CombatResult.ATTACKER_FLED:
-                message = f"{attacker.username} fled from combat with {defender.username}"
-            else:
-                message = f"{defender.username} escaped from {attacker.username}'s attack"
-        elif attacker_ship_destroyed and defender_ship_destroyed:
-            result = CombatResult.MUTUAL_DESTRUCTION
-            message = "Combat ended in mutual destruction"
-        elif attacker_ship_destroyed:
-            result = CombatResult.DEFENDER_VICTORY
-            message = f"{defender.username} defeated {attacker.username} in combat"
-        elif defender_ship_destroyed:
-            result = CombatResult.ATTACKER_VICTORY
-            message = f"{attacker.username} defeated {defender.username} in combat"
-        else:
-            result = CombatResult.DRAW
-            message = "Combat ended in a draw"
-        
-        # Determine cargo theft if attacker victorious
-        cargo_stolen = {}
-        if result == CombatResult.ATTACKER_VICTORY and defender_ship.cargo:
-            # Take a random portion of cargo
-            for resource, amount in defender_ship.cargo.items():
-                if random.random() < 0.7:  # 70% chance to steal each resource
-                    steal_amount = int(amount * random.uniform(0.3, 0.8))  # Steal 30-80%
-                    if steal_amount > 0:
-                        cargo_stolen[resource] = steal_amount
-            
-            if cargo_stolen:
-                cargo_list = ", ".join([f"{amount} {resource}" for resource, amount in cargo_stolen.items()])
-                combat_details.append({
-                    "round": round_number,
-                    "actor": "attacker",
-                    "action": "cargo_theft",
-                    "message": f"{attacker.username} salvaged cargo from {defender.username}'s ship: {cargo_list}"
-                })
-        
-        # Finalize results
-        combat_details.append({
-            "round": round_number,
-            "action": "combat_end",
-            "result": result.name,
-            "message": message
-        })
-        
-        return {
-            "result": result,
-            "message": message,
-            "rounds": round_number,
-            "attacker_drones_lost": attacker_drones_lost,
-            "defender_drones_lost": defender_drones_lost,
-            "attacker_ship_destroyed": attacker_ship_destroyed,
-            "defender_ship_destroyed": defender_ship_destroyed,
-            "cargo_stolen": cargo_stolen,
-            "combat_details": combat_details
-        }
-    
     def _resolve_drone_combat(self, attacker: Player, sector: Sector, deployments: List[DroneDeployment]) -> Dict[str, Any]:
         """Resolve combat between a ship and sector drones."""
-        # Get attacker ship and equipment
-        attacker_ship = attacker.current_ship
-        attacker_drones = attacker.defense_drones
-        
-        # Combine all defender drones
-        total_defender_drones = sum(d.drone_count for d in deployments)
-        defender_drones = total_defender_drones
-        
-        # Combat parameters
-        attacker_attack = self._calculate_attack_power(attacker_ship, attacker_drones)
-        defender_attack = total_defender_drones * 0.5  # Each drone contributes to attack power
-        
-        # Track combat details
-        round_number = 0
-        attacker_drones_lost = 0
-        defender_drones_lost = 0
-        attacker_ship_destroyed = False
-        combat_details = []
-        
-        # Track deployments affected
-        deployment_updates = []
-        for deployment in deployments:
-            deployment_updates.append({
-                "deployment_id": str(deployment.id),
-                "player_id": str(deployment.player_id),
-                "starting_drones": deployment.drone_count,
-                "drones_lost": 0
-            })
-        
-        # Combat continues until one side is defeated or retreats
-        while (not attacker_ship_destroyed and defender_drones > 0):
-            round_number += 1
-            
-            # Add round header
-            combat_details.append({
-                "round": round_number,
-                "message": f"Combat Round {round_number}"
-            })
-            
-            # Attacker's turn
-            if not attacker_ship_destroyed:
-                # Calculate damage to drones
-                drones_destroyed = random.randint(1, min(5, defender_drones))
-                defender_drones -= drones_destroyed
-                defender_drones_lost += drones_destroyed
-                
-                # Distribute drone losses across deployments
-                # This is simplified - a more sophisticated implementation would be needed
-                # for a real game to properly attribute drone losses
-                remaining_to_distribute = drones_destroyed
-                for deployment_update in deployment_updates:
-                    if remaining_to_distribute <= 0:
-                        break
-                    
-                    deployment = next((d for d in deployments if str(d.id) == deployment_update["deployment_id"]), None)
-                    if deployment and deployment.drone_count > deployment_update["drones_lost"]:
-                        available = deployment.drone_count - deployment_update["drones_lost"]
-                        lost = min(remaining_to_distribute, available)
-                        deployment_update["drones_lost"] += lost
-                        remaining_to_distribute -= lost
-                
-                combat_details.append({
-                    "round": round_number,
-                    "actor": "attacker",
-                    "action": "drone_attack",
-                    "message": f"{attacker.username}'s ship destroyed {drones_destroyed} sector defense drones",
-                    "drones_destroyed": drones_destroyed
-                })
-            
-            # Check if combat is over
-            if defender_drones <= 0:
-                break
-            
-            # Defender's turn (drones)
-            # Calculate chance to hit
-            hit_chance = min(0.7, defender_attack / (attacker_attack * 2) * 0.5)
-            
-            # Random element
-            if random.random() < hit_chance:
-                # Successful hit
-                # Determine if attacking drones or ship
-                if attacker_drones > 0:
-                    # Attack attacker's drones first
-                    drones_destroyed = random.randint(1, min(3, attacker_drones))
-                    attacker_drones -= drones_destroyed
-                    attacker_drones_lost += drones_destroyed
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "defender",
-                        "action": "drone_attack",
-                        "message": f"Sector defense drones destroyed {drones_destroyed} of {attacker.username}'s drones",
-                        "drones_destroyed": drones_destroyed
-                    })
-                else:
-                    # Attack ship - calculate ship damage
-                    damage = random.randint(1, 8)
-                    
-                    # Check if attacker ship destroyed
-                    ship_destruction_chance = damage / 60  # Lower chance than player vs player
-                    if random.random() < ship_destruction_chance:
-                        attacker_ship_destroyed = True
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "ship_destroyed",
-                            "message": f"Sector defense drones critically damaged {attacker.username}'s ship, forcing ejection"
-                        })
-                    else:
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "ship_attack",
-                            "message": f"Sector defense drones hit {attacker.username}'s ship for {damage} damage"
-                        })
-            else:
-                # Miss
-                combat_details.append({
-                    "round": round_number,
-                    "actor": "defender",
-                    "action": "miss",
-                    "message": f"Sector defense drones' attack missed {attacker.username}'s ship"
-                })
-            
-            # Check if combat ends due to round limit
-            if round_number >= 8:
-                combat_details.append({
-                    "round": round_number,
-                    "action": "stalemate",
-                    "message": "Combat ends as attacker withdraws after 8 rounds"
-                })
-                break
-        
-        # Determine result
-        if attacker_ship_destroyed:
-            result = CombatResult.DEFENDER_VICTORY
-            message = f"Sector defense drones defeated {attacker.username}"
-        elif defender_drones <= 0:
-            result = CombatResult.ATTACKER_VICTORY
-            message = f"{attacker.username} destroyed all sector defense drones"
-        else:
-            result = CombatResult.DRAW
-            message = "Combat ended in a stalemate"
-        
-        # Finalize results
-        combat_details.append({
-            "round": round_number,
-            "action": "combat_end",
-            "result": result.name,
-            "message": message
-        })
-        
-        return {
-            "result": result,
-            "message": message,
-            "rounds": round_number,
-            "attacker_drones_lost": attacker_drones_lost,
-            "defender_drones_lost": defender_drones_lost,
-            "attacker_ship_destroyed": attacker_ship_destroyed,
-            "deployment_updates": deployment_updates,
-            "combat_details": combat_details
-        }
-    
+        return resolve_drone_assault(
+            self._combatant(attacker),
+            [(str(d.id), str(d.player_id), d.drone_count) for d in deployments],
+            self.rng,
+        )
+
     def _resolve_planet_combat(self, attacker: Player, planet: Planet,
                               planet_owner: Optional[Player]) -> Dict[str, Any]:
         """Resolve combat between a ship and a planet."""
-        # Get attacker ship and equipment
-        attacker_ship = attacker.current_ship
-        attacker_drones = attacker.defense_drones
-
-        # Planet defenses
-        planet_defense_level = planet.defense_level or 0
-        planet_shields = planet.shields or 0
-        planet_weapons = planet.weapon_batteries or 0
-
-        # Calculate planetary defense reduction (shields, defense level, generators)
-        planetary_def = self._calculate_planetary_defense_reduction(planet)
-        damage_reduction = planetary_def["damage_reduction"]
-        remaining_shield_hp = planetary_def["shield_hp"]
-
-        # Combat parameters
-        attacker_attack = self._calculate_attack_power(attacker_ship, attacker_drones)
-        planet_attack = planet_weapons * 2 + planet_defense_level * 3
-        planet_defense = planet_shields * 3 + planet_defense_level * 5
-
-        # Track combat details
-        round_number = 0
-        attacker_drones_lost = 0
-        planet_damage = 0
-        attacker_ship_destroyed = False
-        planet_captured = False
-        combat_details = []
-
-        # Log planetary defense status at start of combat
-        if damage_reduction > 0 or remaining_shield_hp > 0:
-            combat_details.append({
-                "round": 0,
-                "action": "planetary_defense_status",
-                "message": f"Planetary defenses active: {planetary_def['description']}",
-                "damage_reduction": damage_reduction,
-                "shield_hp": remaining_shield_hp
-            })
-
-        # Combat continues until one side is defeated or retreats
-        while (not attacker_ship_destroyed and not planet_captured):
-            round_number += 1
-
-            # Add round header
-            combat_details.append({
-                "round": round_number,
-                "message": f"Combat Round {round_number}"
-            })
-
-            # Attacker's turn
-            if not attacker_ship_destroyed:
-                # Calculate chance to hit
-                hit_chance = min(0.8, attacker_attack / (planet_defense * 1.2) * 0.6)
-
-                # Random element
-                if random.random() < hit_chance:
-                    # Successful hit - damage planet defenses
-                    raw_damage = random.randint(1, 5)
-
-                    # Apply planetary defense reduction to attacker's damage
-                    reduced_damage = max(1, int(raw_damage * (1.0 - damage_reduction)))
-
-                    # If shield HP remains, absorb damage there first
-                    if remaining_shield_hp > 0:
-                        shield_absorbed = min(reduced_damage, remaining_shield_hp)
-                        remaining_shield_hp -= shield_absorbed
-                        hull_damage = reduced_damage - shield_absorbed
-                        if shield_absorbed > 0:
-                            combat_details.append({
-                                "round": round_number,
-                                "actor": "attacker",
-                                "action": "shield_hit",
-                                "message": f"Planetary shields absorbed {shield_absorbed} damage ({remaining_shield_hp} shield HP remaining)",
-                                "shield_absorbed": shield_absorbed,
-                                "shield_hp_remaining": remaining_shield_hp
-                            })
-                        damage = hull_damage
-                    else:
-                        damage = reduced_damage
-
-                    planet_damage += damage
-
-                    # Update planet defense parameters for subsequent rounds
-                    effective_defense_left = max(0, planet_defense_level - planet_damage)
-                    planet_defense = effective_defense_left * 5 + planet_shields * 3
+        defense = PlanetDefense(
+            name=planet.name,
+            defense_level=planet.defense_level or 0,
+            shields=planet.shields or 0,
+            weapon_batteries=planet.weapon_batteries or 0,
+            defense_shields=getattr(planet, "defense_shields", 0) or 0,
+        )
+        return resolve_planet_assault(self._combatant(attacker), defense, self.rng)
 
-                    if damage > 0:
-                        reduction_note = f" (reduced from {raw_damage} by {damage_reduction:.0%} defenses)" if damage_reduction > 0 else ""
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "attacker",
-                            "action": "planet_attack",
-                            "message": f"{attacker.username}'s ship damaged planet defenses for {damage} points{reduction_note}",
-                            "damage": damage,
-                            "raw_damage": raw_damage,
-                            "damage_reduction": damage_reduction
-                        })
-                    
-                    # Check if planet captured
-                    if planet_damage >= planet_defense_level:
-                        planet_captured = True
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "attacker",
-                            "action": "planet_captured",
-                            "message": f"{attacker.username} has overcome planetary defenses and captured the planet"
-                        })
-                else:
-                    # Miss
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "attacker",
-                        "action": "miss",
-                        "message": f"{attacker.username}'s attack missed planetary defenses"
-                    })
-            
-            # Check if combat is over
-            if planet_captured:
-                break
-            
-            # Planet's turn
-            # Calculate chance to hit
-            planet_hit_chance = min(0.7, planet_attack / (attacker_attack * 1.5) * 0.5)
-            
-            # Random element
-            if random.random() < planet_hit_chance:
-                # Successful hit
-                # Determine if attacking drones or ship
-                if attacker_drones > 0:
-                    # Attack attacker's drones first
-                    drones_destroyed = random.randint(1, min(3, attacker_drones))
-                    attacker_drones -= drones_destroyed
-                    attacker_drones_lost += drones_destroyed
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "defender",
-                        "action": "drone_attack",
-                        "message": f"Planetary defenses destroyed {drones_destroyed} of {attacker.username}'s drones",
-                        "drones_destroyed": drones_destroyed
-                    })
-                else:
-                    # Attack ship - calculate ship damage
-                    damage = random.randint(1, 7)
-                    
-                    # Check if attacker ship destroyed
-                    ship_destruction_chance = damage / 50
-                    if random.random() < ship_destruction_chance:
-                        attacker_ship_destroyed = True
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "ship_destroyed",
-                            "message": f"Planetary defenses critically damaged {attacker.username}'s ship, forcing ejection"
-                        })
-                    else:
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "ship_attack",
-                            "message": f"Planetary defenses hit {attacker.username}'s ship for {damage} damage"
-                        })
-            else:
-                # Miss
-                combat_details.append({
-                    "round": round_number,
-                    "actor": "defender",
-                    "action": "miss",
-                    "message": f"Planetary defense systems' attack missed {attacker.username}'s ship"
-                })
-            
-            # Check if combat ends due to round limit
-            if round_number >= 10:
-                combat_details.append({
-                    "round": round_number,
-                    "action": "stalemate",
-                    "message": "Combat ends as attacker withdraws after 10 rounds"
-                })
-                break
-        
-        # Determine result
-        if attacker_ship_destroyed:
-            result = CombatResult.DEFENDER_VICTORY
-            message = f"Planetary defenses defeated {attacker.username}"
-        elif planet_captured:
-            result = CombatResult.ATTACKER_VICTORY
-            message = f"{attacker.username} captured planet {planet.name}"
-        else:
-            result = CombatResult.DRAW
-            message = "Combat ended in a stalemate"
-        
-        # Finalize results
-        combat_details.append({
-            "round": round_number,
-            "action": "combat_end",
-            "result": result.name,
-            "message": message
-        })
-        
-        return {
-            "result": result,
-            "message": message,
-            "rounds": round_number,
-            "attacker_drones_lost": attacker_drones_lost,
-            "defender_drones_lost": 0,  # Planets don't have drones
-            "attacker_ship_destroyed": attacker_ship_destroyed,
-            "planet_damage": planet_damage,
-            "planet_captured": planet_captured,
-            "combat_details": combat_details
-        }
-    
-    def _resolve_port_combat(self, attacker: Player, port: Station, 
+    def _resolve_port_combat(self, attacker: Player, port: Station,
                             port_owner: Optional[Player]) -> Dict[str, Any]:
         """Resolve combat between a ship and a station."""
-        # Similar to planet combat but with port-specific parameters
-        # Get attacker ship and equipment
-        attacker_ship = attacker.current_ship
-        attacker_drones = attacker.defense_drones
-        
-        # Station defenses
-        port_defense_level = station.defense_level or 0
-        port_shields = station.shields or 0
-        port_weapons = station.defense_weapons or 0
-        
-        # Combat parameters
-        attacker_attack = self._calculate_attack_power(attacker_ship, attacker_drones)
-        port_attack = port_weapons * 2 + port_defense_level * 2
-        port_defense = port_shields * 2 + port_defense_level * 4
-        
-        # Track combat details
-        round_number = 0
-        attacker_drones_lost = 0
-        port_damage = 0
-        attacker_ship_destroyed = False
-        port_captured = False
-        combat_details = []
-        
-        # Combat continues until one side is defeated or retreats
-        while (not attacker_ship_destroyed and not port_captured):
-            round_number += 1
-            
-            # Add round header
-            combat_details.append({
-                "round": round_number,
-                "message": f"Combat Round {round_number}"
-            })
-            
-            # Attacker's turn
-            if not attacker_ship_destroyed:
-                # Calculate chance to hit
-                hit_chance = min(0.8, attacker_attack / (port_defense * 1.1) * 0.6)
-                
-                # Random element
-                if random.random() < hit_chance:
-                    # Successful hit - damage port defenses
-                    damage = random.randint(1, 5)
-                    port_damage += damage
-                    
-                    # Update port defense parameters for subsequent rounds
-                    effective_defense_left = max(0, port_defense_level - port_damage)
-                    port_defense = effective_defense_left * 4 + port_shields * 2
-                    
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "attacker",
-                        "action": "port_attack",
-                        "message": f"{attacker.username}'s ship damaged port defenses for {damage} points",
-                        "damage": damage
-                    })
-                    
-                    # Check if port captured
-                    if port_damage >= port_defense_level:
-                        port_captured = True
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "attacker",
-                            "action": "port_captured",
-                            "message": f"{attacker.username} has overcome port defenses and captured the port"
-                        })
-                else:
-                    # Miss
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "attacker",
-                        "action": "miss",
-                        "message": f"{attacker.username}'s attack missed port defenses"
-                    })
-            
-            # Check if combat is over
-            if port_captured:
-                break
-            
-            # Station's turn
-            # Calculate chance to hit
-            port_hit_chance = min(0.7, port_attack / (attacker_attack * 1.3) * 0.5)
-            
-            # Random element
-            if random.random() < port_hit_chance:
-                # Successful hit
-                # Determine if attacking drones or ship
-                if attacker_drones > 0:
-                    # Attack attacker's drones first
-                    drones_destroyed = random.randint(1, min(3, attacker_drones))
-                    attacker_drones -= drones_destroyed
-                    attacker_drones_lost += drones_destroyed
-                    combat_details.append({
-                        "round": round_number,
-                        "actor": "defender",
-                        "action": "drone_attack",
-                        "message": f"Station defenses destroyed {drones_destroyed} of {attacker.username}'s drones",
-                        "drones_destroyed": drones_destroyed
-                    })
-                else:
-                    # Attack ship - calculate ship damage
-                    damage = random.randint(1, 6)
-                    
-                    # Check if attacker ship destroyed
-                    ship_destruction_chance = damage / 50
-                    if random.random() < ship_destruction_chance:
-                        attacker_ship_destroyed = True
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "ship_destroyed",
-                            "message": f"Station defenses critically damaged {attacker.username}'s ship, forcing ejection"
-                        })
-                    else:
-                        combat_details.append({
-                            "round": round_number,
-                            "actor": "defender",
-                            "action": "ship_attack",
-                            "message": f"Station defenses hit {attacker.username}'s ship for {damage} damage"
-                        })
-            else:
-                # Miss
-                combat_details.append({
-                    "round": round_number,
-                    "actor": "defender",
-                    "action": "miss",
-                    "message": f"Station defense systems' attack missed {attacker.username}'s ship"
-                })
-            
-            # Check if combat ends due to round limit
-            if round_number >= 8:
-                combat_details.append({
-                    "round": round_number,
-                    "action": "stalemate",
-                    "message": "Combat ends as attacker withdraws after 8 rounds"
-                })
-                break
-        
-        # Determine result
-        if attacker_ship_destroyed:
-            result = CombatResult.DEFENDER_VICTORY
-            message = f"Station defenses defeated {attacker.username}"
-        elif port_captured:
-            result = CombatResult.ATTACKER_VICTORY
-            message = f"{attacker.username} captured port {station.name}"
-        else:
-            result = CombatResult.DRAW
-            message = "Combat ended in a stalemate"
-        
-        # Finalize results
-        combat_details.append({
-            "round": round_number,
-            "action": "combat_end",
-            "result": result.name,
-            "message": message
-        })
-        
-        return {
-            "result": result,
-            "message": message,
-            "rounds": round_number,
-            "attacker_drones_lost": attacker_drones_lost,
-            "defender_drones_lost": 0,  # Ports don't have drones like players
-            "attacker_ship_destroyed": attacker_ship_destroyed,
-            "port_damage": port_damage,
-            "port_captured": port_captured,
-            "combat_details": combat_details
-        }
-    
+        defense = StationDefense(
+            name=port.name,
+            defense_level=getattr(port, "defense_level", 0) or 0,
+            shields=getattr(port, "shields", 0) or 0,
+            defense_weapons=getattr(port, "defense_weapons", 0) or 0,
+        )
+        return resolve_port_assault(self._combatant(attacker), defense, self.rng)
+
     def _calculate_escape_chance(self, fleeing_ship: Ship, pursuing_ship: Ship) -> int:
         """Calculate the percentage chance of a ship escaping combat.
 
@@ -1754,17 +957,11 @@ class CombatService:
         Returns:
             Escape chance as an integer percentage (10-90).
         """
-        fleeing_speed = fleeing_ship.current_speed if fleeing_ship else 1.0
-        pursuing_speed = pursuing_ship.current_speed if pursuing_ship else 1.0
-
-        chance = 30 + int(fleeing_speed * 10) - int(pursuing_speed * 5)
-
-        # Fast/agile ships get a flat +20% bonus
-        if fleeing_ship and fleeing_ship.type in self.FAST_ESCAPE_SHIP_TYPES:
-            chance += 20
-
-        # Clamp to 10-90%
-        return max(10, min(90, chance))
+        return escape_chance(
+            fleeing_ship.current_speed if fleeing_ship else 1.0,
+            fleeing_ship.type if fleeing_ship else None,
+            pursuing_ship.current_speed if pursuing_ship else 1.0,
+        )
 
     def _calculate_planetary_defense_reduction(self, planet: Planet) -> Dict[str, Any]:
         """Calculate how much planetary defenses reduce incoming attack damage.
@@ -1781,95 +978,24 @@ class CombatService:
                     that must be burned through before planet hull takes damage.
                 description: str — human-readable summary.
         """
-        defense_level = getattr(planet, "defense_level", 0) or 0
-        shield_gen_level = getattr(planet, "defense_shields", 0) or 0
-        shields = getattr(planet, "shields", 0) or 0
-
-        # Each defense_level reduces damage by 5%, capped at 50% (level 10)
-        level_reduction = min(defense_level * 0.05, 0.50)
-
-        # Shield generators add a flat shield HP pool (500 HP per generator level,
-        # plus any existing shield value on the planet).
-        shield_hp = (shield_gen_level * 500) + (shields * 100)
-
-        # Total damage_reduction also includes a small bonus from shield generators
-        # (each gen level adds 4% reduction, up to 40% at level 10)
-        gen_reduction = min(shield_gen_level * 0.04, 0.40)
-
-        # Combined reduction capped at 0.9 so planets are never invincible
-        damage_reduction = min(level_reduction + gen_reduction, 0.90)
-
-        parts = []
-        if defense_level > 0:
-            parts.append(f"Level {defense_level} defenses ({level_reduction:.0%} reduction)")
-        if shield_gen_level > 0:
-            parts.append(f"Level {shield_gen_level} shield generators ({gen_reduction:.0%} reduction, {shield_hp} shield HP)")
-        description = " + ".join(parts) if parts else "No planetary defenses"
-
-        return {
-            "damage_reduction": round(damage_reduction, 2),
-            "shield_hp": shield_hp,
-            "description": description
-        }
+        return planetary_defense_reduction(
+            getattr(planet, "defense_level", 0) or 0,
+            getattr(planet, "defense_shields", 0) or 0,
+            getattr(planet, "shields", 0) or 0,
+        )
 
     def _calculate_attack_power(self, ship: Ship, drones: int) -> float:
         """Calculate the attack power of a ship and its drones."""
         if not ship:
             return 0
-        
-        # Base attack power depends on ship type
-        ship_type_attack = {
-            ShipType.LIGHT_FREIGHTER: 10,
-            ShipType.CARGO_HAULER: 15,
-            ShipType.FAST_COURIER: 20,
-            ShipType.SCOUT_SHIP: 25,
-            ShipType.COLONY_SHIP: 15,
-            ShipType.DEFENDER: 40,
-            ShipType.CARRIER: 30,
-            ShipType.WARP_JUMPER: 20
-        }
-        
-        base_attack = ship_type_attack.get(ship.type, 10)
-        
-        # Parse combat JSON for additional attack power
-        combat_data = ship.combat if hasattr(ship, "combat") and ship.combat else {}
-        attack_bonus = combat_data.get("attack_bonus", 0)
-        
-        # Each drone contributes to attack power
-        drone_attack = drones * 2
-        
-        return base_attack + attack_bonus + drone_attack
-    
+        return ship_attack_power(ship.type, ship.combat if hasattr(ship, "combat") else None, drones)
+
     def _calculate_defense_power(self, ship: Ship, drones: int) -> float:
         """Calculate the defense power of a ship and its drones."""
         if not ship:
             return 0
-        
-        # Base defense power depends on ship type
-        ship_type_defense = {
-            ShipType.LIGHT_FREIGHTER: 10,
-            ShipType.CARGO_HAULER: 20,
-            ShipType.FAST_COURIER: 15,
-            ShipType.SCOUT_SHIP: 10,
-            ShipType.COLONY_SHIP: 20,
-            ShipType.DEFENDER: 50,
-            ShipType.CARRIER: 40,
-            ShipType.WARP_JUMPER: 15
-        }
-        
-        base_defense = ship_type_defense.get(ship.type, 10)
-        
-        # Parse combat JSON for additional defense
-        combat_data = ship.combat if hasattr(ship, "combat") and ship.combat else {}
-        shield_bonus = combat_data.get("shield_bonus", 0)
-        hull_bonus = combat_data.get("hull_bonus", 0)
-        evasion = combat_data.get("evasion", 0)
-        
-        # Each drone contributes to defense
-        drone_defense = drones * 1.5
-        
-        return base_defense + shield_bonus + hull_bonus + evasion + drone_defense
-    
+        return ship_defense_power(ship.type, ship.combat if hasattr(ship, "combat") else None, drones)
+
     def _handle_ship_destruction(self, player: Player, destroyer: Optional[Player], cause: str) -> None:
         """Handle a player's ship being destroyed."""
         if not player.current_ship:
@@ -0,0 +1,209 @@
+"""
+Drone engagement engine
+
+Resolves sector-wide drone battles on arrays instead of Drone objects. All
+active deployments in a sector are loaded into one SectorDrones (one entry
+per deployed drone, with deployment id -> index and drone id -> index maps);
+each round every surviving drone fires at a random surviving enemy using the
+DroneService._simulate_combat damage formula, with hits and kills
+accumulated by index. The per-drone and per-deployment deltas are written
+back with one UPDATE ... FROM unnest(...) statement per table.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from src.models.drone import DroneStatus
+
+ENGAGEMENT_MAX_ROUNDS = 20
+DAMAGED_HEALTH_RATIO = 0.3      # Below this fraction of max health a drone is damaged
+SPEED_BONUS_CHANCE = 0.3        # Faster drones sometimes strike twice as hard
+SPEED_BONUS_MULTIPLIER = 1.5
+
+ATTACKER, DEFENDER = 0, 1
+
+
+@dataclass
+class SectorDrones:
+    """Columnar state of the drones deployed in one sector"""
+    deployment_ids: List[Any]
+    drone_ids: List[Any]
+    player_ids: List[Any]
+    side: np.ndarray
+    health: np.ndarray
+    max_health: np.ndarray
+    attack: np.ndarray
+    defense: np.ndarray
+    speed: np.ndarray
+
+    def __post_init__(self):
+        self.deployment_index: Dict[Any, int] = {d: i for i, d in enumerate(self.deployment_ids)}
+        self.drone_index: Dict[Any, int] = {d: i for i, d in enumerate(self.drone_ids)}
+
+    def __len__(self) -> int:
+        return len(self.drone_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence], attacker_ids: set, attacker_team_id: Any = None) -> "SectorDrones":
+        """
+        Rows of (deployment_id, drone_id, player_id, team_id, health,
+        max_health, attack_power, defense_power, speed). Drones of
+        ``attacker_ids`` or ``attacker_team_id`` form the attacking side.
+        """
+        n = len(rows)
+        cols = list(zip(*rows)) if n else [()] * 9
+        side = np.fromiter(
+            (ATTACKER if player_id in attacker_ids or (attacker_team_id is not None and team_id == attacker_team_id)
+             else DEFENDER for player_id, team_id in zip(cols[2], cols[3])),
+            dtype=np.int8, count=n,
+        )
+        return cls(
+            deployment_ids=list(cols[0]),
+            drone_ids=list(cols[1]),
+            player_ids=list(cols[2]),
+            side=side,
+            health=np.array(cols[4], dtype=np.int64),
+            max_health=np.array(cols[5], dtype=np.int64),
+            attack=np.array(cols[6], dtype=np.int64),
+            defense=np.array(cols[7], dtype=np.int64),
+            speed=np.array(cols[8], dtype=np.float64),
+        )
+
+
+@dataclass
+class EngagementResult:
+    rounds: int
+    winner: Optional[int]       # ATTACKER, DEFENDER or None for a draw
+    health: np.ndarray
+    damage_dealt: np.ndarray
+    damage_taken: np.ndarray
+    kills: np.ndarray
+    engaged: np.ndarray         # drones that fought at least one round
+
+    @property
+    def destroyed(self) -> np.ndarray:
+        return self.engaged & (self.health == 0)
+
+
+def _volley(drones: SectorDrones, health: np.ndarray, shooter_side: int, rng: np.random.Generator):
+    """Every surviving drone of one side fires at a random surviving enemy"""
+    alive = health > 0
+    shooters = np.flatnonzero(alive & (drones.side == shooter_side))
+    enemies = np.flatnonzero(alive & (drones.side != shooter_side))
+    targets = enemies[rng.integers(0, len(enemies), len(shooters))]
+
+    damage = np.maximum(
+        1, drones.attack[shooters] - drones.defense[targets] // 2 + rng.integers(-3, 4, len(shooters))
+    ).astype(np.float64)
+    fast = (drones.speed[shooters] > drones.speed[targets]) & (rng.random(len(shooters)) < SPEED_BONUS_CHANCE)
+    damage = np.where(fast, damage * SPEED_BONUS_MULTIPLIER, damage).astype(np.int64)
+    return shooters, targets, damage
+
+
+def resolve_engagement(
+    drones: SectorDrones, rng: np.random.Generator, max_rounds: int = ENGAGEMENT_MAX_ROUNDS
+) -> EngagementResult:
+    """Fight until one side is wiped out or ``max_rounds`` pass; both sides fire simultaneously"""
+    n = len(drones)
+    health = drones.health.copy()
+    dealt = np.zeros(n, dtype=np.int64)
+    taken = np.zeros(n, dtype=np.int64)
+    kills = np.zeros(n, dtype=np.int64)
+    engaged = np.zeros(n, dtype=bool)
+
+    def side_alive(side: int) -> bool:
+        return bool(np.any((health > 0) & (drones.side == side)))
+
+    rounds = 0
+    while rounds < max_rounds and side_alive(ATTACKER) and side_alive(DEFENDER):
+        rounds += 1
+        engaged |= health > 0
+        volleys = [_volley(drones, health, side, rng) for side in (ATTACKER, DEFENDER)]
+        shooters = np.concatenate([v[0] for v in volleys])
+        targets = np.concatenate([v[1] for v in volleys])
+        damage = np.concatenate([v[2] for v in volleys])
+
+        incoming = np.bincount(targets, weights=damage, minlength=n).astype(np.int64)
+        dealt[shooters] += damage
+        taken += incoming
+        new_health = np.maximum(0, health - incoming)
+
+        # Credit each kill to the hardest hit on the destroyed drone
+        killed = (health > 0) & (new_health == 0)
+        if killed.any():
+            order = np.lexsort((damage, targets))
+            last_per_target = np.r_[targets[order][1:] != targets[order][:-1], True]
+            killer = np.full(n, -1)
+            killer[targets[order][last_per_target]] = shooters[order][last_per_target]
+            kills += np.bincount(killer[killed], minlength=n)
+        health = new_health
+
+    attackers_left, defenders_left = side_alive(ATTACKER), side_alive(DEFENDER)
+    winner = ATTACKER if attackers_left and not defenders_left else (
+        DEFENDER if defenders_left and not attackers_left else None
+    )
+    return EngagementResult(rounds, winner, health, dealt, taken, kills, engaged)
+
+
+_UPDATE_DRONES_SQL = text("""
+    UPDATE drones AS d
+    SET health = v.health,
+        status = CASE
+            WHEN v.health = 0 THEN :destroyed
+            WHEN v.health < d.max_health * :damaged_ratio THEN :damaged
+            ELSE :deployed
+        END,
+        destroyed_at = CASE WHEN v.health = 0 THEN :now ELSE d.destroyed_at END,
+        damage_dealt = d.damage_dealt + v.dealt,
+        damage_taken = d.damage_taken + v.taken,
+        kills = d.kills + v.kills,
+        battles_fought = d.battles_fought + 1,
+        last_action = :now
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:health AS integer[]), CAST(:dealt AS integer[]),
+        CAST(:taken AS integer[]), CAST(:kills AS integer[])
+    ) AS v(id, health, dealt, taken, kills)
+    WHERE d.id = v.id
+""")
+
+_UPDATE_DEPLOYMENTS_SQL = text("""
+    UPDATE drone_deployments AS dd
+    SET enemies_destroyed = COALESCE(dd.enemies_destroyed, 0) + v.kills,
+        damage_prevented = COALESCE(dd.damage_prevented, 0) + v.taken,
+        is_active = v.alive,
+        recalled_at = CASE WHEN v.alive THEN dd.recalled_at ELSE :now END
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:kills AS integer[]), CAST(:taken AS integer[]), CAST(:alive AS boolean[])
+    ) AS v(id, kills, taken, alive)
+    WHERE dd.id = v.id
+""")
+
+
+def engagement_writes(drones: SectorDrones, result: EngagementResult, now: datetime):
+    """The two bulk statements (drones, deployments) with their parameters for the engaged drones"""
+    idx = np.flatnonzero(result.engaged)
+    alive = (result.health[idx] > 0).tolist()
+    drone_params = {
+        "ids": [str(drones.drone_ids[i]) for i in idx],
+        "health": result.health[idx].tolist(),
+        "dealt": result.damage_dealt[idx].tolist(),
+        "taken": result.damage_taken[idx].tolist(),
+        "kills": result.kills[idx].tolist(),
+        "now": now,
+        "destroyed": DroneStatus.DESTROYED.value,
+        "damaged": DroneStatus.DAMAGED.value,
+        "deployed": DroneStatus.DEPLOYED.value,
+        "damaged_ratio": DAMAGED_HEALTH_RATIO,
+    }
+    deployment_params = {
+        "ids": [str(drones.deployment_ids[i]) for i in idx],
+        "kills": drone_params["kills"],
+        "taken": drone_params["taken"],
+        "alive": alive,
+        "now": now,
+    }
+    return [(_UPDATE_DRONES_SQL, drone_params), (_UPDATE_DEPLOYMENTS_SQL, deployment_params)]
@@ -4,11 +4,12 @@ Drone management service for Sectorwars2102.
 Handles drone creation, deployment, combat, and strategy.
 """
 
-from uuid import UUID
-from datetime import datetime
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import json
 import random
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func
 from sqlalchemy.orm import selectinload
@@ -17,6 +18,12 @@ from src.models.drone import Drone, DroneDeployment, DroneCombat, DroneType, Dro
 from src.models.player import Player
 from src.models.sector import Sector
 from src.models.team import Team
+from src.services.drone_engagement import (
+    ATTACKER, DEFENDER, SectorDrones, engagement_writes, resolve_engagement
+)
+
+DRONE_ASSAULT_TURN_COST = 2           # Same base cost as attacking sector drones with a ship
+DRONE_ASSAULT_COOLDOWN_SECONDS = 60   # Per player and sector, from the last engagement of their drones
 
 
 class DroneService:
@@ -343,6 +350,109 @@ class DroneService:
         
         return log
         
+    async def assault_sector(
+        self,
+        sector_id: UUID,
+        player_id: UUID,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Engage every drone the player (and their team) has deployed in a
+        sector against all other drones deployed there.
+
+        The sector's deployments are loaded in one query and resolved on
+        arrays (see drone_engagement); drone and deployment changes are
+        written with one bulk statement each.
+
+        The player must be in the sector, undocked and not landed, have the
+        turns for it and be past the cooldown of their drones' last
+        engagement there.
+
+        Returns a summary of the engagement.
+        """
+        player = await self.session.scalar(
+            select(Player).where(Player.id == player_id).with_for_update()
+        )
+        sector = await self.session.get(Sector, sector_id)
+        if not player or not sector:
+            raise ValueError("Player or sector not found")
+        if player.current_sector_id != sector.sector_id:
+            raise ValueError("You must be in the sector to assault its drones")
+        if player.is_docked or player.is_landed:
+            raise ValueError("Cannot assault while docked at a port or landed on a planet")
+        if player.turns < DRONE_ASSAULT_TURN_COST:
+            raise ValueError(f"Not enough turns to assault sector drones (need {DRONE_ASSAULT_TURN_COST})")
+
+        now = datetime.utcnow()
+        last_engaged = await self.session.scalar(
+            select(func.max(Drone.last_action))
+            .join(DroneDeployment, DroneDeployment.drone_id == Drone.id)
+            .where(and_(
+                DroneDeployment.sector_id == sector_id,
+                DroneDeployment.is_active == True,
+                Drone.player_id == player_id
+            ))
+        )
+        if last_engaged and now - last_engaged < timedelta(seconds=DRONE_ASSAULT_COOLDOWN_SECONDS):
+            raise ValueError("Your drones in this sector are still recovering from their last engagement")
+
+        team_id = player.team_id
+        result = await self.session.execute(
+            select(
+                DroneDeployment.id, Drone.id, Drone.player_id, Drone.team_id, Drone.health,
+                Drone.max_health, Drone.attack_power, Drone.defense_power, Drone.speed
+            )
+            .join(Drone, Drone.id == DroneDeployment.drone_id)
+            .where(and_(
+                DroneDeployment.sector_id == sector_id,
+                DroneDeployment.is_active == True,
+                Drone.status != DroneStatus.DESTROYED.value,
+                Drone.health > 0
+            ))
+            .order_by(DroneDeployment.deployed_at)
+        )
+        drones = SectorDrones.from_rows(result.all(), {player_id}, team_id)
+
+        attackers = drones.side == ATTACKER
+        if not attackers.any():
+            raise ValueError("You have no drones deployed in this sector")
+        if attackers.all():
+            raise ValueError("No enemy drones in this sector")
+
+        outcome = resolve_engagement(drones, np.random.default_rng(seed))
+        player.turns -= DRONE_ASSAULT_TURN_COST
+        for statement, params in engagement_writes(drones, outcome, now):
+            await self.session.execute(statement, params)
+
+        destroyed = outcome.destroyed
+        summary = {
+            "result": {ATTACKER: "attacker_victory", DEFENDER: "defender_victory"}.get(outcome.winner, "draw"),
+            "rounds": outcome.rounds,
+            "attacker_drones": int(attackers.sum()),
+            "defender_drones": int((~attackers).sum()),
+            "attacker_drones_lost": int((destroyed & attackers).sum()),
+            "defender_drones_lost": int((destroyed & ~attackers).sum()),
+            "attacker_damage_dealt": int(outcome.damage_dealt[attackers].sum()),
+            "defender_damage_dealt": int(outcome.damage_dealt[~attackers].sum()),
+        }
+
+        combat_id = uuid4()
+        combat = DroneCombat(
+            id=combat_id,
+            sector_id=sector_id,
+            started_at=now,
+            ended_at=now,
+            rounds=outcome.rounds,
+            attacker_damage_dealt=summary["attacker_damage_dealt"],
+            defender_damage_dealt=summary["defender_damage_dealt"],
+            combat_log=json.dumps(summary)
+        )
+        self.session.add(combat)
+        await self.session.commit()
+
+        return {"combat_id": str(combat_id), "turns_consumed": DRONE_ASSAULT_TURN_COST,
+                "turns_remaining": player.turns, **summary}
+
     async def repair_drone(self, drone_id: UUID, repair_amount: int) -> Drone:
         """
         Repair a damaged drone.
@@ -12,6 +12,7 @@ from src.models.market_transaction import MarketTransaction, MarketPrice, PriceH
 from src.models.station import Station
 from src.models.resource import ResourceType
 from src.models.player import Player
+from src.models.anomaly_flag import AnomalyFlag, AnomalyFlagType, MARKET_FLAG_TYPES
 from src.services.audit_service import AuditService, AuditAction
 
 
@@ -588,49 +589,47 @@ class EconomyAnalyticsService:
             return "Continue monitoring, no immediate action required"
 
     def _detect_market_manipulation(self) -> List[Dict[str, Any]]:
-        """Detect potential market manipulation patterns"""
-        alerts = []
+        """Market manipulation flags raised by the streaming anomaly detector in the last hour"""
         one_hour_ago = datetime.utcnow() - timedelta(hours=1)
 
-        try:
-            # Check for wash trading (same player buying/selling repeatedly)
-            wash_trades = (
-                self.db.query(
-                    MarketTransaction.player_id,
-                    MarketTransaction.station_id,
-                    MarketTransaction.commodity,
-                    func.count(MarketTransaction.id).label('trade_count')
-                )
-                .filter(MarketTransaction.timestamp >= one_hour_ago)
-                .group_by(
-                    MarketTransaction.player_id,
-                    MarketTransaction.station_id,
-                    MarketTransaction.commodity
-                )
-                .having(func.count(MarketTransaction.id) > 10)
-                .all()
+        flags = (
+            self.db.query(AnomalyFlag, Player.nickname, Station.name)
+            .outerjoin(Player, Player.id == AnomalyFlag.player_id)
+            .outerjoin(Station, Station.id == AnomalyFlag.counterparty_id)
+            .filter(
+                AnomalyFlag.flag_type.in_(MARKET_FLAG_TYPES),
+                AnomalyFlag.created_at >= one_hour_ago
             )
+            .order_by(desc(AnomalyFlag.created_at))
+            .limit(200)
+            .all()
+        )
 
-            for trade in wash_trades:
-                player = self.db.query(Player).filter(Player.id == trade.player_id).first()
-                station = self.db.query(Station).filter(Station.id == trade.station_id).first()
-
-                alerts.append({
-                    "id": str(uuid.uuid4()),
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "alert_type": "market_manipulation",
-                    "severity": "high",
-                    "player_id": str(trade.player_id),
-                    "player_name": player.nickname if player else "Unknown",
-                    "station_id": str(trade.station_id),
-                    "port_name": station.name if station else "Unknown",
-                    "resource_type": trade.commodity,
-                    "trade_count": trade.trade_count,
-                    "description": f"Potential wash trading detected: {trade.trade_count} trades in 1 hour",
-                    "recommended_action": "Investigate player trading patterns and consider temporary trading restrictions"
-                })
-        except Exception:
-            pass
+        alerts = []
+        for flag, player_name, station_name in flags:
+            alert = {
+                "id": str(flag.id),
+                "timestamp": flag.created_at.isoformat(),
+                "alert_type": "market_manipulation",
+                "severity": flag.severity,
+                "player_id": str(flag.player_id),
+                "player_name": player_name or "Unknown",
+                "station_id": str(flag.counterparty_id),
+                "port_name": station_name or "Unknown",
+                "resource_type": flag.commodity,
+            }
+            if flag.flag_type == AnomalyFlagType.WASH_TRADING.value:
+                alert["trade_count"] = int(flag.metric)
+                alert["description"] = f"Potential wash trading detected: {int(flag.metric)} trades in 1 hour"
+                alert["recommended_action"] = "Investigate player trading patterns and consider temporary trading restrictions"
+            else:
+                alert["price_z_score"] = flag.metric
+                alert["description"] = (
+                    f"Trade at {flag.details.get('unit_price')} credits deviates {abs(flag.metric):.1f} "
+                    f"standard deviations from the expected {flag.details.get('expected_price')}"
+                )
+                alert["recommended_action"] = "Review the trade for price exploits or collusion"
+            alerts.append(alert)
 
         return alerts
 
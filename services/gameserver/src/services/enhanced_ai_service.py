@@ -34,6 +34,7 @@ from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.exc import SQLAlchemyError
 
 # Import existing ARIA foundation
+from src.services.ai_generation_cache import get_generation_cache, make_cache_key
 from src.services.ai_trading_service import AITradingService
 from src.services.market_prediction_engine import MarketPredictionEngine
 from src.services.route_optimizer import RouteOptimizer
@@ -190,6 +191,9 @@ class EnhancedAIService:
         self.max_conversation_length = 4000
         self.max_analysis_size = 32768  # 32KB
         
+        # Shared cache of generated replies (see _generate_ai_response)
+        self.response_cache = get_generation_cache()
+        
         logger.info("Enhanced AI Service initialized with cross-system intelligence")
 
     # =============================================================================
@@ -898,36 +902,61 @@ class EnhancedAIService:
         
         return entities
 
-    async def _generate_ai_response(self, intent_analysis: Dict[str, Any], 
+    # Intents whose replies read the player's own data; everything else depends
+    # only on the intent, extracted entities and the assistant's permissions
+    PLAYER_SPECIFIC_INTENTS = {"trading"}
+    PLAYER_RESPONSE_TTL = 60
+    SHARED_RESPONSE_TTL = 3600
+
+    async def _generate_ai_response(self, intent_analysis: Dict[str, Any],
                                   assistant: AIComprehensiveAssistant,
                                   context: ConversationContext) -> str:
         """
-        Generate intelligent AI response based on intent analysis
-        Coordinates responses across all game systems
+        Generate intelligent AI response based on intent analysis.
+        Repeated queries are served from the generation cache and identical
+        concurrent queries share one generation; failures are not cached.
         """
         primary_intent = intent_analysis["primary_intent"]
-        entities = intent_analysis["entities"]
-        
+        player_specific = primary_intent in self.PLAYER_SPECIFIC_INTENTS
+        key = make_cache_key(
+            "aria_reply",
+            intent=primary_intent,
+            entities=intent_analysis["entities"],
+            permissions=sorted(k for k, v in (assistant.access_permissions or {}).items() if v),
+            player=str(assistant.player_id) if player_specific else None,
+        )
         try:
-            if primary_intent == "trading":
-                return await self._generate_trading_response(assistant, entities, context)
-            elif primary_intent == "combat":
-                return await self._generate_combat_response(assistant, entities, context)
-            elif primary_intent == "colony":
-                return await self._generate_colony_response(assistant, entities, context)
-            elif primary_intent == "station":
-                return await self._generate_station_response(assistant, entities, context)
-            elif primary_intent == "strategic":
-                return await self._generate_strategic_response(assistant, entities, context)
-            elif primary_intent == "help":
-                return await self._generate_help_response(assistant, entities, context)
-            else:
-                return await self._generate_general_response(assistant, entities, context)
-                
+            return await self.response_cache.get_or_generate(
+                key,
+                lambda: self._dispatch_ai_response(intent_analysis, assistant, context),
+                ttl=self.PLAYER_RESPONSE_TTL if player_specific else self.SHARED_RESPONSE_TTL
+            )
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
             return "I encountered an issue processing your request. Could you please rephrase your question?"
 
+    async def _dispatch_ai_response(self, intent_analysis: Dict[str, Any],
+                                    assistant: AIComprehensiveAssistant,
+                                    context: ConversationContext) -> str:
+        """Route to the per-intent generator (raises on failure)"""
+        primary_intent = intent_analysis["primary_intent"]
+        entities = intent_analysis["entities"]
+        
+        if primary_intent == "trading":
+            return await self._generate_trading_response(assistant, entities, context)
+        elif primary_intent == "combat":
+            return await self._generate_combat_response(assistant, entities, context)
+        elif primary_intent == "colony":
+            return await self._generate_colony_response(assistant, entities, context)
+        elif primary_intent == "station":
+            return await self._generate_station_response(assistant, entities, context)
+        elif primary_intent == "strategic":
+            return await self._generate_strategic_response(assistant, entities, context)
+        elif primary_intent == "help":
+            return await self._generate_help_response(assistant, entities, context)
+        else:
+            return await self._generate_general_response(assistant, entities, context)
+
     async def _generate_trading_response(self, assistant: AIComprehensiveAssistant,
                                        entities: Dict[str, List[str]], context: ConversationContext) -> str:
         """
@@ -4,13 +4,13 @@ Faction service for managing faction relationships, reputation, and missions.
 
 from uuid import UUID
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 import logging
 
 from src.models.faction import Faction, FactionType, FactionMission
-from src.models.reputation import Reputation, ReputationLevel
+from src.models.reputation import Reputation, ReputationHistory, ReputationLevel
 from src.models.player import Player
 from src.models.sector import Sector
 from src.services.websocket_service import ConnectionManager
@@ -149,15 +149,15 @@ class FactionService:
         reputation.combat_response = self._calculate_combat_response(reputation.current_value)
         
         # Add to history
-        if not reputation.history:
-            reputation.history = []
-        reputation.history.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "old_value": old_value,
-            "new_value": reputation.current_value,
-            "change": change,
-            "reason": reason
-        })
+        self.db.add(ReputationHistory(
+            reputation_id=reputation.id,
+            player_id=player_id,
+            faction_id=faction_id,
+            old_value=old_value,
+            new_value=reputation.current_value,
+            change=change,
+            reason=reason[:255]
+        ))
         
         reputation.last_updated = datetime.utcnow()
         self.db.commit()
@@ -253,79 +253,15 @@ class FactionService:
         -50 total decay per call.  Reputations flagged with ``decay_paused``
         are skipped.
 
+        Uses the same set-based engine as the population-wide decay job,
+        scoped to one player.
+
         Returns a list of dicts describing each decayed faction for caller
         visibility / WebSocket notification.
         """
-        reputations = self.db.query(Reputation).filter(
-            Reputation.player_id == player_id
-        ).all()
-
-        now = datetime.utcnow()
-        decay_threshold = timedelta(days=30)
-        max_decay = 50  # absolute cap on total decay applied per invocation
-        results: List[Dict[str, Any]] = []
-
-        for rep in reputations:
-            # Skip locked or paused reputations
-            if rep.decay_paused or rep.is_locked:
-                continue
-
-            # Only decay reputations outside the neutral band
-            if -100 <= rep.current_value <= 100:
-                continue
-
-            # Check inactivity window
-            last = rep.last_updated.replace(tzinfo=None) if rep.last_updated.tzinfo else rep.last_updated
-            inactive_days = (now - last).days
-            if inactive_days <= 30:
-                continue
-
-            decay_days = inactive_days - 30
-            decay_amount = min(decay_days, max_decay)
-
-            old_value = rep.current_value
-            if rep.current_value > 100:
-                # Decay toward zero but not below +100
-                rep.current_value = max(100, rep.current_value - decay_amount)
-            elif rep.current_value < -100:
-                # Decay toward zero but not above -100
-                rep.current_value = min(-100, rep.current_value + decay_amount)
-
-            if rep.current_value != old_value:
-                rep.current_level = self._calculate_reputation_level(rep.current_value)
-                rep.title = self._get_reputation_title(rep.current_level)
-                rep.trade_modifier = self._calculate_trade_modifier(rep.current_value)
-                rep.port_access_level = self._calculate_port_access_level(rep.current_value)
-                rep.combat_response = self._calculate_combat_response(rep.current_value)
-
-                # Record decay in history
-                if not rep.history:
-                    rep.history = []
-                rep.history = rep.history + [{
-                    "timestamp": now.isoformat(),
-                    "old_value": old_value,
-                    "new_value": rep.current_value,
-                    "change": rep.current_value - old_value,
-                    "reason": f"Inactivity decay ({decay_days} days idle)"
-                }]
-
-                results.append({
-                    "faction_id": str(rep.faction_id),
-                    "old_value": old_value,
-                    "new_value": rep.current_value,
-                    "decay_applied": old_value - rep.current_value if old_value > 0 else rep.current_value - old_value,
-                    "inactive_days": inactive_days
-                })
-
-                logger.info(
-                    f"Reputation decay for player {player_id}, faction {rep.faction_id}: "
-                    f"{old_value} -> {rep.current_value} ({inactive_days} days inactive)"
-                )
-
-        if results:
-            self.db.commit()
+        from src.services.reputation_decay_service import ReputationDecayService
 
-        return results
+        return ReputationDecayService(self.db).decay_player_faction_reputations(player_id)
 
     async def get_trade_modifier(self, player_id: UUID, faction_id: UUID) -> float:
         """
@@ -357,7 +293,8 @@ class FactionService:
 
         return TRADE_MODIFIER_PUBLIC_ENEMY
 
-    def _calculate_reputation_level(self, value: int) -> ReputationLevel:
+    @staticmethod
+    def _calculate_reputation_level(value: int) -> ReputationLevel:
         """Calculate reputation level from numeric value."""
         if value >= 700:
             return ReputationLevel.EXALTED
@@ -394,7 +331,8 @@ class FactionService:
         else:
             return ReputationLevel.PUBLIC_ENEMY
     
-    def _get_reputation_title(self, level: ReputationLevel) -> str:
+    @staticmethod
+    def _get_reputation_title(level: ReputationLevel) -> str:
         """Get display title for reputation level."""
         titles = {
             ReputationLevel.EXALTED: "Exalted",
@@ -417,12 +355,14 @@ class FactionService:
         }
         return titles.get(level, "Unknown")
     
-    def _calculate_trade_modifier(self, value: int) -> float:
+    @staticmethod
+    def _calculate_trade_modifier(value: int) -> float:
         """Calculate trade price modifier based on reputation."""
         # Linear scale from -30% to +30% based on reputation
         return round(value / 800 * 0.3, 2)
     
-    def _calculate_port_access_level(self, value: int) -> int:
+    @staticmethod
+    def _calculate_port_access_level(value: int) -> int:
         """Calculate port access level based on reputation."""
         if value >= 600:
             return 3  # Full access
@@ -433,7 +373,8 @@ class FactionService:
         else:
             return 0  # No access
     
-    def _calculate_combat_response(self, value: int) -> str:
+    @staticmethod
+    def _calculate_combat_response(value: int) -> str:
         """Calculate NPC combat response based on reputation."""
         if value >= 400:
             return "friendly"
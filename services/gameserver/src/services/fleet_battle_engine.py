@@ -0,0 +1,218 @@
+"""
+In-memory fleet battle engine.
+
+Both fleets are held as columnar NumPy arrays (one slot per ship) and whole
+volleys are resolved at once: every firing ship rolls to hit, picks a target
+among the enemy ships still in the fight when the volley starts, and damage is
+accumulated per target before shields and hull are applied. The engine has no
+database access, so FleetService loads the arrays once, runs any number of
+rounds, and persists the deltas in bulk.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+HIT_CHANCE = 0.7
+DAMAGE_PER_ATTACK_RATING = 10
+DAMAGE_VARIANCE = (0.8, 1.2)
+RETREAT_HULL_FRACTION = 0.3
+RETREAT_CHANCE = 0.3
+
+MAX_ROUNDS = 30
+LOSS_RATIO_LIMIT = 0.7
+MORALE_COLLAPSE = 20
+MAIN_BATTLE_AFTER_ROUND = 5
+PURSUIT_AFTER_ROUND = 15
+
+
+@dataclass
+class FleetSide:
+    """Columnar combat state for one fleet"""
+    ship_ids: List[Any]
+    labels: List[Dict[str, Any]]          # ship_id / ship_name / player per slot, for events
+    attack: np.ndarray                    # attack_rating per ship
+    shields: np.ndarray
+    hull: np.ndarray
+    max_hull: np.ndarray
+    attack_bonus: float
+    defense_bonus: float
+    initial_ships: int
+    destroyed_count: int = 0              # cumulative for the battle, including earlier calls
+    retreated_count: int = 0
+    active: np.ndarray = None             # still fighting
+    destroyed: np.ndarray = None
+    retreated: np.ndarray = None
+
+    def __post_init__(self):
+        n = len(self.ship_ids)
+        if self.active is None:
+            self.active = self.hull > 0
+        if self.destroyed is None:
+            self.destroyed = np.zeros(n, dtype=bool)
+        if self.retreated is None:
+            self.retreated = np.zeros(n, dtype=bool)
+
+    @classmethod
+    def from_ships(
+        cls,
+        ships: Sequence[Dict[str, Any]],
+        attack_bonus: float,
+        defense_bonus: float,
+        initial_ships: int = 0,
+        destroyed_count: int = 0,
+        retreated_count: int = 0,
+    ) -> "FleetSide":
+        """Build a side from dicts with id, name, player, attack_rating, shields, hull, max_hull."""
+        return cls(
+            ship_ids=[s["id"] for s in ships],
+            labels=[
+                {"ship_id": str(s["id"]), "ship_name": s.get("name"), "player": s.get("player") or "Unknown"}
+                for s in ships
+            ],
+            attack=np.array([s.get("attack_rating", 1) or 0 for s in ships], dtype=np.float64),
+            shields=np.array([s.get("shields", 0) or 0 for s in ships], dtype=np.int64),
+            hull=np.array([s.get("hull", 0) or 0 for s in ships], dtype=np.int64),
+            max_hull=np.array(
+                [s.get("max_hull", s.get("hull", 0)) or 0 for s in ships], dtype=np.int64
+            ),
+            attack_bonus=attack_bonus,
+            defense_bonus=defense_bonus,
+            initial_ships=initial_ships or len(ships),
+            destroyed_count=destroyed_count,
+            retreated_count=retreated_count,
+        )
+
+    @property
+    def active_count(self) -> int:
+        return int(self.active.sum())
+
+    @property
+    def strength(self) -> int:
+        """Remaining hull plus shields of ships still in the fight"""
+        return int((self.hull[self.active] + self.shields[self.active]).sum())
+
+    @property
+    def losses(self) -> int:
+        return self.destroyed_count + self.retreated_count
+
+
+@dataclass
+class BattleOutcome:
+    """Result of running the engine for one call"""
+    rounds: List[Dict[str, Any]] = field(default_factory=list)
+    phase: str = "engagement"
+    ended: bool = False
+
+
+class FleetBattleEngine:
+    """Simulates fleet battle rounds over two FleetSide arrays."""
+
+    def __init__(self, attacker: FleetSide, defender: FleetSide, seed: Optional[int] = None):
+        self.attacker = attacker
+        self.defender = defender
+        self.rng = np.random.default_rng(seed)
+
+    def _volley(self, shooters: FleetSide, targets: FleetSide, round_results: Dict[str, Any]) -> int:
+        """Resolve one side firing at the other; returns damage dealt before defense."""
+        firing = np.flatnonzero(shooters.active)
+        live = np.flatnonzero(targets.active)
+        if len(firing) == 0 or len(live) == 0:
+            return 0
+
+        hits = firing[self.rng.random(len(firing)) < HIT_CHANCE]
+        if len(hits) == 0:
+            return 0
+
+        base = np.floor(shooters.attack[hits] * DAMAGE_PER_ATTACK_RATING * shooters.attack_bonus)
+        damage = np.maximum(1, np.floor(base * self.rng.uniform(*DAMAGE_VARIANCE, len(hits)))).astype(np.int64)
+        # Higher defense = less damage taken
+        received = np.maximum(1, np.floor(damage / max(targets.defense_bonus, 0.01))).astype(np.int64)
+
+        chosen = live[self.rng.integers(0, len(live), len(hits))]
+        incoming = np.zeros(len(targets.hull), dtype=np.int64)
+        np.add.at(incoming, chosen, received)
+
+        # Shields absorb first, the remainder hits the hull
+        absorbed = np.minimum(incoming, targets.shields)
+        targets.shields -= absorbed
+        targets.hull = np.maximum(0, targets.hull - (incoming - absorbed))
+
+        was_hit = incoming > 0
+        newly_destroyed = was_hit & targets.active & (targets.hull <= 0)
+        damaged = (
+            was_hit & targets.active & ~newly_destroyed & (targets.max_hull > 0)
+            & (targets.hull < targets.max_hull * RETREAT_HULL_FRACTION)
+        )
+        damaged_idx = np.flatnonzero(damaged)
+        retreating = damaged_idx[self.rng.random(len(damaged_idx)) < RETREAT_CHANCE]
+
+        destroyed_idx = np.flatnonzero(newly_destroyed)
+        targets.destroyed[destroyed_idx] = True
+        targets.active[destroyed_idx] = False
+        targets.destroyed_count += len(destroyed_idx)
+        targets.retreated[retreating] = True
+        targets.active[retreating] = False
+        targets.retreated_count += len(retreating)
+
+        round_results["ships_destroyed"].extend(targets.labels[i] for i in destroyed_idx)
+        round_results["ships_retreated"].extend(targets.labels[i] for i in retreating)
+        return int(damage.sum())
+
+    def should_end(self, rounds_completed: int, attacker_morale: int, defender_morale: int) -> bool:
+        """Battle end conditions: a side wiped out, morale collapse, heavy losses or timeout."""
+        if self.attacker.active_count == 0 or self.defender.active_count == 0:
+            return True
+        if attacker_morale < MORALE_COLLAPSE or defender_morale < MORALE_COLLAPSE:
+            return True
+        if self.attacker.losses > self.attacker.initial_ships * LOSS_RATIO_LIMIT:
+            return True
+        if self.defender.losses > self.defender.initial_ships * LOSS_RATIO_LIMIT:
+            return True
+        return rounds_completed >= MAX_ROUNDS
+
+    @staticmethod
+    def next_phase(phase: str, round_number: int) -> str:
+        if round_number > MAIN_BATTLE_AFTER_ROUND and phase == "engagement":
+            return "main_battle"
+        if round_number > PURSUIT_AFTER_ROUND and phase == "main_battle":
+            return "pursuit"
+        return phase
+
+    def run(
+        self,
+        max_rounds: Optional[int],
+        rounds_completed: int,
+        phase: str,
+        attacker_morale: int = 100,
+        defender_morale: int = 100,
+    ) -> BattleOutcome:
+        """Simulate up to ``max_rounds`` rounds (None = until the battle ends)."""
+        outcome = BattleOutcome(phase=phase)
+
+        if self.attacker.active_count == 0 or self.defender.active_count == 0:
+            outcome.ended = True
+            return outcome
+
+        while max_rounds is None or len(outcome.rounds) < max_rounds:
+            round_number = rounds_completed + len(outcome.rounds) + 1
+            round_results = {
+                "round": round_number,
+                "phase": outcome.phase,
+                "attacker_damage": 0,
+                "defender_damage": 0,
+                "ships_destroyed": [],
+                "ships_retreated": [],
+            }
+            round_results["attacker_damage"] = self._volley(self.attacker, self.defender, round_results)
+            round_results["defender_damage"] = self._volley(self.defender, self.attacker, round_results)
+            outcome.rounds.append(round_results)
+
+            if self.should_end(round_number, attacker_morale, defender_morale):
+                outcome.ended = True
+                break
+
+            outcome.phase = self.next_phase(outcome.phase, round_number)
+
+        return outcome
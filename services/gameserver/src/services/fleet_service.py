@@ -10,16 +10,20 @@ from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy import and_, or_, func
-import random
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from sqlalchemy import (
+    Boolean, Integer, String, and_, or_, func, cast, column, delete, insert, select, update, values
+)
 import logging
 
 from src.models.fleet import (
-    Fleet, FleetMember, FleetBattle, FleetBattleCasualty,
+    Fleet, FleetMember, FleetBattle, FleetBattleCasualty, FleetBattleEvent,
     FleetRole, FleetStatus, BattlePhase
 )
 from src.models.ship import Ship
 from src.models.player import Player
+from src.models.user import User
+from src.services.fleet_battle_engine import FleetBattleEngine, FleetSide
 from src.models.team import Team
 from src.models.sector import Sector
 from src.models.combat_log import CombatLog, CombatOutcome
@@ -332,16 +336,20 @@ class FleetService:
         """Execute the preparation phase of battle."""
         battle.phase = BattlePhase.ENGAGEMENT.value
 
-        # Log preparation events
-        events = [{
-            "timestamp": datetime.utcnow().isoformat(),
-            "phase": "preparation",
-            "event": "Battle initiated",
-            "attacker_fleet": str(battle.attacker_fleet_id),
-            "defender_fleet": str(battle.defender_fleet_id)
-        }]
-
-        battle.battle_log = events
+        # Log preparation event
+        self.db.add(FleetBattleEvent(
+            battle_id=battle.id,
+            round=0,
+            phase="preparation",
+            event_type="preparation",
+            payload={
+                "timestamp": datetime.utcnow().isoformat(),
+                "phase": "preparation",
+                "event": "Battle initiated",
+                "attacker_fleet": str(battle.attacker_fleet_id),
+                "defender_fleet": str(battle.defender_fleet_id)
+            }
+        ))
         self.db.commit()
 
     def simulate_battle_round(self, battle_id: UUID) -> Dict[str, Any]:
@@ -357,6 +365,21 @@ class FleetService:
         Returns a dict with round results including damage dealt,
         ships destroyed/retreated, and remaining counts per side.
         """
+        return self.simulate_battle(battle_id, max_rounds=1)
+
+    def simulate_battle(
+        self,
+        battle_id: UUID,
+        max_rounds: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Simulate up to ``max_rounds`` rounds, or until the battle ends.
+
+        Both fleets are loaded into arrays with one query, all rounds run
+        in memory in FleetBattleEngine, and the results are persisted with
+        one bulk ship UPDATE, bulk casualty/event INSERTs and a single commit.
+        """
         # Lock battle row to prevent concurrent round simulation
         battle = self.db.query(FleetBattle).filter(FleetBattle.id == battle_id).with_for_update().first()
         if not battle:
@@ -368,97 +391,258 @@ class FleetService:
         attacker = battle.attacker_fleet
         defender = battle.defender_fleet
 
-        # Get active ships (hull > 0, not destroyed)
-        attacker_ships = self._get_active_fleet_ships(attacker)
-        defender_ships = self._get_active_fleet_ships(defender)
+        attacker_side, defender_side = self._load_battle_sides(battle, attacker, defender)
+        engine = FleetBattleEngine(attacker_side, defender_side, seed=seed)
+        outcome = engine.run(
+            max_rounds,
+            rounds_completed=battle.rounds_completed or 0,
+            phase=battle.phase,
+            attacker_morale=attacker.morale or 100,
+            defender_morale=defender.morale or 100,
+        )
 
-        if not attacker_ships or not defender_ships:
-            return self._end_battle(battle)
+        self._persist_battle_rounds(battle, attacker, defender, attacker_side, defender_side, outcome.rounds)
 
-        # Calculate fleet formation bonuses
-        attacker_bonus = self._calculate_formation_bonus(attacker)
-        defender_bonus = self._calculate_formation_bonus(defender)
+        if outcome.ended:
+            result = self._end_battle(battle, attacker_side, defender_side)
+        else:
+            battle.phase = outcome.phase
+            self.db.commit()
+            last_round = outcome.rounds[-1]
+            result = {
+                "battle_id": str(battle.id),
+                "phase": battle.phase,
+                "round": last_round["round"],
+                "attacker_remaining": attacker_side.active_count,
+                "defender_remaining": defender_side.active_count,
+                "round_results": last_round,
+                "battle_ongoing": True
+            }
 
-        # Determine round number from existing log
-        current_log = battle.battle_log if isinstance(battle.battle_log, list) else []
-        round_number = len(current_log) + 1
+        if max_rounds != 1:
+            result["rounds_simulated"] = len(outcome.rounds)
+            result["rounds"] = outcome.rounds
+        return result
 
-        # Simulate combat round
-        round_results = {
-            "round": round_number,
-            "attacker_damage": 0,
-            "defender_damage": 0,
-            "ships_destroyed": [],
-            "ships_retreated": []
-        }
+    def _load_battle_sides(
+        self,
+        battle: FleetBattle,
+        attacker: Fleet,
+        defender: Fleet
+    ) -> Tuple[FleetSide, FleetSide]:
+        """Load both fleets' surviving ships in one query into engine arrays."""
+        fleet_ids = [fleet.id for fleet in (attacker, defender) if fleet]
+        # Ships that retreated earlier in this battle stay out of the fight
+        retreated_earlier = select(FleetBattleCasualty.id).where(
+            FleetBattleCasualty.battle_id == battle.id,
+            FleetBattleCasualty.ship_id == Ship.id,
+            FleetBattleCasualty.retreated == True
+        ).exists()
+        rows = self.db.execute(
+            select(
+                FleetMember.fleet_id,
+                Ship.id,
+                Ship.name,
+                Ship.combat,
+                func.coalesce(Player.nickname, User.username).label("player_name"),
+            )
+            .join(Ship, Ship.id == FleetMember.ship_id)
+            .outerjoin(Player, Player.id == Ship.owner_id)
+            .outerjoin(User, User.id == Player.user_id)
+            .where(
+                FleetMember.fleet_id.in_(fleet_ids),
+                Ship.is_destroyed == False,
+                ~retreated_earlier
+            )
+            .order_by(FleetMember.fleet_id, FleetMember.position, Ship.id)
+        ).all()
 
-        # Attackers fire at defenders
-        for ship in attacker_ships:
-            if random.random() < 0.7 and defender_ships:  # 70% hit chance
-                damage = self._calculate_ship_damage(ship, attacker_bonus)
-                target = random.choice(defender_ships)
-                self._apply_damage_to_ship(target, damage, battle, round_results)
-                round_results["attacker_damage"] += damage
-                # Remove destroyed ships mid-round
-                defender_ships = [s for s in defender_ships if (self._get_ship_combat_stat(s, "hull", 0) or 0) > 0]
-
-        # Refresh defender list (some may have been destroyed this round)
-        active_defender_ships = [
-            s for s in defender_ships
-            if self._get_ship_combat_stat(s, "hull") > 0
-        ]
-
-        # Defenders return fire at attackers
-        for ship in active_defender_ships:
-            if random.random() < 0.7 and attacker_ships:  # 70% hit chance
-                damage = self._calculate_ship_damage(ship, defender_bonus)
-                target = random.choice(attacker_ships)
-                self._apply_damage_to_ship(target, damage, battle, round_results)
-                round_results["defender_damage"] += damage
-                # Remove destroyed ships mid-round
-                attacker_ships = [s for s in attacker_ships if (self._get_ship_combat_stat(s, "hull", 0) or 0) > 0]
-
-        # Update battle damage statistics
-        battle.attacker_damage_dealt = (battle.attacker_damage_dealt or 0) + round_results["attacker_damage"]
-        battle.defender_damage_dealt = (battle.defender_damage_dealt or 0) + round_results["defender_damage"]
-        battle.total_damage_dealt = (battle.attacker_damage_dealt or 0) + (battle.defender_damage_dealt or 0)
-
-        # Append round to battle log (must reassign for JSONB change detection)
-        updated_log = list(current_log)
-        updated_log.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "phase": battle.phase,
-            "round": round_results["round"],
-            "results": round_results
-        })
-        battle.battle_log = updated_log
-        flag_modified(battle, "battle_log")
-
-        # Check for battle end conditions
-        if self._should_end_battle(battle, attacker, defender):
-            return self._end_battle(battle)
-
-        # Progress battle phase based on round count
-        if round_number > 5 and battle.phase == BattlePhase.ENGAGEMENT.value:
-            battle.phase = BattlePhase.MAIN_BATTLE.value
-        elif round_number > 15 and battle.phase == BattlePhase.MAIN_BATTLE.value:
-            battle.phase = BattlePhase.PURSUIT.value
+        ships_by_fleet: Dict[UUID, List[Dict[str, Any]]] = {fleet_id: [] for fleet_id in fleet_ids}
+        for fleet_id, ship_id, name, combat, player_name in rows:
+            combat = combat if isinstance(combat, dict) else {}
+            hull = combat.get("hull", 0) or 0
+            if hull <= 0:
+                continue
+            ships_by_fleet[fleet_id].append({
+                "id": ship_id,
+                "name": name,
+                "player": player_name,
+                "attack_rating": combat.get("attack_rating", 1),
+                "shields": combat.get("shields", 0),
+                "hull": hull,
+                "max_hull": combat.get("max_hull", hull),
+            })
+
+        sides = []
+        for fleet, initial, destroyed, retreated in (
+            (attacker, battle.attacker_ships_initial, battle.attacker_ships_destroyed, battle.attacker_ships_retreated),
+            (defender, battle.defender_ships_initial, battle.defender_ships_destroyed, battle.defender_ships_retreated),
+        ):
+            bonus = self._calculate_formation_bonus(fleet) if fleet else {"attack": 1.0, "defense": 1.0}
+            sides.append(FleetSide.from_ships(
+                ships_by_fleet[fleet.id] if fleet else [],
+                attack_bonus=bonus["attack"],
+                defense_bonus=bonus["defense"],
+                initial_ships=initial or 1,
+                destroyed_count=destroyed or 0,
+                retreated_count=retreated or 0,
+            ))
+        return sides[0], sides[1]
+
+    def _persist_battle_rounds(
+        self,
+        battle: FleetBattle,
+        attacker: Fleet,
+        defender: Fleet,
+        attacker_side: FleetSide,
+        defender_side: FleetSide,
+        rounds: List[Dict[str, Any]]
+    ) -> None:
+        """Write ship deltas, casualties, round events and counters in bulk."""
+        if not rounds:
+            return
 
-        self.db.commit()
+        ship_rows = []
+        casualty_rows = []
+        destroyed_ship_ids = []
+        for fleet, side, is_attacker in ((attacker, attacker_side, True), (defender, defender_side, False)):
+            for i, ship_id in enumerate(side.ship_ids):
+                ship_rows.append((str(ship_id), int(side.shields[i]), int(side.hull[i]), bool(side.destroyed[i])))
+                if side.destroyed[i] or side.retreated[i]:
+                    casualty_rows.append({
+                        "id": uuid4(),
+                        "battle_id": battle.id,
+                        "ship_id": ship_id,
+                        "player_id": None,
+                        "fleet_id": fleet.id,
+                        "ship_name": side.labels[i]["ship_name"],
+                        "was_attacker": is_attacker,
+                        "destroyed": bool(side.destroyed[i]),
+                        "retreated": bool(side.retreated[i]),
+                        "damage_taken": int(side.max_hull[i] - side.hull[i]),
+                        "battle_phase": battle.phase,
+                    })
+                if side.destroyed[i]:
+                    destroyed_ship_ids.append(ship_id)
+
+        # One UPDATE for every ship in the battle
+        deltas = values(
+            column("id", String),
+            column("shields", Integer),
+            column("hull", Integer),
+            column("destroyed", Boolean),
+            name="deltas",
+        ).data(ship_rows)
+        self.db.execute(
+            update(Ship)
+            .where(Ship.id == cast(deltas.c.id, PG_UUID(as_uuid=True)))
+            .values(
+                combat=Ship.combat.op("||", return_type=JSONB)(
+                    func.jsonb_build_object("shields", deltas.c.shields, "hull", deltas.c.hull)
+                ),
+                is_destroyed=Ship.is_destroyed | deltas.c.destroyed,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        # Count remaining active ships after this round
-        attacker_remaining = len(self._get_active_fleet_ships(attacker))
-        defender_remaining = len(self._get_active_fleet_ships(defender))
+        if casualty_rows:
+            owner_rows = self.db.execute(
+                select(Ship.id, Ship.owner_id, Ship.type).where(
+                    Ship.id.in_([c["ship_id"] for c in casualty_rows])
+                )
+            ).all()
+            owners = {ship_id: (owner_id, ship_type) for ship_id, owner_id, ship_type in owner_rows}
+            for casualty in casualty_rows:
+                owner_id, ship_type = owners.get(casualty["ship_id"], (None, None))
+                casualty["player_id"] = owner_id
+                casualty["ship_type"] = ship_type.value if hasattr(ship_type, "value") else ship_type
+            self.db.execute(insert(FleetBattleCasualty), casualty_rows)
+
+        # Destroyed ships leave their fleets
+        if destroyed_ship_ids:
+            self.db.execute(
+                delete(FleetMember)
+                .where(FleetMember.ship_id.in_(destroyed_ship_ids))
+                .execution_options(synchronize_session=False)
+            )
 
-        return {
-            "battle_id": str(battle.id),
-            "phase": battle.phase,
-            "round": round_results["round"],
-            "attacker_remaining": attacker_remaining,
-            "defender_remaining": defender_remaining,
-            "round_results": round_results,
-            "battle_ongoing": True
-        }
+        now = datetime.utcnow()
+        self.db.execute(insert(FleetBattleEvent), [
+            {
+                "battle_id": battle.id,
+                "round": r["round"],
+                "phase": r["phase"],
+                "event_type": "round",
+                "payload": {"timestamp": now.isoformat(), "phase": r["phase"], "round": r["round"], "results": r},
+                "created_at": now,
+            }
+            for r in rounds
+        ])
+
+        # Battle counters
+        attacker_damage = sum(r["attacker_damage"] for r in rounds)
+        defender_damage = sum(r["defender_damage"] for r in rounds)
+        battle.attacker_damage_dealt = (battle.attacker_damage_dealt or 0) + attacker_damage
+        battle.defender_damage_dealt = (battle.defender_damage_dealt or 0) + defender_damage
+        battle.total_damage_dealt = battle.attacker_damage_dealt + battle.defender_damage_dealt
+        battle.attacker_ships_destroyed = attacker_side.destroyed_count
+        battle.attacker_ships_retreated = attacker_side.retreated_count
+        battle.defender_ships_destroyed = defender_side.destroyed_count
+        battle.defender_ships_retreated = defender_side.retreated_count
+        battle.rounds_completed = rounds[-1]["round"]
+
+        self._refresh_fleet_stats_after_battle([attacker, defender])
+
+    def _refresh_fleet_stats_after_battle(self, fleets: List[Fleet]) -> None:
+        """
+        Recompute aggregated fleet stats from surviving membership in one query.
+
+        Destroyed ships have already left their fleets, so this counts every
+        remaining member, including ships that retreated earlier in the battle
+        and are not in the engine arrays. A fleet is disbanded only when no
+        member ship survives.
+        """
+        fleets = [fleet for fleet in fleets if fleet]
+        # Damage leaves fractional hull and shields in the combat JSON, which an
+        # integer cast rejects, so values are summed as floats and truncated here
+        rows = self.db.execute(
+            select(
+                FleetMember.fleet_id,
+                func.count(Ship.id),
+                func.coalesce(func.sum(Ship.combat["attack_rating"].as_float()), 0),
+                func.coalesce(func.sum(Ship.combat["shields"].as_float()), 0),
+                func.coalesce(func.sum(Ship.combat["hull"].as_float()), 0),
+                func.coalesce(func.avg(Ship.current_speed), 0.0),
+            )
+            .join(Ship, Ship.id == FleetMember.ship_id)
+            .where(
+                FleetMember.fleet_id.in_([fleet.id for fleet in fleets]),
+                Ship.is_destroyed == False
+            )
+            .group_by(FleetMember.fleet_id)
+        ).all()
+        totals = {row[0]: row[1:] for row in rows}
+
+        for fleet in fleets:
+            ships, firepower, shields, hull, speed = totals.get(fleet.id, (0, 0, 0, 0, 0.0))
+            fleet.total_ships = int(ships)
+            fleet.total_firepower = int(firepower)
+            fleet.total_shields = int(shields)
+            fleet.total_hull = int(hull)
+            fleet.average_speed = float(speed)
+
+            if fleet.total_ships == 0:
+                fleet.status = FleetStatus.DISBANDED.value
+                fleet.disbanded_at = datetime.utcnow()
+
+    def get_battle_log(self, battle: FleetBattle) -> List[Dict[str, Any]]:
+        """Return the battle's event log, falling back to the legacy JSON log."""
+        events = self.db.query(FleetBattleEvent.payload).filter(
+            FleetBattleEvent.battle_id == battle.id
+        ).order_by(FleetBattleEvent.id).all()
+        if events:
+            return [payload for (payload,) in events]
+        return battle.battle_log if isinstance(battle.battle_log, list) else []
 
     def get_battle_status(self, battle_id: UUID) -> Dict[str, Any]:
         """
@@ -517,7 +701,7 @@ class FleetService:
             },
             "total_damage_dealt": battle.total_damage_dealt or 0,
             "credits_looted": battle.credits_looted or 0,
-            "rounds_completed": len(battle.battle_log) if isinstance(battle.battle_log, list) else 0,
+            "rounds_completed": battle.rounds_completed or 0,
             "casualties": {
                 "attacker": [
                     {
@@ -585,200 +769,37 @@ class FleetService:
 
         return formation_bonus
 
-    def _calculate_ship_damage(self, ship: Ship, fleet_bonus: Dict[str, float]) -> int:
-        """
-        Calculate damage output for a ship.
-
-        Uses attack_rating from the ship's combat JSONB as base firepower.
-        Each gun-equivalent deals 10 base damage, scaled by formation attack bonus
-        and a random variance of +/- 20%.
-        """
-        attack_rating = self._get_ship_combat_stat(ship, "attack_rating", 1)
-        base_damage = attack_rating * 10
-        damage = int(base_damage * fleet_bonus["attack"])
-
-        # Random variance +/- 20%
-        damage = int(damage * random.uniform(0.8, 1.2))
-
-        return max(1, damage)
-
-    def _apply_damage_to_ship(
-        self,
-        ship: Ship,
-        damage: int,
-        battle: FleetBattle,
-        round_results: Dict[str, Any]
-    ):
-        """Apply damage to a ship, reducing shields first then hull."""
-        # Apply target's defense formation bonus to reduce incoming damage
-        member = self.db.query(FleetMember).filter(
-            FleetMember.ship_id == ship.id
-        ).first()
-
-        if member:
-            fleet = member.fleet
-            defense_bonus = self._calculate_formation_bonus(fleet)["defense"]
-            # Higher defense = less damage taken
-            damage = max(1, int(damage / defense_bonus))
-
-        current_shields = self._get_ship_combat_stat(ship, "shields", 0)
-        current_hull = self._get_ship_combat_stat(ship, "hull", 0)
-        max_hull = self._get_ship_combat_stat(ship, "max_hull", current_hull)
-
-        # First absorb damage with shields
-        if current_shields > 0:
-            shield_damage = min(damage, current_shields)
-            current_shields -= shield_damage
-            self._set_ship_combat_stat(ship, "shields", current_shields)
-            damage -= shield_damage
-
-        # Remaining damage hits hull
-        if damage > 0:
-            current_hull -= damage
-
-            if current_hull <= 0:
-                current_hull = 0
-                self._set_ship_combat_stat(ship, "hull", 0)
-                ship.is_destroyed = True
-                self._record_ship_casualty(ship, battle, destroyed=True)
-                round_results["ships_destroyed"].append({
-                    "ship_id": str(ship.id),
-                    "ship_name": ship.name,
-                    "player": ship.owner.username if ship.owner else "Unknown"
-                })
-            else:
-                self._set_ship_combat_stat(ship, "hull", current_hull)
-
-                # Check for retreat (hull below 30% of max)
-                if max_hull > 0 and current_hull < max_hull * 0.3:
-                    if random.random() < 0.3:  # 30% chance to retreat when heavily damaged
-                        self._record_ship_casualty(ship, battle, destroyed=False)
-                        round_results["ships_retreated"].append({
-                            "ship_id": str(ship.id),
-                            "ship_name": ship.name,
-                            "player": ship.owner.username if ship.owner else "Unknown"
-                        })
-
-    def _record_ship_casualty(
-        self,
-        ship: Ship,
-        battle: FleetBattle,
-        destroyed: bool
-    ):
-        """Record a ship casualty in the battle via FleetBattleCasualty."""
-        member = self.db.query(FleetMember).filter(
-            FleetMember.ship_id == ship.id
-        ).first()
-
-        if not member:
-            return
-
-        is_attacker = member.fleet_id == battle.attacker_fleet_id
-
-        max_hull = self._get_ship_combat_stat(ship, "max_hull", 0)
-        current_hull = self._get_ship_combat_stat(ship, "hull", 0)
-
-        # ship.type is an enum — store its string value
-        ship_type_str = ship.type.value if hasattr(ship.type, 'value') else str(ship.type)
-
-        casualty = FleetBattleCasualty(
-            battle_id=battle.id,
-            ship_id=ship.id,
-            player_id=ship.owner_id,
-            fleet_id=member.fleet_id,
-            ship_name=ship.name,
-            ship_type=ship_type_str,
-            was_attacker=is_attacker,
-            destroyed=destroyed,
-            retreated=not destroyed,
-            damage_taken=max_hull - current_hull,
-            battle_phase=battle.phase
-        )
-
-        self.db.add(casualty)
-
-        # Update battle statistics
-        if destroyed:
-            if is_attacker:
-                battle.attacker_ships_destroyed = (battle.attacker_ships_destroyed or 0) + 1
-            else:
-                battle.defender_ships_destroyed = (battle.defender_ships_destroyed or 0) + 1
-        else:
-            if is_attacker:
-                battle.attacker_ships_retreated = (battle.attacker_ships_retreated or 0) + 1
-            else:
-                battle.defender_ships_retreated = (battle.defender_ships_retreated or 0) + 1
-
-        # Remove ship from fleet if destroyed
-        if destroyed:
-            self.remove_ship_from_fleet(member.fleet_id, ship.id)
-
-    def _should_end_battle(
+    def _end_battle(
         self,
         battle: FleetBattle,
-        attacker: Fleet,
-        defender: Fleet
-    ) -> bool:
-        """Check if battle should end."""
-        # No ships left on one side
-        attacker_ships = self._get_active_fleet_ships(attacker)
-        defender_ships = self._get_active_fleet_ships(defender)
-
-        if not attacker_ships or not defender_ships:
-            return True
-
-        # Morale collapsed (below 20%)
-        if (attacker.morale or 100) < 20 or (defender.morale or 100) < 20:
-            return True
-
-        # Too many casualties (> 70% losses)
-        attacker_losses = (battle.attacker_ships_destroyed or 0) + (battle.attacker_ships_retreated or 0)
-        defender_losses = (battle.defender_ships_destroyed or 0) + (battle.defender_ships_retreated or 0)
-
-        attacker_initial = battle.attacker_ships_initial or 1
-        defender_initial = battle.defender_ships_initial or 1
-
-        if attacker_losses > attacker_initial * 0.7:
-            return True
-        if defender_losses > defender_initial * 0.7:
-            return True
-
-        # Battle timeout (30 rounds)
-        log_length = len(battle.battle_log) if isinstance(battle.battle_log, list) else 0
-        if log_length > 30:
-            return True
-
-        return False
-
-    def _end_battle(self, battle: FleetBattle) -> Dict[str, Any]:
-        """End a fleet battle and determine the winner."""
+        attacker_side: Optional[FleetSide] = None,
+        defender_side: Optional[FleetSide] = None
+    ) -> Dict[str, Any]:
+        """End a fleet battle and determine the winner from the final engine state."""
         battle.ended_at = datetime.utcnow()
         battle.phase = BattlePhase.AFTERMATH.value
 
-        # Calculate remaining forces
         attacker = battle.attacker_fleet
         defender = battle.defender_fleet
 
-        attacker_ships = self._get_active_fleet_ships(attacker) if attacker else []
-        defender_ships = self._get_active_fleet_ships(defender) if defender else []
+        if attacker_side is None or defender_side is None:
+            # Ended outside the engine (admin intervention): load current state
+            attacker_side, defender_side = self._load_battle_sides(battle, attacker, defender)
 
-        attacker_strength = sum(
-            self._get_ship_combat_stat(s, "hull", 0) + self._get_ship_combat_stat(s, "shields", 0)
-            for s in attacker_ships
-        )
-        defender_strength = sum(
-            self._get_ship_combat_stat(s, "hull", 0) + self._get_ship_combat_stat(s, "shields", 0)
-            for s in defender_ships
-        )
+        # Calculate remaining forces
+        attacker_strength = attacker_side.strength
+        defender_strength = defender_side.strength
+        attacker_active = attacker_side.active_count
+        defender_active = defender_side.active_count
 
         # Determine winner — need a decisive 1.5x advantage, otherwise draw
         if attacker_strength > defender_strength * 1.5:
             battle.winner = "attacker"
         elif defender_strength > attacker_strength * 1.5:
             battle.winner = "defender"
-        elif len(attacker_ships) > 0 and len(defender_ships) == 0:
+        elif attacker_active > 0 and defender_active == 0:
             battle.winner = "attacker"
-        elif len(defender_ships) > 0 and len(attacker_ships) == 0:
+        elif defender_active > 0 and attacker_active == 0:
             battle.winner = "defender"
         else:
             battle.winner = "draw"
@@ -802,31 +823,36 @@ class FleetService:
 
         # Update fleet statuses
         if attacker:
-            attacker.status = FleetStatus.READY.value
+            if attacker.status != FleetStatus.DISBANDED.value:
+                attacker.status = FleetStatus.READY.value
             attacker.last_battle = datetime.utcnow()
             attacker.morale = max(10, (attacker.morale or 100) - 20)
 
         if defender:
-            defender.status = FleetStatus.READY.value
+            if defender.status != FleetStatus.DISBANDED.value:
+                defender.status = FleetStatus.READY.value
             defender.last_battle = datetime.utcnow()
             defender.morale = max(10, (defender.morale or 100) - 20)
 
-        # Append aftermath entry to battle log
-        current_log = list(battle.battle_log) if isinstance(battle.battle_log, list) else []
-        current_log.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "phase": "aftermath",
-            "event": "Battle ended",
-            "winner": battle.winner,
-            "credits_looted": battle.credits_looted or 0,
-            "final_statistics": {
-                "attacker_ships_destroyed": battle.attacker_ships_destroyed or 0,
-                "defender_ships_destroyed": battle.defender_ships_destroyed or 0,
-                "total_damage": battle.total_damage_dealt or 0
+        # Append aftermath event
+        self.db.add(FleetBattleEvent(
+            battle_id=battle.id,
+            round=battle.rounds_completed or 0,
+            phase="aftermath",
+            event_type="aftermath",
+            payload={
+                "timestamp": datetime.utcnow().isoformat(),
+                "phase": "aftermath",
+                "event": "Battle ended",
+                "winner": battle.winner,
+                "credits_looted": battle.credits_looted or 0,
+                "final_statistics": {
+                    "attacker_ships_destroyed": battle.attacker_ships_destroyed or 0,
+                    "defender_ships_destroyed": battle.defender_ships_destroyed or 0,
+                    "total_damage": battle.total_damage_dealt or 0
+                }
             }
-        })
-        battle.battle_log = current_log
-        flag_modified(battle, "battle_log")
+        ))
 
         self.db.commit()
 
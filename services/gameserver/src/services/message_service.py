@@ -8,8 +8,9 @@ from uuid import UUID, uuid4
 import logging
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, text, tuple_
 
+from src.models.conversation_summary import ConversationSummary
 from src.models.message import Message
 from src.models.player import Player
 from src.models.team import Team
@@ -20,6 +21,72 @@ manager = ConnectionManager()
 
 logger = logging.getLogger(__name__)
 
+# Conversation summaries (one row per player and thread, see models/conversation_summary.py)
+
+_TOUCH_CONVERSATION_SQL = text("""
+    INSERT INTO conversation_summaries (player_id, thread_id, last_message_id, last_message_at, unread_count)
+    VALUES (:player_id, :thread_id, :message_id, :sent_at, :unread)
+    ON CONFLICT (player_id, thread_id) DO UPDATE SET
+        last_message_id = CASE
+            WHEN EXCLUDED.last_message_at >= conversation_summaries.last_message_at
+            THEN EXCLUDED.last_message_id ELSE conversation_summaries.last_message_id
+        END,
+        last_message_at = GREATEST(conversation_summaries.last_message_at, EXCLUDED.last_message_at),
+        unread_count = conversation_summaries.unread_count + EXCLUDED.unread_count
+""")
+
+_READ_CONVERSATION_SQL = text("""
+    UPDATE conversation_summaries
+    SET unread_count = GREATEST(unread_count - 1, 0)
+    WHERE player_id = :player_id AND thread_id = :thread_id
+""")
+
+# Recompute one player's row for a thread from its messages (after deletes);
+# removes the row when nothing in the thread is visible to the player any more
+_REFRESH_CONVERSATION_SQL = text("""
+    WITH visible AS (
+        SELECT id, sent_at, (recipient_id = :player_id AND read_at IS NULL) AS unread
+        FROM messages
+        WHERE thread_id = :thread_id
+          AND ((sender_id = :player_id AND NOT COALESCE(deleted_by_sender, false))
+               OR (recipient_id = :player_id AND NOT COALESCE(deleted_by_recipient, false)))
+    ), removed AS (
+        DELETE FROM conversation_summaries
+        WHERE player_id = :player_id AND thread_id = :thread_id
+          AND NOT EXISTS (SELECT 1 FROM visible)
+    )
+    INSERT INTO conversation_summaries (player_id, thread_id, last_message_id, last_message_at, unread_count)
+    SELECT :player_id, :thread_id,
+           (SELECT id FROM visible ORDER BY sent_at DESC, id DESC LIMIT 1),
+           MAX(sent_at), COUNT(*) FILTER (WHERE unread)
+    FROM visible
+    HAVING COUNT(*) > 0
+    ON CONFLICT (player_id, thread_id) DO UPDATE SET
+        last_message_id = EXCLUDED.last_message_id,
+        last_message_at = EXCLUDED.last_message_at,
+        unread_count = EXCLUDED.unread_count
+""")
+
+
+def _touch_conversations(db: Session, message: Message) -> None:
+    """Move the message's thread to the top for its sender and recipient (unread for the recipient)"""
+    unread = {message.sender_id: 0}
+    if message.recipient_id:
+        unread[message.recipient_id] = 1
+    for player_id, count in unread.items():
+        db.execute(_TOUCH_CONVERSATION_SQL, {
+            "player_id": player_id,
+            "thread_id": message.thread_id,
+            "message_id": message.id,
+            "sent_at": message.sent_at,
+            "unread": count,
+        })
+
+
+def _refresh_conversation(db: Session, player_id: UUID, thread_id: Optional[UUID]) -> None:
+    if player_id and thread_id:
+        db.execute(_REFRESH_CONVERSATION_SQL, {"player_id": player_id, "thread_id": thread_id})
+
 
 class MessageService:
     """Service for managing player messages"""
@@ -86,6 +153,8 @@ class MessageService:
         )
         
         db.add(message)
+        db.flush()
+        _touch_conversations(db, message)
         db.commit()
         db.refresh(message)
         
@@ -228,6 +297,8 @@ class MessageService:
         if not message:
             return False
         
+        if message.read_at is None and message.thread_id:
+            db.execute(_READ_CONVERSATION_SQL, {"player_id": player_id, "thread_id": message.thread_id})
         message.mark_as_read()
         db.commit()
         
@@ -247,6 +318,8 @@ class MessageService:
             return False
         
         message.soft_delete_for(player_id)
+        db.flush()
+        _refresh_conversation(db, player_id, message.thread_id)
         db.commit()
         
         return True
@@ -256,60 +329,57 @@ class MessageService:
         db: Session,
         player_id: UUID,
         page: int = 1,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get conversation threads for a player"""
-        
-        # This is a simplified version - in production you'd want a more
-        # sophisticated query to get unique conversations
-        
-        # Get latest message from each thread
-        from sqlalchemy import func
-        
-        # Subquery to get latest message per thread
-        latest_messages = db.query(
-            Message.thread_id,
-            func.max(Message.sent_at).label('latest_sent')
-        ).filter(
-            and_(
-                or_(
-                    Message.sender_id == player_id,
-                    Message.recipient_id == player_id
-                ),
-                or_(
-                    and_(Message.sender_id == player_id, Message.deleted_by_sender == False),
-                    and_(Message.recipient_id == player_id, Message.deleted_by_recipient == False)
-                )
+        """
+        Get conversation threads for a player, most recent first.
+        
+        Reads the player's conversation_summaries rows in (last_message_at,
+        thread_id) keyset order; ``cursor`` (the previous page's next_cursor)
+        takes precedence over ``page``, which is kept for callers that
+        still page by number.
+        """
+        from src.services.admin_query_service import decode_cursor, encode_cursor
+        
+        query = db.query(ConversationSummary, Message).join(
+            Message, Message.id == ConversationSummary.last_message_id
+        ).filter(ConversationSummary.player_id == player_id)
+        
+        if cursor:
+            last_at, last_thread = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(ConversationSummary.last_message_at, ConversationSummary.thread_id)
+                < tuple_(datetime.fromisoformat(last_at), UUID(last_thread))
             )
-        ).group_by(Message.thread_id).subquery()
         
-        # Get the actual messages
-        query = db.query(Message).join(
-            latest_messages,
-            and_(
-                Message.thread_id == latest_messages.c.thread_id,
-                Message.sent_at == latest_messages.c.latest_sent
-            )
-        )
-        
-        total = query.count()
-        
-        # Get paginated conversations
-        offset = (page - 1) * limit
-        conversations = query.options(
+        query = query.options(
             joinedload(Message.sender),
             joinedload(Message.recipient)
-        ).order_by(desc(Message.sent_at))\
-         .limit(limit)\
-         .offset(offset)\
-         .all()
+        ).order_by(desc(ConversationSummary.last_message_at), desc(ConversationSummary.thread_id))
+        if page > 1 and not cursor:
+            query = query.offset((page - 1) * limit)
+        rows = query.limit(limit + 1).all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        conversations = []
+        for summary, message in rows:
+            data = message.to_dict()
+            data["unread_count"] = summary.unread_count
+            conversations.append(data)
+        
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.last_message_at.isoformat(), last.thread_id)
         
         return {
-            "conversations": [msg.to_dict() for msg in conversations],
-            "total": total,
+            "conversations": conversations,
+            "next_cursor": next_cursor,
             "page": page,
-            "limit": limit,
-            "pages": (total + limit - 1) // limit
+            "limit": limit
         }
     
     @staticmethod
@@ -396,6 +466,12 @@ class MessageService:
         message.moderated_at = datetime.utcnow()
         message.moderated_by = moderator_id
         
+        if action == "delete":
+            # Re-derive the participants' conversation rows without the message
+            db.flush()
+            _refresh_conversation(db, message.sender_id, message.thread_id)
+            _refresh_conversation(db, message.recipient_id, message.thread_id)
+        
         db.commit()
         
         logger.info(f"Message {message_id} moderated by {moderator_id}: {action}")
@@ -5,10 +5,11 @@ This service manages planetary colonization, resource allocation,
 building construction, defenses, and sieges.
 """
 
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, replace
+from typing import Dict, Any, Optional, List, Sequence
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func
 import logging
 
@@ -29,6 +30,35 @@ DEFENSE_UPGRADE_COST = 1000     # Credits per defense level
 DEFENSE_MAX_LEVEL = 10          # Maximum defense level
 DEFENSE_DAMAGE_REDUCTION_PER_LEVEL = 0.10  # 10% damage reduction per level
 
+# Production multipliers and modifiers per planet specialization
+SPECIALIZATION_BONUSES = {
+    "agricultural": {
+        "production": {"fuel": 0.8, "organics": 1.5, "equipment": 0.8, "colonists": 1.2},
+        "defense": 0.9,
+        "research": 0.8
+    },
+    "industrial": {
+        "production": {"fuel": 0.9, "organics": 0.8, "equipment": 1.5, "colonists": 0.9},
+        "defense": 1.0,
+        "research": 0.9
+    },
+    "military": {
+        "production": {"fuel": 0.9, "organics": 0.9, "equipment": 1.1, "colonists": 0.8},
+        "defense": 1.5,
+        "research": 0.8
+    },
+    "research": {
+        "production": {"fuel": 0.8, "organics": 0.8, "equipment": 0.9, "colonists": 0.9},
+        "defense": 0.8,
+        "research": 1.5
+    },
+    "balanced": {
+        "production": {"fuel": 1.0, "organics": 1.0, "equipment": 1.0, "colonists": 1.0},
+        "defense": 1.0,
+        "research": 1.0
+    }
+}
+
 # Shield Generator Levels (0-10)
 # Uses planet.defense_shields to track generator level, planet.shields for strength
 SHIELD_GENERATOR_MAX_LEVEL = 10
@@ -47,6 +77,46 @@ SHIELD_GENERATOR_LEVELS = {
 }
 
 
+@dataclass(frozen=True)
+class SiegeState:
+    """The siege columns of one planet"""
+    under_siege: bool = False
+    siege_turns: int = 0
+    siege_started_at: Optional[datetime] = None
+    siege_attacker_id: Optional[UUID] = None
+
+    @classmethod
+    def of(cls, planet: Planet) -> "SiegeState":
+        return cls(bool(planet.under_siege), planet.siege_turns or 0, planet.siege_started_at, planet.siege_attacker_id)
+
+    def apply_to(self, planet: Planet) -> None:
+        planet.under_siege = self.under_siege
+        planet.siege_turns = self.siege_turns
+        planet.siege_started_at = self.siege_started_at
+        planet.siege_attacker_id = self.siege_attacker_id
+
+
+def advance_siege_state(
+    state: SiegeState, enemy_owner_ids: Sequence[UUID], owner_present: bool, now: datetime
+) -> SiegeState:
+    """
+    One turn of siege detection. Enemies present with the owner absent count
+    toward SIEGE_TURNS_THRESHOLD, after which the siege begins (attributed to
+    the first enemy ship's owner); otherwise an active siege is lifted and the
+    escalation counter reset.
+    """
+    if enemy_owner_ids and not owner_present:
+        if state.under_siege:
+            return state  # Effects are applied by apply_siege_effects
+        turns = state.siege_turns + 1
+        if turns >= SIEGE_TURNS_THRESHOLD:
+            return SiegeState(True, turns, now, enemy_owner_ids[0])
+        return replace(state, siege_turns=turns)
+    if state.under_siege or state.siege_turns > 0:
+        return SiegeState()
+    return state
+
+
 class PlanetaryService:
     """Service for managing planetary operations."""
     
@@ -61,14 +131,16 @@ class PlanetaryService:
             Planet.id == player_planets.c.planet_id
         ).filter(
             player_planets.c.player_id == player_id
-        ).all()
-        
-        result = []
-        for planet in planets:
-            planet_data = self._format_planet_data(planet)
-            result.append(planet_data)
-            
-        return result
+        ).options(joinedload(Planet.sector)).all()
+
+        # Production rates for all planets in one vectorized pass
+        from src.services.colony_economy_engine import PlanetColumns, production_rates
+        rates = production_rates(PlanetColumns.from_planets(planets))
+
+        return [
+            self._format_planet_data(planet, production_rates=rates.as_dict(i))
+            for i, planet in enumerate(planets)
+        ]
         
     def get_planet_details(self, planet_id: UUID, player_id: UUID) -> Dict[str, Any]:
         """Get detailed information about a specific planet."""
@@ -775,47 +847,30 @@ class PlanetaryService:
         # Check if planet owner is present in the sector
         owner_present = owner.current_sector_id == planet.sector_id
 
-        if len(enemy_ships) > 0 and not owner_present:
-            # Enemies are present and owner is absent
-            if not planet.under_siege:
-                # Track escalation toward siege via siege_turns counter
-                planet.siege_turns = (planet.siege_turns or 0) + 1
-
-                if planet.siege_turns >= SIEGE_TURNS_THRESHOLD:
-                    # Siege begins
-                    planet.under_siege = True
-                    planet.siege_started_at = datetime.utcnow()
-                    # Record the first enemy ship's owner as the attacker
-                    planet.siege_attacker_id = enemy_ships[0].owner_id
-                    result["state_changed"] = True
-                    logger.info(
-                        f"Siege begun on planet {planet.name} (id={planet.id}) "
-                        f"by player {planet.siege_attacker_id} with {len(enemy_ships)} ships"
-                    )
-            # If already under siege, state stays the same (effects applied by apply_siege_effects)
-        else:
-            # No enemies present, or owner is present -- lift siege if active
-            if planet.under_siege:
-                planet.under_siege = False
-                planet.siege_started_at = None
-                planet.siege_attacker_id = None
-                planet.siege_turns = 0
-                result["state_changed"] = True
+        before = SiegeState.of(planet)
+        after = advance_siege_state(before, [s.owner_id for s in enemy_ships], owner_present, datetime.utcnow())
+        if after != before:
+            after.apply_to(planet)
+            # Escalation alone is not a state change; sieges starting or lifting and counter resets are
+            result["state_changed"] = after.under_siege != before.under_siege or after.siege_turns == 0
+            if after.under_siege and not before.under_siege:
+                logger.info(
+                    f"Siege begun on planet {planet.name} (id={planet.id}) "
+                    f"by player {planet.siege_attacker_id} with {len(enemy_ships)} ships"
+                )
+            elif before.under_siege and not after.under_siege:
                 logger.info(f"Siege lifted on planet {planet.name} (id={planet.id})")
-            elif planet.siege_turns and planet.siege_turns > 0:
-                # Reset turn counter if enemies left before siege triggered
-                planet.siege_turns = 0
-                result["state_changed"] = True
 
         self.db.commit()
         return result
     
-    def _format_planet_data(self, planet: Planet) -> Dict[str, Any]:
+    def _format_planet_data(self, planet: Planet, production_rates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """Format planet data for API response."""
         sector = planet.sector if planet.sector else None
 
         # Calculate production rates (siege effects are factored in automatically)
-        production_rates = self._calculate_production_rates(planet)
+        if production_rates is None:
+            production_rates = self._calculate_production_rates(planet)
 
         # Get building data
         buildings = self._get_buildings_data(planet)
@@ -1064,32 +1119,4 @@ class PlanetaryService:
         
     def _calculate_specialization_bonuses(self, specialization: str) -> Dict[str, Any]:
         """Calculate bonuses based on planet specialization."""
-        bonuses = {
-            "agricultural": {
-                "production": {"fuel": 0.8, "organics": 1.5, "equipment": 0.8, "colonists": 1.2},
-                "defense": 0.9,
-                "research": 0.8
-            },
-            "industrial": {
-                "production": {"fuel": 0.9, "organics": 0.8, "equipment": 1.5, "colonists": 0.9},
-                "defense": 1.0,
-                "research": 0.9
-            },
-            "military": {
-                "production": {"fuel": 0.9, "organics": 0.9, "equipment": 1.1, "colonists": 0.8},
-                "defense": 1.5,
-                "research": 0.8
-            },
-            "research": {
-                "production": {"fuel": 0.8, "organics": 0.8, "equipment": 0.9, "colonists": 0.9},
-                "defense": 0.8,
-                "research": 1.5
-            },
-            "balanced": {
-                "production": {"fuel": 1.0, "organics": 1.0, "equipment": 1.0, "colonists": 1.0},
-                "defense": 1.0,
-                "research": 1.0
-            }
-        }
-        
-        return bonuses.get(specialization, bonuses["balanced"])
\ No newline at end of file
+        return SPECIALIZATION_BONUSES.get(specialization, SPECIALIZATION_BONUSES["balanced"])
\ No newline at end of file
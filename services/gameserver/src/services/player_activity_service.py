@@ -5,29 +5,43 @@ Tracks player session activity, key events, and analytics summaries
 using Redis with TTL-based expiration.  No new database tables required --
 leverages the existing Player model's last_game_login and the Redis
 infrastructure already in place.
+
+Sessions, summaries and daily aggregates are Redis hashes updated with
+HINCRBY/HINCRBYFLOAT, and unique sectors and unique daily players are
+HyperLogLogs.  Each login, activity and logout is a single round trip (a
+MULTI pipeline or a Lua script), so concurrent actions never overwrite
+each other's counters.
 """
 
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
 from src.models.player import Player
-from src.services.redis_service import RedisService, get_redis_service
+
+if TYPE_CHECKING:
+    from src.services.redis_service import RedisService
 
 logger = logging.getLogger(__name__)
 
 
-# Key prefixes for Redis
-_SESSION_KEY = "activity:session:{player_id}"          # current session data
-_EVENTS_KEY = "activity:events:{player_id}"            # recent event list
-_SUMMARY_KEY = "activity:summary:{player_id}"          # rolling summary
-_DAILY_KEY = "activity:daily:{player_id}:{date}"       # daily aggregates
-_GLOBAL_ONLINE_KEY = "activity:online_players"         # set of currently online player ids
+# Key prefixes for Redis.  Versioned: the v1 keys were JSON strings written
+# with SETEX, and reusing their names for hashes would fail with WRONGTYPE
+# until they expired.  The old keys are left to their TTLs.
+_KEY_PREFIX = "activity:v2:"
+_SESSION_KEY = _KEY_PREFIX + "session:{player_id}"          # current session hash
+_EVENTS_KEY = _KEY_PREFIX + "events:{player_id}"            # recent event list
+_SUMMARY_KEY = _KEY_PREFIX + "summary:{player_id}"          # rolling summary hash
+_DAILY_KEY = _KEY_PREFIX + "daily:{player_id}:{date}"       # daily aggregate hash
+_GLOBAL_ONLINE_KEY = _KEY_PREFIX + "online_players"         # set of currently online player ids
+_SESSION_SECTORS_KEY = _KEY_PREFIX + "session:{player_id}:sectors"    # HLL of sectors this session
+_SUMMARY_SECTORS_KEY = _KEY_PREFIX + "summary:{player_id}:sectors"    # HLL of all sectors visited
+_DAILY_PLAYERS_KEY = _KEY_PREFIX + "daily_players:{date}"   # HLL of players active on a day
 
 # TTLs in seconds
 _SESSION_TTL = 60 * 60 * 24       # 24 hours
@@ -35,6 +49,118 @@ _EVENTS_TTL = 60 * 60 * 24 * 7   # 7 days
 _SUMMARY_TTL = 60 * 60 * 24 * 30 # 30 days
 _DAILY_TTL = 60 * 60 * 24 * 14   # 14 days
 
+_MAX_EVENTS = 500                 # per-player event list length
+
+# KEYS: session, session sectors, events, daily players
+# ARGV: player_id, now iso, event json, is trade, trade volume, is combat,
+#       sector id ('' for none), session ttl, events ttl, daily ttl, max events
+# Counters only move while a session exists; the event is always recorded.
+_TRACK_ACTIVITY_LUA = """
+local active = redis.call('EXISTS', KEYS[1]) == 1
+if active then
+    redis.call('HINCRBY', KEYS[1], 'actions_count', 1)
+    redis.call('HSET', KEYS[1], 'last_activity_at', ARGV[2])
+    if ARGV[4] == '1' then
+        redis.call('HINCRBY', KEYS[1], 'trades_count', 1)
+        redis.call('HINCRBYFLOAT', KEYS[1], 'trade_volume', ARGV[5])
+    end
+    if ARGV[6] == '1' then
+        redis.call('HINCRBY', KEYS[1], 'combat_events', 1)
+    end
+    if ARGV[7] ~= '' then
+        redis.call('PFADD', KEYS[2], ARGV[7])
+        redis.call('EXPIRE', KEYS[2], ARGV[8])
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[8])
+end
+redis.call('LPUSH', KEYS[3], ARGV[3])
+redis.call('LTRIM', KEYS[3], 0, tonumber(ARGV[11]) - 1)
+redis.call('EXPIRE', KEYS[3], ARGV[9])
+redis.call('PFADD', KEYS[4], ARGV[1])
+redis.call('EXPIRE', KEYS[4], ARGV[10])
+return active and 1 or 0
+"""
+
+# KEYS: session, session sectors, summary, summary sectors, daily, events, online set
+# ARGV: player_id, now epoch seconds, now iso, date, summary ttl, daily ttl,
+#       events ttl, max events
+# Folds the session hash into the summary and daily hashes, records the
+# logout event and ends the session.  Returns the session hash (flattened),
+# the duration and the unique sector count.
+_TRACK_LOGOUT_LUA = """
+local flat = redis.call('HGETALL', KEYS[1])
+local session = {}
+for i = 1, #flat, 2 do session[flat[i]] = flat[i + 1] end
+local function num(field) return tonumber(session[field] or '0') or 0 end
+
+local duration = tonumber(ARGV[2]) - (tonumber(session['login_ts'] or ARGV[2]) or tonumber(ARGV[2]))
+if duration < 0 then duration = 0 end
+
+redis.call('HSET', KEYS[3], 'player_id', ARGV[1], 'last_updated', ARGV[3])
+redis.call('HINCRBY', KEYS[3], 'total_sessions', 1)
+redis.call('HINCRBYFLOAT', KEYS[3], 'total_playtime_seconds', duration)
+redis.call('HINCRBY', KEYS[3], 'total_actions', num('actions_count'))
+redis.call('HINCRBY', KEYS[3], 'total_trades', num('trades_count'))
+redis.call('HINCRBYFLOAT', KEYS[3], 'total_trade_volume', num('trade_volume'))
+redis.call('HINCRBY', KEYS[3], 'total_combat_events', num('combat_events'))
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('PFMERGE', KEYS[4], KEYS[4], KEYS[2])
+end
+local unique = redis.call('PFCOUNT', KEYS[4])
+redis.call('HSET', KEYS[3], 'unique_sectors_visited', unique)
+redis.call('EXPIRE', KEYS[3], ARGV[5])
+redis.call('EXPIRE', KEYS[4], ARGV[5])
+
+redis.call('HSET', KEYS[5], 'player_id', ARGV[1], 'date', ARGV[4])
+redis.call('HINCRBY', KEYS[5], 'sessions', 1)
+redis.call('HINCRBYFLOAT', KEYS[5], 'playtime_seconds', duration)
+redis.call('HINCRBY', KEYS[5], 'actions', num('actions_count'))
+redis.call('HINCRBY', KEYS[5], 'trades', num('trades_count'))
+redis.call('HINCRBYFLOAT', KEYS[5], 'trade_volume', num('trade_volume'))
+redis.call('HINCRBY', KEYS[5], 'combat_events', num('combat_events'))
+redis.call('EXPIRE', KEYS[5], ARGV[6])
+
+local event = cjson.encode({
+    event_type = 'logout', timestamp = ARGV[3], details = {duration_seconds = duration}
+})
+redis.call('LPUSH', KEYS[6], event)
+redis.call('LTRIM', KEYS[6], 0, tonumber(ARGV[8]) - 1)
+redis.call('EXPIRE', KEYS[6], ARGV[7])
+
+redis.call('SREM', KEYS[7], ARGV[1])
+redis.call('DEL', KEYS[1], KEYS[2])
+return {flat, tostring(duration), unique}
+"""
+
+_SESSION_INT_FIELDS = ("actions_count", "trades_count", "combat_events")
+_SESSION_FLOAT_FIELDS = ("trade_volume",)
+_SUMMARY_INT_FIELDS = (
+    "total_sessions", "total_actions", "total_trades", "total_combat_events", "unique_sectors_visited",
+)
+_SUMMARY_FLOAT_FIELDS = ("total_playtime_seconds", "total_trade_volume")
+_DAILY_INT_FIELDS = ("sessions", "actions", "trades", "combat_events")
+_DAILY_FLOAT_FIELDS = ("playtime_seconds", "trade_volume")
+
+
+def _parse_hash(
+    data: Dict[str, str], int_fields: Tuple[str, ...], float_fields: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """Convert a Redis hash (all strings) back into typed counters"""
+    parsed: Dict[str, Any] = dict(data)
+    for field in int_fields:
+        parsed[field] = int(float(data.get(field) or 0))
+    for field in float_fields:
+        parsed[field] = float(data.get(field) or 0)
+    return parsed
+
+
+def _event_json(event_type: str, now: datetime, details: Optional[Dict[str, Any]]) -> str:
+    return json.dumps({
+        "event_type": event_type,
+        "timestamp": now.isoformat(),
+        "details": details or {},
+    }, default=str)
+
 
 class ActivityEventType:
     """Constants for trackable event types."""
@@ -62,15 +188,25 @@ class PlayerActivityService:
     - Produce per-player and global activity summaries
     """
 
-    def __init__(self, redis: Optional[RedisService] = None):
+    def __init__(self, redis: Optional["RedisService"] = None):
         self._redis = redis
+        self._scripts: Dict[str, Any] = {}
 
-    async def _get_redis(self) -> RedisService:
+    async def _get_redis(self) -> "RedisService":
         """Lazy-load the Redis service if not injected."""
         if self._redis is None:
+            from src.services.redis_service import get_redis_service
             self._redis = await get_redis_service()
         return self._redis
 
+    def _script(self, redis: "RedisService", name: str, source: str):
+        """Register a Lua script once per service (EVALSHA with EVAL fallback)."""
+        script = self._scripts.get(name)
+        if script is None:
+            script = redis.redis_pool.register_script(source)
+            self._scripts[name] = script
+        return script
+
     # ------------------------------------------------------------------
     # Session tracking
     # ------------------------------------------------------------------
@@ -88,6 +224,8 @@ class PlayerActivityService:
         redis = await self._get_redis()
         now = datetime.utcnow()
         session_key = _SESSION_KEY.format(player_id=player_id)
+        events_key = _EVENTS_KEY.format(player_id=player_id)
+        daily_players_key = _DAILY_PLAYERS_KEY.format(date=now.strftime("%Y-%m-%d"))
 
         session_data = {
             "player_id": player_id,
@@ -97,15 +235,32 @@ class PlayerActivityService:
             "trades_count": 0,
             "trade_volume": 0,
             "combat_events": 0,
-            "sectors_visited": [],
+            "sectors_visited": 0,
         }
 
-        await redis.cache_set(session_key, session_data, ttl=_SESSION_TTL)
-        await self._record_event(player_id, ActivityEventType.LOGIN)
-
-        # Mark player as online
         if redis.redis_pool:
-            await redis.redis_pool.sadd(_GLOBAL_ONLINE_KEY, player_id)
+            # Start the session, record the event and mark the player online
+            # in one MULTI round trip
+            pipe = redis.redis_pool.pipeline(transaction=True)
+            pipe.delete(session_key, _SESSION_SECTORS_KEY.format(player_id=player_id))
+            pipe.hset(session_key, mapping={
+                "player_id": player_id,
+                "login_at": now.isoformat(),
+                "login_ts": now.timestamp(),
+                "last_activity_at": now.isoformat(),
+                "actions_count": 0,
+                "trades_count": 0,
+                "trade_volume": 0,
+                "combat_events": 0,
+            })
+            pipe.expire(session_key, _SESSION_TTL)
+            pipe.lpush(events_key, _event_json(ActivityEventType.LOGIN, now, None))
+            pipe.ltrim(events_key, 0, _MAX_EVENTS - 1)
+            pipe.expire(events_key, _EVENTS_TTL)
+            pipe.sadd(_GLOBAL_ONLINE_KEY, player_id)
+            pipe.pfadd(daily_players_key, player_id)
+            pipe.expire(daily_players_key, _DAILY_TTL)
+            await pipe.execute()
 
         # Optionally update DB
         if db:
@@ -131,35 +286,39 @@ class PlayerActivityService:
         """
         redis = await self._get_redis()
         now = datetime.utcnow()
-        session_key = _SESSION_KEY.format(player_id=player_id)
+        if not redis.redis_pool:
+            return None
+
+        script = self._script(redis, "logout", _TRACK_LOGOUT_LUA)
+        flat, duration, unique_sectors = await script(
+            keys=[
+                _SESSION_KEY.format(player_id=player_id),
+                _SESSION_SECTORS_KEY.format(player_id=player_id),
+                _SUMMARY_KEY.format(player_id=player_id),
+                _SUMMARY_SECTORS_KEY.format(player_id=player_id),
+                _DAILY_KEY.format(player_id=player_id, date=now.strftime("%Y-%m-%d")),
+                _EVENTS_KEY.format(player_id=player_id),
+                _GLOBAL_ONLINE_KEY,
+            ],
+            args=[
+                player_id, now.timestamp(), now.isoformat(), now.strftime("%Y-%m-%d"),
+                _SUMMARY_TTL, _DAILY_TTL, _EVENTS_TTL, _MAX_EVENTS,
+            ],
+        )
 
-        # Retrieve current session
-        session_data = await redis.cache_get(session_key)
-        if not session_data:
+        raw_session = dict(zip(flat[::2], flat[1::2]))
+        if not raw_session:
             logger.debug(f"No active session found for player {player_id}")
-            session_data = {"login_at": now.isoformat(), "actions_count": 0}
-
-        # Compute session duration
-        login_at = datetime.fromisoformat(session_data.get("login_at", now.isoformat()))
-        duration_seconds = (now - login_at).total_seconds()
+            raw_session = {"login_at": now.isoformat()}
+        session_data = _parse_hash(raw_session, _SESSION_INT_FIELDS, _SESSION_FLOAT_FIELDS)
+        session_data.pop("login_ts", None)
         session_data["logout_at"] = now.isoformat()
-        session_data["duration_seconds"] = duration_seconds
-
-        # Persist session to rolling summary
-        await self._update_summary(player_id, session_data)
-        await self._update_daily(player_id, session_data)
-        await self._record_event(player_id, ActivityEventType.LOGOUT, {
-            "duration_seconds": duration_seconds,
-        })
-
-        # Remove from online set & delete session key
-        if redis.redis_pool:
-            await redis.redis_pool.srem(_GLOBAL_ONLINE_KEY, player_id)
-        await redis.cache_delete(session_key)
+        session_data["duration_seconds"] = float(duration)
+        session_data["unique_sectors_visited"] = int(unique_sectors)
 
         logger.info(
-            f"Player {player_id} logged out after {duration_seconds:.0f}s, "
-            f"{session_data.get('actions_count', 0)} actions"
+            f"Player {player_id} logged out after {session_data['duration_seconds']:.0f}s, "
+            f"{session_data['actions_count']} actions"
         )
         return session_data
 
@@ -176,6 +335,9 @@ class PlayerActivityService:
         """
         Record a gameplay event and update the running session counters.
 
+        Everything (session counters, sector HyperLogLog, event list and the
+        daily unique-player HyperLogLog) is updated by one Lua script call.
+
         Parameters
         ----------
         player_id : str
@@ -186,34 +348,37 @@ class PlayerActivityService:
             Additional context (e.g. commodity, quantity, sector_id).
         """
         redis = await self._get_redis()
+        if not redis.redis_pool:
+            return
 
-        # Update session counters
-        session_key = _SESSION_KEY.format(player_id=player_id)
-        session = await redis.cache_get(session_key)
-        if session:
-            session["actions_count"] = session.get("actions_count", 0) + 1
-            session["last_activity_at"] = datetime.utcnow().isoformat()
-
-            if event_type in (ActivityEventType.TRADE_BUY, ActivityEventType.TRADE_SELL):
-                session["trades_count"] = session.get("trades_count", 0) + 1
-                volume = (details or {}).get("total_value", 0)
-                session["trade_volume"] = session.get("trade_volume", 0) + volume
-
-            if event_type in (ActivityEventType.COMBAT_ATTACK, ActivityEventType.COMBAT_DEFEND):
-                session["combat_events"] = session.get("combat_events", 0) + 1
-
-            if event_type == ActivityEventType.SECTOR_MOVE:
-                sector = (details or {}).get("sector_id")
-                visited = session.get("sectors_visited", [])
-                if sector and str(sector) not in visited:
-                    visited.append(str(sector))
-                    # Keep list bounded
-                    session["sectors_visited"] = visited[-100:]
-
-            await redis.cache_set(session_key, session, ttl=_SESSION_TTL)
-
-        # Record individual event
-        await self._record_event(player_id, event_type, details)
+        now = datetime.utcnow()
+        details = details or {}
+        is_trade = event_type in (ActivityEventType.TRADE_BUY, ActivityEventType.TRADE_SELL)
+        is_combat = event_type in (ActivityEventType.COMBAT_ATTACK, ActivityEventType.COMBAT_DEFEND)
+        sector = details.get("sector_id") if event_type == ActivityEventType.SECTOR_MOVE else None
+
+        script = self._script(redis, "activity", _TRACK_ACTIVITY_LUA)
+        await script(
+            keys=[
+                _SESSION_KEY.format(player_id=player_id),
+                _SESSION_SECTORS_KEY.format(player_id=player_id),
+                _EVENTS_KEY.format(player_id=player_id),
+                _DAILY_PLAYERS_KEY.format(date=now.strftime("%Y-%m-%d")),
+            ],
+            args=[
+                player_id,
+                now.isoformat(),
+                _event_json(event_type, now, details),
+                "1" if is_trade else "0",
+                details.get("total_value", 0) if is_trade else 0,
+                "1" if is_combat else "0",
+                str(sector) if sector else "",
+                _SESSION_TTL,
+                _EVENTS_TTL,
+                _DAILY_TTL,
+                _MAX_EVENTS,
+            ],
+        )
 
     # ------------------------------------------------------------------
     # Analytics queries
@@ -222,8 +387,18 @@ class PlayerActivityService:
     async def get_player_session(self, player_id: str) -> Optional[Dict[str, Any]]:
         """Return current session data for a player (or None if offline)."""
         redis = await self._get_redis()
-        session_key = _SESSION_KEY.format(player_id=player_id)
-        return await redis.cache_get(session_key)
+        if not redis.redis_pool:
+            return None
+        pipe = redis.redis_pool.pipeline(transaction=False)
+        pipe.hgetall(_SESSION_KEY.format(player_id=player_id))
+        pipe.pfcount(_SESSION_SECTORS_KEY.format(player_id=player_id))
+        data, sectors = await pipe.execute()
+        if not data:
+            return None
+        session = _parse_hash(data, _SESSION_INT_FIELDS, _SESSION_FLOAT_FIELDS)
+        session.pop("login_ts", None)
+        session["sectors_visited"] = int(sectors or 0)
+        return session
 
     async def get_player_summary(self, player_id: str) -> Dict[str, Any]:
         """
@@ -232,8 +407,9 @@ class PlayerActivityService:
         Includes total sessions, playtime, trade volume, combat events, etc.
         """
         redis = await self._get_redis()
-        summary_key = _SUMMARY_KEY.format(player_id=player_id)
-        summary = await redis.cache_get(summary_key)
+        summary = None
+        if redis.redis_pool:
+            summary = await redis.redis_pool.hgetall(_SUMMARY_KEY.format(player_id=player_id))
         if not summary:
             return {
                 "player_id": player_id,
@@ -245,7 +421,7 @@ class PlayerActivityService:
                 "total_combat_events": 0,
                 "unique_sectors_visited": 0,
             }
-        return summary
+        return _parse_hash(summary, _SUMMARY_INT_FIELDS, _SUMMARY_FLOAT_FIELDS)
 
     async def get_recent_events(
         self, player_id: str, limit: int = 50
@@ -270,8 +446,9 @@ class PlayerActivityService:
         redis = await self._get_redis()
         if date is None:
             date = datetime.utcnow().strftime("%Y-%m-%d")
-        daily_key = _DAILY_KEY.format(player_id=player_id, date=date)
-        stats = await redis.cache_get(daily_key)
+        stats = None
+        if redis.redis_pool:
+            stats = await redis.redis_pool.hgetall(_DAILY_KEY.format(player_id=player_id, date=date))
         if not stats:
             return {
                 "player_id": player_id,
@@ -283,7 +460,16 @@ class PlayerActivityService:
                 "trade_volume": 0,
                 "combat_events": 0,
             }
-        return stats
+        return _parse_hash(stats, _DAILY_INT_FIELDS, _DAILY_FLOAT_FIELDS)
+
+    async def get_daily_active_players(self, date: Optional[str] = None) -> int:
+        """Return the (HyperLogLog-estimated) number of players active on a day."""
+        redis = await self._get_redis()
+        if date is None:
+            date = datetime.utcnow().strftime("%Y-%m-%d")
+        if redis.redis_pool:
+            return await redis.redis_pool.pfcount(_DAILY_PLAYERS_KEY.format(date=date))
+        return 0
 
     async def get_online_player_count(self) -> int:
         """Return count of currently online players."""
@@ -300,125 +486,6 @@ class PlayerActivityService:
             return list(members) if members else []
         return []
 
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
-
-    async def _record_event(
-        self,
-        player_id: str,
-        event_type: str,
-        details: Optional[Dict[str, Any]] = None,
-    ) -> None:
-        """Push an event onto the player's event list in Redis."""
-        redis = await self._get_redis()
-        events_key = _EVENTS_KEY.format(player_id=player_id)
-
-        event = {
-            "event_type": event_type,
-            "timestamp": datetime.utcnow().isoformat(),
-            "details": details or {},
-        }
-
-        if redis.redis_pool:
-            await redis.redis_pool.lpush(events_key, json.dumps(event))
-            await redis.redis_pool.ltrim(events_key, 0, 499)  # keep last 500 events
-            await redis.redis_pool.expire(events_key, _EVENTS_TTL)
-
-    async def _update_summary(
-        self,
-        player_id: str,
-        session_data: Dict[str, Any],
-    ) -> None:
-        """Merge completed session data into the rolling summary."""
-        redis = await self._get_redis()
-        summary_key = _SUMMARY_KEY.format(player_id=player_id)
-
-        summary = await redis.cache_get(summary_key)
-        if not summary:
-            summary = {
-                "player_id": player_id,
-                "total_sessions": 0,
-                "total_playtime_seconds": 0,
-                "total_actions": 0,
-                "total_trades": 0,
-                "total_trade_volume": 0,
-                "total_combat_events": 0,
-                "unique_sectors_visited": 0,
-                "all_sectors": [],
-            }
-
-        summary["total_sessions"] = summary.get("total_sessions", 0) + 1
-        summary["total_playtime_seconds"] = (
-            summary.get("total_playtime_seconds", 0)
-            + session_data.get("duration_seconds", 0)
-        )
-        summary["total_actions"] = (
-            summary.get("total_actions", 0) + session_data.get("actions_count", 0)
-        )
-        summary["total_trades"] = (
-            summary.get("total_trades", 0) + session_data.get("trades_count", 0)
-        )
-        summary["total_trade_volume"] = (
-            summary.get("total_trade_volume", 0) + session_data.get("trade_volume", 0)
-        )
-        summary["total_combat_events"] = (
-            summary.get("total_combat_events", 0) + session_data.get("combat_events", 0)
-        )
-
-        # Merge visited sectors
-        existing = set(summary.get("all_sectors", []))
-        new_sectors = session_data.get("sectors_visited", [])
-        existing.update(new_sectors)
-        summary["all_sectors"] = list(existing)[-200:]  # cap at 200
-        summary["unique_sectors_visited"] = len(summary["all_sectors"])
-        summary["last_updated"] = datetime.utcnow().isoformat()
-
-        await redis.cache_set(summary_key, summary, ttl=_SUMMARY_TTL)
-
-    async def _update_daily(
-        self,
-        player_id: str,
-        session_data: Dict[str, Any],
-    ) -> None:
-        """Update the daily aggregate stats."""
-        redis = await self._get_redis()
-        date = datetime.utcnow().strftime("%Y-%m-%d")
-        daily_key = _DAILY_KEY.format(player_id=player_id, date=date)
-
-        stats = await redis.cache_get(daily_key)
-        if not stats:
-            stats = {
-                "player_id": player_id,
-                "date": date,
-                "sessions": 0,
-                "playtime_seconds": 0,
-                "actions": 0,
-                "trades": 0,
-                "trade_volume": 0,
-                "combat_events": 0,
-            }
-
-        stats["sessions"] = stats.get("sessions", 0) + 1
-        stats["playtime_seconds"] = (
-            stats.get("playtime_seconds", 0)
-            + session_data.get("duration_seconds", 0)
-        )
-        stats["actions"] = (
-            stats.get("actions", 0) + session_data.get("actions_count", 0)
-        )
-        stats["trades"] = (
-            stats.get("trades", 0) + session_data.get("trades_count", 0)
-        )
-        stats["trade_volume"] = (
-            stats.get("trade_volume", 0) + session_data.get("trade_volume", 0)
-        )
-        stats["combat_events"] = (
-            stats.get("combat_events", 0) + session_data.get("combat_events", 0)
-        )
-
-        await redis.cache_set(daily_key, stats, ttl=_DAILY_TTL)
-
 
 # ------------------------------------------------------------------
 # Module-level convenience accessor
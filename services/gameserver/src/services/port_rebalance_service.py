@@ -0,0 +1,278 @@
+"""
+Streaming port stock rebalancer
+
+Rebalancing every station's commodity flags and stock levels used to load all
+stations, mutate them and commit once, holding row locks on the whole station
+table for the duration. This service runs the rebalance as a job:
+
+- station ids are streamed in id order from a server-side cursor on a
+  read-only session
+- each batch of stations is locked, rebalanced and committed together with
+  the job's progress and keyset checkpoint, so locks are held for one batch
+  and an interrupted job resumes after the last committed station
+- dry runs compute the same diffs without locking stations and roll the
+  station writes back
+- a worker claims a job with a conditional UPDATE and holds a lease on it,
+  renewed with every batch, so only one worker in any process runs a job
+  and a RUNNING job whose lease lapsed is known to be interrupted
+- stock levels are drawn from a per-station RNG seeded by the job seed, so a
+  dry run previews exactly what an apply with the same seed will write
+"""
+
+import copy
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.models.port_rebalance_job import PortRebalanceJob, RebalanceJobStatus
+from src.models.station import Station
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+SAMPLE_CHANGES_LIMIT = 50
+JOB_LEASE_SECONDS = 300  # Renewed per batch; a lapsed lease marks the worker as gone
+
+_TRACKED_FIELDS = ("quantity", "buys", "sells", "current_price", "production_rate")
+
+
+def station_rng(seed: int, station_id: Any) -> random.Random:
+    """Deterministic RNG for one station within a job"""
+    return random.Random(f"{seed}:{station_id}")
+
+
+def diff_commodities(before: Dict[str, Dict], after: Dict[str, Dict]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per commodity, the tracked fields whose value changed as {"old": ..., "new": ...}"""
+    changes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for name, new_data in after.items():
+        old_data = before.get(name, {})
+        fields = {
+            field: {"old": old_data.get(field), "new": new_data.get(field)}
+            for field in _TRACKED_FIELDS
+            if old_data.get(field) != new_data.get(field)
+        }
+        if fields:
+            changes[name] = fields
+    return changes
+
+
+def rebalance_station(station: Station, rng: random.Random) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Recompute a station's trading flags and stock levels on a copy of its
+    commodities and assign it back (so the JSONB change is persisted).
+    Returns the diff.
+    """
+    before = station.commodities or {}
+    station.commodities = copy.deepcopy(before)
+    station.update_commodity_trading_flags()
+    station.update_commodity_stock_levels(rng=rng)
+    return diff_commodities(before, station.commodities)
+
+
+def job_status(job: PortRebalanceJob) -> Dict[str, Any]:
+    """Job progress for the admin API"""
+    progress = job.processed_stations / job.total_stations if job.total_stations else (1.0 if job.is_finished else 0.0)
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "dry_run": job.dry_run,
+        "batch_size": job.batch_size,
+        "seed": job.seed,
+        "total_stations": job.total_stations,
+        "processed_stations": job.processed_stations,
+        "changed_stations": job.changed_stations,
+        "progress": round(min(progress, 1.0), 4),
+        "resumable": job.status in (RebalanceJobStatus.FAILED.value, RebalanceJobStatus.CANCELLED.value)
+                     or (job.status == RebalanceJobStatus.RUNNING.value and not is_job_active(job)),
+        "sample_changes": job.sample_changes or [],
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _lease_deadline() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=JOB_LEASE_SECONDS)
+
+
+def is_job_active(job: PortRebalanceJob) -> bool:
+    """Whether a worker (in any process) holds an unexpired lease on the job"""
+    return (
+        job.status in (RebalanceJobStatus.RUNNING.value, RebalanceJobStatus.CANCELLING.value)
+        and job.lease_expires_at is not None
+        and job.lease_expires_at > datetime.now(timezone.utc)
+    )
+
+
+def create_job(
+    db: Session,
+    created_by: Optional[uuid.UUID],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    seed: Optional[int] = None,
+) -> PortRebalanceJob:
+    """Record a new job (not started)"""
+    job = PortRebalanceJob(
+        status=RebalanceJobStatus.PENDING.value,
+        dry_run=dry_run,
+        batch_size=max(1, min(batch_size, MAX_BATCH_SIZE)),
+        seed=seed if seed is not None else random.getrandbits(53),
+        total_stations=db.query(func.count(Station.id)).scalar() or 0,
+        sample_changes=[],
+        created_by=created_by,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def request_cancel(db: Session, job: PortRebalanceJob) -> PortRebalanceJob:
+    """Ask a running job to stop after its current batch"""
+    if job.status in (RebalanceJobStatus.PENDING.value, RebalanceJobStatus.RUNNING.value):
+        job.status = (RebalanceJobStatus.CANCELLING.value if is_job_active(job)
+                      else RebalanceJobStatus.CANCELLED.value)
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def prepare_resume(db: Session, job: PortRebalanceJob) -> bool:
+    """Reset a failed, cancelled or interrupted job so run_job continues from its checkpoint"""
+    lease_lapsed = or_(
+        PortRebalanceJob.lease_expires_at.is_(None),
+        PortRebalanceJob.lease_expires_at <= datetime.now(timezone.utc),
+    )
+    reset = db.execute(
+        update(PortRebalanceJob)
+        .where(
+            PortRebalanceJob.id == job.id,
+            or_(
+                PortRebalanceJob.status.in_(
+                    (RebalanceJobStatus.FAILED.value, RebalanceJobStatus.CANCELLED.value)
+                ),
+                and_(
+                    PortRebalanceJob.status.in_(
+                        (RebalanceJobStatus.RUNNING.value, RebalanceJobStatus.CANCELLING.value)
+                    ),
+                    lease_lapsed,
+                ),
+            ),
+        )
+        .values(status=RebalanceJobStatus.PENDING.value, error=None, finished_at=None, lease_expires_at=None)
+        .returning(PortRebalanceJob.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    db.commit()
+    return reset is not None
+
+
+def claim_job(db: Session, job_id: uuid.UUID) -> bool:
+    """Atomically move a PENDING job to RUNNING under a fresh lease; False if another worker has it"""
+    claimed = db.execute(
+        update(PortRebalanceJob)
+        .where(PortRebalanceJob.id == job_id, PortRebalanceJob.status == RebalanceJobStatus.PENDING.value)
+        .values(
+            status=RebalanceJobStatus.RUNNING.value,
+            started_at=func.coalesce(PortRebalanceJob.started_at, func.now()),
+            lease_expires_at=_lease_deadline(),
+        )
+        .returning(PortRebalanceJob.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    db.commit()
+    return claimed is not None
+
+
+def run_job(job_id: uuid.UUID, session_factory: Optional[Callable[[], Session]] = None) -> None:
+    """Run (or resume) a job to completion; blocking, meant for a worker thread"""
+    if session_factory is None:
+        from src.core.database import SessionLocal
+        session_factory = SessionLocal
+
+    reader = session_factory()
+    writer = session_factory()
+    try:
+        if not claim_job(writer, job_id):
+            return
+        job = writer.get(PortRebalanceJob, job_id)
+
+        ids = select(Station.id).order_by(Station.id)
+        if job.last_station_id is not None:
+            ids = ids.where(Station.id > job.last_station_id)
+        stream = reader.execute(
+            ids.execution_options(stream_results=True, yield_per=job.batch_size)
+        ).scalars()
+
+        for batch_ids in stream.partitions(job.batch_size):
+            if job.status == RebalanceJobStatus.CANCELLING.value:
+                job.status = RebalanceJobStatus.CANCELLED.value
+                job.finished_at = datetime.now(timezone.utc)
+                job.lease_expires_at = None
+                writer.commit()
+                logger.info(f"Port rebalance job {job_id} cancelled after {job.processed_stations} stations")
+                return
+            _process_batch(writer, job, list(batch_ids))
+
+        job.status = RebalanceJobStatus.COMPLETED.value
+        job.finished_at = datetime.now(timezone.utc)
+        job.lease_expires_at = None
+        writer.commit()
+        logger.info(
+            f"Port rebalance job {job_id} completed: {job.changed_stations} of "
+            f"{job.processed_stations} stations changed{' (dry run)' if job.dry_run else ''}"
+        )
+    except Exception as e:
+        writer.rollback()
+        logger.error(f"Port rebalance job {job_id} failed: {e}")
+        job = writer.get(PortRebalanceJob, job_id)
+        if job is not None:
+            job.status = RebalanceJobStatus.FAILED.value
+            job.error = str(e)
+            job.finished_at = datetime.now(timezone.utc)
+            job.lease_expires_at = None
+            writer.commit()
+    finally:
+        reader.close()
+        writer.close()
+
+
+def _process_batch(writer: Session, job: PortRebalanceJob, batch_ids: List[uuid.UUID]) -> None:
+    """Rebalance one batch and commit it with the job checkpoint (station writes dropped for dry runs)"""
+    seed, dry_run = job.seed, job.dry_run
+    query = writer.query(Station).filter(Station.id.in_(batch_ids)).order_by(Station.id)
+    if not dry_run:
+        query = query.with_for_update()
+    stations = query.all()
+
+    changed = []
+    for station in stations:
+        changes = rebalance_station(station, station_rng(seed, station.id))
+        if changes:
+            changed.append({
+                "station_id": str(station.id),
+                "station_name": station.name,
+                "station_class": station.station_class.value,
+                "station_type": station.type.value,
+                "sector_id": station.sector_id,
+                "changes": changes,
+            })
+
+    if dry_run:
+        writer.rollback()  # Drops the station writes
+
+    job.processed_stations += len(batch_ids)
+    job.changed_stations += len(changed)
+    job.last_station_id = batch_ids[-1]
+    job.lease_expires_at = _lease_deadline()
+    sample = list(job.sample_changes or [])
+    if len(sample) < SAMPLE_CHANGES_LIMIT:
+        job.sample_changes = sample + changed[:SAMPLE_CHANGES_LIMIT - len(sample)]
+    writer.commit()
@@ -4,12 +4,43 @@ Provides hybrid PostgreSQL + Redis architecture for optimal performance
 """
 
 import json
+import time
 import asyncio
 from typing import Any, Optional, Dict, List
 from datetime import datetime, timedelta
-import aioredis
 import redis
-from core.config import settings
+import redis.asyncio
+from src.core.config import settings
+
+PRESENCE_TTL_SECONDS = 300               # heartbeat window before a player counts as offline
+_SECTOR_PRESENCE_KEY = "sector_presence:"  # + sector id: sorted set of player id -> last heartbeat
+
+# KEYS: player_online, player_sector, new sector presence set
+# ARGV: player_id, now (epoch seconds), ttl, sector id
+# Moves the player between sector presence sets and refreshes the heartbeat
+# in one atomic step. The previous sector's set is derived from
+# player_sector, so the script must run on a single (non-cluster) node.
+_PRESENCE_HEARTBEAT_LUA = """
+local previous = redis.call('GET', KEYS[2])
+if previous and previous ~= ARGV[4] then
+    redis.call('ZREM', '""" + _SECTOR_PRESENCE_KEY + """' .. previous, ARGV[1])
+end
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[1])
+redis.call('SET', KEYS[1], 'online', 'EX', ARGV[3])
+redis.call('SET', KEYS[2], ARGV[4], 'EX', ARGV[3])
+return previous
+"""
+
+# KEYS: player_online, player_sector
+# ARGV: player_id
+_PRESENCE_OFFLINE_LUA = """
+local previous = redis.call('GET', KEYS[2])
+if previous then
+    redis.call('ZREM', '""" + _SECTOR_PRESENCE_KEY + """' .. previous, ARGV[1])
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+return previous
+"""
 
 
 class RedisService:
@@ -25,14 +56,16 @@ class RedisService:
     """
     
     def __init__(self):
-        self.redis_pool: Optional[aioredis.Redis] = None
+        self.redis_pool: Optional[redis.asyncio.Redis] = None
         self.sync_redis: Optional[redis.Redis] = None
         self.pubsub = None
+        self._presence_heartbeat = None
+        self._presence_offline = None
         
     async def connect(self):
         """Initialize Redis connection pool"""
         try:
-            self.redis_pool = aioredis.from_url(
+            self.redis_pool = redis.asyncio.from_url(
                 settings.REDIS_URL,
                 encoding="utf-8",
                 decode_responses=True,
@@ -41,6 +74,8 @@ class RedisService:
             
             # Test connection
             await self.redis_pool.ping()
+            self._presence_heartbeat = self.redis_pool.register_script(_PRESENCE_HEARTBEAT_LUA)
+            self._presence_offline = self.redis_pool.register_script(_PRESENCE_OFFLINE_LUA)
             print(f"✅ Redis connected successfully at {settings.REDIS_URL}")
             
             # Initialize sync client for non-async operations
@@ -56,6 +91,15 @@ class RedisService:
             await self.redis_pool.close()
         if self.sync_redis:
             self.sync_redis.close()
+        self.redis_pool = None
+        self.sync_redis = None
+        self._presence_heartbeat = None
+        self._presence_offline = None
+    
+    @property
+    def is_connected(self) -> bool:
+        """Whether connect() has completed (presence calls are no-ops until then)"""
+        return self.redis_pool is not None and self._presence_heartbeat is not None
     
     # ================================
     # REAL-TIME MESSAGING
@@ -72,6 +116,7 @@ class RedisService:
         }
         
         channel = f"sector:{sector_id}:movement"
+        await self.update_player_presence(player_id, sector_id)
         await self.redis_pool.publish(channel, json.dumps(message))
     
     async def publish_trade_event(self, trade_data: Dict):
@@ -237,30 +282,44 @@ class RedisService:
     # GAME STATE SYNCHRONIZATION
     # ================================
     
-    async def sync_player_online_status(self, player_id: str, is_online: bool):
-        """Track player online status"""
+    async def sync_player_online_status(self, player_id: str, is_online: bool, sector_id: Optional[str] = None):
+        """Track player online status (and sector presence when the sector is known)"""
+        if not self.is_connected:
+            return
         key = f"player_online:{player_id}"
         
-        if is_online:
-            await self.redis_pool.setex(key, 300, "online")  # 5 minute heartbeat
+        if not is_online:
+            await self._presence_offline(keys=[key, f"player_sector:{player_id}"], args=[player_id])
+        elif sector_id is not None:
+            await self.update_player_presence(player_id, sector_id)
         else:
-            await self.redis_pool.delete(key)
+            await self.redis_pool.setex(key, PRESENCE_TTL_SECONDS, "online")  # 5 minute heartbeat
+    
+    async def update_player_presence(self, player_id: str, sector_id: str):
+        """Heartbeat a player into a sector, leaving their previous sector atomically"""
+        if not self.is_connected:
+            return
+        await self._presence_heartbeat(
+            keys=[
+                f"player_online:{player_id}",
+                f"player_sector:{player_id}",
+                f"{_SECTOR_PRESENCE_KEY}{sector_id}",
+            ],
+            args=[player_id, time.time(), PRESENCE_TTL_SECONDS, str(sector_id)],
+        )
     
     async def get_online_players_in_sector(self, sector_id: str) -> List[str]:
         """Get list of online players in a sector"""
-        # This would need to be combined with PostgreSQL sector data
-        # For now, return players who have recent activity
-        pattern = "player_online:*"
-        keys = await self.redis_pool.keys(pattern)
-        
-        online_players = []
-        for key in keys:
-            player_id = key.split(":")[-1]
-            # Here we'd check if player is actually in this sector via PostgreSQL
-            # For demonstration, adding all online players
-            online_players.append(player_id)
+        # Members whose last heartbeat is older than the presence window are
+        # pruned by score before reading, so only this sector's set is touched
+        key = f"{_SECTOR_PRESENCE_KEY}{sector_id}"
+        cutoff = time.time() - PRESENCE_TTL_SECONDS
         
-        return online_players
+        pipe = self.redis_pool.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+        pipe.zrange(key, 0, -1)
+        _, online_players = await pipe.execute()
+        return list(online_players)
     
     # ================================
     # UTILITY METHODS
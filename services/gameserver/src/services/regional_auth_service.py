@@ -1,12 +1,15 @@
 """Regional authentication and authorization service for multi-regional platform"""
 
 import asyncio
-from typing import Dict, List, Optional, Set, Tuple
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import event, inspect, select, and_, or_
+from sqlalchemy.orm import Session, selectinload
 
 from src.core.database import get_async_session
 from src.models.region import Region, RegionalMembership, MembershipType
@@ -75,13 +78,167 @@ class RegionalRole(str, Enum):
     BANNED = "banned"
 
 
+# One bit per permission; region-scoped permissions are checked against the
+# mask of the region they are requested for
+PERMISSION_BITS: Dict[RegionalPermission, int] = {
+    permission: 1 << index for index, permission in enumerate(RegionalPermission)
+}
+ALL_PERMISSIONS_MASK = (1 << len(PERMISSION_BITS)) - 1
+
+
+def permission_mask(permissions: Iterable[RegionalPermission]) -> int:
+    """Bitmask of a set of permissions"""
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+GALAXY_PERMISSIONS = frozenset({
+    RegionalPermission.GALAXY_ADMIN_FULL,
+    RegionalPermission.GALAXY_MANAGE_REGIONS,
+    RegionalPermission.GALAXY_MANAGE_NEXUS,
+    RegionalPermission.GALAXY_VIEW_ALL,
+    RegionalPermission.GALAXY_MANAGE_USERS,
+})
+
+GALACTIC_CITIZEN_PERMISSIONS = frozenset({
+    RegionalPermission.TRAVEL_BETWEEN_REGIONS,
+    RegionalPermission.GALACTIC_CITIZEN_BENEFITS,
+    RegionalPermission.CROSS_REGIONAL_TRADE,
+    RegionalPermission.NEXUS_ACCESS,
+    RegionalPermission.EMBASSY_ACCESS,
+})
+
+ROLE_PERMISSIONS: Dict[RegionalRole, frozenset] = {
+    RegionalRole.REGION_OWNER: frozenset({
+        RegionalPermission.REGION_OWNER_FULL,
+        RegionalPermission.REGION_MANAGE_ECONOMY,
+        RegionalPermission.REGION_MANAGE_GOVERNANCE,
+        RegionalPermission.REGION_MANAGE_MEMBERS,
+        RegionalPermission.REGION_VIEW_ANALYTICS,
+        RegionalPermission.REGION_MANAGE_CULTURE,
+        RegionalPermission.REGION_MANAGE_TREATIES,
+        RegionalPermission.REGION_CREATE_ELECTIONS,
+        RegionalPermission.REGION_MODERATE_CONTENT,
+        RegionalPermission.REGION_VOTE,
+        RegionalPermission.REGION_TRADE,
+        RegionalPermission.REGION_COMMUNICATE,
+    }),
+    RegionalRole.REGION_ADMINISTRATOR: frozenset({
+        RegionalPermission.REGION_MANAGE_ECONOMY,
+        RegionalPermission.REGION_MANAGE_MEMBERS,
+        RegionalPermission.REGION_VIEW_ANALYTICS,
+        RegionalPermission.REGION_MODERATE_CONTENT,
+        RegionalPermission.REGION_VOTE,
+        RegionalPermission.REGION_TRADE,
+        RegionalPermission.REGION_COMMUNICATE,
+    }),
+    RegionalRole.REGION_MODERATOR: frozenset({
+        RegionalPermission.REGION_MODERATE_CONTENT,
+        RegionalPermission.REGION_VOTE,
+        RegionalPermission.REGION_TRADE,
+        RegionalPermission.REGION_COMMUNICATE,
+    }),
+    RegionalRole.REGION_CITIZEN: frozenset({
+        RegionalPermission.REGION_VOTE,
+        RegionalPermission.REGION_PROPOSE_POLICY,
+        RegionalPermission.REGION_TRADE,
+        RegionalPermission.REGION_COMMUNICATE,
+        RegionalPermission.REGION_CREATE_CONTENT,
+        RegionalPermission.REGION_PARTICIPATE_EVENTS,
+    }),
+    RegionalRole.REGION_RESIDENT: frozenset({
+        RegionalPermission.REGION_TRADE,
+        RegionalPermission.REGION_COMMUNICATE,
+        RegionalPermission.REGION_PARTICIPATE_EVENTS,
+    }),
+    RegionalRole.REGION_VISITOR: frozenset({
+        RegionalPermission.REGION_TRADE,
+        RegionalPermission.REGION_COMMUNICATE,
+    }),
+}
+
+ROLE_MASKS: Dict[RegionalRole, int] = {role: permission_mask(perms) for role, perms in ROLE_PERMISSIONS.items()}
+GALAXY_MASK = permission_mask(GALAXY_PERMISSIONS)
+GALACTIC_CITIZEN_MASK = permission_mask(GALACTIC_CITIZEN_PERMISSIONS)
+
+
+def resolve_regional_role(
+    owner_id, player_id, user_id, local_rank: Optional[str], membership_type: Optional[str]
+) -> RegionalRole:
+    """Role a membership confers; regions are owned by users, older rows by players"""
+    if owner_id is not None and owner_id in (player_id, user_id):
+        return RegionalRole.REGION_OWNER
+    if local_rank == "administrator":
+        return RegionalRole.REGION_ADMINISTRATOR
+    if local_rank == "moderator":
+        return RegionalRole.REGION_MODERATOR
+    if membership_type == MembershipType.CITIZEN:
+        return RegionalRole.REGION_CITIZEN
+    if membership_type == MembershipType.RESIDENT:
+        return RegionalRole.REGION_RESIDENT
+    return RegionalRole.REGION_VISITOR
+
+
+@dataclass(frozen=True)
+class EffectivePermissions:
+    """A user's permissions everywhere: one mask for all regions, one per member region"""
+    global_mask: int = 0
+    region_masks: Dict[str, int] = field(default_factory=dict)
+
+    def allows(self, region_id: str, permission: RegionalPermission) -> bool:
+        mask = self.global_mask | self.region_masks.get(str(region_id), 0)
+        return bool(mask & (PERMISSION_BITS[permission] | PERMISSION_BITS[RegionalPermission.GALAXY_ADMIN_FULL]))
+
+
+NO_PERMISSIONS = EffectivePermissions()
+
+
+class PermissionCache:
+    """Bounded LRU of effective permission sets per user with a TTL"""
+
+    def __init__(self, max_users: int = 10_000, ttl_seconds: float = 900, clock=time.monotonic):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[EffectivePermissions, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[EffectivePermissions]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        permissions, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return permissions
+
+    def put(self, user_id: str, permissions: EffectivePermissions) -> None:
+        self._entries[user_id] = (permissions, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class RegionalAuthService:
     """Comprehensive regional authentication and authorization service"""
     
-    def __init__(self):
-        self.permission_cache: Dict[str, Dict[str, Set[RegionalPermission]]] = {}
-        self.cache_expiry: Dict[str, datetime] = {}
+    def __init__(self, max_cached_users: int = 10_000):
         self.cache_duration = timedelta(minutes=15)
+        self.permission_cache = PermissionCache(
+            max_users=max_cached_users, ttl_seconds=self.cache_duration.total_seconds()
+        )
     
     async def check_regional_permission(
         self, 
@@ -106,48 +263,62 @@ class RegionalAuthService:
         session: AsyncSession
     ) -> bool:
         """Internal permission check implementation"""
-        
-        # Check cache first
-        cache_key = f"{user_id}:{region_id}"
-        if cache_key in self.permission_cache:
-            if cache_key in self.cache_expiry and datetime.utcnow() < self.cache_expiry[cache_key]:
-                user_permissions = self.permission_cache[cache_key].get(region_id, set())
-                if permission in user_permissions or RegionalPermission.GALAXY_ADMIN_FULL in user_permissions:
-                    return True
-        
-        # Get user's player record
+        permissions = await self.get_effective_permissions(user_id, session)
+        return permissions.allows(region_id, permission)
+    
+    async def get_effective_permissions(
+        self,
+        user_id: str,
+        session: AsyncSession
+    ) -> EffectivePermissions:
+        """A user's permissions in every region, cached (including denials) per user"""
+        user_id = str(user_id)
+        permissions = self.permission_cache.get(user_id)
+        if permissions is None:
+            permissions = await self._load_effective_permissions(user_id, session)
+            self.permission_cache.put(user_id, permissions)
+        return permissions
+    
+    async def _load_effective_permissions(self, user_id: str, session: AsyncSession) -> EffectivePermissions:
+        """Resolve every region's permission mask for a user in a single query"""
         result = await session.execute(
-            select(Player).options(
-                selectinload(Player.user),
-                selectinload(Player.regional_memberships).selectinload(RegionalMembership.region)
-            ).where(Player.user_id == user_id)
+            select(
+                Player.id,
+                Player.is_galactic_citizen,
+                User,
+                RegionalMembership.region_id,
+                RegionalMembership.local_rank,
+                RegionalMembership.membership_type,
+                Region.owner_id,
+            )
+            .join(User, User.id == Player.user_id)
+            .outerjoin(RegionalMembership, RegionalMembership.player_id == Player.id)
+            .outerjoin(Region, Region.id == RegionalMembership.region_id)
+            .where(Player.user_id == user_id)
         )
-        player = result.scalar_one_or_none()
+        rows = result.all()
+        if not rows:
+            return NO_PERMISSIONS
         
-        if not player:
-            return False
+        player_id, is_galactic_citizen, user = rows[0][:3]
+        global_mask = 0
+        if getattr(user, 'is_platform_admin', False):
+            global_mask = ALL_PERMISSIONS_MASK
+        elif is_galactic_citizen:
+            global_mask = GALACTIC_CITIZEN_MASK
         
-        # Check galaxy-level permissions first
-        if await self._has_galaxy_permission(player, permission, session):
-            await self._cache_permission(user_id, region_id, permission)
-            return True
-        
-        # Check galactic citizen permissions
-        if player.is_galactic_citizen and await self._has_galactic_citizen_permission(permission):
-            await self._cache_permission(user_id, region_id, permission)
-            return True
+        region_masks: Dict[str, int] = {}
+        for _, _, _, region_id, local_rank, membership_type, owner_id in rows:
+            if region_id is None:
+                continue
+            role = resolve_regional_role(owner_id, player_id, user.id, local_rank, membership_type)
+            region_masks[str(region_id)] = region_masks.get(str(region_id), 0) | ROLE_MASKS[role]
         
-        # Check regional membership permissions
-        regional_membership = await self._get_regional_membership(player.id, region_id, session)
-        if regional_membership:
-            regional_role = await self._get_regional_role(regional_membership, session)
-            role_permissions = await self._get_role_permissions(regional_role, region_id)
-            
-            if permission in role_permissions:
-                await self._cache_permission(user_id, region_id, permission)
-                return True
-        
-        return False
+        return EffectivePermissions(global_mask=global_mask, region_masks=region_masks)
+    
+    def invalidate_user_permissions(self, user_id: str) -> None:
+        """Drop a user's cached permissions after a role or citizenship change"""
+        self.permission_cache.invalidate(user_id)
     
     async def _has_galaxy_permission(
         self, 
@@ -161,28 +332,11 @@ class RegionalAuthService:
         if player.user and hasattr(player.user, 'is_platform_admin') and player.user.is_platform_admin:
             return True
         
-        # Check specific galaxy permissions
-        galaxy_permissions = {
-            RegionalPermission.GALAXY_ADMIN_FULL,
-            RegionalPermission.GALAXY_MANAGE_REGIONS,
-            RegionalPermission.GALAXY_MANAGE_NEXUS,
-            RegionalPermission.GALAXY_VIEW_ALL,
-            RegionalPermission.GALAXY_MANAGE_USERS
-        }
-        
-        return permission in galaxy_permissions and await self._user_has_galaxy_role(player, session)
+        return permission in GALAXY_PERMISSIONS and await self._user_has_galaxy_role(player, session)
     
     async def _has_galactic_citizen_permission(self, permission: RegionalPermission) -> bool:
         """Check if permission is available to galactic citizens"""
-        galactic_citizen_permissions = {
-            RegionalPermission.TRAVEL_BETWEEN_REGIONS,
-            RegionalPermission.GALACTIC_CITIZEN_BENEFITS,
-            RegionalPermission.CROSS_REGIONAL_TRADE,
-            RegionalPermission.NEXUS_ACCESS,
-            RegionalPermission.EMBASSY_ACCESS
-        }
-        
-        return permission in galactic_citizen_permissions
+        return permission in GALACTIC_CITIZEN_PERMISSIONS
     
     async def _get_regional_membership(
         self, 
@@ -207,27 +361,17 @@ class RegionalAuthService:
     async def _get_regional_role(
         self, 
         membership: RegionalMembership, 
-        session: AsyncSession
+        session: AsyncSession,
+        user_id: Optional[str] = None
     ) -> RegionalRole:
         """Determine player's role in region"""
-        
-        # Check if player owns the region
-        if membership.region.owner_id == membership.player_id:
-            return RegionalRole.REGION_OWNER
-        
-        # Check for administrative roles
-        if membership.local_rank == "administrator":
-            return RegionalRole.REGION_ADMINISTRATOR
-        elif membership.local_rank == "moderator":
-            return RegionalRole.REGION_MODERATOR
-        
-        # Check membership type
-        if membership.membership_type == MembershipType.CITIZEN:
-            return RegionalRole.REGION_CITIZEN
-        elif membership.membership_type == MembershipType.RESIDENT:
-            return RegionalRole.REGION_RESIDENT
-        else:
-            return RegionalRole.REGION_VISITOR
+        return resolve_regional_role(
+            membership.region.owner_id,
+            membership.player_id,
+            user_id,
+            membership.local_rank,
+            membership.membership_type,
+        )
     
     async def _get_role_permissions(
         self, 
@@ -235,66 +379,7 @@ class RegionalAuthService:
         region_id: str
     ) -> Set[RegionalPermission]:
         """Get permissions for specific role in region"""
-        
-        # Format region-specific permissions
-        def format_permission(perm: str) -> RegionalPermission:
-            return RegionalPermission(perm.format(region_id=region_id))
-        
-        role_permissions = {
-            RegionalRole.REGION_OWNER: {
-                format_permission(RegionalPermission.REGION_OWNER_FULL.value),
-                format_permission(RegionalPermission.REGION_MANAGE_ECONOMY.value),
-                format_permission(RegionalPermission.REGION_MANAGE_GOVERNANCE.value),
-                format_permission(RegionalPermission.REGION_MANAGE_MEMBERS.value),
-                format_permission(RegionalPermission.REGION_VIEW_ANALYTICS.value),
-                format_permission(RegionalPermission.REGION_MANAGE_CULTURE.value),
-                format_permission(RegionalPermission.REGION_MANAGE_TREATIES.value),
-                format_permission(RegionalPermission.REGION_CREATE_ELECTIONS.value),
-                format_permission(RegionalPermission.REGION_MODERATE_CONTENT.value),
-                format_permission(RegionalPermission.REGION_VOTE.value),
-                format_permission(RegionalPermission.REGION_TRADE.value),
-                format_permission(RegionalPermission.REGION_COMMUNICATE.value),
-            },
-            
-            RegionalRole.REGION_ADMINISTRATOR: {
-                format_permission(RegionalPermission.REGION_MANAGE_ECONOMY.value),
-                format_permission(RegionalPermission.REGION_MANAGE_MEMBERS.value),
-                format_permission(RegionalPermission.REGION_VIEW_ANALYTICS.value),
-                format_permission(RegionalPermission.REGION_MODERATE_CONTENT.value),
-                format_permission(RegionalPermission.REGION_VOTE.value),
-                format_permission(RegionalPermission.REGION_TRADE.value),
-                format_permission(RegionalPermission.REGION_COMMUNICATE.value),
-            },
-            
-            RegionalRole.REGION_MODERATOR: {
-                format_permission(RegionalPermission.REGION_MODERATE_CONTENT.value),
-                format_permission(RegionalPermission.REGION_VOTE.value),
-                format_permission(RegionalPermission.REGION_TRADE.value),
-                format_permission(RegionalPermission.REGION_COMMUNICATE.value),
-            },
-            
-            RegionalRole.REGION_CITIZEN: {
-                format_permission(RegionalPermission.REGION_VOTE.value),
-                format_permission(RegionalPermission.REGION_PROPOSE_POLICY.value),
-                format_permission(RegionalPermission.REGION_TRADE.value),
-                format_permission(RegionalPermission.REGION_COMMUNICATE.value),
-                format_permission(RegionalPermission.REGION_CREATE_CONTENT.value),
-                format_permission(RegionalPermission.REGION_PARTICIPATE_EVENTS.value),
-            },
-            
-            RegionalRole.REGION_RESIDENT: {
-                format_permission(RegionalPermission.REGION_TRADE.value),
-                format_permission(RegionalPermission.REGION_COMMUNICATE.value),
-                format_permission(RegionalPermission.REGION_PARTICIPATE_EVENTS.value),
-            },
-            
-            RegionalRole.REGION_VISITOR: {
-                format_permission(RegionalPermission.REGION_TRADE.value),
-                format_permission(RegionalPermission.REGION_COMMUNICATE.value),
-            }
-        }
-        
-        return role_permissions.get(role, set())
+        return set(ROLE_PERMISSIONS.get(role, ()))
     
     async def _user_has_galaxy_role(self, player: Player, session: AsyncSession) -> bool:
         """Check if user has galaxy-level administrative role"""
@@ -302,19 +387,6 @@ class RegionalAuthService:
         # For now, assume only users with is_platform_admin flag
         return player.user and hasattr(player.user, 'is_platform_admin') and player.user.is_platform_admin
     
-    async def _cache_permission(self, user_id: str, region_id: str, permission: RegionalPermission):
-        """Cache permission result"""
-        cache_key = f"{user_id}:{region_id}"
-        
-        if cache_key not in self.permission_cache:
-            self.permission_cache[cache_key] = {}
-        
-        if region_id not in self.permission_cache[cache_key]:
-            self.permission_cache[cache_key][region_id] = set()
-        
-        self.permission_cache[cache_key][region_id].add(permission)
-        self.cache_expiry[cache_key] = datetime.utcnow() + self.cache_duration
-    
     async def get_accessible_regions(self, user_id: str) -> List[Dict[str, any]]:
         """Get list of regions user can access with their roles"""
         
@@ -334,7 +406,7 @@ class RegionalAuthService:
             
             # Add regions from memberships
             for membership in player.regional_memberships:
-                role = await self._get_regional_role(membership, session)
+                role = await self._get_regional_role(membership, session, player.user_id)
                 accessible_regions.append({
                     "region_id": str(membership.region_id),
                     "region_name": membership.region.name,
@@ -384,11 +456,7 @@ class RegionalAuthService:
             await session.commit()
             
             # Clear cache for this user
-            keys_to_clear = [k for k in self.permission_cache.keys() if k.startswith(f"{user_id}:")]
-            for key in keys_to_clear:
-                del self.permission_cache[key]
-                if key in self.cache_expiry:
-                    del self.cache_expiry[key]
+            self.invalidate_user_permissions(user_id)
             
             logger.info(f"Promoted user {user_id} to galactic citizen")
             return True
@@ -409,11 +477,7 @@ class RegionalAuthService:
             await session.commit()
             
             # Clear cache for this user
-            keys_to_clear = [k for k in self.permission_cache.keys() if k.startswith(f"{user_id}:")]
-            for key in keys_to_clear:
-                del self.permission_cache[key]
-                if key in self.cache_expiry:
-                    del self.cache_expiry[key]
+            self.invalidate_user_permissions(user_id)
             
             logger.info(f"Revoked galactic citizenship for user {user_id}")
             return True
@@ -444,16 +508,68 @@ class RegionalAuthService:
             membership.local_rank = role
             await session.commit()
             
-            # Clear cache for this user
-            cache_key = f"{user_id}:{region_id}"
-            if cache_key in self.permission_cache:
-                del self.permission_cache[cache_key]
-            if cache_key in self.cache_expiry:
-                del self.cache_expiry[cache_key]
+            # Clear cache for the member (callers pass either the user or the player id)
+            self.invalidate_user_permissions(user_id)
+            member = await session.get(Player, membership.player_id)
+            if member is not None:
+                self.invalidate_user_permissions(member.user_id)
             
             logger.info(f"Assigned role {role} to user {user_id} in region {region_id}")
             return True
 
 
 # Singleton instance for use across the application
-regional_auth = RegionalAuthService()
\ No newline at end of file
+regional_auth = RegionalAuthService()
+
+
+# Invalidation on committed changes to citizenship, memberships, region ownership
+# and user roles, so grants and revocations apply without waiting out the cache TTL
+# (covers the PayPal webhook handlers and Player.join_region/leave_region alike)
+
+_PENDING_KEY = "regional_permission_invalidations"
+
+
+def _changed_ids(obj, attribute: str) -> Set[str]:
+    """Current and previous values of a foreign-key attribute, as strings"""
+    history = inspect(obj).attrs[attribute].history
+    return {str(value) for value in (*history.added, *history.deleted, *history.unchanged) if value is not None}
+
+
+def _permission_user_ids(session: Session) -> Set[str]:
+    user_ids: Set[str] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        changed = obj in session.new or obj in session.deleted or session.is_modified(obj)
+        if not changed:
+            continue
+        if isinstance(obj, Player) and obj.user_id is not None:
+            user_ids.add(str(obj.user_id))
+        elif isinstance(obj, User) and obj.id is not None:
+            user_ids.add(str(obj.id))
+        elif isinstance(obj, Region):
+            user_ids |= _changed_ids(obj, "owner_id")
+        elif isinstance(obj, RegionalMembership):
+            player = obj.player
+            if player is None and obj.player_id is not None:
+                with session.no_autoflush:
+                    player = session.get(Player, obj.player_id)
+            if player is not None and player.user_id is not None:
+                user_ids.add(str(player.user_id))
+    return user_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_permission_changes(session, flush_context, instances):
+    user_ids = _permission_user_ids(session)
+    if user_ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_permissions(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        regional_auth.invalidate_user_permissions(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_permission_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,364 @@
+"""
+Reputation Decay Service
+
+Set-based decay for faction reputations and personal reputation across the
+whole player population. Eligible rows are walked in keyset-ordered chunks;
+each chunk is written back with a single UPDATE ... FROM (VALUES ...) and its
+history entries are appended to reputation_history in one INSERT.
+The population-wide run is weekly: each run is recorded in
+reputation_decay_runs and a run within DECAY_INTERVAL of the last finished
+(or still running) one is skipped. A run that fails drops its claim so the
+next attempt is not locked out for the week.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, String, case, cast, column, func, insert, or_, select, text, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from src.models.player import Player
+from src.models.reputation import Reputation, ReputationDecayRun, ReputationHistory
+from src.services.faction_service import FactionService
+from src.services.personal_reputation_service import REPUTATION_TIERS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Faction decay rule: reputations outside the neutral band that have been
+# idle for more than FACTION_DECAY_GRACE_DAYS lose 1 point per extra idle day,
+# capped at FACTION_MAX_DECAY per run, never crossing back into the band.
+FACTION_DECAY_GRACE_DAYS = 30
+FACTION_MAX_DECAY = 50
+FACTION_NEUTRAL_BAND = 100
+FACTION_VALUE_RANGE = 1000
+
+# Personal reputation decays toward 0 by this much per weekly run
+PERSONAL_WEEKLY_DECAY = 5
+
+# Minimum spacing between population-wide runs
+DECAY_INTERVAL = timedelta(days=7)
+
+# An unfinished claim older than this is treated as an abandoned run
+DECAY_RUN_TIMEOUT = timedelta(hours=6)
+
+
+def _build_faction_effects() -> Dict[int, Tuple[str, str, float, int, str]]:
+    """Precompute (level, title, trade modifier, port access, combat response) per value."""
+    table = {}
+    for value in range(-FACTION_VALUE_RANGE, FACTION_VALUE_RANGE + 1):
+        level = FactionService._calculate_reputation_level(value)
+        table[value] = (
+            level.name,
+            FactionService._get_reputation_title(level),
+            FactionService._calculate_trade_modifier(value),
+            FactionService._calculate_port_access_level(value),
+            FactionService._calculate_combat_response(value),
+        )
+    return table
+
+
+FACTION_EFFECTS = _build_faction_effects()
+
+
+def _faction_decayed_value(value: int, inactive_days: int) -> int:
+    """Apply the 30-day / 50-point-cap decay rule to a single value."""
+    decay_amount = min(inactive_days - FACTION_DECAY_GRACE_DAYS, FACTION_MAX_DECAY)
+    if value > FACTION_NEUTRAL_BAND:
+        return max(FACTION_NEUTRAL_BAND, value - decay_amount)
+    return min(-FACTION_NEUTRAL_BAND, value + decay_amount)
+
+
+def _personal_tier_columns(score):
+    """SQL CASE expressions mapping a personal reputation score to (tier, color)."""
+    tier_whens = []
+    color_whens = []
+    for min_s, max_s, tier, color in REPUTATION_TIERS:
+        condition = score.between(min_s, max_s)
+        tier_whens.append((condition, tier))
+        color_whens.append((condition, color))
+    # Scores beyond the table clamp to the extreme tiers
+    low_tier, high_tier = REPUTATION_TIERS[0], REPUTATION_TIERS[-1]
+    tier_whens.append((score < low_tier[0], low_tier[2]))
+    color_whens.append((score < low_tier[0], low_tier[3]))
+    return case(*tier_whens, else_=high_tier[2]), case(*color_whens, else_=high_tier[3])
+
+
+class ReputationDecayService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ------------------------------------------------------------------
+    # Faction reputation decay
+    # ------------------------------------------------------------------
+
+    def run_faction_decay(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE, now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Decay every eligible faction reputation, committing once per chunk."""
+        now = now or datetime.utcnow()
+        after_id: Optional[uuid.UUID] = None
+        scanned = 0
+        decayed = 0
+        chunks = 0
+
+        while True:
+            rows = self._load_faction_chunk(now, chunk_size, after_id=after_id)
+            if not rows:
+                break
+
+            after_id = rows[-1].id
+            scanned += len(rows)
+            decayed += len(self._decay_faction_rows(rows, now))
+            chunks += 1
+            self.db.commit()
+
+            if len(rows) < chunk_size:
+                break
+
+        logger.info(
+            "Faction reputation decay: %d eligible, %d decayed in %d chunks",
+            scanned, decayed, chunks,
+        )
+        return {"scanned": scanned, "decayed": decayed, "chunks": chunks}
+
+    def decay_player_faction_reputations(
+        self, player_id: uuid.UUID, now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Decay one player's faction reputations and describe each change."""
+        now = now or datetime.utcnow()
+        rows = self._load_faction_chunk(now, limit=None, player_id=player_id)
+        results = self._decay_faction_rows(rows, now)
+        if results:
+            self.db.commit()
+        return results
+
+    def _load_faction_chunk(
+        self,
+        now: datetime,
+        limit: Optional[int],
+        after_id: Optional[uuid.UUID] = None,
+        player_id: Optional[uuid.UUID] = None,
+    ) -> List[Any]:
+        """Select eligible reputations ordered by id, starting after ``after_id``."""
+        # (now - last_updated).days > 30  <=>  last_updated <= now - 31 days
+        cutoff = now - timedelta(days=FACTION_DECAY_GRACE_DAYS + 1)
+        query = (
+            select(
+                Reputation.id,
+                Reputation.player_id,
+                Reputation.faction_id,
+                Reputation.current_value,
+                Reputation.last_updated,
+            )
+            .where(
+                Reputation.decay_paused == False,
+                Reputation.is_locked == False,
+                or_(
+                    Reputation.current_value > FACTION_NEUTRAL_BAND,
+                    Reputation.current_value < -FACTION_NEUTRAL_BAND,
+                ),
+                Reputation.last_updated <= cutoff,
+            )
+            .order_by(Reputation.id)
+        )
+        if after_id is not None:
+            query = query.where(Reputation.id > after_id)
+        if player_id is not None:
+            query = query.where(Reputation.player_id == player_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return self.db.execute(query).all()
+
+    def _decay_faction_rows(self, rows: List[Any], now: datetime) -> List[Dict[str, Any]]:
+        """Compute new values in memory and write the chunk back in one statement."""
+        updates = []
+        results = []
+        for row in rows:
+            last = row.last_updated.replace(tzinfo=None) if row.last_updated.tzinfo else row.last_updated
+            inactive_days = (now - last).days
+            new_value = _faction_decayed_value(row.current_value, inactive_days)
+            if new_value == row.current_value:
+                continue
+
+            effects_key = max(-FACTION_VALUE_RANGE, min(FACTION_VALUE_RANGE, new_value))
+            level, title, trade_modifier, port_access, combat_response = FACTION_EFFECTS[effects_key]
+            updates.append((
+                row.id, row.current_value, new_value,
+                level, title, trade_modifier, port_access, combat_response,
+            ))
+            results.append({
+                "reputation_id": row.id,
+                "player_id": row.player_id,
+                "faction_id": row.faction_id,
+                "old_value": row.current_value,
+                "new_value": new_value,
+                "inactive_days": inactive_days,
+            })
+
+        if not updates:
+            return []
+
+        decayed = values(
+            column("id", String),
+            column("old_value", Integer),
+            column("new_value", Integer),
+            column("level", String),
+            column("title", String),
+            column("trade_modifier", Float),
+            column("port_access_level", Integer),
+            column("combat_response", String),
+            name="decayed",
+        ).data([(str(u[0]),) + u[1:] for u in updates])
+
+        # Matching on the old value skips rows changed since they were read
+        stmt = (
+            update(Reputation)
+            .where(
+                Reputation.id == cast(decayed.c.id, UUID(as_uuid=True)),
+                Reputation.current_value == decayed.c.old_value,
+            )
+            .values(
+                current_value=decayed.c.new_value,
+                current_level=cast(decayed.c.level, Reputation.current_level.type),
+                title=decayed.c.title,
+                trade_modifier=decayed.c.trade_modifier,
+                port_access_level=decayed.c.port_access_level,
+                combat_response=decayed.c.combat_response,
+            )
+            .returning(Reputation.id)
+            .execution_options(synchronize_session=False)
+        )
+        applied = {row_id for (row_id,) in self.db.execute(stmt)}
+
+        results = [r for r in results if r["reputation_id"] in applied]
+        if results:
+            self.db.execute(insert(ReputationHistory), [
+                {
+                    "reputation_id": r["reputation_id"],
+                    "player_id": r["player_id"],
+                    "faction_id": r["faction_id"],
+                    "old_value": r["old_value"],
+                    "new_value": r["new_value"],
+                    "change": r["new_value"] - r["old_value"],
+                    "reason": f"Inactivity decay ({r['inactive_days'] - FACTION_DECAY_GRACE_DAYS} days idle)",
+                }
+                for r in results
+            ])
+
+        return [
+            {
+                "faction_id": str(r["faction_id"]),
+                "old_value": r["old_value"],
+                "new_value": r["new_value"],
+                "decay_applied": abs(r["old_value"] - r["new_value"]),
+                "inactive_days": r["inactive_days"],
+            }
+            for r in results
+        ]
+
+    # ------------------------------------------------------------------
+    # Personal reputation decay
+    # ------------------------------------------------------------------
+
+    def run_personal_decay(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """Apply the weekly personal reputation decay to every non-neutral player."""
+        after_id: Optional[uuid.UUID] = None
+        decayed = 0
+        chunks = 0
+
+        while True:
+            chunk_ids = select(Player.id).where(Player.personal_reputation != 0)
+            if after_id is not None:
+                chunk_ids = chunk_ids.where(Player.id > after_id)
+            chunk_ids = chunk_ids.order_by(Player.id).limit(chunk_size)
+
+            updated = self._decay_personal(Player.id.in_(chunk_ids.scalar_subquery()))
+            if not updated:
+                break
+
+            after_id = max(updated)
+            decayed += len(updated)
+            chunks += 1
+            self.db.commit()
+
+            if len(updated) < chunk_size:
+                break
+
+        logger.info("Personal reputation decay: %d players decayed in %d chunks", decayed, chunks)
+        return {"decayed": decayed, "chunks": chunks}
+
+    def _decay_personal(self, condition) -> List[uuid.UUID]:
+        """Move matching scores PERSONAL_WEEKLY_DECAY points toward 0 and refresh tier/color."""
+        new_score = case(
+            (Player.personal_reputation > 0,
+             func.greatest(0, Player.personal_reputation - PERSONAL_WEEKLY_DECAY)),
+            else_=func.least(0, Player.personal_reputation + PERSONAL_WEEKLY_DECAY),
+        )
+        tier, color = _personal_tier_columns(new_score)
+        stmt = (
+            update(Player)
+            .where(condition, Player.personal_reputation != 0)
+            .values(personal_reputation=new_score, reputation_tier=tier, name_color=color)
+            .returning(Player.id)
+            .execution_options(synchronize_session=False)
+        )
+        return [row_id for (row_id,) in self.db.execute(stmt)]
+
+    def run_all(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """Run both decay passes."""
+        return {
+            "faction": self.run_faction_decay(chunk_size=chunk_size),
+            "personal": self.run_personal_decay(chunk_size=chunk_size),
+        }
+
+    def run_weekly(self, chunk_size: int = DEFAULT_CHUNK_SIZE, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Run both decay passes unless a run finished or is in progress within DECAY_INTERVAL."""
+        now = now or datetime.utcnow()
+        last_run, claim = self._claim_weekly_run(now)
+        if claim is None:
+            logger.info("Reputation decay skipped: last run at %s", last_run.isoformat())
+            return {
+                "skipped": True,
+                "last_run_at": last_run.isoformat(),
+                "next_run_at": (last_run + DECAY_INTERVAL).isoformat(),
+            }
+
+        try:
+            result = self.run_all(chunk_size=chunk_size)
+        except Exception:
+            # Release the claim so the failed run can be retried this week
+            self.db.rollback()
+            self.db.delete(claim)
+            self.db.commit()
+            raise
+
+        claim.finished_at = datetime.utcnow()
+        self.db.commit()
+        return {"skipped": False, **result}
+
+    def _claim_weekly_run(self, now: datetime) -> Tuple[Optional[datetime], Optional[ReputationDecayRun]]:
+        """Record a run at ``now`` unless one is too recent; returns the previous run time and the claim."""
+        # Serialises concurrent claims; the lock is held until commit/rollback
+        self.db.execute(text("LOCK TABLE reputation_decay_runs IN SHARE ROW EXCLUSIVE MODE"))
+        last_run = self.db.execute(
+            select(func.max(ReputationDecayRun.started_at)).where(
+                or_(
+                    ReputationDecayRun.finished_at.isnot(None),
+                    ReputationDecayRun.started_at > now - DECAY_RUN_TIMEOUT,
+                )
+            )
+        ).scalar()
+        if last_run is not None and last_run.tzinfo:
+            last_run = last_run.replace(tzinfo=None)
+        if last_run is not None and now - last_run < DECAY_INTERVAL:
+            self.db.rollback()
+            return last_run, None
+        claim = ReputationDecayRun(started_at=now)
+        self.db.add(claim)
+        self.db.commit()
+        return last_run, claim
@@ -0,0 +1,473 @@
+"""
+Storage for AI security profiles, request counters and cost counters
+
+AISecurityService used to keep every player's profile and daily cost in
+unbounded per-process dicts, so each worker enforced its own limits and memory
+grew with every player who ever chatted. Two stores share one interface:
+
+- RedisSecurityProfileStore: the shared store. Request counters are fixed
+  windows (``ai_sec:req:{player}:{window}:{index}``) that expire on their own
+  and are checked-and-incremented atomically in one Lua call. Daily costs live
+  in one expiring sorted set per day, so ZINCRBY is the atomic
+  increment-and-read and reports are a single range query. Profile hashes
+  (violations, trust, blocks) only exist for players with violations and
+  expire after PROFILE_TTL_SECONDS. A small per-node LRU front cache keeps hot
+  profiles off the network for a couple of seconds. A Redis error on any call
+  falls back to an in-process store for RETRY_AFTER_SECONDS instead of
+  failing the request. Calls block on the network, so async callers run them
+  with asyncio.to_thread.
+- SecurityProfileStore: the in-process fallback when Redis is unreachable,
+  with the same window semantics, an LRU bound on profiles and day-keyed costs.
+
+Because callers run in worker threads, the in-process store and the Redis
+store's front cache are guarded by a per-store lock (never held across a
+Redis call).
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ai_sec"
+PROFILE_TTL_SECONDS = 7 * 86400
+COST_TTL_SECONDS = 8 * 86400
+DEFAULT_MAX_PROFILES = 10_000
+FRONT_CACHE_SIZE = 1024
+FRONT_CACHE_TTL_SECONDS = 2.0
+RETRY_AFTER_SECONDS = 5.0
+
+# (limit name in AISecurityService.rate_limits, window length in seconds)
+RATE_WINDOWS: List[Tuple[str, int]] = [
+    ("requests_per_minute", 60),
+    ("requests_per_hour", 3600),
+    ("requests_per_day", 86400),
+]
+
+
+@dataclass
+class PlayerSecurityProfile:
+    """Tracks security metrics per player"""
+    player_id: str
+    violation_count: int = 0
+    last_violation: Optional[datetime] = None
+    request_count_1min: int = 0
+    request_count_1hour: int = 0
+    request_count_1day: int = 0
+    last_request_time: Optional[datetime] = None
+    is_blocked: bool = False
+    block_expires: Optional[datetime] = None
+    trust_score: float = 1.0  # 0.0 (untrusted) to 1.0 (trusted)
+
+
+def _window_index(moment: datetime, seconds: int) -> int:
+    return int(moment.timestamp()) // seconds
+
+
+def _day_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+
+def _locked(method):
+    """Run the method holding the store's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class SecurityProfileStore:
+    """In-process store: LRU-bounded profiles and day-keyed cost counters"""
+
+    backend = "memory"
+
+    def __init__(self, max_profiles: int = DEFAULT_MAX_PROFILES):
+        self._lock = threading.RLock()
+        self.max_profiles = max_profiles
+        self.profiles: "OrderedDict[str, PlayerSecurityProfile]" = OrderedDict()
+        self.cost_tracking: Dict[str, float] = {}  # "player_id:YYYY-MM-DD" -> cost_usd
+
+    # Profiles
+
+    @_locked
+    def get_profile(self, player_id: str) -> PlayerSecurityProfile:
+        return self._profile(player_id, datetime.utcnow())
+
+    def _profile(self, player_id: str, now: datetime) -> PlayerSecurityProfile:
+        profile = self.profiles.get(player_id)
+        if profile is None:
+            profile = PlayerSecurityProfile(player_id=player_id)
+            self.profiles[player_id] = profile
+            while len(self.profiles) > self.max_profiles:
+                self.profiles.popitem(last=False)
+        else:
+            self.profiles.move_to_end(player_id)
+        self._refresh_windows(profile, now)
+        return profile
+
+    @_locked
+    def find_profile(self, player_id: str) -> Optional[PlayerSecurityProfile]:
+        """The stored profile, without creating one"""
+        if player_id not in self.profiles:
+            return None
+        return self.get_profile(player_id)
+
+    @_locked
+    def save_profile(self, profile: PlayerSecurityProfile) -> None:
+        self.profiles[profile.player_id] = profile
+        self.profiles.move_to_end(profile.player_id)
+
+    @_locked
+    def iter_profiles(self) -> Iterable[PlayerSecurityProfile]:
+        return list(self.profiles.values())
+
+    @_locked
+    def record_violation(self, player_id: str, trust_reduction: float, now: datetime) -> PlayerSecurityProfile:
+        profile = self.get_profile(player_id)
+        profile.violation_count += 1
+        profile.last_violation = now
+        profile.trust_score = max(0.0, profile.trust_score - trust_reduction)
+        return profile
+
+    @_locked
+    def set_block(self, player_id: str, expires: Optional[datetime]) -> PlayerSecurityProfile:
+        profile = self.get_profile(player_id)
+        profile.is_blocked = expires is not None
+        profile.block_expires = expires
+        return profile
+
+    # Request windows
+
+    @staticmethod
+    def _refresh_windows(profile: PlayerSecurityProfile, now: datetime) -> None:
+        """Zero the counters whose window has rolled over since the last request"""
+        last = profile.last_request_time
+        for attr, (_, seconds) in zip(("request_count_1min", "request_count_1hour", "request_count_1day"), RATE_WINDOWS):
+            if last is None or _window_index(last, seconds) != _window_index(now, seconds):
+                setattr(profile, attr, 0)
+
+    @_locked
+    def request_counts(self, player_id: str, now: datetime) -> Tuple[int, int, int]:
+        profile = self._profile(player_id, now)
+        return profile.request_count_1min, profile.request_count_1hour, profile.request_count_1day
+
+    @_locked
+    def consume_request(self, player_id: str, limits: Dict[str, int], now: datetime) -> bool:
+        """Count a request if every window is below its limit; False (and no count) otherwise"""
+        profile = self._profile(player_id, now)
+        counts = (profile.request_count_1min, profile.request_count_1hour, profile.request_count_1day)
+        if any(count >= limits[name] for count, (name, _) in zip(counts, RATE_WINDOWS)):
+            return False
+        profile.request_count_1min += 1
+        profile.request_count_1hour += 1
+        profile.request_count_1day += 1
+        profile.last_request_time = now
+        return True
+
+    # Costs
+
+    @_locked
+    def add_cost(self, player_id: str, amount_usd: float, day: str) -> float:
+        key = f"{player_id}:{day}"
+        total = self.cost_tracking.get(key, 0.0) + amount_usd
+        self.cost_tracking[key] = total
+        return total
+
+    @_locked
+    def get_cost(self, player_id: str, day: str) -> float:
+        return self.cost_tracking.get(f"{player_id}:{day}", 0.0)
+
+    @_locked
+    def daily_costs(self, day: str) -> Dict[str, float]:
+        suffix = f":{day}"
+        return {
+            key[:-len(suffix)]: cost for key, cost in self.cost_tracking.items() if key.endswith(suffix)
+        }
+
+    @_locked
+    def cleanup(self, cutoff_day: str) -> int:
+        """Drop cost entries older than ``cutoff_day``; returns how many were removed"""
+        old = [key for key in self.cost_tracking if ":" in key and key.rsplit(":", 1)[1] < cutoff_day]
+        for key in old:
+            del self.cost_tracking[key]
+        return len(old)
+
+    @_locked
+    def stats(self) -> Dict[str, int]:
+        return {"profiles": len(self.profiles), "cost_entries": len(self.cost_tracking)}
+
+
+# KEYS: one counter per window; ARGV: limits (one per key), then TTLs (one per key)
+_CONSUME_REQUEST_LUA = """
+local n = #KEYS
+for i = 1, n do
+    local count = tonumber(redis.call('GET', KEYS[i]) or '0')
+    if count >= tonumber(ARGV[i]) then
+        return 0
+    end
+end
+for i = 1, n do
+    if redis.call('INCR', KEYS[i]) == 1 then
+        redis.call('EXPIRE', KEYS[i], ARGV[n + i])
+    end
+end
+return 1
+"""
+
+# KEYS[1]: profile hash; ARGV: trust reduction, violation time, ttl
+_RECORD_VIOLATION_LUA = """
+local count = redis.call('HINCRBY', KEYS[1], 'violation_count', 1)
+local trust = tonumber(redis.call('HGET', KEYS[1], 'trust_score') or '1')
+trust = math.max(0, trust - tonumber(ARGV[1]))
+redis.call('HSET', KEYS[1], 'trust_score', tostring(trust), 'last_violation', ARGV[2])
+if redis.call('TTL', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+
+def _with_fallback(method):
+    """Serve the call from the in-process fallback while Redis is failing"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._clock() < self._retry_at:
+            return getattr(self.fallback, name)(*args, **kwargs)
+        try:
+            return method(self, *args, **kwargs)
+        except RedisError as e:
+            logger.warning(f"Redis error in AI security store ({name}), using in-process store: {e}")
+            self._retry_at = self._clock() + self.retry_after
+            return getattr(self.fallback, name)(*args, **kwargs)
+
+    return wrapper
+
+
+class RedisSecurityProfileStore(SecurityProfileStore):
+    """Shared Redis store with a small per-node LRU front cache of profiles"""
+
+    backend = "redis"
+
+    def __init__(self, client, front_cache_size: int = FRONT_CACHE_SIZE,
+                 front_cache_ttl: float = FRONT_CACHE_TTL_SECONDS,
+                 retry_after: float = RETRY_AFTER_SECONDS,
+                 clock=time.monotonic):
+        super().__init__(max_profiles=front_cache_size)
+        self.client = client
+        self.front_cache_ttl = front_cache_ttl
+        self.retry_after = retry_after
+        self.fallback = SecurityProfileStore()
+        self._retry_at = 0.0
+        self._clock = clock
+        self._fetched_at: Dict[str, float] = {}
+        self._consume_request = client.register_script(_CONSUME_REQUEST_LUA)
+        self._record_violation = client.register_script(_RECORD_VIOLATION_LUA)
+
+    @staticmethod
+    def _profile_key(player_id: str) -> str:
+        return f"{KEY_PREFIX}:profile:{player_id}"
+
+    @staticmethod
+    def _window_keys(player_id: str, now: datetime) -> List[str]:
+        return [
+            f"{KEY_PREFIX}:req:{player_id}:{seconds}:{_window_index(now, seconds)}"
+            for _, seconds in RATE_WINDOWS
+        ]
+
+    @staticmethod
+    def _cost_key(day: str) -> str:
+        return f"{KEY_PREFIX}:cost:{day}"
+
+    # Profiles
+
+    def _invalidate(self, player_id: str) -> None:
+        with self._lock:
+            self.profiles.pop(player_id, None)
+            self._fetched_at.pop(player_id, None)
+
+    @staticmethod
+    def _parse_profile(player_id: str, data: Dict[str, str]) -> PlayerSecurityProfile:
+        def parse_time(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return PlayerSecurityProfile(
+            player_id=player_id,
+            violation_count=int(data.get("violation_count") or 0),
+            last_violation=parse_time(data.get("last_violation")),
+            last_request_time=parse_time(data.get("last_request_time")),
+            is_blocked=data.get("is_blocked") == "1",
+            block_expires=parse_time(data.get("block_expires")),
+            trust_score=float(data.get("trust_score") or 1.0),
+        )
+
+    def _load(self, player_id: str, now: datetime) -> PlayerSecurityProfile:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(self._profile_key(player_id))
+        pipe.mget(self._window_keys(player_id, now))
+        data, counts = pipe.execute()
+        profile = self._parse_profile(player_id, data or {})
+        profile.request_count_1min, profile.request_count_1hour, profile.request_count_1day = (
+            int(count or 0) for count in counts
+        )
+        return profile
+
+    @_with_fallback
+    def get_profile(self, player_id: str) -> PlayerSecurityProfile:
+        with self._lock:
+            fetched_at = self._fetched_at.get(player_id)
+            if fetched_at is not None and self._clock() - fetched_at < self.front_cache_ttl:
+                self.profiles.move_to_end(player_id)
+                return self.profiles[player_id]
+
+        profile = self._load(player_id, datetime.utcnow())
+        with self._lock:
+            self.profiles[player_id] = profile
+            self.profiles.move_to_end(player_id)
+            self._fetched_at[player_id] = self._clock()
+            while len(self.profiles) > self.max_profiles:
+                evicted, _ = self.profiles.popitem(last=False)
+                self._fetched_at.pop(evicted, None)
+        return profile
+
+    @_with_fallback
+    def find_profile(self, player_id: str) -> Optional[PlayerSecurityProfile]:
+        if not self.client.exists(self._profile_key(player_id)):
+            return None
+        return self.get_profile(player_id)
+
+    def _profile_ttl(self, profile: PlayerSecurityProfile) -> int:
+        ttl = PROFILE_TTL_SECONDS
+        if profile.is_blocked and profile.block_expires:
+            ttl = max(ttl, int((profile.block_expires - datetime.utcnow()).total_seconds()) + 1)
+        return ttl
+
+    @_with_fallback
+    def save_profile(self, profile: PlayerSecurityProfile) -> None:
+        key = self._profile_key(profile.player_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={
+            "violation_count": profile.violation_count,
+            "last_violation": profile.last_violation.isoformat() if profile.last_violation else "",
+            "is_blocked": "1" if profile.is_blocked else "0",
+            "block_expires": profile.block_expires.isoformat() if profile.block_expires else "",
+            "trust_score": profile.trust_score,
+        })
+        pipe.expire(key, self._profile_ttl(profile))
+        pipe.execute()
+        self._invalidate(profile.player_id)
+
+    @_with_fallback
+    def iter_profiles(self) -> Iterable[PlayerSecurityProfile]:
+        """Profiles of players with violations (the only ones stored)"""
+        prefix = self._profile_key("")
+        keys = list(self.client.scan_iter(match=f"{prefix}*", count=500))
+        if not keys:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return [
+            self._parse_profile(key[len(prefix):], data)
+            for key, data in zip(keys, pipe.execute()) if data
+        ]
+
+    @_with_fallback
+    def record_violation(self, player_id: str, trust_reduction: float, now: datetime) -> PlayerSecurityProfile:
+        self._record_violation(
+            keys=[self._profile_key(player_id)],
+            args=[trust_reduction, now.isoformat(), PROFILE_TTL_SECONDS],
+        )
+        self._invalidate(player_id)
+        return self.get_profile(player_id)
+
+    @_with_fallback
+    def set_block(self, player_id: str, expires: Optional[datetime]) -> PlayerSecurityProfile:
+        profile = self.get_profile(player_id)
+        profile.is_blocked = expires is not None
+        profile.block_expires = expires
+        self.save_profile(profile)
+        return self.get_profile(player_id)
+
+    # Request windows
+
+    @_with_fallback
+    def request_counts(self, player_id: str, now: datetime) -> Tuple[int, int, int]:
+        counts = self.client.mget(self._window_keys(player_id, now))
+        return tuple(int(count or 0) for count in counts)
+
+    @_with_fallback
+    def consume_request(self, player_id: str, limits: Dict[str, int], now: datetime) -> bool:
+        allowed = self._consume_request(
+            keys=self._window_keys(player_id, now),
+            args=[limits[name] for name, _ in RATE_WINDOWS] + [seconds for _, seconds in RATE_WINDOWS],
+        )
+        # Cached counters may lag by up to front_cache_ttl; enforcement never reads them
+        return bool(allowed)
+
+    # Costs
+
+    @_with_fallback
+    def add_cost(self, player_id: str, amount_usd: float, day: str) -> float:
+        key = self._cost_key(day)
+        pipe = self.client.pipeline()
+        pipe.zincrby(key, amount_usd, player_id)
+        pipe.expire(key, COST_TTL_SECONDS)
+        total, _ = pipe.execute()
+        return float(total)
+
+    @_with_fallback
+    def get_cost(self, player_id: str, day: str) -> float:
+        return float(self.client.zscore(self._cost_key(day), player_id) or 0.0)
+
+    @_with_fallback
+    def daily_costs(self, day: str) -> Dict[str, float]:
+        return {
+            member: float(score)
+            for member, score in self.client.zrange(self._cost_key(day), 0, -1, withscores=True)
+        }
+
+    def cleanup(self, cutoff_day: str) -> int:
+        # Every key carries a TTL; only the front cache and fallback need trimming
+        with self._lock:
+            self.profiles.clear()
+            self._fetched_at.clear()
+        return self.fallback.cleanup(cutoff_day)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"front_cache_profiles": len(self.profiles)}
+
+
+def create_security_profile_store() -> SecurityProfileStore:
+    """
+    Redis-backed store when Redis answers, otherwise the in-process store.
+    AI_SECURITY_STORE=memory skips the Redis attempt.
+    """
+    if os.getenv("AI_SECURITY_STORE", "redis").lower() == "redis":
+        try:
+            import redis
+            from src.core.config import settings
+
+            client = redis.from_url(
+                settings.REDIS_URL, decode_responses=True,
+                socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+            client.ping()
+            logger.info("AI security profiles stored in Redis")
+            return RedisSecurityProfileStore(client)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for AI security profiles, using in-process store: {e}")
+    return SecurityProfileStore()
@@ -0,0 +1,258 @@
+"""
+Galaxy-wide siege detection sweep
+
+PlanetaryService._detect_siege checks one planet with three queries (owner,
+ships in the sector, owner's team) and a commit. The sweep evaluates every
+owned planet per turn with a fixed number of queries:
+
+- owned planets with their (first) owner's team and location
+- active ships in those planets' sectors, indexed by sector
+- the team of each ship owner, so allies are filtered without a query per owner
+
+Each planet is advanced with the same advance_siege_state rules, only the
+planets whose siege columns changed are written in one UPDATE ... FROM
+unnest(...) statement, and websocket notifications are produced only for
+sieges that started or lifted.
+"""
+
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from src.models.planet import Planet, player_planets
+from src.models.player import Player
+from src.models.ship import Ship
+from src.services.planetary_service import SiegeState, advance_siege_state
+
+logger = logging.getLogger(__name__)
+
+SIEGE_SWEEP_SECONDS = int(os.getenv("SIEGE_SWEEP_SECONDS", "60"))
+WRITE_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class OwnedPlanet:
+    planet_id: UUID
+    name: str
+    sector_id: int
+    state: SiegeState
+    owner_id: UUID
+    owner_team_id: Optional[UUID]
+    owner_sector_id: Optional[int]
+    owner_user_id: Optional[UUID]
+
+
+@dataclass
+class SiegeChange:
+    """A planet whose siege state flipped during a sweep"""
+    planet: OwnedPlanet
+    state: SiegeState
+    enemy_ship_count: int
+
+    def notification(self) -> Dict[str, Any]:
+        return {
+            "event": "siege_started" if self.state.under_siege else "siege_lifted",
+            "planetId": str(self.planet.planet_id),
+            "planetName": self.planet.name,
+            "sectorId": self.planet.sector_id,
+            "underSiege": self.state.under_siege,
+            "attackerId": str(self.state.siege_attacker_id) if self.state.siege_attacker_id else None,
+            "enemyShips": self.enemy_ship_count,
+        }
+
+
+@dataclass
+class SweepResult:
+    evaluated: int = 0
+    updated: int = 0
+    changes: List[SiegeChange] = field(default_factory=list)
+
+
+def build_sector_index(ships: Iterable[Tuple[int, UUID]]) -> Dict[int, List[UUID]]:
+    """Owner id of every active ship, per sector, in query order"""
+    index: Dict[int, List[UUID]] = defaultdict(list)
+    for sector_id, owner_id in ships:
+        index[sector_id].append(owner_id)
+    return index
+
+
+def evaluate_sieges(
+    planets: Sequence[OwnedPlanet],
+    sector_index: Dict[int, List[UUID]],
+    team_of: Dict[UUID, UUID],
+    now: datetime,
+) -> Tuple[List[Tuple[OwnedPlanet, SiegeState]], List[SiegeChange]]:
+    """
+    Advance every planet one turn. Returns the planets whose columns changed
+    (with their new state) and the subset whose siege started or lifted.
+    """
+    updates: List[Tuple[OwnedPlanet, SiegeState]] = []
+    changes: List[SiegeChange] = []
+    for planet in planets:
+        enemies = [
+            owner for owner in sector_index.get(planet.sector_id, ())
+            if owner != planet.owner_id
+            and (planet.owner_team_id is None or team_of.get(owner) != planet.owner_team_id)
+        ]
+        owner_present = planet.owner_sector_id == planet.sector_id
+        state = advance_siege_state(planet.state, enemies, owner_present, now)
+        if state == planet.state:
+            continue
+        updates.append((planet, state))
+        if state.under_siege != planet.state.under_siege:
+            changes.append(SiegeChange(planet, state, len(enemies)))
+    return updates, changes
+
+
+def load_owned_planets(db: Session) -> List[OwnedPlanet]:
+    """Every owned planet with its siege columns and first owner"""
+    rows = db.execute(
+        select(
+            Planet.id, Planet.name, Planet.sector_id,
+            Planet.under_siege, Planet.siege_turns, Planet.siege_started_at, Planet.siege_attacker_id,
+            Player.id, Player.team_id, Player.current_sector_id, Player.user_id,
+        )
+        .join(player_planets, player_planets.c.planet_id == Planet.id)
+        .join(Player, Player.id == player_planets.c.player_id)
+        .order_by(Planet.id, player_planets.c.acquired_at)
+    ).all()
+
+    planets: List[OwnedPlanet] = []
+    for (planet_id, name, sector_id, under_siege, turns, started_at, attacker_id,
+         owner_id, team_id, owner_sector_id, user_id) in rows:
+        if planets and planets[-1].planet_id == planet_id:
+            continue  # Co-owned planet; the first owner decides, as in check_and_update_siege
+        planets.append(OwnedPlanet(
+            planet_id, name, sector_id,
+            SiegeState(bool(under_siege), turns or 0, started_at, attacker_id),
+            owner_id, team_id, owner_sector_id, user_id,
+        ))
+    return planets
+
+
+def load_sector_index(db: Session) -> Dict[int, List[UUID]]:
+    """Active ships in sectors that contain owned planets"""
+    owned_sectors = (
+        select(Planet.sector_id)
+        .join(player_planets, player_planets.c.planet_id == Planet.id)
+        .distinct()
+    )
+    ships = db.execute(
+        select(Ship.sector_id, Ship.owner_id)
+        .where(
+            Ship.is_active == True,
+            Ship.is_destroyed == False,
+            Ship.sector_id.in_(owned_sectors),
+        )
+        .order_by(Ship.sector_id, Ship.created_at)
+    ).all()
+    return build_sector_index(ships)
+
+
+def load_team_map(db: Session, player_ids: Iterable[UUID]) -> Dict[UUID, UUID]:
+    """Team of each player that has one"""
+    ids = list(set(player_ids))
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(Player.id, Player.team_id).where(Player.id.in_(ids), Player.team_id.isnot(None))
+    ).all()
+    return dict(rows)
+
+
+# Compare-and-set: a planet whose siege columns changed since the sweep read
+# them (e.g. a concurrent attack) is left alone and re-evaluated next sweep
+_UPDATE_SQL = text("""
+    UPDATE planets AS p
+    SET under_siege = v.under_siege,
+        siege_turns = v.siege_turns,
+        siege_started_at = v.siege_started_at,
+        siege_attacker_id = v.siege_attacker_id
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:under_siege AS boolean[]), CAST(:siege_turns AS integer[]),
+        CAST(:siege_started_at AS timestamptz[]), CAST(:siege_attacker_id AS uuid[]),
+        CAST(:old_under_siege AS boolean[]), CAST(:old_siege_turns AS integer[])
+    ) AS v(id, under_siege, siege_turns, siege_started_at, siege_attacker_id, old_under_siege, old_siege_turns)
+    WHERE p.id = v.id
+      AND p.under_siege IS NOT DISTINCT FROM v.old_under_siege
+      AND p.siege_turns IS NOT DISTINCT FROM v.old_siege_turns
+    RETURNING p.id
+""")
+
+
+def write_siege_states(db: Session, updates: Sequence[Tuple[OwnedPlanet, SiegeState]]) -> Set[UUID]:
+    """Bulk-write new siege columns; returns the ids actually written. Does not commit."""
+    written: Set[UUID] = set()
+    for start in range(0, len(updates), WRITE_CHUNK_SIZE):
+        chunk = updates[start:start + WRITE_CHUNK_SIZE]
+        result = db.execute(_UPDATE_SQL, {
+            "ids": [str(planet.planet_id) for planet, _ in chunk],
+            "under_siege": [state.under_siege for _, state in chunk],
+            "siege_turns": [state.siege_turns for _, state in chunk],
+            "siege_started_at": [state.siege_started_at for _, state in chunk],
+            "siege_attacker_id": [
+                str(state.siege_attacker_id) if state.siege_attacker_id else None for _, state in chunk
+            ],
+            "old_under_siege": [planet.state.under_siege for planet, _ in chunk],
+            "old_siege_turns": [planet.state.siege_turns for planet, _ in chunk],
+        })
+        written.update(UUID(str(planet_id)) for (planet_id,) in result)
+    return written
+
+
+def sweep_sieges(db: Session, now: Optional[datetime] = None) -> SweepResult:
+    """Run siege detection for every owned planet and commit the changed rows"""
+    now = now or datetime.now(timezone.utc)
+    planets = load_owned_planets(db)
+    sector_index = load_sector_index(db)
+    team_of = load_team_map(db, (owner for owners in sector_index.values() for owner in owners))
+
+    updates, changes = evaluate_sieges(planets, sector_index, team_of, now)
+    if updates:
+        written = write_siege_states(db, updates)
+        db.commit()
+        if len(written) < len(updates):
+            logger.info(f"Siege sweep skipped {len(updates) - len(written)} planets changed since they were read")
+        updates = [(planet, state) for planet, state in updates if planet.planet_id in written]
+        changes = [change for change in changes if change.planet.planet_id in written]
+
+    for change in changes:
+        logger.info(
+            f"Siege {'begun' if change.state.under_siege else 'lifted'} on planet "
+            f"{change.planet.name} (id={change.planet.planet_id})"
+        )
+    return SweepResult(evaluated=len(planets), updated=len(updates), changes=changes)
+
+
+def run_siege_sweep() -> SweepResult:
+    """Run one sweep in its own session (for the background loop)"""
+    from src.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return sweep_sieges(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def notify_siege_changes(changes: Sequence[SiegeChange], manager=None) -> None:
+    """Tell planet owners that a siege started or lifted"""
+    if manager is None:
+        from src.services.websocket_service import connection_manager as manager
+    for change in changes:
+        if change.planet.owner_user_id is None:
+            continue
+        try:
+            await manager.send_planetary_update(change.notification(), owner_user_id=str(change.planet.owner_user_id))
+        except Exception as e:
+            logger.warning(f"Failed to send siege notification for planet {change.planet.planet_id}: {e}")
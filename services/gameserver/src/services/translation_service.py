@@ -7,6 +7,11 @@ import logging
 import json
 import re
 import html
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
@@ -24,6 +29,73 @@ from src.core.database import get_async_session
 
 logger = logging.getLogger(__name__)
 
+# Compiled bundles are kept per worker process. Writes through this service
+# invalidate them immediately; the TTL bounds staleness for writes made by
+# other workers.
+_BUNDLE_TTL = 300
+_BUNDLE_CACHE_SIZE = 256
+_GZIP_MIN_SIZE = 1024
+
+
+@dataclass
+class TranslationBundle:
+    """Serialized translation payload ready to be served as-is"""
+    language_code: str            # Language actually compiled (after fallback)
+    body: bytes                   # UTF-8 JSON payload
+    etag: str                     # Strong ETag derived from the identity payload hash
+    compiled_at: float = field(default_factory=time.monotonic)
+    _gzipped: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def gzipped(self) -> bytes:
+        """Gzip-compressed payload, computed once on first use"""
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+    @property
+    def gzip_etag(self) -> str:
+        """Strong ETag for the gzip representation, distinct from the identity one"""
+        return self.etag[:-1] + '-gzip"'
+
+    @property
+    def compressible(self) -> bool:
+        return len(self.body) >= _GZIP_MIN_SIZE
+
+    def is_expired(self) -> bool:
+        return time.monotonic() - self.compiled_at > _BUNDLE_TTL
+
+
+# (compiled language, namespace or "", include_context, namespace-only payload),
+# least recently used first
+_bundle_cache: "OrderedDict[Tuple[str, str, bool, bool], TranslationBundle]" = OrderedDict()
+
+# Requested language codes that fell back to another language, so unknown
+# codes share the fallback's bundle instead of each compiling their own
+_language_fallbacks: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _remember(cache: OrderedDict, key: Any, value: Any) -> None:
+    """Insert as most recently used, evicting the least recently used past _BUNDLE_CACHE_SIZE"""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _BUNDLE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def invalidate_translation_bundles(language_code: Optional[str] = None) -> None:
+    """Drop compiled bundles for a language, or all bundles when no language is given"""
+    if language_code is None:
+        _bundle_cache.clear()
+        _language_fallbacks.clear()
+        return
+
+    stale = [key for key, bundle in _bundle_cache.items() if bundle.language_code == language_code]
+    for key in stale:
+        _bundle_cache.pop(key, None)
+    # The code may now exist in its own right
+    _language_fallbacks.pop(language_code, None)
+
 
 class TranslationService:
     """Unified translation service for all applications"""
@@ -216,6 +288,7 @@ class TranslationService:
                 self.db.add(namespace)
             
             self.db.commit()
+            invalidate_translation_bundles()
             logger.info("Translation system initialized with default data")
             return True
             
@@ -330,6 +403,21 @@ class TranslationService:
         include_context: bool = False
     ) -> Dict[str, Any]:
         """Get translations for a language and optional namespace"""
+        bundle = await self.get_translation_bundle(language_code, namespace, include_context)
+        return json.loads(bundle.body)
+    
+    async def get_translation_bundle(
+        self,
+        language_code: str,
+        namespace: Optional[str] = None,
+        include_context: bool = False,
+        namespace_only: bool = False
+    ) -> TranslationBundle:
+        """Get a compiled translation bundle, compiling it on a cache miss.
+        
+        With ``namespace_only`` the payload is the namespace's own key tree
+        rather than being wrapped in a ``{namespace: {...}}`` object.
+        """
         try:
             # Validate inputs
             if not self.validate_language_code(language_code):
@@ -338,50 +426,83 @@ class TranslationService:
             if namespace and not self.validate_namespace_name(namespace):
                 raise HTTPException(status_code=400, detail=f"Invalid namespace format: '{namespace}'")
             
-            # Validate language exists
-            language = (
-                self.db.query(Language)
-                .filter(Language.code == language_code)
-                .first()
-            )
+            resolved = _language_fallbacks.get(language_code, language_code)
+            cache_key = (resolved, namespace or "", include_context, namespace_only)
+            bundle = _bundle_cache.get(cache_key)
+            if bundle is not None and not bundle.is_expired():
+                _bundle_cache.move_to_end(cache_key)
+                return bundle
+            
+            # Recompiling re-resolves the requested code, so a fallback is
+            # dropped once the language exists and its bundle has expired
+            bundle = self._compile_bundle(language_code, namespace, include_context, namespace_only)
+            if bundle.language_code != language_code:
+                _remember(_language_fallbacks, language_code, bundle.language_code)
+            else:
+                _language_fallbacks.pop(language_code, None)
+            _remember(_bundle_cache, (bundle.language_code,) + cache_key[1:], bundle)
+            return bundle
             
+        except Exception as e:
+            self._handle_error("get_translation_bundle", e)
+    
+    def _compile_bundle(
+        self,
+        language_code: str,
+        namespace: Optional[str],
+        include_context: bool,
+        namespace_only: bool
+    ) -> TranslationBundle:
+        """Load translations in a single query and serialize them to a bundle"""
+        # Validate language exists
+        language = (
+            self.db.query(Language)
+            .filter(Language.code == language_code)
+            .first()
+        )
+        
+        if not language:
+            # Fallback to English if language not found
+            language = self.db.query(Language).filter(Language.code == "en").first()
             if not language:
-                # Fallback to English if language not found
-                language = self.db.query(Language).filter(Language.code == "en").first()
-                if not language:
-                    raise HTTPException(status_code=500, detail="Base language 'en' not configured")
-            
-            # Build query
-            query = (
-                self.db.query(TranslationKey)
-                .join(TranslationNamespace)
-                .filter(TranslationKey.language_id == language.id)
+                raise HTTPException(status_code=500, detail="Base language 'en' not configured")
+        
+        # Select plain columns so the namespace name comes from the join
+        # instead of a lazy load per row
+        query = (
+            self.db.query(
+                TranslationNamespace.name,
+                TranslationKey.key,
+                TranslationKey.value,
+                TranslationKey.context,
+                TranslationKey.is_verified
             )
-            
-            if namespace:
-                query = query.filter(TranslationNamespace.name == namespace)
-            
-            translations = query.all()
-            
-            # Organize translations by namespace and key
-            result = {}
-            for trans in translations:
-                ns_name = trans.namespace.name
-                
-                if ns_name not in result:
-                    result[ns_name] = {}
-                
-                # Create nested key structure (e.g., "buttons.save" -> {"buttons": {"save": "Save"}})
-                self._set_nested_value(result[ns_name], trans.key, {
-                    "value": trans.value,
-                    "context": trans.context if include_context else None,
-                    "verified": trans.is_verified
-                } if include_context else trans.value)
-            
-            return result
-            
-        except Exception as e:
-            self._handle_error("get_translations", e)
+            .join(TranslationNamespace, TranslationKey.namespace_id == TranslationNamespace.id)
+            .filter(TranslationKey.language_id == language.id)
+        )
+        
+        if namespace:
+            query = query.filter(TranslationNamespace.name == namespace)
+        
+        # Organize translations by namespace and key
+        result = {}
+        for ns_name, key, value, context, is_verified in query.all():
+            if ns_name not in result:
+                result[ns_name] = {}
+            
+            # Create nested key structure (e.g., "buttons.save" -> {"buttons": {"save": "Save"}})
+            self._set_nested_value(result[ns_name], key, {
+                "value": value,
+                "context": context,
+                "verified": is_verified
+            } if include_context else value)
+        
+        if namespace_only:
+            result = result.get(namespace, {})
+        
+        body = json.dumps(result, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return TranslationBundle(language_code=language.code, body=body, etag=etag)
     
     async def get_namespace_translations(
         self, 
@@ -390,19 +511,19 @@ class TranslationService:
     ) -> Dict[str, str]:
         """Get translations for a specific namespace (simplified format)"""
         try:
-            # Validate inputs
-            if not self.validate_language_code(language_code):
-                raise HTTPException(status_code=400, detail=f"Invalid language code format: '{language_code}'")
-            
-            if not self.validate_namespace_name(namespace):
-                raise HTTPException(status_code=400, detail=f"Invalid namespace format: '{namespace}'")
-            
-            result = await self.get_translations(language_code, namespace)
-            return result.get(namespace, {})
+            bundle = await self.get_namespace_bundle(language_code, namespace)
+            return json.loads(bundle.body)
         except Exception as e:
             self._handle_error("get_namespace_translations", e, user_facing=False)
             return {}
     
+    async def get_namespace_bundle(self, language_code: str, namespace: str) -> TranslationBundle:
+        """Get the compiled bundle for a single namespace"""
+        if not self.validate_namespace_name(namespace):
+            raise HTTPException(status_code=400, detail=f"Invalid namespace format: '{namespace}'")
+        
+        return await self.get_translation_bundle(language_code, namespace, namespace_only=True)
+    
     async def set_translation(
         self,
         key: str,
@@ -491,6 +612,7 @@ class TranslationService:
                 self.db.add(new_translation)
             
             self.db.commit()
+            invalidate_translation_bundles(language.code)
             
             # Update progress tracking
             await self._update_translation_progress(language.id, ns.id)
@@ -562,6 +684,8 @@ class TranslationService:
                     logger.error(f"Error processing translation key '{key}': {e}")
                     error_count += 1
             
+            invalidate_translation_bundles(language_code)
+            
             return {
                 "imported": imported_count,
                 "updated": updated_count,
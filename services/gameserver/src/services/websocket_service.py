@@ -6,6 +6,8 @@ from datetime import datetime, UTC
 import logging
 from uuid import uuid4
 
+from src.core.metrics import timed_send
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +63,7 @@ class ConnectionManager:
             self.team_connections[team_id].add(user_id)
         
         logger.info(f"User {user_id} connected via WebSocket")
+        await self._sync_presence(user_data, current_sector)
         
         # Notify other players in the same sector
         if current_sector:
@@ -98,6 +101,7 @@ class ConnectionManager:
                 del self.team_connections[team_id]
         
         logger.info(f"User {user_id} disconnected from WebSocket")
+        await self._sync_presence(metadata.get("user_data", {}), current_sector, is_online=False)
         
         # Notify other players in the same sector
         if current_sector:
@@ -113,7 +117,7 @@ class ConnectionManager:
         """Send a message to a specific user"""
         if user_id in self.active_connections:
             try:
-                await self.active_connections[user_id].send_text(json.dumps(message))
+                await timed_send(self.active_connections[user_id], json.dumps(message))
                 return True
             except Exception as e:
                 logger.error(f"Error sending message to user {user_id}: {e}")
@@ -134,7 +138,7 @@ class ConnectionManager:
                 continue
             
             try:
-                await self.active_connections[user_id].send_text(json.dumps(message))
+                await timed_send(self.active_connections[user_id], json.dumps(message))
             except Exception as e:
                 logger.error(f"Error broadcasting to user {user_id} in sector {sector_id}: {e}")
                 disconnect_users.append(user_id)
@@ -157,7 +161,7 @@ class ConnectionManager:
                 continue
             
             try:
-                await self.active_connections[user_id].send_text(json.dumps(message))
+                await timed_send(self.active_connections[user_id], json.dumps(message))
             except Exception as e:
                 logger.error(f"Error broadcasting to user {user_id} in team {team_id}: {e}")
                 disconnect_users.append(user_id)
@@ -174,7 +178,7 @@ class ConnectionManager:
                 continue
             
             try:
-                await self.active_connections[user_id].send_text(json.dumps(message))
+                await timed_send(self.active_connections[user_id], json.dumps(message))
             except Exception as e:
                 logger.error(f"Error broadcasting globally to user {user_id}: {e}")
                 disconnect_users.append(user_id)
@@ -319,7 +323,7 @@ class ConnectionManager:
         """Send a message to a specific admin"""
         if admin_id in self.admin_connections:
             try:
-                await self.admin_connections[admin_id].send_text(json.dumps(message))
+                await timed_send(self.admin_connections[admin_id], json.dumps(message))
                 return True
             except Exception as e:
                 logger.error(f"Error sending message to admin {admin_id}: {e}")
@@ -334,7 +338,7 @@ class ConnectionManager:
                 continue
             
             try:
-                await self.admin_connections[admin_id].send_text(json.dumps(message))
+                await timed_send(self.admin_connections[admin_id], json.dumps(message))
             except Exception as e:
                 logger.error(f"Error broadcasting to admin {admin_id}: {e}")
                 disconnect_admins.append(admin_id)
@@ -404,6 +408,7 @@ class ConnectionManager:
         
         # Update metadata
         metadata["current_sector"] = new_sector_id
+        await self._sync_presence(metadata.get("user_data", {}), new_sector_id)
         
         # Notify players in new sector
         await self.broadcast_to_sector(new_sector_id, {
@@ -477,7 +482,23 @@ class ConnectionManager:
     async def handle_heartbeat(self, user_id: str):
         """Update last heartbeat for a user"""
         if user_id in self.connection_metadata:
-            self.connection_metadata[user_id]["last_heartbeat"] = datetime.now(UTC)
+            metadata = self.connection_metadata[user_id]
+            metadata["last_heartbeat"] = datetime.now(UTC)
+            await self._sync_presence(metadata.get("user_data", {}), metadata.get("current_sector"))
+    
+    async def _sync_presence(self, user_data: Dict[str, Any], sector_id: Optional[int], is_online: bool = True):
+        """Mirror a player's online status and sector into the Redis presence sets"""
+        player_id = user_data.get("player_id")
+        if not player_id:
+            return
+        try:
+            from src.services.redis_service import redis_service
+            await redis_service.sync_player_online_status(
+                player_id, is_online, str(sector_id) if sector_id else None
+            )
+        except Exception as e:
+            # Presence is best effort; the socket itself must not fail over it
+            logger.warning(f"Presence sync failed for player {player_id}: {e}")
     
     def get_connection_stats(self) -> Dict[str, Any]:
         """Get statistics about current connections"""
@@ -560,8 +581,42 @@ class ConnectionManager:
 connection_manager = ConnectionManager()
 
 
+def player_snapshot(user, player) -> Dict[str, Any]:
+    """Connection user_data for a user and their player"""
+    return {
+        "user_id": str(user.id),
+        "username": user.username,
+        "player_id": str(player.id),
+        "current_sector": player.current_sector_id,
+        "team_id": str(player.team_id) if player.team_id else None,
+        "credits": player.credits,
+        "turns": player.turns,
+        # Reputation and Ranking for Comms display
+        "personal_reputation": player.personal_reputation,
+        "reputation_tier": player.reputation_tier,
+        "name_color": player.name_color,
+        "military_rank": player.military_rank
+    }
+
+
+def load_player_snapshot(user_id: str) -> Optional[Dict[str, Any]]:
+    """Fresh player snapshot read with a session that is closed before returning"""
+    from src.core.database import session_scope
+    from src.models.player import Player
+    from src.models.user import User
+
+    with session_scope() as db:
+        row = db.query(User, Player).join(Player, Player.user_id == User.id).filter(User.id == user_id).first()
+        return player_snapshot(*row) if row else None
+
+
 async def handle_websocket_message(user_id: str, message_data: Dict[str, Any]):
-    """Handle incoming WebSocket messages from clients"""
+    """
+    Handle incoming WebSocket messages from clients.
+
+    Sockets hold no database session; handlers that need the database borrow
+    one for the message (see load_player_snapshot) and run it off the event loop.
+    """
     message_type = message_data.get("type")
     
     if message_type == "heartbeat":
@@ -638,6 +693,21 @@ async def handle_websocket_message(user_id: str, message_data: Dict[str, Any]):
                 "timestamp": datetime.now(UTC).isoformat()
             })
     
+    elif message_type == "refresh_player":
+        # Reload credits, turns and location from the database
+        snapshot = await asyncio.to_thread(load_player_snapshot, user_id)
+        metadata = connection_manager.connection_metadata.get(user_id)
+        if snapshot is None or metadata is None:
+            return
+        metadata["user_data"] = snapshot
+        if snapshot["current_sector"] != metadata.get("current_sector"):
+            await connection_manager.update_user_location(user_id, snapshot["current_sector"])
+        await connection_manager.send_personal_message(user_id, {
+            "type": "player_snapshot",
+            "player": snapshot,
+            "timestamp": datetime.now(UTC).isoformat()
+        })
+
     else:
         logger.warning(f"Unknown WebSocket message type: {message_type} from user {user_id}")
 
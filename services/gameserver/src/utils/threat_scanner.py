@@ -0,0 +1,222 @@
+"""
+Precompiled single-pass threat scanner
+
+Security detectors used to loop over dozens of uncompiled pattern strings per
+input. ThreatScanner compiles every category once:
+
+- regex rules are merged into one non-capturing alternation, so clean input
+  (the common case) is cleared by a single search. Only inputs that hit are
+  confirmed per category and per pattern, so reported matches are exactly
+  those of the individual patterns. Categories containing backreferences
+  cannot be merged (group numbers would shift) and are checked pattern by
+  pattern.
+- case-insensitive rules are case-folded at compile time and run without
+  IGNORECASE against the lower-cased input, which lets the regex engine use
+  its literal fast paths.
+- patterns longer than the input (by minimum match width) are never run,
+  which keeps expensive repetition rules off short chat messages.
+- literal keyword rules are matched in one pass over the lower-cased input
+  with an Aho-Corasick automaton when pyahocorasick is installed, otherwise
+  with a single overlapping-lookahead alternation.
+
+Verdicts are cached per input text (LRU), so repeated messages are free.
+"""
+
+import re
+from functools import lru_cache
+from re import _parser as sre_parse
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Inputs longer than this are scanned without caching the verdict
+MAX_CACHED_LENGTH = 4096
+DEFAULT_CACHE_SIZE = 4096
+
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+_FLAG_LETTERS = ((re.IGNORECASE, "i"), (re.DOTALL, "s"), (re.MULTILINE, "m"))
+
+
+def _min_width(pattern: str, flags: int) -> int:
+    return sre_parse.parse(pattern, flags).getwidth()[0]
+
+
+def _casefold_pattern(pattern: str) -> str:
+    """Lower-case a pattern's literals, leaving escapes such as \\W or \\B intact"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].lower())
+            i += 1
+    return "".join(out)
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    letters = "".join(letter for flag, letter in _FLAG_LETTERS if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+
+
+class _Rule:
+    """One compiled regex rule; folded rules run on the lower-cased input"""
+
+    __slots__ = ("pattern", "original", "fast", "folded", "min_width")
+
+    def __init__(self, pattern: str, flags: int):
+        self.pattern = pattern
+        self.original = re.compile(pattern, flags)
+        self.folded = bool(flags & re.IGNORECASE)
+        self.fast = re.compile(_casefold_pattern(pattern), flags & ~re.IGNORECASE) if self.folded else self.original
+        self.min_width = _min_width(pattern, flags)
+
+    @property
+    def fast_source(self) -> str:
+        return _scoped(self.fast.pattern, self.fast.flags & (re.DOTALL | re.MULTILINE))
+
+    def search(self, text: str, text_lower: str) -> bool:
+        if self.min_width > len(text):
+            return False
+        return self.fast.search(text_lower if self.folded else text) is not None
+
+
+class LiteralMatcher:
+    """Finds which of a set of literal keywords occur anywhere in a text"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        self._automaton = None
+        self._regex = None
+        if not self.keywords:
+            return
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            # Longest first, so a keyword that is a prefix of another is
+            # recovered by the substring closure in find()
+            alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+            self._regex = re.compile(f"(?=({alternation}))")
+            self._any = re.compile(alternation)
+
+    def find(self, text_lower: str) -> FrozenSet[str]:
+        """Keywords present in ``text_lower`` (already lower-cased)"""
+        if not self.keywords:
+            return frozenset()
+        if self._automaton is not None:
+            return frozenset(keyword for _, keyword in self._automaton.iter(text_lower))
+        found = {match.group(1) for match in self._regex.finditer(text_lower)}
+        if not found:
+            return frozenset()
+        # A keyword starting where a longer one was captured is a substring of it
+        return frozenset(k for k in self.keywords if k in found or any(k in f for f in found))
+
+    def search(self, text_lower: str) -> bool:
+        if not self.keywords:
+            return False
+        if self._automaton is not None:
+            return next(self._automaton.iter(text_lower), None) is not None
+        return self._any.search(text_lower) is not None
+
+
+class ThreatScanner:
+    """
+    Evaluates every rule category against an input in one pass.
+
+    ``regex_rules`` maps a category to ``(patterns, flags)``; ``literal_rules``
+    maps a category to keywords. ``scan`` returns, per category that hit, the
+    matching patterns or keywords in their declared order.
+    """
+
+    def __init__(
+        self,
+        regex_rules: Mapping[str, Tuple[Sequence[str], int]],
+        literal_rules: Optional[Mapping[str, Sequence[str]]] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.regex_rules = {name: (tuple(patterns), flags) for name, (patterns, flags) in regex_rules.items()}
+        self.literal_rules = {name: tuple(words) for name, words in (literal_rules or {}).items()}
+
+        self._rules: Dict[str, Tuple[_Rule, ...]] = {
+            name: tuple(_Rule(p, flags) for p in patterns)
+            for name, (patterns, flags) in self.regex_rules.items()
+        }
+
+        # Mergeable categories, split by whether they run on the folded input
+        self._category_regex: Dict[str, Tuple["re.Pattern[str]", bool]] = {}
+        self._standalone: List[str] = []
+        merged: Dict[bool, List[str]] = {True: [], False: []}
+        for name, rules in self._rules.items():
+            if not rules:
+                continue
+            if any(_BACKREFERENCE.search(rule.pattern) for rule in rules) or \
+                    len({rule.folded for rule in rules}) > 1:
+                self._standalone.append(name)
+                continue
+            folded = rules[0].folded
+            alternation = "|".join(rule.fast_source for rule in rules)
+            self._category_regex[name] = (re.compile(alternation), folded)
+            merged[folded].append(alternation)
+        self._gates = [
+            (re.compile("|".join(alternations)), folded)
+            for folded, alternations in merged.items() if alternations
+        ]
+
+        self._literals = {name: LiteralMatcher(words) for name, words in self.literal_rules.items()}
+        self._keyword_order = {
+            name: {k.lower(): i for i, k in enumerate(words)} for name, words in self.literal_rules.items()
+        }
+        all_keywords = [k for words in self.literal_rules.values() for k in words]
+        self._literal_gate = LiteralMatcher(all_keywords)
+
+        self._cached_scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def scan(self, text: str) -> Mapping[str, Tuple[str, ...]]:
+        """Categories that hit, each with its matching patterns/keywords (read-only)"""
+        if len(text) > MAX_CACHED_LENGTH:
+            return self._scan(text)
+        return self._cached_scan(text)
+
+    def _scan(self, text: str) -> Mapping[str, Tuple[str, ...]]:
+        hits: Dict[str, Tuple[str, ...]] = {}
+        text_lower = text.lower()
+
+        if any(gate.search(text_lower if folded else text) for gate, folded in self._gates):
+            for name, (category_regex, folded) in self._category_regex.items():
+                if category_regex.search(text_lower if folded else text):
+                    self._confirm(name, text, text_lower, hits)
+        for name in self._standalone:
+            self._confirm(name, text, text_lower, hits)
+
+        if self._literals and self._literal_gate.search(text_lower):
+            for name, matcher in self._literals.items():
+                found = matcher.find(text_lower)
+                if found:
+                    order = self._keyword_order[name]
+                    hits[name] = tuple(sorted(found, key=order.__getitem__))
+        return MappingProxyType(hits)
+
+    def _confirm(self, name: str, text: str, text_lower: str, hits: Dict[str, Tuple[str, ...]]) -> None:
+        matched = tuple(rule.pattern for rule in self._rules[name] if rule.search(text, text_lower))
+        if matched:
+            hits[name] = matched
+
+    def findall(self, category: str, pattern: str, text: str) -> list:
+        """``re.findall`` of one rule's original compiled pattern (for violation details)"""
+        for rule in self._rules[category]:
+            if rule.pattern == pattern:
+                return rule.original.findall(text)
+        raise KeyError(pattern)
+
+    def cache_info(self):
+        return self._cached_scan.cache_info()
@@ -0,0 +1,73 @@
+"""Keyset paging of admin sector lists and sector summary refreshes against the database."""
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.cluster import Cluster, ClusterType
+from src.models.region import Region
+from src.models.sector import Sector
+from src.models.sector_summary import SectorSummary
+from src.models.station import Station, StationClass, StationType
+from src.services.admin_query_service import page_sectors, refresh_sector_summaries
+
+# Far above any generated galaxy so the test sectors never collide with seeded ones
+FIRST_SECTOR = 9_900_001
+
+
+@pytest.fixture
+def cluster(db: Session) -> Cluster:
+    region = Region(name=f"paging-{uuid.uuid4().hex[:8]}", display_name="Paging Test Region")
+    db.add(region)
+    db.flush()
+    cluster = Cluster(name="Paging Test Cluster", region_id=region.id, type=ClusterType.STANDARD)
+    db.add(cluster)
+    db.flush()
+    for i in range(5):
+        db.add(Sector(
+            sector_id=FIRST_SECTOR + i, name=f"Paging {i}", cluster_id=cluster.id, region_id=region.id,
+            x_coord=i, y_coord=0,
+        ))
+    db.flush()
+    return cluster
+
+
+def test_keyset_pages_cover_every_sector_once_in_order(db: Session, cluster: Cluster):
+    filters = [Sector.cluster_id == cluster.id]
+    seen, cursor = [], None
+    while True:
+        page = page_sectors(db, 2, cursor=cursor, filters=filters)
+        seen.extend(sector.sector_id for sector, _ in page.rows)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == list(range(FIRST_SECTOR, FIRST_SECTOR + 5))
+
+
+def test_missing_summaries_are_computed_without_writing(db: Session, cluster: Cluster):
+    db.add(Station(
+        name="Paging Station", sector_id=FIRST_SECTOR,
+        station_class=StationClass.CLASS_1, type=StationType.TRADING,
+    ))
+    db.flush()
+
+    page = page_sectors(db, 1, filters=[Sector.cluster_id == cluster.id])
+
+    (sector, summary), = page.rows
+    assert summary.station_count == 1 and summary.has_port
+    assert db.query(SectorSummary).filter(SectorSummary.sector_id == FIRST_SECTOR).first() is None
+
+
+def test_refresh_only_rewrites_changed_rows(db: Session, cluster: Cluster):
+    sector_ids = list(range(FIRST_SECTOR, FIRST_SECTOR + 5))
+
+    assert refresh_sector_summaries(db, sector_ids) == 5
+    assert refresh_sector_summaries(db, sector_ids) == 0
+
+    db.add(Station(
+        name="Paging Station", sector_id=FIRST_SECTOR + 2,
+        station_class=StationClass.CLASS_1, type=StationType.TRADING,
+    ))
+    db.flush()
+    assert refresh_sector_summaries(db, sector_ids) == 1
@@ -0,0 +1,68 @@
+"""Bounty board aggregate upkeep and ranking against the database."""
+import uuid
+
+from sqlalchemy.orm import Session
+
+from src.models.bounty import BountyBoardEntry
+from src.models.player import Player
+from src.models.user import User
+from src.services.bounty_service import SYSTEM_BOUNTY_TIERS, BountyService
+
+
+def make_player(db: Session, name: str, credits: int = 100000, reputation: int = 0) -> Player:
+    user = User(username=f"{name}-{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@test.local")
+    db.add(user)
+    db.flush()
+    player = Player(
+        user_id=user.id, nickname=name,
+        credits=credits, personal_reputation=reputation,
+    )
+    db.add(player)
+    db.flush()
+    return player
+
+
+def board(db: Session, player: Player):
+    db.expire_all()
+    return db.get(BountyBoardEntry, player.id)
+
+
+def test_placements_stack_into_one_board_row(db: Session):
+    hunter, rival, target = make_player(db, "hunter"), make_player(db, "rival"), make_player(db, "target")
+    service = BountyService(db)
+
+    assert service.place_bounty(hunter.id, target.id, 2000)["success"]
+    assert service.place_bounty(rival.id, target.id, 3000)["success"]
+
+    entry = board(db, target)
+    assert (entry.total_amount, entry.bounty_count) == (5000, 2)
+    assert sum(b["amount"] for b in target.settings["bounties"]) == entry.total_amount
+
+
+def test_collection_clears_the_board_row(db: Session):
+    hunter, target = make_player(db, "hunter"), make_player(db, "target")
+    service = BountyService(db)
+    service.place_bounty(hunter.id, target.id, 2000)
+
+    result = service.collect_bounty(hunter.id, target.id)
+
+    assert result["player_bounties_collected"] == 2000
+    assert board(db, target) is None
+    assert target.settings["bounties"] == []
+
+
+def test_board_totals_match_the_per_player_listing(db: Session):
+    hunter = make_player(db, "hunter")
+    villain = make_player(db, "villain", reputation=min(SYSTEM_BOUNTY_TIERS))
+    target = make_player(db, "target")
+    service = BountyService(db)
+    service.place_bounty(hunter.id, villain.id, 4000)
+    service.place_bounty(hunter.id, target.id, 1000)
+
+    listed = {b["player_id"]: b for b in service.get_available_bounties(limit=100)["bounties"]}
+
+    for player in (villain, target):
+        detail = service.get_bounties_on_player(player.id)
+        row = listed[str(player.id)]
+        assert row["total_bounty"] == detail["total_value"]
+        assert row["bounty_count"] == len(detail["player_bounties"]) + len(detail["system_bounties"])
@@ -0,0 +1,111 @@
+"""Conversation summary upkeep and keyset-paged conversation lists against the database."""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.conversation_summary import ConversationSummary
+from src.models.message import Message
+from src.models.player import Player
+from src.models.user import User
+from src.services.message_service import MessageService, _touch_conversations
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+def make_player(db: Session, name: str) -> Player:
+    user = User(username=f"{name}-{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@test.local")
+    db.add(user)
+    db.flush()
+    player = Player(user_id=user.id)
+    db.add(player)
+    db.flush()
+    return player
+
+
+def send(db: Session, sender: Player, recipient: Player, sent_at: datetime, thread_id=None) -> Message:
+    message = Message(
+        sender_id=sender.id, recipient_id=recipient.id, content="hello",
+        thread_id=thread_id or uuid.uuid4(), sent_at=sent_at,
+    )
+    db.add(message)
+    db.flush()
+    _touch_conversations(db, message)
+    return message
+
+
+def summary(db: Session, player: Player, thread_id) -> ConversationSummary:
+    db.expire_all()
+    return db.get(ConversationSummary, (player.id, thread_id))
+
+
+@pytest.fixture
+def players(db: Session):
+    return make_player(db, "alice"), make_player(db, "bob")
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_thread_once_newest_first(db: Session, players):
+    alice, bob = players
+    messages = [send(db, alice, bob, START + timedelta(minutes=i)) for i in range(5)]
+    # Two threads with the same last message time are ordered by thread id
+    messages.append(send(db, alice, bob, START + timedelta(minutes=4)))
+
+    seen, cursor = [], None
+    while True:
+        page = await MessageService.get_conversations(db, bob.id, limit=2, cursor=cursor)
+        seen.extend(c["id"] for c in page["conversations"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(messages, key=lambda m: (m.sent_at, m.thread_id), reverse=True)
+    assert seen == [str(m.id) for m in expected]
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_rejected(db: Session, players):
+    with pytest.raises(ValueError):
+        await MessageService.get_conversations(db, players[0].id, cursor="not-a-cursor")
+
+
+def test_touch_keeps_the_latest_message_and_counts_unread_for_the_recipient(db: Session, players):
+    alice, bob = players
+    first = send(db, alice, bob, START)
+    latest = send(db, bob, alice, START + timedelta(minutes=5), thread_id=first.thread_id)
+    send(db, alice, bob, START + timedelta(minutes=1), thread_id=first.thread_id)  # Delivered out of order
+
+    for player in (alice, bob):
+        row = summary(db, player, first.thread_id)
+        assert row.last_message_id == latest.id
+        assert row.last_message_at == latest.sent_at
+    assert summary(db, alice, first.thread_id).unread_count == 1
+    assert summary(db, bob, first.thread_id).unread_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_decrements_unread_once(db: Session, players):
+    alice, bob = players
+    message = send(db, alice, bob, START)
+    send(db, alice, bob, START + timedelta(minutes=1), thread_id=message.thread_id)
+
+    assert await MessageService.mark_as_read(db, message.id, bob.id)
+    assert await MessageService.mark_as_read(db, message.id, bob.id)
+
+    assert summary(db, bob, message.thread_id).unread_count == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_refreshes_or_removes_the_summary(db: Session, players):
+    alice, bob = players
+    older = send(db, alice, bob, START)
+    newer = send(db, alice, bob, START + timedelta(minutes=1), thread_id=older.thread_id)
+
+    assert await MessageService.delete_message(db, newer.id, bob.id)
+    row = summary(db, bob, older.thread_id)
+    assert (row.last_message_id, row.unread_count) == (older.id, 1)
+    assert summary(db, alice, older.thread_id).last_message_id == newer.id
+
+    assert await MessageService.delete_message(db, older.id, bob.id)
+    assert summary(db, bob, older.thread_id) is None
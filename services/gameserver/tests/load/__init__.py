@@ -0,0 +1 @@
+"""Load-test harness (run with python -m tests.load.run_load_test)"""
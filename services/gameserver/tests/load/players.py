@@ -0,0 +1,167 @@
+"""
+Scripted virtual players.
+
+Each player logs in over HTTP, keeps a websocket open with periodic
+heartbeats (whose round trip is recorded as "WS heartbeat"), and loops
+through a play session until the deadline: read state, look around, trade
+when docked at a station, then warp to a random neighbouring sector.
+Choices come from a per-player RNG derived from the run seed, so the same
+seed replays the same decisions for the same galaxy.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+import websockets
+
+from tests.load.stats import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+PASSWORD = "loadtest-password"
+# The rate-limit middleware exempts test clients; the harness measures the game, not the limiter
+USER_AGENT = "sectorwars-loadtest testclient"
+
+
+@dataclass
+class Scenario:
+    duration_seconds: float = 60.0
+    think_time_ms: float = 200.0        # Upper bound of the random pause between actions
+    trade_probability: float = 0.5      # Chance to trade when in a sector with a station
+    heartbeat_interval_seconds: float = 5.0
+    request_timeout_seconds: float = 30.0
+
+
+def username_for(index: int) -> str:
+    return f"loadtest_{index:05d}"
+
+
+class VirtualPlayer:
+    def __init__(self, index: int, base_url: str, stations: Dict[int, List[str]],
+                 recorder: LatencyRecorder, scenario: Scenario, seed: int):
+        self.username = username_for(index)
+        self.base_url = base_url
+        self.stations = stations
+        self.recorder = recorder
+        self.scenario = scenario
+        self.rng = random.Random(seed * 100_003 + index)
+        self.client: Optional[httpx.AsyncClient] = None
+        self.sector_id = 1
+
+    async def request(self, method: str, endpoint: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        """Send a request and record its latency under the endpoint's route template"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, API_PREFIX + path, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(f"{method} {endpoint}", (time.perf_counter() - started) * 1000, None)
+            logger.debug(f"{self.username} {method} {path} failed: {e}")
+            return None
+        self.recorder.record(f"{method} {endpoint}", (time.perf_counter() - started) * 1000, response.status_code)
+        return response
+
+    async def run(self, deadline: float) -> None:
+        timeout = httpx.Timeout(self.scenario.request_timeout_seconds)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as client:
+            self.client = client
+            response = await self.request(
+                "POST", "/auth/player/login/json", "/auth/player/login/json",
+                json={"username": self.username, "password": PASSWORD},
+            )
+            if response is None or response.status_code != 200:
+                logger.warning(f"{self.username} could not log in")
+                return
+            token = response.json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            socket_task = asyncio.create_task(self.hold_websocket(token, deadline))
+            try:
+                while time.monotonic() < deadline:
+                    await self.play_turn()
+            finally:
+                socket_task.cancel()
+                await asyncio.gather(socket_task, return_exceptions=True)
+
+    async def think(self) -> None:
+        await asyncio.sleep(self.rng.uniform(0, self.scenario.think_time_ms) / 1000)
+
+    async def play_turn(self) -> None:
+        await self.request("GET", "/player/state", "/player/state")
+        await self.request("GET", "/player/current-sector", "/player/current-sector")
+        await self.think()
+
+        stations = self.stations.get(self.sector_id)
+        if stations and self.rng.random() < self.scenario.trade_probability:
+            await self.trade(self.rng.choice(stations))
+            await self.think()
+
+        response = await self.request("GET", "/player/available-moves", "/player/available-moves")
+        if response is None or response.status_code != 200:
+            return
+        moves = response.json()
+        destinations = [move["sector_id"] for move in moves.get("warps", []) + moves.get("tunnels", [])]
+        if not destinations:
+            return
+        destination = self.rng.choice(destinations)
+        response = await self.request("POST", "/player/move/{sector_id}", f"/player/move/{destination}")
+        if response is not None and response.status_code == 200:
+            self.sector_id = destination
+        await self.think()
+
+    async def trade(self, station_id: str) -> None:
+        response = await self.request("POST", "/trading/dock", "/trading/dock", json={"station_id": station_id})
+        if response is None or response.status_code != 200:
+            return
+        try:
+            response = await self.request("GET", "/trading/market/{station_id}", f"/trading/market/{station_id}")
+            if response is None or response.status_code != 200:
+                return
+            in_stock = sorted(name for name, r in response.json()["resources"].items() if (r["quantity"] or 0) > 0)
+            if not in_stock:
+                return
+            trade = {"station_id": station_id, "resource_type": self.rng.choice(in_stock), "quantity": 1}
+            response = await self.request("POST", "/trading/buy", "/trading/buy", json=trade)
+            if response is not None and response.status_code == 200:
+                await self.request("POST", "/trading/sell", "/trading/sell", json=trade)
+        finally:
+            await self.request("POST", "/trading/undock", "/trading/undock")
+
+    async def hold_websocket(self, token: str, deadline: float) -> None:
+        url = self.base_url.replace("http", "ws", 1) + f"{API_PREFIX}/ws/connect?token={token}"
+        started = time.perf_counter()
+        try:
+            socket = await websockets.connect(url, open_timeout=self.scenario.request_timeout_seconds)
+        except Exception as e:
+            self.recorder.record("WS connect", (time.perf_counter() - started) * 1000, None)
+            logger.debug(f"{self.username} websocket connect failed: {e}")
+            return
+        self.recorder.record("WS connect", (time.perf_counter() - started) * 1000, 101)
+
+        async with socket:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.rng.uniform(0.5, 1.0) * self.scenario.heartbeat_interval_seconds)
+                sent = time.perf_counter()
+                try:
+                    await socket.send(json.dumps({"type": "heartbeat"}))
+                    await self.await_message(socket, "heartbeat_ack")
+                except Exception as e:
+                    self.recorder.record("WS heartbeat", (time.perf_counter() - sent) * 1000, None)
+                    logger.debug(f"{self.username} websocket heartbeat failed: {e}")
+                    return
+                self.recorder.record("WS heartbeat", (time.perf_counter() - sent) * 1000, 200)
+
+    async def await_message(self, socket, message_type: str) -> Dict[str, Any]:
+        """Read until a message of the given type, skipping broadcasts received meanwhile"""
+        async with asyncio.timeout(self.scenario.request_timeout_seconds):
+            while True:
+                message = json.loads(await socket.recv())
+                if message.get("type") == message_type:
+                    return message
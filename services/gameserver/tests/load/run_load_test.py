@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Gameserver load test.
+
+Starts disposable Postgres and Redis, seeds a galaxy from a fixed seed,
+serves the app with uvicorn, registers virtual players and drives them over
+HTTP and websockets for a fixed duration. Prints p50/p95/p99 latency and
+requests per second per endpoint, optionally writes the report as JSON, and
+exits non-zero when a regression budget is exceeded.
+
+Run from services/gameserver:
+
+    python -m tests.load.run_load_test --players 50 --duration 60 \\
+        --budget tests/load/budget.json --report load-report.json
+
+Pass an earlier report as --baseline to enforce the budget's
+max_regression_pct against it.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from tests.load.environment import configure_gameserver_env, disposable_services, free_port
+from tests.load.stats import LatencyRecorder, check_budget, format_report, load_json
+
+logger = logging.getLogger("loadtest")
+
+GAMESERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REGISTRATION_CONCURRENCY = 10
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--players", type=int, default=25, help="Number of virtual players")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of load after warm-up")
+    parser.add_argument("--seed", type=int, default=2102, help="Seed for the galaxy and player decisions")
+    parser.add_argument("--sectors", type=int, default=300, help="Sectors in the seeded region")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn worker processes")
+    parser.add_argument("--think-time-ms", type=float, default=200.0, help="Maximum pause between player actions")
+    parser.add_argument("--budget", help="Regression budget JSON; exit 1 when exceeded")
+    parser.add_argument("--baseline", help="Earlier report JSON for the budget's max_regression_pct")
+    parser.add_argument("--report", help="Write the report JSON here")
+    return parser.parse_args(argv)
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=GAMESERVER_DIR,
+        env=os.environ.copy(),
+    )
+
+
+async def wait_for_server(base_url: str, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/v1/status/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Gameserver did not become healthy within {timeout}s")
+
+
+async def register_players(base_url: str, count: int) -> List[str]:
+    from tests.load.players import PASSWORD, USER_AGENT, username_for
+
+    semaphore = asyncio.Semaphore(REGISTRATION_CONCURRENCY)
+    usernames = [username_for(i) for i in range(count)]
+
+    async def register(client: httpx.AsyncClient, username: str) -> None:
+        async with semaphore:
+            response = await client.post("/api/v1/auth/register", json={
+                "username": username, "email": f"{username}@loadtest.example.com", "password": PASSWORD,
+            })
+            response.raise_for_status()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, headers={"User-Agent": USER_AGENT}) as client:
+        await asyncio.gather(*(register(client, username) for username in usernames))
+    return usernames
+
+
+async def drive_players(base_url: str, stations: Dict[int, List[str]], args: argparse.Namespace) -> dict:
+    from tests.load.players import Scenario, VirtualPlayer
+
+    recorder = LatencyRecorder()
+    scenario = Scenario(duration_seconds=args.duration, think_time_ms=args.think_time_ms)
+    players = [VirtualPlayer(i, base_url, stations, recorder, scenario, args.seed) for i in range(args.players)]
+
+    started = time.monotonic()
+    deadline = started + scenario.duration_seconds
+    await asyncio.gather(*(player.run(deadline) for player in players))
+    return recorder.report(time.monotonic() - started)
+
+
+def run(args: argparse.Namespace) -> dict:
+    with disposable_services() as (database_url, redis_url):
+        configure_gameserver_env(database_url, redis_url)
+
+        # The gameserver reads its settings at import time
+        from src.core.database import SessionLocal
+        from tests.load.seed import create_schema, provision_players, seed_galaxy
+
+        create_schema()
+        with SessionLocal() as db:
+            stations = seed_galaxy(db, args.seed, args.sectors)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(port, args.workers)
+        try:
+            asyncio.run(wait_for_server(base_url))
+            usernames = asyncio.run(register_players(base_url, args.players))
+            with SessionLocal() as db:
+                provision_players(db, usernames)
+            logger.info(f"Driving {args.players} players for {args.duration}s")
+            return asyncio.run(drive_players(base_url, stations, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def main(argv: List[str] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)8s] %(message)s")
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    report = run(args)
+    report["config"] = {
+        "players": args.players, "duration_seconds": args.duration, "seed": args.seed,
+        "sectors": args.sectors, "workers": args.workers, "think_time_ms": args.think_time_ms,
+    }
+    print(format_report(report))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.budget:
+        return 0
+    baseline = load_json(args.baseline) if args.baseline else None
+    violations = check_budget(report, load_json(args.budget), baseline)
+    for violation in violations:
+        print(f"BUDGET EXCEEDED: {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
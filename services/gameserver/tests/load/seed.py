@@ -0,0 +1,100 @@
+"""
+Seeded galaxy and player fixtures for load tests.
+
+Imports the gameserver, so environment.configure_gameserver_env must have
+run first. The galaxy is built the way the admin generate endpoint builds
+Terran Space, with the global RNG seeded so the same seed gives the same
+sectors, warps and stations.
+"""
+
+import logging
+import random
+from typing import Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from src.core.database import Base, engine
+from src.models.player import Player
+from src.models.region import Region, RegionType
+from src.models.sector import Sector
+from src.models.ship import Ship, ShipType
+from src.models.station import Station
+from src.models.user import User
+from src.services.galaxy_service import GalaxyGenerator
+
+logger = logging.getLogger(__name__)
+
+LOADTEST_TURNS = 1_000_000      # Enough that no virtual player runs out during a run
+LOADTEST_CREDITS = 1_000_000
+
+
+def create_schema() -> None:
+    Base.metadata.create_all(bind=engine)
+
+
+def seed_galaxy(db: Session, seed: int, sectors: int = 300) -> Dict[int, List[str]]:
+    """Generate Terran Space with the given seed; returns station ids by sector_id"""
+    random.seed(seed)
+    generator = GalaxyGenerator(db)
+    generator.generate_galaxy("Load Test Galaxy", {"num_sectors": sectors})
+
+    terran_space = Region(
+        name="terran-space",
+        display_name="Terran Space",
+        region_type=RegionType.TERRAN_SPACE,
+        owner_id=None,
+        subscription_tier="free",
+        status="active",
+        governance_type="democracy",
+        tax_rate=0.05,
+        economic_specialization="terran_colony",
+        starting_credits=10000,
+        starting_ship="merchant",
+        total_sectors=sectors,
+    )
+    db.add(terran_space)
+    db.flush()
+    # Also gives sector 1, where registration places players, its starter station
+    generator.generate_region_content(terran_space, cluster_count=max(2, sectors // 50))
+    db.commit()
+
+    stations: Dict[int, List[str]] = {}
+    rows = (
+        db.query(Station.sector_id, Station.id)
+        .join(Sector, Sector.sector_id == Station.sector_id)
+        .filter(Sector.region_id == terran_space.id)
+        .order_by(Station.sector_id, Station.id)
+    )
+    for sector_id, station_id in rows:
+        stations.setdefault(sector_id, []).append(str(station_id))
+    logger.info(f"Seeded {sectors} sectors with stations in {len(stations)} of them (seed {seed})")
+    return stations
+
+
+def provision_players(db: Session, usernames: Iterable[str]) -> None:
+    """Give registered players a flagship and enough turns and credits to play for the whole run"""
+    players = db.query(Player).join(User, User.id == Player.user_id).filter(User.username.in_(list(usernames))).all()
+    for player in players:
+        ship = Ship(
+            name=f"{player.nickname}'s Light Freighter",
+            type=ShipType.LIGHT_FREIGHTER,
+            owner_id=player.id,
+            sector_id=player.current_sector_id,
+            base_speed=1.0,
+            current_speed=1.0,
+            turn_cost=1,
+            warp_capable=False,
+            is_active=True,
+            maintenance={"status": "good", "next_service": None},
+            cargo={"capacity": 50, "used": 0, "contents": {}},
+            combat={"shields": 10, "weapons": 5},
+            is_flagship=True,
+            purchase_value=5000,
+            current_value=5000,
+        )
+        db.add(ship)
+        db.flush()
+        player.current_ship_id = ship.id
+        player.turns = LOADTEST_TURNS
+        player.credits = LOADTEST_CREDITS
+    db.commit()
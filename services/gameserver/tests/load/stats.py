@@ -0,0 +1,154 @@
+"""
+Latency statistics and regression budgets for the load-test harness.
+
+Kept free of gameserver imports so it can be unit tested without a
+database and reused to compare saved reports.
+"""
+
+import json
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+LATENCY_LIMITS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class EndpointSamples:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0             # 5xx responses, transport failures and timeouts
+    rejected: int = 0           # 4xx responses (game rules, e.g. not enough credits)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies_ms)
+
+
+class LatencyRecorder:
+    """Collects per-endpoint request latencies during a run"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointSamples] = defaultdict(EndpointSamples)
+
+    def record(self, endpoint: str, latency_ms: float, status: Optional[int] = None) -> None:
+        """Record one request; a status of None means the request failed without a response"""
+        samples = self.endpoints[endpoint]
+        samples.latencies_ms.append(latency_ms)
+        if status is None or status >= 500:
+            samples.errors += 1
+        elif status >= 400:
+            samples.rejected += 1
+
+    def report(self, duration_seconds: float) -> Dict[str, Any]:
+        """Percentiles, throughput and error rates per endpoint and in total"""
+        endpoints = {}
+        all_latencies: List[float] = []
+        total_errors = total_rejected = 0
+        for name in sorted(self.endpoints):
+            samples = self.endpoints[name]
+            endpoints[name] = _summarize(samples.latencies_ms, samples.errors, samples.rejected, duration_seconds)
+            all_latencies += samples.latencies_ms
+            total_errors += samples.errors
+            total_rejected += samples.rejected
+        return {
+            "duration_seconds": round(duration_seconds, 3),
+            "total": _summarize(all_latencies, total_errors, total_rejected, duration_seconds),
+            "endpoints": endpoints,
+        }
+
+
+def _summarize(latencies_ms: List[float], errors: int, rejected: int, duration_seconds: float) -> Dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        "count": count,
+        "rps": round(count / duration_seconds, 2) if duration_seconds > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+        "errors": errors,
+        "rejected": rejected,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+    }
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_budget(report: Dict[str, Any], budget: Dict[str, Any],
+                 baseline: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Violations of a regression budget, empty when the run is within it.
+
+    The budget has absolute limits for the whole run ("total"), for every
+    endpoint ("default") and per endpoint ("endpoints"), each any of
+    p50_ms/p95_ms/p99_ms (maximum), min_rps and max_error_rate. With a
+    baseline report, "max_regression_pct" also caps how far each latency
+    percentile may rise over the baseline's for the same endpoint.
+    Endpoints with fewer than "min_samples" requests are not judged.
+    """
+    violations = []
+    min_samples = budget.get("min_samples", 1)
+    max_regression_pct = budget.get("max_regression_pct")
+
+    violations += _check_limits("total", report["total"], budget.get("total", {}))
+
+    default = budget.get("default", {})
+    per_endpoint = budget.get("endpoints", {})
+    for name, stats in report["endpoints"].items():
+        if stats["count"] < min_samples:
+            continue
+        violations += _check_limits(name, stats, {**default, **per_endpoint.get(name, {})})
+
+        if baseline is not None and max_regression_pct is not None:
+            previous = baseline.get("endpoints", {}).get(name)
+            if previous and previous["count"] >= min_samples:
+                factor = 1 + max_regression_pct / 100.0
+                for key in LATENCY_LIMITS:
+                    if previous[key] > 0 and stats[key] > previous[key] * factor:
+                        violations.append(
+                            f"{name}: {key} {stats[key]} regressed more than {max_regression_pct}% "
+                            f"over baseline {previous[key]}"
+                        )
+
+    for name in per_endpoint:
+        if name not in report["endpoints"]:
+            violations.append(f"{name}: no requests recorded")
+    return violations
+
+
+def _check_limits(name: str, stats: Dict[str, Any], limits: Dict[str, Any]) -> List[str]:
+    violations = []
+    for key in LATENCY_LIMITS:
+        if key in limits and stats[key] > limits[key]:
+            violations.append(f"{name}: {key} {stats[key]} exceeds {limits[key]}")
+    if "min_rps" in limits and stats["rps"] < limits["min_rps"]:
+        violations.append(f"{name}: rps {stats['rps']} below {limits['min_rps']}")
+    if "max_error_rate" in limits and stats["error_rate"] > limits["max_error_rate"]:
+        violations.append(f"{name}: error rate {stats['error_rate']} exceeds {limits['max_error_rate']}")
+    return violations
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Plain-text table of a report"""
+    header = f"{'endpoint':<44} {'count':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>6} {'4xx':>6}"
+    lines = [header, "-" * len(header)]
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, s in rows:
+        lines.append(
+            f"{name:<44} {s['count']:>7} {s['rps']:>8.1f} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} "
+            f"{s['p99_ms']:>8.1f} {s['errors']:>6} {s['rejected']:>6}"
+        )
+    return "\n".join(lines)
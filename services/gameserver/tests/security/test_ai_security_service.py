@@ -13,6 +13,7 @@ from src.services.ai_security_service import (
     SecurityThreatLevel,
     get_security_service
 )
+from src.services.security_profile_store import SecurityProfileStore
 
 
 class TestAISecurityService:
@@ -20,7 +21,7 @@ class TestAISecurityService:
     
     def setup_method(self):
         """Set up fresh security service for each test"""
-        self.security_service = AISecurityService()
+        self.security_service = AISecurityService(store=SecurityProfileStore())
         # Use unique player ID for each test to avoid cross-test interference
         import uuid
         self.test_player_id = f"test_player_{uuid.uuid4().hex[:8]}"
@@ -191,11 +192,37 @@ class TestAISecurityService:
         assert self.security_service.check_rate_limits(self.test_player_id)
         
         # Simulate multiple rapid requests
-        profile = self.security_service.get_or_create_player_profile(self.test_player_id)
-        profile.request_count_1min = 100  # Exceed per-minute limit
-        profile.last_request_time = datetime.utcnow()  # Set last request time
+        for _ in range(self.security_service.rate_limits["requests_per_minute"]):
+            is_safe, _ = self.security_service.validate_input("hello", self.test_player_id, "s")
+            assert is_safe
         
         assert not self.security_service.check_rate_limits(self.test_player_id)
+        is_safe, violations = self.security_service.validate_input("hello", self.test_player_id, "s")
+        assert not is_safe
+        assert violations[0].violation_type == SecurityViolationType.RATE_LIMIT_EXCEEDED
+
+    def test_rate_limit_windows_roll_over(self):
+        """Rejected requests are not counted, and a new minute window starts fresh"""
+        store = SecurityProfileStore()
+        limits = {"requests_per_minute": 2, "requests_per_hour": 3, "requests_per_day": 100}
+        start = datetime(2025, 1, 1, 12, 0, 0)
+        
+        assert store.consume_request("p", limits, start)
+        assert store.consume_request("p", limits, start)
+        assert not store.consume_request("p", limits, start)
+        assert store.request_counts("p", start) == (2, 2, 2)
+        
+        next_minute = start + timedelta(minutes=1)
+        assert store.consume_request("p", limits, next_minute)
+        assert not store.consume_request("p", limits, next_minute)  # hourly limit reached
+
+    def test_profile_store_is_bounded(self):
+        """The in-process store keeps only the most recently used profiles"""
+        store = SecurityProfileStore(max_profiles=2)
+        for player_id in ("a", "b", "a", "c"):
+            store.get_profile(player_id)
+        
+        assert [p.player_id for p in store.iter_profiles()] == ["a", "c"]
 
     def test_cost_limiting(self):
         """Test API cost limiting"""
@@ -388,22 +415,23 @@ class TestSecurityServiceIntegration:
 
     def test_cleanup_functionality(self):
         """Test data cleanup functionality"""
-        security_service = AISecurityService()
+        store = SecurityProfileStore()
+        security_service = AISecurityService(store=store)
         
         # Add some test data
         old_date = (datetime.utcnow() - timedelta(days=10)).strftime("%Y-%m-%d")
-        security_service.cost_tracking[f"test_player:{old_date}"] = 0.50
+        store.add_cost("test_player", 0.50, old_date)
         
         recent_date = datetime.utcnow().strftime("%Y-%m-%d")
-        security_service.cost_tracking[f"test_player:{recent_date}"] = 0.25
+        security_service.track_cost("test_player", 0.25)
         
         # Cleanup old data
         security_service.cleanup_old_data(days_to_keep=7)
         
         # Old data should be removed, recent data kept
-        assert f"test_player:{old_date}" not in security_service.cost_tracking
-        assert f"test_player:{recent_date}" in security_service.cost_tracking
-
+        assert store.get_cost("test_player", old_date) == 0.0
+        assert store.get_cost("test_player", recent_date) == 0.25
+        assert security_service.get_daily_cost_usage("test_player") == 0.25
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
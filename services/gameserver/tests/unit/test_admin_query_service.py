@@ -0,0 +1,58 @@
+"""Unit tests for the admin data-access helpers: cursors and summary refresh statements"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.admin_query_service import decode_cursor, encode_cursor, refresh_sector_summaries, sector_flags
+from src.models.sector_summary import SectorSummary
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return SimpleNamespace(rowcount=len((params or {}).get("sector_ids", [])) or 7)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(4812, "2026-01-01T00:00:00")
+    assert decode_cursor(cursor) == [4812, "2026-01-01T00:00:00"]
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm9wZQ", "e30"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_targeted_refresh_is_one_statement_for_the_given_sectors():
+    session = RecordingSession()
+
+    assert refresh_sector_summaries(session, [12, 3, 12]) == 2
+    (sql, params), = session.statements
+    assert "ON CONFLICT (sector_id) DO UPDATE" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert "ANY(:sector_ids)" in sql
+    assert params == {"sector_ids": [3, 12]}
+
+    assert refresh_sector_summaries(session, []) == 0
+    assert len(session.statements) == 1
+
+
+def test_full_refresh_has_no_filter():
+    session = RecordingSession()
+    refresh_sector_summaries(session)
+    (sql, params), = session.statements
+    assert "ANY(" not in sql and params == {}
+
+
+def test_sector_flags_from_summary():
+    summary = SectorSummary(sector_id=1, station_count=1, planet_count=0, warp_tunnel_count=2, player_count=5)
+    assert sector_flags(summary) == {
+        "has_port": True, "has_planet": False, "has_warp_tunnel": True, "player_count": 5
+    }
+    assert sector_flags(None)["player_count"] == 0
@@ -0,0 +1,117 @@
+"""Unit tests for the AI generation cache: single-flight, TTL/LRU and variant pools"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.services.ai_generation_cache import GenerationCache, make_cache_key
+from src.services.ai_provider_pool import LLMClientPool
+from src.services.ai_provider_service import AIProviderService, ProviderConfig, ProviderType
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_generation():
+    cache = GenerationCache()
+    calls = 0
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "scene"
+
+    results = await asyncio.gather(*(cache.get_or_generate("k", generate) for _ in range(50)))
+
+    assert results == ["scene"] * 50
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 49
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter_and_are_not_cached():
+    cache = GenerationCache()
+
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("All AI providers failed")
+
+    results = await asyncio.gather(
+        *(cache.get_or_generate("k", broken) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.get("k") is None
+
+    async def working():
+        return "ok"
+
+    assert await cache.get_or_generate("k", working) == "ok"
+
+
+def test_ttl_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = GenerationCache(max_entries=2, ttl=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")          # a becomes most recently used
+    cache.put("c", 3)       # evicts b
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 1  # expired entries are dropped lazily on lookup
+    assert cache.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_hits_refill_variant_pool_in_background():
+    cache = GenerationCache(rng=random.Random(0))
+    counter = iter(range(100))
+
+    async def generate():
+        return f"variant-{next(counter)}"
+
+    first = await cache.get_or_generate("k", generate, variants=3)
+    for _ in range(5):
+        await cache.get_or_generate("k", generate, variants=3)
+        await asyncio.sleep(0)
+
+    assert first == "variant-0"
+    assert cache.variant_count("k") == 3
+    assert cache.generations == 3
+
+
+def test_cache_key_ignores_case_whitespace_and_key_order():
+    assert make_cache_key("scene", guard="Sgt.  Vega", ships=["A"]) == \
+        make_cache_key("scene", ships=["a"], guard="sgt. vega")
+    assert make_cache_key("scene", guard="Vega") != make_cache_key("outcome", guard="Vega")
+
+
+@pytest.mark.asyncio
+async def test_initial_scene_is_shared_across_ship_orderings():
+    service = AIProviderService(ProviderConfig(scene_variants=1), pool=LLMClientPool(), cache=GenerationCache())
+    calls = 0
+
+    async def fake_chain(operation, call, include_manual=True):
+        nonlocal calls
+        calls += 1
+        return "  Halt! Which ship is yours?  ", ProviderType.OPENAI
+
+    service._run_chain = fake_chain
+    guard = ("Vega", "Sergeant", "Friendly Veteran", "Old hand", 0.3)
+
+    first = await service.generate_initial_scene(*guard, ["SCOUT_SHIP", "ESCAPE_POD"])
+    second = await service.generate_initial_scene(*guard, ["ESCAPE_POD", "SCOUT_SHIP"])
+
+    assert first == second == ("Halt! Which ship is yours?", ProviderType.OPENAI)
+    assert calls == 1
@@ -0,0 +1,162 @@
+"""Unit tests for the pooled LLM client layer: breakers, gates, hedging and the chain"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.services.ai_provider_pool import (
+    CircuitBreaker, CircuitState, LLMClientPool, ProviderGate, ProviderUnavailableError
+)
+from src.services.ai_provider_service import AIProviderService, ProviderConfig, ProviderType
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubProvider:
+    def __init__(self, provider_type, delay=0.0, fail=False):
+        self.provider_type = provider_type
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    async def run(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.provider_type.value} down")
+        return self.provider_type.value
+
+
+def make_service(providers, **config):
+    pool = LLMClientPool()
+    service = AIProviderService(ProviderConfig(retry_delay=5.0, **config), pool=pool)
+    service.providers = providers
+    return service
+
+
+def test_breaker_opens_after_threshold_and_allows_one_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_gate_rejects_while_open_and_limits_concurrency():
+    gate = ProviderGate("openai", max_concurrency=2, timeout=1.0,
+                        breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=60))
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        peak = max(peak, gate.in_flight)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    assert await asyncio.gather(*(gate.call(work) for _ in range(6))) == ["ok"] * 6
+    assert peak == 2
+    assert gate.latency.total == 6
+
+    async def boom():
+        raise ValueError("bad gateway")
+
+    with pytest.raises(ValueError):
+        await gate.call(boom)
+    with pytest.raises(ProviderUnavailableError):
+        await gate.call(work)
+    assert gate.stats()["errors"] == {"ValueError": 1}
+    assert gate.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_probe_is_released_when_cancelled_while_queued():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    gate = ProviderGate("openai", max_concurrency=1, timeout=1.0, breaker=breaker)
+
+    await gate._semaphore.acquire()  # Every slot busy: the probe has to queue
+    probe = asyncio.create_task(gate.call(lambda: asyncio.sleep(0, "ok")))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    gate._semaphore.release()
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert await gate.call(lambda: asyncio.sleep(0, "ok")) == "ok"
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_chain_skips_open_circuit_without_retry_delay():
+    primary = StubProvider(ProviderType.OPENAI)
+    manual = StubProvider(ProviderType.MANUAL)
+    service = make_service([primary, manual])
+    breaker = service.gates[ProviderType.OPENAI].breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    result, used = await asyncio.wait_for(service._run_chain("test", lambda p: p.run()), timeout=1.0)
+
+    assert (result, used) == ("manual", ProviderType.MANUAL)
+    assert primary.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_returns_secondary_when_primary_is_slow():
+    primary = StubProvider(ProviderType.OPENAI, delay=1.0)
+    secondary = StubProvider(ProviderType.ANTHROPIC, delay=0.01)
+    service = make_service([primary, secondary, StubProvider(ProviderType.MANUAL)], hedge_after=0.05)
+
+    result, used = await asyncio.wait_for(service._run_chain("test", lambda p: p.run()), timeout=0.5)
+
+    assert used == ProviderType.ANTHROPIC
+    assert (primary.calls, secondary.calls) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_pool_talks_to_local_openai_stand_in():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "test-model",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "Papers, please."}}],
+        })
+
+    pool = LLMClientPool(openai_api_key="sk-test", openai_base_url="http://llm.local/v1",
+                         transport=httpx.MockTransport(handler))
+    try:
+        text = await pool.openai_chat("test-model", [{"role": "user", "content": "hi"}], 0.5, 20)
+    finally:
+        await pool.aclose()
+
+    assert text == "Papers, please."
+    assert seen[0]["max_tokens"] == 20
@@ -0,0 +1,160 @@
+"""Unit tests for the streaming trade and combat anomaly detector"""
+
+import uuid
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.models.anomaly_flag import AnomalyFlagType
+from src.models.combat_log import CombatLog, CombatOutcome
+from src.models.market_transaction import MarketTransaction, TransactionType
+from src.services import anomaly_detector as detector_module
+from src.services.anomaly_detector import (
+    PRICE_MIN_SAMPLES,
+    REPEAT_COMBAT_THRESHOLD,
+    WASH_TRADE_THRESHOLD,
+    WIN_RATE_MIN_COMBATS,
+    WINDOW_SECONDS,
+    AnomalyDetector,
+    collect_flags,
+    persist_pending_flags,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_wash_trading_flags_once_per_window():
+    clock = FakeClock()
+    detector = AnomalyDetector(clock)
+    player, station = uuid.uuid4(), uuid.uuid4()
+
+    flags = [f for _ in range(3 * WASH_TRADE_THRESHOLD) for f in detector.observe_trade(player, station, "ore", 10)]
+    assert [(f.flag_type, f.metric) for f in flags] == [(AnomalyFlagType.WASH_TRADING.value, WASH_TRADE_THRESHOLD + 1)]
+
+    clock.now += WINDOW_SECONDS + 1
+    flags = [f for _ in range(WASH_TRADE_THRESHOLD + 1) for f in detector.observe_trade(player, station, "ore", 10)]
+    assert len(flags) == 1
+
+
+def test_price_outlier_is_flagged_after_warm_up():
+    detector = AnomalyDetector(FakeClock())
+    station = uuid.uuid4()
+    for i in range(PRICE_MIN_SAMPLES):
+        assert detector.observe_trade(uuid.uuid4(), station, "tech", 100 + i % 5) == []
+
+    flags = detector.observe_trade(uuid.uuid4(), station, "tech", 1000)
+
+    assert [f.flag_type for f in flags] == [AnomalyFlagType.PRICE_DEVIATION.value]
+    assert flags[0].metric > 0
+
+
+def test_repeat_combat_escalates_and_win_rate_outlier_flags_once():
+    detector = AnomalyDetector(FakeClock())
+    farmer, victim = uuid.uuid4(), uuid.uuid4()
+    for _ in range(200):
+        detector.observe_combat_result(uuid.uuid4(), False)
+        detector.observe_combat_result(uuid.uuid4(), True)
+
+    repeat = [f for _ in range(15) for f in detector.observe_combat(farmer, victim)]
+    outliers = [f for _ in range(3 * WIN_RATE_MIN_COMBATS) for f in detector.observe_combat_result(farmer, True)]
+
+    assert [(f.severity, f.metric) for f in repeat] == [("medium", REPEAT_COMBAT_THRESHOLD + 1), ("high", 11)]
+    assert len(outliers) == 1 and outliers[0].player_id == farmer
+
+
+def test_flushed_rows_feed_the_detector():
+    detector = AnomalyDetector(FakeClock())
+    attacker, defender = uuid.uuid4(), uuid.uuid4()
+    logs = [
+        CombatLog(attacker_id=attacker, defender_id=defender, outcome=CombatOutcome.ATTACKER_WIN.value)
+        for _ in range(REPEAT_COMBAT_THRESHOLD + 1)
+    ]
+    trade = MarketTransaction(
+        player_id=uuid.uuid4(), station_id=uuid.uuid4(), commodity="fuel", unit_price=5,
+        transaction_type=TransactionType.BUY,
+    )
+
+    flags = collect_flags(detector, logs + [trade], [])
+
+    assert [f.flag_type for f in flags] == [AnomalyFlagType.REPEAT_COMBAT.value]
+    assert detector.finished_combats == len(logs)
+    assert flags[0].to_model().counterparty_id == defender
+
+
+def test_buy_and_sell_prices_are_tracked_separately():
+    detector = AnomalyDetector(FakeClock())
+    station = uuid.uuid4()
+    for i in range(PRICE_MIN_SAMPLES):
+        detector.observe_trade(uuid.uuid4(), station, "ore", 100 + i % 3, TransactionType.BUY)
+        detector.observe_trade(uuid.uuid4(), station, "ore", 60 + i % 3, TransactionType.SELL)
+
+    assert detector.observe_trade(uuid.uuid4(), station, "ore", 61, TransactionType.SELL) == []
+    flags = detector.observe_trade(uuid.uuid4(), station, "ore", 61, TransactionType.BUY)
+    assert [f.flag_type for f in flags] == [AnomalyFlagType.PRICE_DEVIATION.value]
+    assert flags[0].details["transaction_type"] == "buy"
+
+
+def test_dirty_combat_log_counts_its_outcome_once():
+    detector = AnomalyDetector(FakeClock())
+    attacker = uuid.uuid4()
+    log = CombatLog(attacker_id=attacker, defender_id=uuid.uuid4())
+    set_committed_value(log, "outcome", CombatOutcome.ONGOING.value)
+
+    log.outcome = CombatOutcome.ATTACKER_WIN.value
+    collect_flags(detector, [], [log])
+    assert detector.finished_combats == 1 and detector.attacker_wins == 1
+
+    set_committed_value(log, "outcome", CombatOutcome.ATTACKER_WIN.value)
+    log.outcome = CombatOutcome.DEFENDER_WIN.value
+    collect_flags(detector, [], [log])
+    assert detector.finished_combats == 1
+
+
+class FakeSession:
+    def __init__(self, new=()):
+        self.info = {}
+        self.new = list(new)
+        self.dirty = []
+        self.added = []
+        self.committed = False
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_only_committed_events_reach_the_detector(monkeypatch):
+    detector = AnomalyDetector(FakeClock())
+    monkeypatch.setattr(detector_module, "anomaly_detector", detector)
+    attacker, defender = uuid.uuid4(), uuid.uuid4()
+
+    def flush_combats(count):
+        session = FakeSession(CombatLog(attacker_id=attacker, defender_id=defender) for _ in range(count))
+        detector_module._before_flush(session, None, None)
+        return session
+
+    rolled_back = flush_combats(REPEAT_COMBAT_THRESHOLD + 1)
+    detector_module._after_rollback(rolled_back)
+    detector_module._after_commit(rolled_back)
+    assert detector.combats.events == {} and not detector.pending_flags
+
+    detector_module._after_commit(flush_combats(REPEAT_COMBAT_THRESHOLD + 1))
+    assert [f.flag_type for f in detector.pending_flags] == [AnomalyFlagType.REPEAT_COMBAT.value]
+
+    writer = FakeSession()
+    assert persist_pending_flags(detector, lambda: writer) == 1
+    assert writer.committed and writer.added[0].counterparty_id == defender
+    assert not detector.pending_flags
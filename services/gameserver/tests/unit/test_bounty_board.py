@@ -0,0 +1,51 @@
+"""Unit tests for the bounty board's SQL system-bounty tiers and row locking"""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.bounty_service import (
+    SYSTEM_BOUNTY_THRESHOLD,
+    SYSTEM_BOUNTY_TIERS,
+    BountyService,
+    _system_bounty_columns,
+)
+
+
+def evaluate(case_expr, score):
+    """Evaluate a ``personal_reputation <= threshold`` CASE for one score, in WHEN order."""
+    for condition, result in case_expr.whens:
+        if condition.operator(score, condition.right.value):
+            return result.value
+    return case_expr.else_.value
+
+
+@pytest.mark.parametrize("score", sorted(
+    {t + d for t in SYSTEM_BOUNTY_TIERS for d in (-1, 0, 1)} | {0, 1000, -5000}
+))
+def test_sql_tiers_match_python_system_bounties(score):
+    """The board's CASE totals agree with _get_system_bounties at and around every threshold"""
+    amount, count = _system_bounty_columns()
+    bounties = BountyService(MagicMock())._get_system_bounties(MagicMock(personal_reputation=score))
+
+    assert evaluate(amount, score) == sum(b["amount"] for b in bounties)
+    assert evaluate(count, score) == len(bounties)
+    assert (score <= SYSTEM_BOUNTY_THRESHOLD) == bool(bounties)
+
+
+def test_placement_locks_placer_and_target_in_id_order():
+    """Both rows are taken FOR UPDATE in one ordered query before the list and board are written"""
+    placer_id, target_id = uuid.uuid4(), uuid.uuid4()
+    db = MagicMock()
+    locked = db.query.return_value.filter.return_value.order_by.return_value.with_for_update.return_value
+    locked.all.return_value = [
+        MagicMock(id=placer_id, credits=0),
+        MagicMock(id=target_id),
+    ]
+
+    result = BountyService(db).place_bounty(placer_id, target_id, 5000)
+
+    assert result["success"] is False  # Placer cannot afford it; nothing else is written
+    db.query.return_value.filter.return_value.order_by.return_value.with_for_update.assert_called_once_with()
+    db.execute.assert_not_called()
@@ -0,0 +1,138 @@
+"""Unit tests for the vectorized colony economy engine"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.services.colony_economy_engine import (
+    _COLUMNS,
+    MAX_CATCH_UP_DAYS,
+    SPECIALIZATIONS,
+    PlanetColumns,
+    apply_production,
+    production_rates,
+    run_production_tick,
+)
+from src.services.planetary_service import PlanetaryService
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_planet(rng, **overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        fuel_allocation=rng.randint(0, 500),
+        organics_allocation=rng.randint(0, 500),
+        equipment_allocation=rng.randint(0, 500),
+        mine_level=rng.randint(0, 5),
+        farm_level=rng.randint(0, 5),
+        factory_level=rng.randint(0, 5),
+        habitability_score=rng.choice([None, 0, 35, 70, 100]),
+        specialization=rng.choice([None, "", "unknown"] + SPECIALIZATIONS),
+        under_siege=rng.random() < 0.3,
+        colonists=rng.randint(0, 5000),
+        max_colonists=10000,
+        fuel_ore=0,
+        organics=0,
+        equipment=0,
+        last_production=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_vectorized_rates_match_scalar_formula():
+    rng = random.Random(7)
+    planets = [make_planet(rng) for _ in range(500)]
+    service = PlanetaryService(db=None)
+
+    rates = production_rates(PlanetColumns.from_planets(planets))
+
+    for i, planet in enumerate(planets):
+        assert rates.as_dict(i) == pytest.approx(service._calculate_production_rates(planet), abs=0.011)
+
+
+def test_tick_credits_elapsed_days_and_starts_new_clocks():
+    rng = random.Random(1)
+    producing = make_planet(rng, specialization=None, under_siege=False, fuel_allocation=100, mine_level=0,
+                            last_production=NOW - timedelta(days=2))
+    fresh = make_planet(rng, last_production=None)
+    stale = make_planet(rng, specialization=None, under_siege=False, fuel_allocation=1, mine_level=0,
+                        last_production=NOW - timedelta(days=100))
+
+    cols = PlanetColumns.from_planets([producing, fresh, stale])
+    result = apply_production(cols, NOW.timestamp(), np.random.default_rng(0))
+
+    assert result.fuel_ore[0] == 2000
+    assert result.fuel_ore[1] == fresh.fuel_ore  # No elapsed time yet
+    assert result.fuel_ore[2] == int(10 * MAX_CATCH_UP_DAYS)
+    assert result.mask.all()
+
+
+def test_colonist_growth_is_capped_by_habitability_and_halted_by_siege():
+    rng = random.Random(2)
+    last = NOW - timedelta(days=7)
+    near_cap = make_planet(rng, colonists=4990, max_colonists=10000, habitability_score=50,
+                           specialization=None, under_siege=False, last_production=last)
+    over_cap = make_planet(rng, colonists=9000, max_colonists=10000, habitability_score=50,
+                           specialization=None, under_siege=False, last_production=last)
+    besieged = make_planet(rng, colonists=1000, under_siege=True, last_production=last)
+
+    result = apply_production(PlanetColumns.from_planets([near_cap, over_cap, besieged]), NOW.timestamp())
+
+    assert result.colonists.tolist() == [5000, 9000, 1000]
+
+
+@pytest.mark.slow
+def test_one_tick_over_100k_planets_is_fast():
+    n = 100_000
+    gen = np.random.default_rng(3)
+    cols = PlanetColumns(
+        ids=np.arange(n).astype(object),
+        fuel_allocation=gen.integers(0, 500, n),
+        organics_allocation=gen.integers(0, 500, n),
+        equipment_allocation=gen.integers(0, 500, n),
+        mine_level=gen.integers(0, 5, n),
+        farm_level=gen.integers(0, 5, n),
+        factory_level=gen.integers(0, 5, n),
+        habitability=gen.integers(0, 101, n),
+        specialization=gen.integers(0, len(SPECIALIZATIONS) + 1, n).astype(np.int8),
+        under_siege=gen.random(n) < 0.1,
+        colonists=gen.integers(1, 10000, n),
+        max_colonists=np.full(n, 10000),
+        fuel_ore=np.zeros(n, dtype=np.int64),
+        organics=np.zeros(n, dtype=np.int64),
+        equipment=np.zeros(n, dtype=np.int64),
+        last_production=np.full(n, NOW.timestamp() - 3600.0),
+    )
+
+    started = time.perf_counter()
+    result = apply_production(cols, NOW.timestamp(), gen)
+    elapsed = time.perf_counter() - started
+
+    assert result.mask.sum() == n
+    assert elapsed < 0.5
+
+
+def test_tick_writes_deltas_guarded_by_the_last_production_read():
+    last = NOW - timedelta(days=1)
+    planet = make_planet(random.Random(5), fuel_allocation=100, mine_level=0, specialization=None,
+                         under_siege=False, fuel_ore=40, last_production=last)
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [tuple(getattr(planet, c.key) for c in _COLUMNS)]
+    db.execute.return_value.rowcount = 0
+
+    stats = run_production_tick(db, now=NOW, rng=np.random.default_rng(0))
+
+    statement, params = db.execute.call_args.args
+    assert "fuel_ore = COALESCE(p.fuel_ore, 0) + v.d_fuel_ore" in str(statement)
+    assert "IS NOT DISTINCT FROM v.old_last_production" in str(statement)
+    assert params["d_fuel_ore"] == [1000]
+    assert params["old_last_production"] == [last]
+    assert stats["updated"] == 0  # Another tick got there first
@@ -0,0 +1,98 @@
+"""Unit tests for the batched, cached admin live combat feed"""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.combat_log import CombatLog
+from src.models.fleet import FleetBattle
+from src.models.player import Player
+from src.models.sector import Sector
+from src.services import combat_analytics_service as analytics
+from src.services.combat_analytics_service import CombatAnalyticsService
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args):
+        return self
+
+    order_by = limit = filter
+
+    def all(self):
+        return list(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+
+    def query(self, *entities):
+        model = getattr(entities[0], "class_", entities[0])
+        self.queries.append(model)
+        return FakeQuery(self.tables.get(model, []))
+
+
+def combat(attacker, defender, sector):
+    return SimpleNamespace(
+        id=uuid.uuid4(), attacker_id=attacker, defender_id=defender, sector_uuid=sector,
+        combat_type="ship_to_ship", ended_at=None, started_at=datetime.utcnow() - timedelta(seconds=30),
+        outcome="ongoing", rounds=3, attacker_damage_dealt=10, defender_damage_dealt=5,
+        attacker_drones_lost=0, defender_drones_lost=0, attacker_drones=2, defender_drones=1,
+    )
+
+
+@pytest.fixture
+def session():
+    analytics.invalidate_live_combat_feed()
+    players = [SimpleNamespace(id=uuid.uuid4(), nickname=f"p{i}", team_id=None) for i in range(10)]
+    sector = SimpleNamespace(id=uuid.uuid4(), name="Vega", x_coord=1, y_coord=2, z_coord=3)
+    combats = [combat(players[i % 10].id, players[(i + 1) % 10].id, sector.id) for i in range(50)]
+    combats.append(combat(None, players[0].id, None))
+    yield FakeSession({CombatLog: combats, Player: players, Sector: [sector], FleetBattle: []})
+    analytics.invalidate_live_combat_feed()
+
+
+def test_feed_resolves_page_in_constant_queries(session):
+    feed = CombatAnalyticsService(session).get_live_combat_feed(limit=60)
+
+    assert len(feed) == 51
+    assert session.queries == [CombatLog, Player, Sector, FleetBattle]
+    first, unattributed = (next(e for e in feed if e["id"] == str(c.id)) for c in session.tables[CombatLog][::50])
+    assert first["attacker"]["name"] == "p0" and first["defender"]["name"] == "p1"
+    assert first["sector"]["coordinates"] == "[1,2,3]"
+    assert unattributed["attacker"] == {"id": "None", "type": "player", "name": "Unknown"}
+    assert unattributed["sector"]["name"] == "Unknown Sector"
+
+
+def test_feed_is_shared_until_invalidated(session):
+    CombatAnalyticsService(session).get_live_combat_feed(limit=60)
+    CombatAnalyticsService(session).get_live_combat_feed(limit=60)
+    assert len(session.queries) == 4
+
+    CombatAnalyticsService(session).get_live_combat_feed(limit=10)
+    assert len(session.queries) == 8
+
+    analytics.invalidate_live_combat_feed()
+    CombatAnalyticsService(session).get_live_combat_feed(limit=60)
+    assert len(session.queries) == 12
+
+
+def test_expired_pages_are_pruned_on_write(session, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(analytics.time, "monotonic", lambda: clock[0])
+    for limit in (10, 20):
+        CombatAnalyticsService(session).get_live_combat_feed(limit=limit)
+
+    clock[0] += analytics.LIVE_FEED_CACHE_SECONDS + 1
+    CombatAnalyticsService(session).get_live_combat_feed(limit=30)
+
+    assert [key[0] for key in analytics._live_feed_cache] == [30]
@@ -0,0 +1,127 @@
+"""Unit tests for the seeded combat kernel and the Monte Carlo balance runner"""
+
+import random
+from collections import OrderedDict
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models.combat import CombatResult
+from src.models.ship import ShipType
+from src.services import combat_balance_simulator
+from src.services.combat_balance_simulator import baseline_combatant, run_balance_simulation
+from src.services.combat_kernel import (
+    PlanetDefense, resolve_drone_assault, resolve_planet_assault, resolve_ship_duel
+)
+from src.services.combat_service import CombatService
+
+
+def test_same_seed_replays_duel():
+    """Two duels with the same seed produce identical logs and outcomes"""
+    attacker = baseline_combatant(ShipType.DEFENDER)
+    defender = baseline_combatant(ShipType.CARGO_HAULER)
+
+    first = resolve_ship_duel(attacker, defender, random.Random(99), defender_cargo={"ore": 100})
+    second = resolve_ship_duel(attacker, defender, random.Random(99), defender_cargo={"ore": 100})
+
+    assert first == second
+    assert first["combat_details"][-1]["action"] == "combat_end"
+
+
+def test_unrecorded_run_matches_recorded_outcome():
+    """Skipping the combat log does not change the random stream or the result"""
+    attacker = baseline_combatant(ShipType.SCOUT_SHIP)
+    defender = baseline_combatant(ShipType.CARRIER)
+
+    for seed in range(50):
+        recorded = resolve_ship_duel(attacker, defender, random.Random(seed))
+        silent = resolve_ship_duel(attacker, defender, random.Random(seed), record=False)
+        assert silent["combat_details"] == []
+        assert (silent["result"], silent["rounds"]) == (recorded["result"], recorded["rounds"])
+
+
+def test_drone_losses_are_attributed_in_deployment_order():
+    """Destroyed sector drones are charged to deployments first to last"""
+    attacker = baseline_combatant(ShipType.CARRIER)
+    result = resolve_drone_assault(attacker, [("d1", "p1", 2), ("d2", "p2", 10)], random.Random(5))
+
+    lost = [u["drones_lost"] for u in result["deployment_updates"]]
+    assert sum(lost) == result["defender_drones_lost"]
+    if lost[1]:
+        assert lost[0] == 2
+
+
+def test_undefended_planet_falls_in_first_hit():
+    """A planet with no defenses is captured as soon as it is hit"""
+    attacker = baseline_combatant(ShipType.DEFENDER)
+    result = resolve_planet_assault(attacker, PlanetDefense(name="Bare Rock"), random.Random(1))
+
+    assert result["result"] == CombatResult.ATTACKER_VICTORY
+    assert result["planet_captured"]
+
+
+def test_service_uses_kernel_with_its_seed():
+    """CombatService only maps players to kernel inputs, so a seeded service replays"""
+    def player(name, ship_type):
+        p = MagicMock(username=name, defense_drones=3, military_rank="Recruit")
+        p.current_ship = MagicMock(type=ship_type, combat={}, current_speed=1.0, cargo={})
+        return p
+
+    attacker, defender = player("a", ShipType.DEFENDER), player("b", ShipType.LIGHT_FREIGHTER)
+    first = CombatService(MagicMock(), seed=3)._resolve_ship_combat(attacker, defender, None)
+    second = CombatService(MagicMock(), seed=3)._resolve_ship_combat(attacker, defender, None)
+
+    assert first == second
+
+
+def test_balance_simulation_is_reproducible(monkeypatch):
+    """A seeded simulation yields the same tables in-process and across worker processes"""
+    types = [ShipType.DEFENDER, ShipType.SCOUT_SHIP]
+    monkeypatch.setattr(combat_balance_simulator, "CHUNK_SIZE", 100)
+    monkeypatch.setattr(combat_balance_simulator, "_results", OrderedDict())
+    first = run_balance_simulation(types, iterations=300, seed=17, workers=1)
+
+    combat_balance_simulator._results.clear()
+    monkeypatch.setattr(combat_balance_simulator, "PARALLEL_THRESHOLD", 0)
+    second = run_balance_simulation(types, iterations=300, seed=17, workers=2)
+
+    assert first == second
+    assert set(first["by_ship_type"]) == {"DEFENDER", "SCOUT_SHIP"}
+    assert first["total_simulations"] == 4 * 300
+    matchup = first["matchups"]["DEFENDER vs SCOUT_SHIP"]
+    assert abs(sum(v for k, v in matchup.items() if k not in ("attacker", "defender", "simulations", "avg_rounds")) - 1) < 0.01
+
+
+def test_shutdown_stops_the_worker_pool(monkeypatch):
+    """The shared pool is shut down and dropped; the next parallel run starts a fresh one"""
+    types = [ShipType.DEFENDER, ShipType.SCOUT_SHIP]
+    monkeypatch.setattr(combat_balance_simulator, "CHUNK_SIZE", 100)
+    monkeypatch.setattr(combat_balance_simulator, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(combat_balance_simulator, "_results", OrderedDict())
+    run_balance_simulation(types, iterations=200, workers=2)
+    pool = combat_balance_simulator._pool
+
+    combat_balance_simulator.shutdown_pool()
+
+    assert combat_balance_simulator._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(abs, -1)
+    run_balance_simulation(types, iterations=200, workers=2)
+    assert combat_balance_simulator._pool is not pool
+    combat_balance_simulator.shutdown_pool()
+
+
+def test_seeded_simulations_are_cached_and_iterations_capped(monkeypatch):
+    types = [ShipType.DEFENDER, ShipType.SCOUT_SHIP]
+    monkeypatch.setattr(combat_balance_simulator, "_results", OrderedDict())
+    first = run_balance_simulation(types, iterations=50, seed=3, workers=1)
+
+    def fail(*args):
+        raise AssertionError("seeded run was recomputed")
+
+    monkeypatch.setattr(combat_balance_simulator, "_simulate", fail)
+    cached = run_balance_simulation(types, iterations=50, seed=3, workers=1)
+    assert cached == first and cached is not first
+
+    with pytest.raises(ValueError):
+        run_balance_simulation(types, iterations=combat_balance_simulator.MAX_ITERATIONS + 1, seed=3)
@@ -0,0 +1,96 @@
+"""Unit tests for array-based drone engagements and ordered drone loss attribution"""
+
+import random
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from src.models.ship import ShipType
+from src.services.combat_balance_simulator import baseline_combatant
+from src.services.combat_kernel import allocate_losses, resolve_drone_assault
+from src.services.drone_engagement import (
+    ATTACKER,
+    DEFENDER,
+    SectorDrones,
+    engagement_writes,
+    resolve_engagement,
+)
+
+
+def drone_rows(player_id, count, team_id=None, health=100, attack=10, defense=10, speed=1.0):
+    return [
+        (uuid.uuid4(), uuid.uuid4(), player_id, team_id, health, 100, attack, defense, speed)
+        for _ in range(count)
+    ]
+
+
+def test_allocate_losses_fills_deployments_in_order():
+    assert allocate_losses([2, 10, 3], 7).tolist() == [2, 5, 0]
+    assert allocate_losses([2, 10, 3], 0).tolist() == [0, 0, 0]
+    assert allocate_losses([2, 10, 3], 99).tolist() == [2, 10, 3]
+
+
+def test_assault_over_many_deployments_charges_losses_once():
+    attacker = baseline_combatant(ShipType.CARRIER)
+    deployments = [(f"d{i}", f"p{i % 50}", 3) for i in range(500)]
+
+    result = resolve_drone_assault(attacker, deployments, random.Random(11))
+
+    lost = [u["drones_lost"] for u in result["deployment_updates"]]
+    assert sum(lost) == result["defender_drones_lost"]
+    assert all(u["drones_lost"] <= u["starting_drones"] for u in result["deployment_updates"])
+
+
+def test_teams_fight_together_and_strong_side_wins():
+    me, ally, enemy, team = uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    rows = (drone_rows(me, 5, attack=40) + drone_rows(ally, 5, team_id=team, attack=40)
+            + drone_rows(enemy, 3, attack=5, defense=0, health=20))
+    drones = SectorDrones.from_rows(rows, {me}, team)
+
+    result = resolve_engagement(drones, np.random.default_rng(4))
+
+    assert drones.side.tolist() == [ATTACKER] * 10 + [DEFENDER] * 3
+    assert result.winner == ATTACKER
+    assert result.destroyed[10:].all()
+    assert result.kills.sum() == 3
+    assert result.damage_taken.sum() == result.damage_dealt.sum()
+    assert drones.deployment_index[rows[12][0]] == 12
+
+
+def test_writes_cover_only_engaged_drones():
+    me, enemy = uuid.uuid4(), uuid.uuid4()
+    rows = drone_rows(me, 2) + drone_rows(enemy, 2)
+    drones = SectorDrones.from_rows(rows, {me})
+    result = resolve_engagement(drones, np.random.default_rng(0), max_rounds=1)
+
+    (_, drone_params), (_, deployment_params) = engagement_writes(drones, result, now=None)
+
+    assert drone_params["ids"] == [str(r[1]) for r in rows]
+    assert deployment_params["ids"] == [str(r[0]) for r in rows]
+    assert deployment_params["alive"] == (result.health > 0).tolist()
+
+
+@pytest.mark.slow
+def test_sector_with_thousands_of_drones_resolves_quickly():
+    players = [uuid.uuid4() for _ in range(300)]
+    gen = random.Random(9)
+    rows = [row for p in players for row in drone_rows(p, gen.randint(5, 20), attack=gen.randint(5, 30))]
+    attackers = set(players[:100])
+
+    started = time.perf_counter()
+    drones = SectorDrones.from_rows(rows, attackers)
+    result = resolve_engagement(drones, np.random.default_rng(1))
+    engagement_writes(drones, result, now=None)
+    elapsed = time.perf_counter() - started
+
+    assert len(drones) > 3000
+    assert result.rounds > 0
+    assert elapsed < 1.0
+
+    deployments = [(f"d{i}", f"p{i}", 10) for i in range(500)]
+    started = time.perf_counter()
+    for seed in range(100):
+        resolve_drone_assault(baseline_combatant(ShipType.CARRIER), deployments, random.Random(seed), record=False)
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,90 @@
+"""Unit tests for the array-based fleet battle engine"""
+
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from src.services.fleet_battle_engine import FleetBattleEngine, FleetSide, MAX_ROUNDS
+from src.services.fleet_service import FleetService
+
+
+def make_side(count, attack=5, shields=50, hull=200, prefix="s"):
+    ships = [
+        {"id": f"{prefix}{i}", "name": f"{prefix}{i}", "attack_rating": attack,
+         "shields": shields, "hull": hull, "max_hull": hull}
+        for i in range(count)
+    ]
+    return FleetSide.from_ships(ships, attack_bonus=1.0, defense_bonus=1.0)
+
+
+def test_same_seed_replays_identically():
+    """A seeded battle produces the same rounds and final state every time"""
+    results = []
+    for _ in range(2):
+        attacker, defender = make_side(20, prefix="a"), make_side(20, prefix="d")
+        outcome = FleetBattleEngine(attacker, defender, seed=42).run(None, 0, "engagement")
+        results.append((outcome.rounds, attacker.hull.copy(), defender.hull.copy()))
+
+    assert results[0][0] == results[1][0]
+    assert np.array_equal(results[0][1], results[1][1])
+    assert np.array_equal(results[0][2], results[1][2])
+
+
+def test_max_rounds_stops_early_and_resumes_numbering():
+    """A bounded call runs exactly max_rounds and continues the round counter"""
+    attacker, defender = make_side(50, hull=10_000, prefix="a"), make_side(50, hull=10_000, prefix="d")
+    outcome = FleetBattleEngine(attacker, defender, seed=1).run(3, rounds_completed=4, phase="engagement")
+
+    assert not outcome.ended
+    assert [r["round"] for r in outcome.rounds] == [5, 6, 7]
+    # Phase advances after round 5
+    assert outcome.phase == "main_battle"
+
+
+def test_overwhelming_attacker_wipes_defender():
+    """The battle ends once one side has no ships left in the fight"""
+    attacker = make_side(30, attack=50, prefix="a")
+    defender = make_side(2, attack=1, shields=0, hull=20, prefix="d")
+    outcome = FleetBattleEngine(attacker, defender, seed=7).run(None, 0, "engagement")
+
+    assert outcome.ended
+    assert defender.active_count == 0
+    assert defender.destroyed_count + defender.retreated_count == 2
+    assert len(outcome.rounds) < MAX_ROUNDS
+
+
+def test_shields_absorb_before_hull():
+    """Damage drains shields first and only the remainder reaches the hull"""
+    attacker = make_side(1, attack=1, prefix="a")
+    defender = make_side(1, shields=1_000, hull=100, prefix="d")
+    FleetBattleEngine(attacker, defender, seed=3).run(5, 0, "engagement")
+
+    assert defender.hull[0] == 100
+    assert defender.shields[0] < 1_000
+
+
+def test_large_battle_is_fast():
+    """Hundreds of ships per side resolve to completion well under a second"""
+    attacker, defender = make_side(500, prefix="a"), make_side(500, prefix="d")
+    start = time.perf_counter()
+    outcome = FleetBattleEngine(attacker, defender, seed=11).run(None, 0, "engagement")
+    elapsed = time.perf_counter() - start
+
+    assert outcome.ended
+    assert elapsed < 1.0
+
+
+def test_post_battle_refresh_sums_fractional_combat_values():
+    """Damaged ships carry float hull/shields in JSON; the refresh must not cast them to integer"""
+    db = MagicMock()
+    fleet = MagicMock(id="f1")
+    db.execute.return_value.all.return_value = [("f1", 2, 10.0, 99.5, 37.5, 3.0)]
+
+    FleetService(db)._refresh_fleet_stats_after_battle([fleet])
+
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "AS INTEGER" not in sql and "AS FLOAT" in sql
+    assert (fleet.total_firepower, fleet.total_shields, fleet.total_hull) == (10, 99, 37)
+    assert fleet.total_ships == 2
@@ -0,0 +1,83 @@
+"""Unit tests for the load-test harness latency statistics and regression budgets"""
+
+from tests.load.stats import LatencyRecorder, check_budget, percentile
+
+
+def make_report(latencies, status=200, endpoint="GET /player/state", duration=10.0):
+    recorder = LatencyRecorder()
+    for latency in latencies:
+        recorder.record(endpoint, latency, status)
+    return recorder.report(duration)
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_report_counts_throughput_errors_and_rejections():
+    recorder = LatencyRecorder()
+    for _ in range(8):
+        recorder.record("POST /trading/buy", 10.0, 200)
+    recorder.record("POST /trading/buy", 12.0, 400)
+    recorder.record("POST /trading/buy", 30000.0, None)
+    recorder.record("GET /player/state", 5.0, 503)
+
+    report = recorder.report(5.0)
+
+    buy = report["endpoints"]["POST /trading/buy"]
+    assert buy["count"] == 10
+    assert buy["rps"] == 2.0
+    assert buy["errors"] == 1
+    assert buy["rejected"] == 1
+    assert buy["error_rate"] == 0.1
+    assert report["total"]["count"] == 11
+    assert report["total"]["errors"] == 2
+
+
+def test_budget_passes_within_limits():
+    report = make_report([10.0] * 50)
+    budget = {"total": {"min_rps": 1}, "default": {"p95_ms": 50, "max_error_rate": 0.01}}
+    assert check_budget(report, budget) == []
+
+
+def test_budget_reports_absolute_limit_violations():
+    report = make_report([10.0] * 90 + [500.0] * 10)
+    budget = {
+        "total": {"min_rps": 100},
+        "default": {"p99_ms": 1000},
+        "endpoints": {"GET /player/state": {"p95_ms": 100}, "WS heartbeat": {"p95_ms": 50}},
+    }
+
+    violations = check_budget(report, budget)
+
+    assert any("GET /player/state: p95_ms" in v for v in violations)
+    assert any("total: rps" in v for v in violations)
+    assert any("WS heartbeat: no requests recorded" in v for v in violations)
+    assert not any("p99_ms" in v for v in violations)
+
+
+def test_budget_fails_on_error_rate():
+    report = make_report([10.0] * 10, status=500)
+    assert check_budget(report, {"default": {"max_error_rate": 0.05}}) == [
+        "GET /player/state: error rate 1.0 exceeds 0.05"
+    ]
+
+
+def test_budget_compares_against_baseline():
+    baseline = make_report([10.0] * 100)
+    budget = {"max_regression_pct": 20}
+
+    assert check_budget(make_report([11.0] * 100), budget, baseline) == []
+    violations = check_budget(make_report([13.0] * 100), budget, baseline)
+    assert len(violations) == 3
+    assert all("regressed more than 20%" in v for v in violations)
+
+
+def test_budget_skips_endpoints_with_too_few_samples():
+    report = make_report([900.0] * 3)
+    assert check_budget(report, {"min_samples": 10, "default": {"p95_ms": 100}}) == []
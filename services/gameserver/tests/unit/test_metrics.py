@@ -0,0 +1,148 @@
+"""Unit tests for the gameserver metrics registry and hot-path instrumentation"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from src.api.middleware.metrics import MetricsMiddleware
+from src.core import metrics as metrics_module
+from src.core.metrics import (
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_CONNECTIONS,
+    DB_QUERY_SECONDS,
+    EVENT_LOOP_LAG_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    WEBSOCKET_SEND_SECONDS,
+    WEBSOCKET_SENDS_IN_FLIGHT,
+    Histogram,
+    LoopLagSampler,
+    TimedQueuePool,
+    fingerprint_statement,
+    install_database_metrics,
+    metrics_authorized,
+    normalize_statement,
+    registry,
+    timed_send,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    lines = histogram.render()
+
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_sum{route="/a"} 4.05' in lines
+    assert 'test_latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_statement_fingerprints_ignore_literals_and_in_list_length():
+    a = "SELECT players.id FROM players JOIN ships ON ships.owner_id = players.id WHERE players.id IN (%(id_1)s, %(id_2)s)"
+    b = "SELECT players.id  FROM players JOIN ships ON ships.owner_id = players.id\nWHERE players.id IN (%(id_1)s)"
+
+    assert normalize_statement(a) == normalize_statement(b)
+    assert "?" in normalize_statement("UPDATE players SET credits = 5 WHERE nickname = 'x''y'")
+    fingerprint, statement = fingerprint_statement(a)
+    assert fingerprint == fingerprint_statement(b)[0]
+    assert statement == "SELECT players,ships"
+
+
+def test_request_latency_is_labelled_by_route_template():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/items/1")
+            await client.get("/items/2")
+            await client.get("/missing")
+
+    before = HTTP_REQUEST_SECONDS.count("GET", "/items/{item_id}", "200")
+    asyncio.run(run())
+
+    assert HTTP_REQUEST_SECONDS.count("GET", "/items/{item_id}", "200") == before + 2
+    assert HTTP_REQUEST_SECONDS.count("GET", "unmatched", "404") >= 1
+
+
+def test_database_metrics_time_queries_checkouts_and_pool_usage(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=TimedQueuePool, pool_size=2)
+    assert isinstance(engine.pool, QueuePool)
+    install_database_metrics({"test": engine})
+
+    checkouts = DB_POOL_CHECKOUT_SECONDS.count("sync")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+        registry.render()
+        assert DB_POOL_CONNECTIONS.value("test", "in_use") == 1
+
+    registry.render()
+    assert DB_POOL_CONNECTIONS.value("test", "in_use") == 0
+    assert DB_POOL_CONNECTIONS.value("test", "size") == 2
+    assert DB_POOL_CHECKOUT_SECONDS.count("sync") >= checkouts + 1
+    assert DB_QUERY_SECONDS.count(*fingerprint_statement("SELECT 1")) >= 2
+
+
+def test_loop_lag_sampler_records_late_wakeups():
+    sampler = LoopLagSampler(interval=0.5, warn_after=1.0)
+    before = EVENT_LOOP_LAG_SECONDS.count()
+
+    sampler.record(0.002)
+    sampler.record(1.5)
+    sampler.record(-0.001)
+
+    assert EVENT_LOOP_LAG_SECONDS.count() == before + 3
+    assert sampler.max_lag == 1.5
+    sampler.collect()
+    assert sampler.max_lag == 0.0
+
+
+def test_timed_send_tracks_sends_in_flight():
+    seen = []
+
+    class SlowSocket:
+        async def send_text(self, data):
+            seen.append(WEBSOCKET_SENDS_IN_FLIGHT.value())
+
+    before = WEBSOCKET_SENDS_IN_FLIGHT.value()
+    asyncio.run(timed_send(SlowSocket(), "{}"))
+
+    assert seen == [before + 1]
+    assert WEBSOCKET_SENDS_IN_FLIGHT.value() == before
+
+
+def test_timed_send_skips_instrumentation_when_metrics_are_disabled(monkeypatch):
+    sent = []
+
+    class Socket:
+        async def send_text(self, data):
+            sent.append(data)
+
+    monkeypatch.setattr(metrics_module, "METRICS_ENABLED", False)
+    before = WEBSOCKET_SEND_SECONDS.count()
+    asyncio.run(timed_send(Socket(), "{}"))
+
+    assert sent == ["{}"]
+    assert WEBSOCKET_SEND_SECONDS.count() == before
+
+
+def test_scrape_requires_the_configured_token(monkeypatch):
+    assert not metrics_authorized("Bearer anything")
+
+    monkeypatch.setattr(metrics_module, "METRICS_TOKEN", "s3cret")
+    assert metrics_authorized("Bearer s3cret")
+    assert not metrics_authorized("Bearer wrong")
+    assert not metrics_authorized(None)
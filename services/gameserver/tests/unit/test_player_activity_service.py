@@ -0,0 +1,150 @@
+"""Unit tests for the Redis-backed player activity tracker, against a scripted Redis fake"""
+
+import asyncio
+import json
+import re
+
+from src.services import player_activity_service as activity
+from src.services.player_activity_service import ActivityEventType, PlayerActivityService
+
+
+class FakePipeline:
+    def __init__(self, pool, transaction):
+        self.pool = pool
+        self.transaction = transaction
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return command
+
+    async def execute(self):
+        self.pool.pipelines.append(self)
+        return self.pool.pipeline_results.pop(0) if self.pool.pipeline_results else []
+
+
+class FakeScript:
+    def __init__(self, pool, source):
+        self.pool = pool
+        self.source = source
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.pool.script_results.pop(0) if self.pool.script_results else 0
+
+
+class FakeRedisPool:
+    def __init__(self):
+        self.pipelines = []
+        self.pipeline_results = []
+        self.scripts = []
+        self.script_results = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+    def register_script(self, source):
+        script = FakeScript(self, source)
+        self.scripts.append(script)
+        return script
+
+
+class FakeRedisService:
+    def __init__(self):
+        self.redis_pool = FakeRedisPool()
+
+
+def make_service():
+    redis = FakeRedisService()
+    return PlayerActivityService(redis=redis), redis.redis_pool
+
+
+def test_keys_do_not_reuse_v1_string_key_names():
+    templates = [
+        activity._SESSION_KEY, activity._EVENTS_KEY, activity._SUMMARY_KEY, activity._DAILY_KEY,
+        activity._GLOBAL_ONLINE_KEY, activity._SESSION_SECTORS_KEY, activity._SUMMARY_SECTORS_KEY,
+        activity._DAILY_PLAYERS_KEY,
+    ]
+    v1 = {"activity:session:{player_id}", "activity:summary:{player_id}", "activity:daily:{player_id}:{date}"}
+
+    assert all(t.startswith("activity:v2:") for t in templates)
+    assert not v1 & set(templates)
+
+
+def test_scripts_reference_only_the_keys_and_args_passed():
+    def highest(kind, source):
+        return max(int(n) for n in re.findall(kind + r"\[(\d+)\]", source))
+
+    assert highest("KEYS", activity._TRACK_ACTIVITY_LUA) == 4
+    assert highest("ARGV", activity._TRACK_ACTIVITY_LUA) == 11
+    assert highest("KEYS", activity._TRACK_LOGOUT_LUA) == 7
+    assert highest("ARGV", activity._TRACK_LOGOUT_LUA) == 8
+
+
+def test_login_starts_session_in_one_transaction():
+    service, pool = make_service()
+
+    asyncio.run(service.track_login("p1"))
+
+    assert len(pool.pipelines) == 1
+    pipe = pool.pipelines[0]
+    assert pipe.transaction is True
+    names = [name for name, _, _ in pipe.commands]
+    assert names == ["delete", "hset", "expire", "lpush", "ltrim", "expire", "sadd", "pfadd", "expire"]
+    assert pipe.commands[0][1] == ("activity:v2:session:p1", "activity:v2:session:p1:sectors")
+    mapping = pipe.commands[1][2]["mapping"]
+    assert mapping["actions_count"] == 0 and "login_ts" in mapping
+    assert pipe.commands[6][1] == ("activity:v2:online_players", "p1")
+
+
+def test_trade_and_move_pass_counters_to_the_activity_script():
+    service, pool = make_service()
+
+    asyncio.run(service.track_activity("p1", ActivityEventType.TRADE_BUY, {"total_value": 250, "sector_id": 4}))
+    asyncio.run(service.track_activity("p1", ActivityEventType.SECTOR_MOVE, {"sector_id": 9}))
+
+    assert len(pool.scripts) == 1
+    (keys, trade_args), (_, move_args) = pool.scripts[0].calls
+    assert keys[:3] == [
+        "activity:v2:session:p1", "activity:v2:session:p1:sectors", "activity:v2:events:p1",
+    ]
+    assert keys[3].startswith("activity:v2:daily_players:")
+    assert trade_args[3:7] == ["1", 250, "0", ""]
+    assert json.loads(trade_args[2])["event_type"] == "trade_buy"
+    assert move_args[3:7] == ["0", 0, "0", "9"]
+
+
+def test_logout_parses_the_folded_session():
+    service, pool = make_service()
+    pool.script_results.append([
+        ["player_id", "p1", "login_ts", "100.0", "actions_count", "7", "trade_volume", "12.5"],
+        "42.5",
+        3,
+    ])
+
+    session = asyncio.run(service.track_logout("p1"))
+
+    keys, args = pool.scripts[0].calls[0]
+    assert keys[2] == "activity:v2:summary:p1"
+    assert keys[6] == "activity:v2:online_players"
+    assert args[0] == "p1"
+    assert session["actions_count"] == 7
+    assert session["trades_count"] == 0
+    assert session["trade_volume"] == 12.5
+    assert session["duration_seconds"] == 42.5
+    assert session["unique_sectors_visited"] == 3
+    assert "login_ts" not in session
+
+
+def test_logout_without_a_session_still_returns_a_summary():
+    service, pool = make_service()
+    pool.script_results.append([[], "0", 0])
+
+    session = asyncio.run(service.track_logout("p1"))
+
+    assert session["duration_seconds"] == 0.0
+    assert session["actions_count"] == 0
+    assert "logout_at" in session
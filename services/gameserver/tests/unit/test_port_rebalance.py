@@ -0,0 +1,102 @@
+"""Unit tests for the port stock rebalancer: seeded previews and commodity diffs"""
+
+import copy
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from src.models.port_rebalance_job import PortRebalanceJob, RebalanceJobStatus
+from src.models.station import Station, StationClass, StationType
+from src.services.port_rebalance_service import (
+    claim_job,
+    diff_commodities,
+    is_job_active,
+    job_status,
+    rebalance_station,
+    station_rng,
+)
+
+
+COMMODITIES = {
+    "ore": {"quantity": 1000, "capacity": 5000, "base_price": 15, "current_price": 15,
+            "production_rate": 100, "buys": False, "sells": False},
+    "fuel": {"quantity": 1500, "capacity": 4000, "base_price": 12, "current_price": 12,
+             "production_rate": 120, "buys": True, "sells": False},
+}
+
+
+def make_station(station_class=StationClass.CLASS_9):
+    return Station(
+        id=uuid.uuid4(), name="Test Port", sector_id=7, station_class=station_class,
+        type=StationType.TRADING, commodities=copy.deepcopy(COMMODITIES),
+    )
+
+
+def make_station_like(station):
+    clone = make_station(station.station_class)
+    clone.id = station.id
+    return clone
+
+
+def test_same_seed_reproduces_the_preview():
+    station = make_station()
+    preview = rebalance_station(make_station_like(station), station_rng(42, station.id))
+    applied = rebalance_station(station, station_rng(42, station.id))
+
+    assert preview == applied
+    assert applied["ore"]["sells"] == {"old": False, "new": True}
+    assert applied["fuel"]["buys"] == {"old": True, "new": False}
+
+
+def test_rebalance_assigns_a_new_commodities_dict():
+    station = make_station()
+    original = station.commodities
+
+    rebalance_station(station, station_rng(1, station.id))
+
+    assert station.commodities is not original  # reassigned, so the JSONB change is flushed
+    assert original == COMMODITIES
+
+
+def test_diff_reports_only_changed_fields():
+    after = copy.deepcopy(COMMODITIES)
+    after["ore"]["quantity"] = 4500
+    assert diff_commodities(COMMODITIES, after) == {"ore": {"quantity": {"old": 1000, "new": 4500}}}
+    assert diff_commodities(COMMODITIES, copy.deepcopy(COMMODITIES)) == {}
+
+
+def make_running_job(lease_expires_at):
+    return PortRebalanceJob(
+        id=uuid.uuid4(), status=RebalanceJobStatus.RUNNING.value, dry_run=True, batch_size=100, seed=1,
+        total_stations=400, processed_stations=100, changed_stations=80, sample_changes=[],
+        lease_expires_at=lease_expires_at,
+    )
+
+
+def test_interrupted_running_job_is_resumable():
+    lapsed = datetime.now(timezone.utc) - timedelta(seconds=1)
+    status = job_status(make_running_job(lapsed))
+    assert status["progress"] == 0.25
+    assert status["resumable"]
+    assert job_status(make_running_job(None))["resumable"]
+
+
+def test_leased_running_job_is_not_resumable():
+    leased = datetime.now(timezone.utc) + timedelta(seconds=60)
+    job = make_running_job(leased)
+    assert is_job_active(job)
+    assert not job_status(job)["resumable"]
+
+
+def test_claim_only_moves_pending_jobs():
+    job_id = uuid.uuid4()
+    db = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = None
+
+    assert not claim_job(db, job_id)
+    db.commit.assert_called_once()
+    db.execute.return_value.scalar_one_or_none.return_value = job_id
+    assert claim_job(db, job_id)
+    statement = str(db.execute.call_args.args[0])
+    assert "WHERE port_rebalance_jobs.id = :id_1 AND port_rebalance_jobs.status = :status_1" in statement
+    assert "RETURNING port_rebalance_jobs.id" in statement
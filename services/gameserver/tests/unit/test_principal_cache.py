@@ -0,0 +1,193 @@
+"""Unit tests for cached principal resolution in request authentication"""
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.auth import principal_cache as cache_module
+from src.auth.principal_cache import (
+    PrincipalCache,
+    decode_snapshot,
+    encode_snapshot,
+    principal_cache,
+    resolve_user,
+    snapshot_user,
+)
+from src.models.admin_credentials import AdminCredentials
+from src.models.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingSession(Session):
+    """Unbound session whose user lookups come from a dict and are counted"""
+
+    def __init__(self, users):
+        super().__init__()
+        self.users = users
+        self.lookups = 0
+
+    def query(self, *entities):
+        self.lookups += 1
+        found = list(self.users.values())[:1]
+        return SimpleNamespace(filter=lambda *a: SimpleNamespace(first=lambda: found[0] if found else None))
+
+
+class FakeAsyncRedis:
+    """Dict-backed async client; the conditional SET script is emulated in Python"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def eval(self, script, numkeys, snapshot_key, generation_key, generation, value, ttl):
+        if self.data.get(generation_key, "0") == generation:
+            self.data[snapshot_key] = value
+            return 1
+        return 0
+
+    def pipeline(self, transaction=True):
+        client, ops = self, []
+
+        class Pipeline:
+            def incr(self, key):
+                ops.append(lambda: client.data.__setitem__(key, str(int(client.data.get(key, "0")) + 1)))
+
+            def expire(self, key, ttl):
+                pass
+
+            def delete(self, key):
+                ops.append(lambda: client.data.pop(key, None))
+
+            async def execute(self):
+                for op in ops:
+                    op()
+
+        return Pipeline()
+
+
+def make_user(**fields):
+    defaults = dict(id=uuid.uuid4(), username="pilot", is_active=True, is_admin=False, deleted=False)
+    return User(**{**defaults, **fields})
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(cache_module, "_redis_client", lambda kind: None)
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_second_resolution_attaches_without_querying():
+    user = make_user()
+    db = CountingSession({user.id: user})
+
+    await resolve_user(db, str(user.id))
+    db.expunge_all()
+    cached = await resolve_user(db, str(user.id))
+
+    assert db.lookups == 1
+    assert cached in db and cached is not user
+    assert (cached.id, cached.username, cached.is_admin) == (user.id, "pilot", False)
+    assert not db.is_modified(cached)
+
+
+@pytest.mark.asyncio
+async def test_inactive_users_are_not_cached():
+    user = make_user(is_active=False)
+    db = CountingSession({user.id: user})
+
+    assert await resolve_user(db, str(user.id)) is None
+    assert len(principal_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_committed_role_change_and_password_reset_invalidate():
+    user = make_user()
+    db = CountingSession({user.id: user})
+    cached = await resolve_user(db, str(user.id))
+    db.expunge_all()
+    cached = await resolve_user(db, str(user.id))
+
+    cached.is_admin = True
+    cache_module._collect_principal_changes(db, None, None)
+    assert principal_cache.get(str(user.id)) is not None
+    cache_module._invalidate_committed_principals(db)
+    assert principal_cache.get(str(user.id)) is None
+
+    await resolve_user(db, str(user.id))
+    db.add(AdminCredentials(user_id=user.id, password_hash="x"))
+    cache_module._collect_principal_changes(db, None, None)
+    cache_module._discard_principal_changes(db)
+    cache_module._invalidate_committed_principals(db)
+    assert principal_cache.get(str(user.id)) is not None
+
+    cache_module._collect_principal_changes(db, None, None)
+    cache_module._invalidate_committed_principals(db)
+    assert principal_cache.get(str(user.id)) is None
+
+
+def test_lru_ttl_and_snapshot_round_trip():
+    clock = FakeClock()
+    cache = PrincipalCache(max_users=2, ttl_seconds=10, clock=clock)
+    cache.put("a", {}), cache.put("b", {}), cache.put("c", {})
+    assert cache.get("a") is None and len(cache) == 2
+    clock.now = 11
+    assert cache.get("b") is None
+
+    snapshot = snapshot_user(make_user())
+    assert decode_snapshot(encode_snapshot(snapshot)) == snapshot
+
+
+@pytest.mark.asyncio
+async def test_redis_snapshot_is_shared_and_not_republished_after_invalidation(monkeypatch):
+    redis = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "_redis_client", lambda kind: redis if kind == "async" else None)
+    user = make_user()
+    user_id = str(user.id)
+
+    await resolve_user(CountingSession({user.id: user}), user_id)
+    assert f"auth:principal:{user_id}" in redis.data
+
+    # A request read the generation and the DB row, then the user changed before it wrote back
+    _, generation = await cache_module._redis_get(user_id)
+    await cache_module._redis_invalidate(user_id)
+    await cache_module._redis_set(user_id, snapshot_user(user), generation)
+    assert f"auth:principal:{user_id}" not in redis.data
+
+    principal_cache.clear()
+    db = CountingSession({user.id: user})
+    await resolve_user(db, user_id)
+    assert db.lookups == 1 and f"auth:principal:{user_id}" in redis.data
+
+
+@pytest.mark.asyncio
+async def test_invalidation_inside_the_event_loop_does_not_use_the_sync_client(monkeypatch):
+    redis = FakeAsyncRedis()
+    clients = []
+
+    def client(kind):
+        clients.append(kind)
+        return redis if kind == "async" else None
+
+    monkeypatch.setattr(cache_module, "_redis_client", client)
+    redis.data["auth:principal:u1"] = "{}"
+
+    cache_module.invalidate_principal("u1")
+    await asyncio.gather(*cache_module._invalidation_tasks)
+
+    assert clients == ["async"]
+    assert redis.data == {"auth:principal_gen:u1": "1"}
@@ -0,0 +1,146 @@
+"""Unit tests for Redis sector presence, against a scripted Redis fake"""
+
+import asyncio
+import re
+
+from src.services import redis_service as presence
+from src.services.redis_service import PRESENCE_TTL_SECONDS, RedisService
+from src.services.websocket_service import ConnectionManager
+
+
+class FakePipeline:
+    def __init__(self, pool, transaction):
+        self.pool = pool
+        self.transaction = transaction
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return command
+
+    async def execute(self):
+        self.pool.pipelines.append(self)
+        return self.pool.pipeline_results.pop(0) if self.pool.pipeline_results else []
+
+
+class FakeScript:
+    def __init__(self, source):
+        self.source = source
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+
+
+class FakeRedisPool:
+    def __init__(self):
+        self.pipelines = []
+        self.pipeline_results = []
+        self.setex_calls = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+    async def setex(self, *args):
+        self.setex_calls.append(args)
+
+
+class FakeWebSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        pass
+
+
+def make_service():
+    service = RedisService()
+    service.redis_pool = FakeRedisPool()
+    service._presence_heartbeat = FakeScript(presence._PRESENCE_HEARTBEAT_LUA)
+    service._presence_offline = FakeScript(presence._PRESENCE_OFFLINE_LUA)
+    return service
+
+
+def test_scripts_reference_only_the_keys_and_args_passed():
+    def highest(kind, source):
+        return max(int(n) for n in re.findall(kind + r"\[(\d+)\]", source))
+
+    assert highest("KEYS", presence._PRESENCE_HEARTBEAT_LUA) == 3
+    assert highest("ARGV", presence._PRESENCE_HEARTBEAT_LUA) == 4
+    assert highest("KEYS", presence._PRESENCE_OFFLINE_LUA) == 2
+    assert highest("ARGV", presence._PRESENCE_OFFLINE_LUA) == 1
+
+
+def test_scripts_leave_the_previous_sector_set():
+    for source in (presence._PRESENCE_HEARTBEAT_LUA, presence._PRESENCE_OFFLINE_LUA):
+        assert "redis.call('ZREM', 'sector_presence:' .. previous, ARGV[1])" in source
+
+
+def test_heartbeat_scores_by_epoch_seconds(monkeypatch):
+    monkeypatch.setattr(presence.time, "time", lambda: 1_000_000.0)
+    service = make_service()
+
+    asyncio.run(service.update_player_presence("p1", "42"))
+
+    keys, args = service._presence_heartbeat.calls[0]
+    assert keys == ["player_online:p1", "player_sector:p1", "sector_presence:42"]
+    assert args == ["p1", 1_000_000.0, PRESENCE_TTL_SECONDS, "42"]
+
+
+def test_online_status_routes_to_the_right_script():
+    service = make_service()
+
+    asyncio.run(service.sync_player_online_status("p1", True, "7"))
+    asyncio.run(service.sync_player_online_status("p1", True))
+    asyncio.run(service.sync_player_online_status("p1", False))
+
+    assert service._presence_heartbeat.calls[0][0][2] == "sector_presence:7"
+    assert service.redis_pool.setex_calls == [("player_online:p1", PRESENCE_TTL_SECONDS, "online")]
+    assert service._presence_offline.calls == [(["player_online:p1", "player_sector:p1"], ["p1"])]
+
+
+def test_sector_read_prunes_stale_members_by_score(monkeypatch):
+    monkeypatch.setattr(presence.time, "time", lambda: 1_000_000.0)
+    service = make_service()
+    service.redis_pool.pipeline_results.append([2, ["p1", "p2"]])
+
+    players = asyncio.run(service.get_online_players_in_sector("42"))
+
+    pipe = service.redis_pool.pipelines[0]
+    assert pipe.transaction is True
+    cutoff = 1_000_000.0 - PRESENCE_TTL_SECONDS
+    assert pipe.commands == [
+        ("zremrangebyscore", ("sector_presence:42", "-inf", f"({cutoff}"), {}),
+        ("zrange", ("sector_presence:42", 0, -1), {}),
+    ]
+    assert players == ["p1", "p2"]
+
+
+def test_presence_is_a_no_op_until_connected():
+    service = RedisService()
+
+    asyncio.run(service.update_player_presence("p1", "42"))
+    asyncio.run(service.sync_player_online_status("p1", False))
+
+    assert not service.is_connected
+
+
+def test_connection_lifecycle_keeps_presence_in_step(monkeypatch):
+    service = make_service()
+    monkeypatch.setattr(presence, "redis_service", service)
+    manager = ConnectionManager()
+    user_data = {"player_id": "p1", "username": "pilot", "current_sector": 3}
+
+    async def lifecycle():
+        await manager.connect(FakeWebSocket(), "u1", user_data)
+        await manager.update_user_location("u1", 8)
+        await manager.handle_heartbeat("u1")
+        await manager.disconnect("u1")
+
+    asyncio.run(lifecycle())
+
+    sectors = [keys[2] for keys, _ in service._presence_heartbeat.calls]
+    assert sectors == ["sector_presence:3", "sector_presence:8", "sector_presence:8"]
+    assert service._presence_offline.calls == [(["player_online:p1", "player_sector:p1"], ["p1"])]
@@ -0,0 +1,137 @@
+"""Unit tests for regional permission resolution: bitmasks, negative caching and invalidation"""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.player import Player
+from src.models.region import MembershipType, Region, RegionalMembership
+from src.services import regional_auth_service
+from src.services.regional_auth_service import (
+    NO_PERMISSIONS,
+    PermissionCache,
+    RegionalAuthService,
+    RegionalPermission,
+    regional_auth,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    """Answers the effective-permission query with fixed rows and counts calls"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return SimpleNamespace(all=lambda: list(self.rows))
+
+
+def membership_rows(user, player_id, *memberships, galactic=False):
+    return [
+        (player_id, galactic, user, region_id, local_rank, membership_type, owner_id)
+        for region_id, local_rank, membership_type, owner_id in memberships
+    ]
+
+
+@pytest.fixture
+def ids():
+    return SimpleNamespace(
+        user=uuid.uuid4(), player=uuid.uuid4(), home=uuid.uuid4(), owned=uuid.uuid4(), other=uuid.uuid4()
+    )
+
+
+@pytest.mark.asyncio
+async def test_one_query_answers_every_region_and_denials(ids):
+    user = SimpleNamespace(id=ids.user)
+    session = FakeSession(membership_rows(
+        user, ids.player,
+        (ids.home, None, MembershipType.CITIZEN, None),
+        (ids.owned, None, MembershipType.VISITOR, ids.user),
+    ))
+    service = RegionalAuthService()
+    check = service.check_regional_permission
+    user_id = str(ids.user)
+
+    assert await check(user_id, str(ids.home), RegionalPermission.REGION_VOTE, session)
+    assert not await check(user_id, str(ids.home), RegionalPermission.REGION_MANAGE_ECONOMY, session)
+    assert await check(user_id, str(ids.owned), RegionalPermission.REGION_MANAGE_GOVERNANCE, session)
+    assert not await check(user_id, str(ids.other), RegionalPermission.REGION_TRADE, session)
+    assert not await check(user_id, str(ids.home), RegionalPermission.NEXUS_ACCESS, session)
+    assert session.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_galactic_citizens_and_platform_admins(ids):
+    citizen = FakeSession(membership_rows(
+        SimpleNamespace(id=ids.user), ids.player, (None, None, None, None), galactic=True
+    ))
+    admin = FakeSession(membership_rows(
+        SimpleNamespace(id=ids.user, is_platform_admin=True), ids.player, (None, None, None, None)
+    ))
+    region = str(ids.other)
+
+    service = RegionalAuthService()
+    assert await service.check_regional_permission("citizen", region, RegionalPermission.NEXUS_ACCESS, citizen)
+    assert not await service.check_regional_permission("citizen", region, RegionalPermission.REGION_VOTE, citizen)
+    assert await service.check_regional_permission("admin", region, RegionalPermission.REGION_OWNER_FULL, admin)
+
+
+@pytest.mark.asyncio
+async def test_unknown_users_are_cached_until_invalidated(ids):
+    session = FakeSession([])
+    service = RegionalAuthService()
+
+    for _ in range(3):
+        assert not await service.check_regional_permission("ghost", str(ids.home), RegionalPermission.REGION_VOTE, session)
+    assert session.queries == 1
+
+    service.invalidate_user_permissions("ghost")
+    await service.check_regional_permission("ghost", str(ids.home), RegionalPermission.REGION_VOTE, session)
+    assert session.queries == 2
+
+
+def test_permission_cache_is_bounded_and_expires():
+    clock = FakeClock()
+    cache = PermissionCache(max_users=2, ttl_seconds=10, clock=clock)
+    for user_id in ("a", "b"):
+        cache.put(user_id, object())
+    cache.get("a")
+    cache.put("c", object())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_membership_citizenship_and_ownership_changes_invalidate_on_commit():
+    member, owner = uuid.uuid4(), uuid.uuid4()
+    session = Session()
+    player = Player(id=uuid.uuid4(), user_id=member)
+    session.add(RegionalMembership(player=player, region_id=uuid.uuid4(), membership_type="citizen"))
+    session.add(Region(id=uuid.uuid4(), name="paid", owner_id=owner))
+    for user_id in (member, owner):
+        regional_auth.permission_cache.put(str(user_id), NO_PERMISSIONS)
+
+    regional_auth_service._collect_permission_changes(session, None, None)
+    assert session.info[regional_auth_service._PENDING_KEY] == {str(member), str(owner)}
+    assert regional_auth.permission_cache.get(str(member)) is NO_PERMISSIONS  # Not before commit
+
+    regional_auth_service._invalidate_committed_permissions(session)
+    assert regional_auth.permission_cache.get(str(member)) is None
+    assert regional_auth.permission_cache.get(str(owner)) is None
+    assert regional_auth_service._PENDING_KEY not in session.info
@@ -0,0 +1,137 @@
+"""Unit tests for the set-based reputation decay engine"""
+
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.faction_service import FactionService
+from src.services.reputation_decay_service import (
+    FACTION_EFFECTS,
+    ReputationDecayService,
+    _faction_decayed_value,
+)
+
+Row = namedtuple("Row", "id player_id faction_id current_value last_updated")
+
+
+def test_decay_respects_grace_period_and_cap():
+    """One point per idle day past 30, capped at 50 per run"""
+    assert _faction_decayed_value(500, 31) == 499
+    assert _faction_decayed_value(500, 45) == 485
+    assert _faction_decayed_value(500, 400) == 450
+    assert _faction_decayed_value(-500, 45) == -485
+
+
+def test_decay_never_crosses_neutral_band():
+    """Values stop at +/-100 instead of decaying into the neutral band"""
+    assert _faction_decayed_value(120, 100) == 100
+    assert _faction_decayed_value(-120, 100) == -100
+
+
+def test_effects_table_matches_service_calculations():
+    """The precomputed lookup agrees with FactionService's per-row helpers"""
+    for value in (-800, -450, -101, 100, 250, 699, 700, 800):
+        level = FactionService._calculate_reputation_level(value)
+        assert FACTION_EFFECTS[value] == (
+            level.name,
+            FactionService._get_reputation_title(level),
+            FactionService._calculate_trade_modifier(value),
+            FactionService._calculate_port_access_level(value),
+            FactionService._calculate_combat_response(value),
+        )
+
+
+def test_chunk_is_written_with_one_update_and_one_history_insert():
+    """A chunk issues a single UPDATE plus a single history INSERT"""
+    now = datetime(2026, 6, 1)
+    rows = [
+        Row(uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), 500, now - timedelta(days=45)),
+        Row(uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), -300, now - timedelta(days=90)),
+    ]
+    db = MagicMock()
+    db.execute.side_effect = [iter([(rows[0].id,), (rows[1].id,)]), None]
+
+    results = ReputationDecayService(db)._decay_faction_rows(rows, now)
+
+    assert db.execute.call_count == 2
+    history = db.execute.call_args_list[1].args[1]
+    assert [h["change"] for h in history] == [-15, 50]
+    assert [r["new_value"] for r in results] == [485, -250]
+
+
+def test_rows_changed_concurrently_are_not_recorded():
+    """Rows the UPDATE did not match (value changed since read) get no history"""
+    now = datetime(2026, 6, 1)
+    rows = [Row(uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), 500, now - timedelta(days=45))]
+    db = MagicMock()
+    db.execute.side_effect = [iter([])]
+
+    assert ReputationDecayService(db)._decay_faction_rows(rows, now) == []
+    assert db.execute.call_count == 1
+
+
+def test_weekly_run_is_skipped_within_seven_days():
+    """A second run inside the interval rolls back without decaying anything"""
+    now = datetime(2026, 6, 8)
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = now - timedelta(days=6)
+    service = ReputationDecayService(db)
+    service.run_all = MagicMock()
+
+    result = service.run_weekly(now=now)
+
+    assert result["skipped"] is True
+    assert result["next_run_at"] == datetime(2026, 6, 9).isoformat()
+    service.run_all.assert_not_called()
+    db.rollback.assert_called_once()
+    db.add.assert_not_called()
+
+
+def test_weekly_run_records_itself_before_decaying():
+    """An overdue run is recorded and committed, then both passes run and the claim is finished"""
+    now = datetime(2026, 6, 8)
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = now - timedelta(days=7)
+    service = ReputationDecayService(db)
+    service.run_all = MagicMock(return_value={"faction": {}, "personal": {}})
+
+    result = service.run_weekly(now=now)
+
+    assert result == {"skipped": False, "faction": {}, "personal": {}}
+    claim = db.add.call_args.args[0]
+    assert claim.started_at == now
+    assert claim.finished_at is not None
+    assert db.commit.call_count == 2
+    service.run_all.assert_called_once()
+
+
+def test_failed_weekly_run_releases_its_claim():
+    """A run that raises deletes its claim so it can be retried inside the week"""
+    now = datetime(2026, 6, 8)
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = None
+    service = ReputationDecayService(db)
+    service.run_all = MagicMock(side_effect=RuntimeError("connection lost"))
+
+    with pytest.raises(RuntimeError):
+        service.run_weekly(now=now)
+
+    claim = db.add.call_args.args[0]
+    db.delete.assert_called_once_with(claim)
+    assert claim.finished_at is None
+    assert db.commit.call_count == 2
+
+
+def test_weekly_claim_ignores_abandoned_runs():
+    """Only finished runs, or unfinished ones inside the run timeout, block a new claim"""
+    now = datetime(2026, 6, 8)
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = None
+    ReputationDecayService(db)._claim_weekly_run(now)
+
+    query = str(db.execute.call_args_list[1].args[0])
+    assert "reputation_decay_runs.finished_at IS NOT NULL" in query
+    assert "reputation_decay_runs.started_at >" in query
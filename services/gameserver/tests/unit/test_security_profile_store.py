@@ -0,0 +1,207 @@
+"""Unit tests for the Redis-backed AI security profile store, against a scripted Redis fake"""
+
+import threading
+from datetime import datetime
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.services import security_profile_store as store_module
+from src.services.security_profile_store import RedisSecurityProfileStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return command
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Dict-backed Redis; registered scripts are emulated by their Python equivalent"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.commands = []
+        self.down = False
+
+    def _check(self, name):
+        if self.down:
+            raise RedisConnectionError("connection refused")
+        self.commands.append(name)
+
+    def register_script(self, source):
+        if source == store_module._CONSUME_REQUEST_LUA:
+            return self._consume_request
+        return self._record_violation
+
+    def _consume_request(self, keys, args):
+        self._check("evalsha")
+        limits, ttls = args[:len(keys)], args[len(keys):]
+        if any(int(self.data.get(key, 0)) >= limit for key, limit in zip(keys, limits)):
+            return 0
+        for key, ttl in zip(keys, ttls):
+            self.data[key] = int(self.data.get(key, 0)) + 1
+            self.ttls.setdefault(key, ttl)
+        return 1
+
+    def _record_violation(self, keys, args):
+        self._check("evalsha")
+        profile = self.data.setdefault(keys[0], {})
+        profile["violation_count"] = str(int(profile.get("violation_count", 0)) + 1)
+        profile["trust_score"] = str(max(0.0, float(profile.get("trust_score", 1)) - args[0]))
+        profile["last_violation"] = args[1]
+        return 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hgetall(self, key):
+        self._check("hgetall")
+        return dict(self.data.get(key, {}))
+
+    def hset(self, key, mapping):
+        self._check("hset")
+        self.data.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def mget(self, keys):
+        self._check("mget")
+        return [self.data.get(key) for key in keys]
+
+    def exists(self, key):
+        self._check("exists")
+        return int(key in self.data)
+
+    def expire(self, key, ttl):
+        self._check("expire")
+        self.ttls[key] = ttl
+
+    def zincrby(self, key, amount, member):
+        self._check("zincrby")
+        scores = self.data.setdefault(key, {})
+        scores[member] = scores.get(member, 0.0) + amount
+        return scores[member]
+
+    def zscore(self, key, member):
+        self._check("zscore")
+        return self.data.get(key, {}).get(member)
+
+    def zrange(self, key, start, end, withscores=False):
+        self._check("zrange")
+        return sorted(self.data.get(key, {}).items(), key=lambda item: item[1])
+
+
+def make_store():
+    client, clock = FakeRedis(), FakeClock()
+    return RedisSecurityProfileStore(client, front_cache_ttl=2.0, retry_after=5.0, clock=clock), client, clock
+
+
+def test_consume_request_enforces_every_window_atomically():
+    store, client, _ = make_store()
+    now = datetime(2026, 1, 1, 12, 0, 30)
+    limits = {"requests_per_minute": 2, "requests_per_hour": 3, "requests_per_day": 10}
+
+    assert store.consume_request("p", limits, now)
+    assert store.consume_request("p", limits, now)
+    assert not store.consume_request("p", limits, now)
+    assert store.request_counts("p", now) == (2, 2, 2)
+
+    next_minute = datetime(2026, 1, 1, 12, 1, 5)
+    assert store.consume_request("p", limits, next_minute)
+    assert not store.consume_request("p", limits, next_minute)
+    assert store.request_counts("p", next_minute) == (1, 3, 3)
+    assert sorted(client.ttls[key] for key in store._window_keys("p", now)) == [60, 3600, 86400]
+
+
+def test_costs_accumulate_in_one_sorted_set_per_day():
+    store, client, _ = make_store()
+
+    assert store.add_cost("a", 0.25, "2026-01-01") == 0.25
+    assert store.add_cost("a", 0.5, "2026-01-01") == 0.75
+    store.add_cost("b", 0.1, "2026-01-01")
+    store.add_cost("a", 9.0, "2026-01-02")
+
+    assert store.get_cost("a", "2026-01-01") == 0.75
+    assert store.get_cost("c", "2026-01-01") == 0.0
+    assert store.daily_costs("2026-01-01") == {"a": 0.75, "b": 0.1}
+    assert client.ttls["ai_sec:cost:2026-01-01"] == store_module.COST_TTL_SECONDS
+
+
+def test_front_cache_serves_hot_profiles_until_ttl():
+    store, client, clock = make_store()
+
+    store.get_profile("p")
+    store.get_profile("p")
+    assert client.commands.count("hgetall") == 1
+
+    clock.now += 2.5
+    store.get_profile("p")
+    assert client.commands.count("hgetall") == 2
+
+
+def test_writes_invalidate_the_front_cache():
+    store, client, _ = make_store()
+    now = datetime(2026, 1, 1)
+
+    assert store.get_profile("p").violation_count == 0
+    profile = store.record_violation("p", 0.25, now)
+
+    assert profile.violation_count == 1
+    assert profile.trust_score == 0.75
+    assert store.set_block("p", datetime(2026, 1, 2)).is_blocked
+
+
+def test_redis_errors_fall_back_to_the_in_process_store():
+    store, client, clock = make_store()
+    limits = {"requests_per_minute": 1, "requests_per_hour": 10, "requests_per_day": 10}
+    now = datetime(2026, 1, 1)
+    client.down = True
+
+    assert store.consume_request("p", limits, now)
+    assert not store.consume_request("p", limits, now)
+    assert store.add_cost("p", 0.5, "2026-01-01") == 0.5
+    assert store.get_profile("p").violation_count == 0
+
+    client.down = False
+    assert store.get_cost("p", "2026-01-01") == 0.5  # still inside the retry window
+    clock.now += 5.0
+    assert store.get_cost("p", "2026-01-01") == 0.0
+
+
+def test_front_cache_survives_concurrent_eviction():
+    client = FakeRedis()
+    store = RedisSecurityProfileStore(client, front_cache_size=2, front_cache_ttl=60.0)
+    errors = []
+
+    def hammer(offset):
+        try:
+            for i in range(2000):
+                store.get_profile(f"p{(i + offset) % 5}")
+        except Exception as e:  # pragma: no cover - the failure being guarded against
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store.profiles) <= 2
+    assert set(store._fetched_at) == set(store.profiles)
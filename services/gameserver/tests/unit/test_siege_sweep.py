@@ -0,0 +1,75 @@
+"""Unit tests for the sector-indexed siege sweep"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.services.planetary_service import SIEGE_TURNS_THRESHOLD, SiegeState
+from src.services.siege_sweep_service import (
+    OwnedPlanet,
+    build_sector_index,
+    evaluate_sieges,
+    notify_siege_changes,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def owned_planet(sector_id=1, state=SiegeState(), owner=None, team=None, owner_sector=99):
+    return OwnedPlanet(uuid.uuid4(), "Terra", sector_id, state, owner or uuid.uuid4(), team, owner_sector, uuid.uuid4())
+
+
+def test_only_enemies_escalate_and_allies_are_ignored():
+    owner, ally, enemy = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    team = uuid.uuid4()
+    contested = owned_planet(sector_id=1, owner=owner, team=team)
+    allied = owned_planet(sector_id=2, owner=owner, team=team)
+    own_ships = owned_planet(sector_id=3, owner=owner)
+    quiet = owned_planet(sector_id=4)
+    index = build_sector_index([(1, ally), (1, enemy), (2, ally), (3, owner)])
+
+    updates, changes = evaluate_sieges([contested, allied, own_ships, quiet], index, {ally: team}, NOW)
+
+    assert [(p.planet_id, s.siege_turns) for p, s in updates] == [(contested.planet_id, 1)]
+    assert changes == []
+
+
+def test_siege_starts_at_threshold_and_lifts_when_owner_returns():
+    enemy = uuid.uuid4()
+    escalating = owned_planet(state=SiegeState(siege_turns=SIEGE_TURNS_THRESHOLD - 1))
+    besieged = owned_planet(state=SiegeState(True, 5, NOW, enemy), owner_sector=1)
+    index = build_sector_index([(1, enemy), (1, uuid.uuid4())])
+
+    updates, changes = evaluate_sieges([escalating, besieged], index, {}, NOW)
+
+    assert len(updates) == 2
+    started, lifted = changes
+    assert started.state == SiegeState(True, SIEGE_TURNS_THRESHOLD, NOW, enemy)
+    assert started.enemy_ship_count == 2
+    assert lifted.state == SiegeState()
+    assert lifted.notification()["event"] == "siege_lifted"
+
+
+def test_unchanged_sieges_are_not_written():
+    enemy = uuid.uuid4()
+    besieged = owned_planet(state=SiegeState(True, 5, NOW, enemy))
+
+    updates, changes = evaluate_sieges([besieged], build_sector_index([(1, enemy)]), {}, NOW)
+
+    assert updates == [] and changes == []
+
+
+@pytest.mark.asyncio
+async def test_notifications_go_to_owners():
+    sent = []
+
+    class Manager:
+        async def send_planetary_update(self, data, owner_user_id=None, sector_id=None):
+            sent.append((owner_user_id, data["event"]))
+
+    planet = owned_planet(state=SiegeState(siege_turns=SIEGE_TURNS_THRESHOLD - 1))
+    _, changes = evaluate_sieges([planet], build_sector_index([(1, uuid.uuid4())]), {}, NOW)
+    await notify_siege_changes(changes, manager=Manager())
+
+    assert sent == [(str(planet.owner_user_id), "siege_started")]
@@ -0,0 +1,129 @@
+"""Unit tests for compiled translation bundles and their HTTP caching"""
+
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from src.services import translation_service
+from src.services.translation_service import TranslationService, invalidate_translation_bundles
+from src.api.routes.translation import _bundle_response
+
+
+class FakeRequest:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def service():
+    """Translation service backed by a mocked session returning fixed rows"""
+    invalidate_translation_bundles()
+    db = MagicMock()
+    language = MagicMock(code="en", id=1)
+    query = db.query.return_value
+    query.filter.return_value.first.return_value = language
+    query.join.return_value.filter.return_value.all.return_value = [
+        ("common", "buttons.save", "Save", "Save button", True),
+        ("common", "buttons.cancel", "Cancel", None, False),
+    ]
+    query.join.return_value.filter.return_value.filter.return_value.all.return_value = [
+        ("common", "buttons.save", "Save", "Save button", True),
+    ]
+    yield TranslationService(db)
+    invalidate_translation_bundles()
+
+
+@pytest.mark.asyncio
+async def test_bundle_is_compiled_once(service):
+    """Repeated requests are served from the compiled bundle without touching the DB"""
+    first = await service.get_translation_bundle("en")
+    calls = service.db.query.call_count
+
+    second = await service.get_translation_bundle("en")
+
+    assert second is first
+    assert service.db.query.call_count == calls
+    assert json.loads(first.body) == {"common": {"buttons": {"save": "Save", "cancel": "Cancel"}}}
+
+
+@pytest.mark.asyncio
+async def test_namespace_bundle_is_unwrapped(service):
+    """Namespace bundles contain only that namespace's key tree"""
+    bundle = await service.get_namespace_bundle("en", "common")
+    assert json.loads(bundle.body) == {"buttons": {"save": "Save"}}
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_language_bundles(service):
+    """Writes invalidate every bundle compiled for the language"""
+    await service.get_translation_bundle("en")
+    await service.get_namespace_bundle("en", "common")
+
+    invalidate_translation_bundles("en")
+
+    assert translation_service._bundle_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_returns_304(service):
+    """A matching ETag short-circuits to 304 with no body"""
+    bundle = await service.get_translation_bundle("en")
+
+    response = _bundle_response(FakeRequest({"if-none-match": bundle.etag}), bundle)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == bundle.etag
+    assert response.body == b""
+
+
+@pytest.mark.asyncio
+async def test_stale_etag_returns_full_body(service):
+    """A different ETag gets the full payload"""
+    bundle = await service.get_translation_bundle("en")
+
+    response = _bundle_response(FakeRequest({"if-none-match": '"stale"'}), bundle)
+
+    assert response.status_code == 200
+    assert response.body == bundle.body
+
+
+@pytest.mark.asyncio
+async def test_fallback_languages_share_one_bundle(service):
+    """Unknown codes resolve to the fallback's cache entry instead of adding their own"""
+    fallback = await service.get_translation_bundle("xx")
+    calls = service.db.query.call_count
+
+    assert fallback.language_code == "en"
+    assert await service.get_translation_bundle("xx") is fallback
+    assert await service.get_translation_bundle("en") is fallback
+    assert list(translation_service._bundle_cache) == [("en", "", False, False)]
+    assert service.db.query.call_count == calls
+
+
+@pytest.mark.asyncio
+async def test_bundle_cache_evicts_least_recently_used(service, monkeypatch):
+    """The cache is bounded; the oldest untouched bundle goes first"""
+    monkeypatch.setattr(translation_service, "_BUNDLE_CACHE_SIZE", 2)
+    await service.get_translation_bundle("en")
+    await service.get_translation_bundle("en", "common")
+    await service.get_translation_bundle("en")  # Touch, so "common" is now oldest
+
+    await service.get_translation_bundle("en", include_context=True)
+
+    assert list(translation_service._bundle_cache) == [("en", "", False, False), ("en", "", True, False)]
+
+
+@pytest.mark.asyncio
+async def test_gzip_representation_has_its_own_etag(service, monkeypatch):
+    """Identity and gzip responses never share a strong ETag"""
+    monkeypatch.setattr(translation_service, "_GZIP_MIN_SIZE", 0)
+    bundle = await service.get_translation_bundle("en")
+
+    gzipped = _bundle_response(FakeRequest({"accept-encoding": "gzip"}), bundle)
+    identity = _bundle_response(FakeRequest(), bundle)
+    revalidated = _bundle_response(FakeRequest({"accept-encoding": "gzip", "if-none-match": bundle.etag}), bundle)
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == bundle.etag[:-1] + '-gzip"'
+    assert identity.headers["etag"] == bundle.etag
+    assert revalidated.status_code == 200
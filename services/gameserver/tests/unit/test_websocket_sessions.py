@@ -0,0 +1,71 @@
+"""Unit tests for websocket handshakes releasing their database session before the receive loop"""
+
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import websocket as ws_routes
+
+
+class FakeSession:
+    def __init__(self, player):
+        self.player = player
+        self.open = False
+
+    def query(self, model):
+        return SimpleNamespace(filter=lambda *a: SimpleNamespace(first=lambda: self.player))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    user = SimpleNamespace(id=uuid.uuid4(), username="pilot", is_admin=True)
+    player = SimpleNamespace(
+        id=uuid.uuid4(), current_sector_id=None, team_id=None, credits=100, turns=10,
+        personal_reputation=0, reputation_tier="Neutral", name_color=None, military_rank="Recruit",
+    )
+    fake = FakeSession(player)
+
+    @contextmanager
+    def session_scope():
+        fake.open = True
+        try:
+            yield fake
+        finally:
+            fake.open = False
+
+    async def get_user(token, db):
+        assert db is fake and fake.open
+        return user if token == "good" else None
+
+    monkeypatch.setattr(ws_routes, "session_scope", session_scope)
+    monkeypatch.setattr(ws_routes, "get_current_user_from_token", get_user)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ws_routes.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path, ack", [("/ws/connect", "heartbeat_ack"), ("/ws/admin", "pong")])
+def test_session_is_closed_while_socket_is_open(client, session, path, ack):
+    with client.websocket_connect(f"{path}?token=good") as socket:
+        assert not session.open
+        socket.send_json({"type": "heartbeat"})
+        while (message := socket.receive_json())["type"] != ack:
+            assert message["type"] == "connection_established"
+        assert not session.open
+
+
+def test_unknown_player_is_rejected_and_session_released(client, session):
+    session.player = None
+    with pytest.raises(Exception):
+        with client.websocket_connect("/ws/connect?token=good") as socket:
+            socket.receive_json()
+    assert not session.open
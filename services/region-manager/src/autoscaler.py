@@ -0,0 +1,117 @@
+"""Smoothed auto-scaling decisions for regional containers"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RegionLoad:
+    """Smoothed load and scaling history for one region"""
+    cpu: Optional[float] = None
+    memory: Optional[float] = None
+    samples: int = 0
+    above: int = 0              # Consecutive smoothed samples over the scale-up thresholds
+    below: int = 0              # Consecutive smoothed samples under the scale-down thresholds
+    last_scaled_at: float = float("-inf")
+    cpu_cores: float = 0.0      # Allocation last applied (or the default)
+    memory_gb: int = 0
+
+
+@dataclass
+class ScalingDecision:
+    direction: str              # "up" or "down"
+    cpu_cores: float
+    memory_gb: int
+    cpu_percent: float
+    memory_percent: float
+
+
+def container_allocation(host_config: Dict[str, Any]) -> Optional[Tuple[float, int]]:
+    """(cpu_cores, memory_gb) limits from a container's Docker HostConfig, or None when unlimited"""
+    if host_config.get("NanoCpus"):
+        cpu_cores = host_config["NanoCpus"] / 1e9
+    elif host_config.get("CpuQuota", 0) > 0 and host_config.get("CpuPeriod"):
+        cpu_cores = host_config["CpuQuota"] / host_config["CpuPeriod"]
+    else:
+        return None
+    memory = host_config.get("Memory") or 0
+    if memory <= 0:
+        return None
+    return round(cpu_cores, 2), int(round(memory / 1024 ** 3))
+
+
+class RegionAutoscaler:
+    """
+    Decides when to resize a region from its CPU/memory samples.
+
+    Samples are smoothed with an EWMA; a resize needs the smoothed load to
+    stay past a threshold for several consecutive samples (hysteresis, with
+    scale-down thresholds well under scale-up ones) and is suppressed during
+    the cooldown after the previous resize, so single spikes and dips do not
+    make a region flap.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.settings = get_settings()
+        self.clock = clock
+        self.regions: Dict[str, RegionLoad] = {}
+
+    def _load(self, region_name: str) -> RegionLoad:
+        load = self.regions.get(region_name)
+        if load is None:
+            load = RegionLoad(cpu_cores=self.settings.DEFAULT_CPU_CORES, memory_gb=self.settings.DEFAULT_MEMORY_GB)
+            self.regions[region_name] = load
+        return load
+
+    def forget(self, region_name: str) -> None:
+        self.regions.pop(region_name, None)
+
+    def record_allocation(self, region_name: str, cpu_cores: float, memory_gb: int,
+                          start_cooldown: bool = True) -> None:
+        """
+        Note a region's allocation: after provisioning or a resize (automatic or
+        manual), which starts its cooldown, or as found on a running container.
+        """
+        load = self._load(region_name)
+        load.cpu_cores, load.memory_gb = cpu_cores, memory_gb
+        if start_cooldown:
+            load.last_scaled_at = self.clock()
+            load.above = load.below = 0
+
+    def observe(self, region_name: str, cpu_percent: float, memory_percent: float) -> Optional[ScalingDecision]:
+        """Fold in one sample; returns a decision when the region should be resized"""
+        s = self.settings
+        load = self._load(region_name)
+        alpha = s.AUTOSCALE_EWMA_ALPHA
+        load.cpu = cpu_percent if load.cpu is None else alpha * cpu_percent + (1 - alpha) * load.cpu
+        load.memory = memory_percent if load.memory is None else alpha * memory_percent + (1 - alpha) * load.memory
+        load.samples += 1
+
+        high = load.cpu > s.SCALE_UP_CPU_THRESHOLD or load.memory > s.SCALE_UP_MEMORY_THRESHOLD
+        low = load.cpu < s.SCALE_DOWN_CPU_THRESHOLD and load.memory < s.SCALE_DOWN_MEMORY_THRESHOLD
+        load.above = load.above + 1 if high else 0
+        load.below = load.below + 1 if low else 0
+
+        if load.samples < s.AUTOSCALE_MIN_SAMPLES:
+            return None
+        since_last = self.clock() - load.last_scaled_at
+
+        if load.above >= s.SCALE_UP_SUSTAINED_SAMPLES and since_last >= s.SCALE_UP_COOLDOWN_SECONDS:
+            cpu_cores = min(round(load.cpu_cores * 1.5, 2), s.MAX_CPU_CORES)
+            memory_gb = min(int(round(load.memory_gb * 1.3)), s.MAX_MEMORY_GB)
+            if (cpu_cores, memory_gb) != (load.cpu_cores, load.memory_gb):
+                return ScalingDecision("up", cpu_cores, memory_gb, load.cpu, load.memory)
+
+        if load.below >= s.SCALE_DOWN_SUSTAINED_SAMPLES and since_last >= s.SCALE_DOWN_COOLDOWN_SECONDS:
+            cpu_cores = max(round(load.cpu_cores / 1.5, 2), s.MIN_CPU_CORES)
+            memory_gb = max(int(load.memory_gb / 1.3), s.MIN_MEMORY_GB)
+            if (cpu_cores, memory_gb) != (load.cpu_cores, load.memory_gb):
+                return ScalingDecision("down", cpu_cores, memory_gb, load.cpu, load.memory)
+
+        return None
@@ -58,6 +58,18 @@ class Settings(BaseSettings):
     SCALE_UP_MEMORY_THRESHOLD: float = float(os.environ.get("SCALE_UP_MEMORY_THRESHOLD", "85.0"))
     SCALE_DOWN_CPU_THRESHOLD: float = float(os.environ.get("SCALE_DOWN_CPU_THRESHOLD", "20.0"))
     SCALE_DOWN_MEMORY_THRESHOLD: float = float(os.environ.get("SCALE_DOWN_MEMORY_THRESHOLD", "30.0"))
+    AUTOSCALE_EWMA_ALPHA: float = float(os.environ.get("AUTOSCALE_EWMA_ALPHA", "0.3"))
+    AUTOSCALE_MIN_SAMPLES: int = int(os.environ.get("AUTOSCALE_MIN_SAMPLES", "3"))
+    SCALE_UP_SUSTAINED_SAMPLES: int = int(os.environ.get("SCALE_UP_SUSTAINED_SAMPLES", "3"))
+    SCALE_DOWN_SUSTAINED_SAMPLES: int = int(os.environ.get("SCALE_DOWN_SUSTAINED_SAMPLES", "10"))
+    SCALE_UP_COOLDOWN_SECONDS: int = int(os.environ.get("SCALE_UP_COOLDOWN_SECONDS", "300"))
+    SCALE_DOWN_COOLDOWN_SECONDS: int = int(os.environ.get("SCALE_DOWN_COOLDOWN_SECONDS", "1800"))
+    MIN_CPU_CORES: float = float(os.environ.get("MIN_CPU_CORES", "1.0"))
+    MIN_MEMORY_GB: int = int(os.environ.get("MIN_MEMORY_GB", "2"))
+
+    # Container stats collection
+    MONITOR_CONCURRENCY: int = int(os.environ.get("MONITOR_CONCURRENCY", "16"))
+    STATS_MAX_AGE_SECONDS: float = float(os.environ.get("STATS_MAX_AGE_SECONDS", "15"))
     
     # Network configuration
     REGIONAL_NETWORK_SUBNET: str = os.environ.get("REGIONAL_NETWORK_SUBNET", "172.21.0.0/16")
@@ -14,6 +14,7 @@ from datetime import datetime
 
 from region_provisioner import RegionProvisioner
 from monitoring import RegionMonitor
+from autoscaler import RegionAutoscaler
 from config import get_settings
 from models import RegionRequest, RegionStatus, ScalingRequest
 
@@ -49,6 +50,7 @@ app.add_middleware(
 settings = get_settings()
 provisioner = RegionProvisioner()
 monitor = RegionMonitor()
+autoscaler = RegionAutoscaler()
 
 # Global state
 active_regions: Dict[str, RegionStatus] = {}
@@ -75,6 +77,10 @@ async def startup_event():
                 player_count=0,
                 resource_usage={}
             )
+            # Scaling decisions start from the region's real limits, not the defaults
+            allocation = await provisioner.get_region_allocation(region.name)
+            if allocation:
+                autoscaler.record_allocation(region.name, *allocation, start_cooldown=False)
         
         logger.info(f"Loaded {len(active_regions)} existing regions")
     except Exception as e:
@@ -268,6 +274,7 @@ async def provision_region_task(request: RegionRequest):
         
         # Start containers
         container_info = await provisioner.start_region_containers(request.name, config)
+        autoscaler.record_allocation(request.name, request.cpu_cores, request.memory_gb)
         
         # Update region status
         if request.name in active_regions:
@@ -302,7 +309,11 @@ async def terminate_region_task(region_name: str):
         
         # Remove from active regions
         if region_name in active_regions:
+            container_id = active_regions[region_name].container_id
+            if container_id:
+                monitor.unsubscribe(container_id)
             del active_regions[region_name]
+        autoscaler.forget(region_name)
         
         logger.info(f"Region {region_name} terminated successfully")
         
@@ -322,6 +333,7 @@ async def scale_region_task(region_name: str, request: ScalingRequest):
             memory_limit=request.memory_gb * 1024,  # Convert to MB
             disk_limit=request.disk_gb * 1024  # Convert to MB
         )
+        autoscaler.record_allocation(region_name, request.cpu_cores, request.memory_gb)
         
         logger.info(f"Region {region_name} scaled successfully")
         
@@ -329,62 +341,72 @@ async def scale_region_task(region_name: str, request: ScalingRequest):
         logger.error(f"Failed to scale region {region_name}: {e}")
 
 
+async def monitor_region(region_name: str, limit: asyncio.Semaphore):
+    """Refresh one region's resource usage and player count, then check auto-scaling"""
+    async with limit:
+        region = active_regions.get(region_name)
+        if region is None or region.status != "active":
+            return
+        try:
+            stats, player_count = await asyncio.gather(
+                monitor.get_container_stats(region.container_id),
+                monitor.get_region_player_count(region_name),
+            )
+            if stats:
+                region.resource_usage = stats
+                region.player_count = player_count
+
+                # Check for auto-scaling triggers
+                await check_auto_scaling(region_name, stats)
+
+        except Exception as e:
+            logger.warning(f"Failed to monitor region {region_name}: {e}")
+
+
 async def monitor_regions_loop():
-    """Background loop to monitor all regions"""
+    """
+    Background loop to monitor all regions.
+
+    Regions are visited concurrently (bounded by MONITOR_CONCURRENCY); container
+    stats come from streaming subscriptions or worker threads, so a sweep costs
+    about one region's latency and never blocks the API.
+    """
+    limit = asyncio.Semaphore(settings.MONITOR_CONCURRENCY)
     while True:
         try:
-            await asyncio.sleep(30)  # Monitor every 30 seconds
-            
-            for region_name in list(active_regions.keys()):
-                try:
-                    # Get container stats
-                    stats = await monitor.get_container_stats(
-                        active_regions[region_name].container_id
-                    )
-                    
-                    if stats:
-                        active_regions[region_name].resource_usage = stats
-                        
-                        # Get player count from region API
-                        player_count = await monitor.get_region_player_count(region_name)
-                        active_regions[region_name].player_count = player_count
-                        
-                        # Check for auto-scaling triggers
-                        await check_auto_scaling(region_name, stats)
-                
-                except Exception as e:
-                    logger.warning(f"Failed to monitor region {region_name}: {e}")
-        
+            await asyncio.sleep(settings.MONITORING_INTERVAL_SECONDS)
+
+            monitor.prune_subscriptions(
+                r.container_id for r in active_regions.values() if r.container_id
+            )
+            await asyncio.gather(*(monitor_region(name, limit) for name in list(active_regions)))
+
         except Exception as e:
             logger.error(f"Error in monitoring loop: {e}")
 
 
 async def check_auto_scaling(region_name: str, stats: Dict[str, any]):
-    """Check if a region needs auto-scaling"""
+    """Feed a sample to the autoscaler and resize the region when it decides to"""
     try:
-        cpu_usage = stats.get("cpu_percent", 0)
-        memory_usage = stats.get("memory_percent", 0)
-        
-        # Auto-scale up if CPU > 80% or Memory > 85%
-        if cpu_usage > 80 or memory_usage > 85:
-            logger.info(f"Auto-scaling up region {region_name} - CPU: {cpu_usage}%, Memory: {memory_usage}%")
-            
-            current_region = active_regions[region_name]
-            current_cpu = current_region.resource_usage.get("cpu_cores", 2)
-            current_memory = current_region.resource_usage.get("memory_gb", 4)
-            
-            scale_request = ScalingRequest(
-                cpu_cores=min(current_cpu * 1.5, 8),  # Max 8 cores
-                memory_gb=min(current_memory * 1.3, 16),  # Max 16GB
-                disk_gb=current_region.resource_usage.get("disk_gb", 20)
-            )
-            
-            await scale_region_task(region_name, scale_request)
-        
-        # Auto-scale down if CPU < 20% and Memory < 30% for sustained period
-        elif cpu_usage < 20 and memory_usage < 30:
-            # Implementation for scale-down logic
-            pass
+        decision = autoscaler.observe(
+            region_name, stats.get("cpu_percent", 0), stats.get("memory_percent", 0)
+        )
+        if decision is None or not settings.AUTO_SCALING_ENABLED:
+            return
+
+        logger.info(
+            f"Auto-scaling {decision.direction} region {region_name} - smoothed CPU: "
+            f"{decision.cpu_percent:.1f}%, Memory: {decision.memory_percent:.1f}% -> "
+            f"{decision.cpu_cores} cores, {decision.memory_gb}GB"
+        )
+        current_region = active_regions[region_name]
+        scale_request = ScalingRequest(
+            cpu_cores=decision.cpu_cores,
+            memory_gb=decision.memory_gb,
+            disk_gb=current_region.resource_usage.get("disk_gb", settings.DEFAULT_DISK_GB)
+        )
+
+        await scale_region_task(region_name, scale_request)
     
     except Exception as e:
         logger.error(f"Error in auto-scaling check for {region_name}: {e}")
@@ -3,6 +3,8 @@
 import asyncio
 import docker
 import logging
+import threading
+import time
 from typing import Dict, Optional, Any
 import httpx
 import psutil
@@ -13,6 +15,102 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 
 
+def parse_container_stats(stats: Dict[str, Any], created: str) -> Dict[str, Any]:
+    """Resource usage summary from a Docker stats sample"""
+    # Calculate CPU usage
+    cpu_stats = stats.get('cpu_stats', {})
+    precpu_stats = stats.get('precpu_stats', {})
+    cpu_usage = cpu_stats.get('cpu_usage', {})
+    cpu_count = cpu_stats.get('online_cpus') or len(cpu_usage.get('percpu_usage') or []) or 1
+
+    cpu_delta = cpu_usage.get('total_usage', 0) - precpu_stats.get('cpu_usage', {}).get('total_usage', 0)
+    system_delta = cpu_stats.get('system_cpu_usage', 0) - precpu_stats.get('system_cpu_usage', 0)
+    cpu_percent = 0.0
+
+    if system_delta > 0 and cpu_delta > 0:
+        cpu_percent = (cpu_delta / system_delta) * cpu_count * 100.0
+
+    # Calculate memory usage
+    memory_stats = stats.get('memory_stats', {})
+    memory_usage = memory_stats.get('usage', 0)
+    memory_limit = memory_stats.get('limit', 1) or 1
+    memory_percent = (memory_usage / memory_limit) * 100.0
+    memory_mb = memory_usage / (1024 * 1024)
+
+    # Calculate network I/O
+    network_io = 0.0
+    for interface, data in (stats.get('networks') or {}).items():
+        network_io += data.get('rx_bytes', 0) + data.get('tx_bytes', 0)
+    network_io_mb = network_io / (1024 * 1024)
+
+    # Calculate disk I/O
+    disk_io = 0.0
+    for item in (stats.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+        disk_io += item.get('value', 0)
+    disk_io_mb = disk_io / (1024 * 1024)
+
+    # Container uptime
+    created_at = datetime.fromisoformat(created.replace('Z', '+00:00'))
+    uptime_seconds = (datetime.now(created_at.tzinfo) - created_at).total_seconds()
+
+    return {
+        "cpu_percent": round(cpu_percent, 2),
+        "memory_percent": round(memory_percent, 2),
+        "memory_mb": round(memory_mb, 2),
+        "network_io_mb": round(network_io_mb, 2),
+        "disk_io_mb": round(disk_io_mb, 2),
+        "uptime_seconds": int(uptime_seconds),
+        "cpu_cores": cpu_count,
+        "memory_limit_gb": round(memory_limit / (1024 ** 3), 2)
+    }
+
+
+class ContainerStatsStream:
+    """
+    Persistent streaming stats subscription for one container.
+
+    Docker pushes a sample about once a second; a daemon thread keeps the
+    latest parsed sample so readers never wait on the Docker API.
+    """
+
+    RESUBSCRIBE_DELAY_SECONDS = 5
+
+    def __init__(self, container):
+        self.container = container
+        self.latest: Optional[Dict[str, Any]] = None
+        self.updated_at = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"stats-{container.short_id}", daemon=True)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def age(self) -> float:
+        """Seconds since the latest sample (infinite before the first)"""
+        return time.monotonic() - self.updated_at if self.latest is not None else float("inf")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        created = self.container.attrs['Created']
+        while not self._stop.is_set():
+            try:
+                for sample in self.container.stats(stream=True, decode=True):
+                    if self._stop.is_set():
+                        return
+                    self.latest = parse_container_stats(sample, created)
+                    self.updated_at = time.monotonic()
+            except Exception as e:
+                logger.warning(f"Stats stream for container {self.container.short_id} interrupted: {e}")
+            # Stream ended (container restarted or daemon hiccup); resubscribe after a pause
+            self._stop.wait(self.RESUBSCRIBE_DELAY_SECONDS)
+
+
 class RegionMonitor:
     """Monitor regional container performance and health"""
     
@@ -20,6 +118,7 @@ class RegionMonitor:
         self.settings = get_settings()
         self.docker_client = docker.from_env()
         self.http_client = httpx.AsyncClient(timeout=10.0)
+        self._streams: Dict[str, ContainerStatsStream] = {}
     
     async def initialize(self):
         """Initialize monitoring service"""
@@ -27,66 +126,54 @@ class RegionMonitor:
     
     async def cleanup(self):
         """Cleanup monitoring resources"""
+        for container_id in list(self._streams):
+            self.unsubscribe(container_id)
         await self.http_client.aclose()
     
+    def _subscribe(self, container_id: str) -> ContainerStatsStream:
+        """Start a streaming stats subscription (blocking Docker lookup; run off the event loop)"""
+        stream = self._streams.get(container_id)
+        if stream is None or not stream.alive:
+            stream = ContainerStatsStream(self.docker_client.containers.get(container_id))
+            stream.start()
+            self._streams[container_id] = stream
+        return stream
+
+    def unsubscribe(self, container_id: str) -> None:
+        stream = self._streams.pop(container_id, None)
+        if stream:
+            stream.stop()
+
+    def prune_subscriptions(self, container_ids) -> None:
+        """Stop subscriptions for containers no longer monitored"""
+        keep = set(container_ids)
+        for container_id in list(self._streams):
+            if container_id not in keep:
+                self.unsubscribe(container_id)
+
+    def _fetch_container_stats(self, container_id: str) -> Dict[str, Any]:
+        """One-shot stats read; blocks for about two seconds while Docker samples CPU"""
+        container = self.docker_client.containers.get(container_id)
+        return parse_container_stats(container.stats(stream=False), container.attrs['Created'])
+
     async def get_container_stats(self, container_id: Optional[str]) -> Optional[Dict[str, Any]]:
-        """Get resource usage statistics for a container"""
+        """
+        Get resource usage statistics for a container.
+
+        Served from the container's streaming subscription when it has a
+        recent sample; otherwise the subscription is (re)started and a
+        one-shot read is made in a worker thread, never on the event loop.
+        """
         if not container_id:
             return None
-        
+
+        stream = self._streams.get(container_id)
+        if stream and stream.age() <= self.settings.STATS_MAX_AGE_SECONDS:
+            return stream.latest
+
         try:
-            container = self.docker_client.containers.get(container_id)
-            
-            # Get container stats
-            stats = container.stats(stream=False)
-            
-            # Calculate CPU usage
-            cpu_stats = stats['cpu_stats']
-            precpu_stats = stats['precpu_stats']
-            
-            cpu_delta = cpu_stats['cpu_usage']['total_usage'] - precpu_stats['cpu_usage']['total_usage']
-            system_delta = cpu_stats['system_cpu_usage'] - precpu_stats['system_cpu_usage']
-            cpu_percent = 0.0
-            
-            if system_delta > 0 and cpu_delta > 0:
-                cpu_percent = (cpu_delta / system_delta) * len(cpu_stats['cpu_usage']['percpu_usage']) * 100.0
-            
-            # Calculate memory usage
-            memory_stats = stats['memory_stats']
-            memory_usage = memory_stats.get('usage', 0)
-            memory_limit = memory_stats.get('limit', 1)
-            memory_percent = (memory_usage / memory_limit) * 100.0
-            memory_mb = memory_usage / (1024 * 1024)
-            
-            # Calculate network I/O
-            network_io = 0.0
-            if 'networks' in stats:
-                for interface, data in stats['networks'].items():
-                    network_io += data.get('rx_bytes', 0) + data.get('tx_bytes', 0)
-            network_io_mb = network_io / (1024 * 1024)
-            
-            # Calculate disk I/O
-            disk_io = 0.0
-            if 'blkio_stats' in stats and 'io_service_bytes_recursive' in stats['blkio_stats']:
-                for item in stats['blkio_stats']['io_service_bytes_recursive']:
-                    disk_io += item.get('value', 0)
-            disk_io_mb = disk_io / (1024 * 1024)
-            
-            # Container uptime
-            created_at = datetime.fromisoformat(container.attrs['Created'].replace('Z', '+00:00'))
-            uptime_seconds = (datetime.now(created_at.tzinfo) - created_at).total_seconds()
-            
-            return {
-                "cpu_percent": round(cpu_percent, 2),
-                "memory_percent": round(memory_percent, 2),
-                "memory_mb": round(memory_mb, 2),
-                "network_io_mb": round(network_io_mb, 2),
-                "disk_io_mb": round(disk_io_mb, 2),
-                "uptime_seconds": int(uptime_seconds),
-                "cpu_cores": len(cpu_stats['cpu_usage']['percpu_usage']),
-                "memory_limit_gb": round(memory_limit / (1024 ** 3), 2)
-            }
-        
+            await asyncio.to_thread(self._subscribe, container_id)
+            return await asyncio.to_thread(self._fetch_container_stats, container_id)
         except Exception as e:
             logger.error(f"Failed to get container stats for {container_id}: {e}")
             return None
@@ -136,8 +223,8 @@ class RegionMonitor:
                 metrics = response.json()
                 
                 # Add container resource metrics
-                containers = self.docker_client.containers.list(
-                    filters={"label": f"region={region_name}"}
+                containers = await asyncio.to_thread(
+                    self.docker_client.containers.list, filters={"label": f"region={region_name}"}
                 )
                 
                 if containers:
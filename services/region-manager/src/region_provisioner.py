@@ -5,13 +5,14 @@ import docker
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import asyncpg
 import redis.asyncio as redis
 from jinja2 import Environment, FileSystemLoader
 import yaml
 import os
 
+from autoscaler import container_allocation
 from models import RegionRequest, RegionConfig
 from config import get_settings
 
@@ -56,6 +57,22 @@ class RegionProvisioner:
             """)
             return regions
     
+    async def get_region_allocation(self, region_name: str) -> Optional[Tuple[float, int]]:
+        """(cpu_cores, memory_gb) currently applied to a region's game server container"""
+        def lookup():
+            containers = self.docker_client.containers.list(
+                filters={"label": [f"region={region_name}", "service=gameserver"]}
+            )
+            if not containers:
+                return None
+            return container_allocation(containers[0].attrs.get("HostConfig") or {})
+
+        try:
+            return await asyncio.to_thread(lookup)
+        except Exception as e:
+            logger.warning(f"Failed to read resource allocation for region {region_name}: {e}")
+            return None
+
     async def validate_region_request(self, request: RegionRequest) -> bool:
         """Validate region provisioning request"""
         try:
@@ -0,0 +1,6 @@
+"""Region manager modules import each other as top-level modules (PYTHONPATH=/app/src in the image)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,59 @@
+"""Unit tests for region auto-scaling decisions"""
+
+from autoscaler import RegionAutoscaler, container_allocation
+from config import get_settings
+
+
+class FakeClock:
+    def __init__(self, now=10_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def run_hot(autoscaler, region, samples):
+    decision = None
+    for _ in range(samples):
+        decision = autoscaler.observe(region, 95.0, 95.0) or decision
+    return decision
+
+
+def test_hot_region_scales_up_from_its_provisioned_allocation():
+    settings = get_settings()
+    clock = FakeClock()
+    autoscaler = RegionAutoscaler(clock)
+    autoscaler.record_allocation("big", 6.0, 12)
+    clock.now += settings.SCALE_UP_COOLDOWN_SECONDS
+
+    decision = run_hot(autoscaler, "big", settings.AUTOSCALE_MIN_SAMPLES + settings.SCALE_UP_SUSTAINED_SAMPLES)
+
+    assert decision is not None and decision.direction == "up"
+    assert decision.cpu_cores >= 6.0
+    assert decision.memory_gb >= 12
+
+
+def test_allocation_found_on_a_running_container_does_not_start_a_cooldown():
+    settings = get_settings()
+    autoscaler = RegionAutoscaler(FakeClock())
+    autoscaler.record_allocation("loaded", 6.0, 12, start_cooldown=False)
+
+    decision = run_hot(autoscaler, "loaded", settings.AUTOSCALE_MIN_SAMPLES + settings.SCALE_UP_SUSTAINED_SAMPLES)
+
+    assert decision is not None and decision.cpu_cores == min(9.0, settings.MAX_CPU_CORES)
+
+
+def test_provisioning_starts_a_cooldown():
+    settings = get_settings()
+    autoscaler = RegionAutoscaler(FakeClock())
+    autoscaler.record_allocation("fresh", 2.0, 4)
+
+    assert run_hot(autoscaler, "fresh", settings.AUTOSCALE_MIN_SAMPLES + settings.SCALE_UP_SUSTAINED_SAMPLES) is None
+
+
+def test_container_allocation_reads_docker_limits():
+    gib = 1024 ** 3
+    assert container_allocation({"NanoCpus": 6_000_000_000, "Memory": 12 * gib}) == (6.0, 12)
+    assert container_allocation({"CpuQuota": 300000, "CpuPeriod": 100000, "Memory": 4 * gib}) == (3.0, 4)
+    assert container_allocation({"NanoCpus": 0, "CpuQuota": 0, "Memory": 4 * gib}) is None
+    assert container_allocation({"NanoCpus": 2_000_000_000, "Memory": 0}) is None